@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from .models import AgentHourlyRollup, RollupWatermark, ServiceHourlyRollup
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the RollupWatermark model.
+    Displays 'name', 'last_message_id', 'last_message_at' and 'updated_at' in the list view.
+    """
+    list_display = ('name', 'last_message_id', 'last_message_at', 'updated_at')
+
+
+@admin.register(ServiceHourlyRollup)
+class ServiceHourlyRollupAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the ServiceHourlyRollup model.
+    Displays 'bucket', 'service', the message counts and 'responses' in the list view.
+    """
+    list_display = ('bucket', 'service', 'user_messages', 'bot_messages', 'agent_messages', 'responses')
+    list_filter = ('service',)
+
+
+@admin.register(AgentHourlyRollup)
+class AgentHourlyRollupAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the AgentHourlyRollup model.
+    Displays 'bucket', 'support_agent', 'messages' and 'responses' in the list view.
+    """
+    list_display = ('bucket', 'support_agent', 'messages', 'responses')
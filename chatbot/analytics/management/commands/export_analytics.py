@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from analytics.repositories.export_repository import EXPORT_TABLES
+from analytics.services.export_service import ExportService
+
+
+class Command(BaseCommand):
+    """
+    Exports messages, chats and contacts to date-partitioned Parquet or Arrow IPC
+    files, incrementally: each run only writes the rows added since the previous one.
+
+        python manage.py export_analytics
+        python manage.py export_analytics --table messages --format arrow --output /data/chatbot
+    """
+
+    help = "Export messages, chats and contacts to Parquet or Arrow files for offline analysis."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--table", action="append", choices=list(EXPORT_TABLES), help="Table to export; all of them by default."
+        )
+        parser.add_argument("--format", dest="file_format", choices=["parquet", "arrow"], default="parquet")
+        parser.add_argument("--output", default=None, help="Export root; EXPORT_ROOT by default.")
+        parser.add_argument("--full", action="store_true", help="Remove the previous files and export every row.")
+
+    def handle(self, *args, **options):
+        export_service = ExportService()
+        for table in options["table"] or EXPORT_TABLES:
+            result = export_service.export(table, options["file_format"], options["output"], options["full"])
+            self.stdout.write(f"{table}: rows={result['rows']} files={result['files']} last_id={result['last_id']}")
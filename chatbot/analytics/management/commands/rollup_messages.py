@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.services.analytics_service import AnalyticsService
+
+
+class Command(BaseCommand):
+    """
+    Adds the messages created since the last run to the hourly analytics rollups.
+
+    Keep one instance running with `--loop` (or run it from cron):
+        python manage.py rollup_messages --loop --interval 60
+    """
+
+    help = "Add the new messages to the hourly analytics rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep rolling up every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between runs with --loop.")
+        parser.add_argument("--limit", type=int, default=None, help="Messages per run; all new ones by default.")
+
+    def handle(self, *args, **options):
+        analytics_service = AnalyticsService()
+        while True:
+            result = analytics_service.rollup(options["limit"])
+            if result["messages"] or not options["loop"]:
+                self.stdout.write(f"messages={result['messages']} last_message_id={result['last_message_id']}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,128 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("chat", "0010_faq_articles"),
+        ("supportAgent", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingResponse",
+            fields=[
+                (
+                    "chat",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="chat.chat",
+                    ),
+                ),
+                ("waiting_since", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Pending response",
+                "verbose_name_plural": "Pending responses",
+            },
+        ),
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("last_message_id", models.BigIntegerField(default=0)),
+                ("last_message_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ServiceHourlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                (
+                    "service",
+                    models.CharField(
+                        choices=[("0", "Telegram"), ("1", "Discord")], max_length=2
+                    ),
+                ),
+                ("user_messages", models.PositiveIntegerField(default=0)),
+                ("bot_messages", models.PositiveIntegerField(default=0)),
+                ("agent_messages", models.PositiveIntegerField(default=0)),
+                ("responses", models.PositiveIntegerField(default=0)),
+                ("response_seconds", models.FloatField(default=0)),
+            ],
+            options={
+                "verbose_name": "Service hourly rollup",
+                "verbose_name_plural": "Service hourly rollups",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bucket", "service"), name="service_rollup_bucket_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AgentHourlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("messages", models.PositiveIntegerField(default=0)),
+                ("responses", models.PositiveIntegerField(default=0)),
+                ("response_seconds", models.FloatField(default=0)),
+                (
+                    "support_agent",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="Not constrained: the rollups of a removed agent are kept.",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="supportAgent.supportagent",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Agent hourly rollup",
+                "verbose_name_plural": "Agent hourly rollups",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bucket", "support_agent"),
+                        name="agent_rollup_bucket_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table", models.CharField(max_length=32)),
+                ("file_format", models.CharField(max_length=16)),
+                ("last_id", models.BigIntegerField(default=0)),
+                ("rows", models.BigIntegerField(default=0)),
+                ("exported_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Export watermark",
+                "verbose_name_plural": "Export watermarks",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("table", "file_format"), name="export_watermark_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
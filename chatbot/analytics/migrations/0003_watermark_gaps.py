@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_export_watermarks"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportwatermark",
+            name="gaps",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="rollupwatermark",
+            name="gaps",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
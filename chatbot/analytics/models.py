@@ -0,0 +1,163 @@
+from django.db import models
+
+from chat.models import Chat
+from supportAgent.models import SupportAgent
+
+
+class RollupWatermark(models.Model):
+    """
+    Position of a rollup job in the message table: the rollups hold every message
+    up to `last_message_id`, and only the messages after it are read by the next run.
+
+    Attributes:
+        name (str): The rollup job, e.g. 'messages'.
+        last_message_id (int): The id of the last message added to the rollups.
+        last_message_at (datetime): The creation time of that message (optional).
+        gaps (list): Id ranges skipped below `last_message_id`, re-scanned by the next runs
+            (see analytics.utils.id_gaps).
+        updated_at (datetime): When the job last advanced.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    last_message_id = models.BigIntegerField(default=0)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    gaps = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """
+        Returns a string representation of the watermark.
+        """
+        return f"{self.name}: message {self.last_message_id}"
+
+
+class ServiceHourlyRollup(models.Model):
+    """
+    Message counts and first-response times of one chat service in one hour.
+
+    Attributes:
+        bucket (datetime): The start of the hour (UTC).
+        service (str): The service of the chats ('0' = Telegram, '1' = Discord).
+        user_messages (int): Messages sent by contacts.
+        bot_messages (int): Messages sent by the bot.
+        agent_messages (int): Messages sent by support agents.
+        responses (int): Agent replies to a contact waiting for an agent.
+        response_seconds (float): Sum of the waiting times of those replies.
+    """
+
+    bucket = models.DateTimeField()
+    service = models.CharField(max_length=2, choices=[('0', 'Telegram'), ('1', 'Discord')])
+    user_messages = models.PositiveIntegerField(default=0)
+    bot_messages = models.PositiveIntegerField(default=0)
+    agent_messages = models.PositiveIntegerField(default=0)
+    responses = models.PositiveIntegerField(default=0)
+    response_seconds = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name = "Service hourly rollup"
+        verbose_name_plural = "Service hourly rollups"
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'service'], name='service_rollup_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the rollup.
+        """
+        return f"{self.get_service_display()} {self.bucket:%Y-%m-%d %H}h"
+
+
+class AgentHourlyRollup(models.Model):
+    """
+    Load and first-response times of one support agent in one hour.
+
+    Attributes:
+        bucket (datetime): The start of the hour (UTC).
+        support_agent (ForeignKey): The agent.
+        messages (int): Messages sent by the agent.
+        responses (int): Replies of the agent to a contact waiting for an agent.
+        response_seconds (float): Sum of the waiting times of those replies.
+    """
+
+    bucket = models.DateTimeField()
+    support_agent = models.ForeignKey(
+        SupportAgent, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+',
+        help_text="Not constrained: the rollups of a removed agent are kept."
+    )
+    messages = models.PositiveIntegerField(default=0)
+    responses = models.PositiveIntegerField(default=0)
+    response_seconds = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name = "Agent hourly rollup"
+        verbose_name_plural = "Agent hourly rollups"
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'support_agent'], name='agent_rollup_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the rollup.
+        """
+        return f"Agent {self.support_agent_id} {self.bucket:%Y-%m-%d %H}h"
+
+
+class PendingResponse(models.Model):
+    """
+    A chat whose contact is waiting for a support agent: it wrote after the last
+    agent message of the chat (or there is none yet). Kept by the rollup job so
+    the next agent message of the chat can be timed without reading the history.
+
+    Attributes:
+        chat (OneToOneField): The waiting chat.
+        waiting_since (datetime): The creation time of the first unanswered contact message.
+    """
+
+    chat = models.OneToOneField(Chat, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    waiting_since = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Pending response"
+        verbose_name_plural = "Pending responses"
+
+    def __str__(self):
+        """
+        Returns a string representation of the pending response.
+        """
+        return f"Chat {self.chat_id} waiting since {self.waiting_since}"
+
+
+class ExportWatermark(models.Model):
+    """
+    Position of the columnar export of a table in one format: the exported files
+    hold every row up to `last_id`, and the next export only writes the rows after it.
+
+    Attributes:
+        table (str): The exported table ('messages', 'chats' or 'contacts').
+        file_format (str): 'parquet' or 'arrow'.
+        last_id (int): The id of the last exported row.
+        rows (int): The number of rows exported so far.
+        gaps (list): Id ranges skipped below `last_id`, re-scanned by the next exports
+            (see analytics.utils.id_gaps).
+        exported_at (datetime): When the export last advanced.
+    """
+
+    table = models.CharField(max_length=32)
+    file_format = models.CharField(max_length=16)
+    last_id = models.BigIntegerField(default=0)
+    rows = models.BigIntegerField(default=0)
+    gaps = models.JSONField(default=list, blank=True)
+    exported_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Export watermark"
+        verbose_name_plural = "Export watermarks"
+        constraints = [
+            models.UniqueConstraint(fields=['table', 'file_format'], name='export_watermark_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the watermark.
+        """
+        return f"{self.table} ({self.file_format}): row {self.last_id}"
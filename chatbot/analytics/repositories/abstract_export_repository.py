@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, Optional
+
+from analytics.models import ExportWatermark
+
+
+class AbstractExportRepository(ABC):
+    """
+    Abstract base class for export repositories.
+    Define the operations for reading the exported tables and the export watermarks.
+    """
+
+    @abstractmethod
+    def get_rows(
+        table: str, after_id: int = 0, start: Optional[datetime] = None, end: Optional[datetime] = None,
+        chunk_size: int = 2000,
+    ) -> Iterator[tuple]:
+        """
+        Iterates over the rows of an exported table after an id, in id order.
+        """
+        pass
+
+    @abstractmethod
+    def get_rows_in(table: str, gaps: list, chunk_size: int = 2000) -> Iterator[tuple]:
+        """
+        Iterates over the rows of an exported table whose ids fall in the gaps of a watermark.
+        """
+        pass
+
+    @abstractmethod
+    def get_watermark(table: str, file_format: str) -> ExportWatermark:
+        """
+        Retrieves (creating it if needed) the export watermark of a table.
+        """
+        pass
+
+    @abstractmethod
+    def save_watermark(watermark: ExportWatermark, last_id: int, rows: int, gaps: list) -> None:
+        """
+        Advances the export watermark of a table.
+        """
+        pass
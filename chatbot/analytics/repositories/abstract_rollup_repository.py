@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from analytics.models import RollupWatermark
+
+
+class AbstractRollupRepository(ABC):
+    """
+    Abstract base class for rollup repositories.
+    Define the operations for the rollup job state and the hourly rollup tables.
+    """
+
+    @abstractmethod
+    def lock_watermark(name: str) -> RollupWatermark:
+        """
+        Retrieves (creating it if needed) and locks the watermark of a rollup job.
+        """
+        pass
+
+    @abstractmethod
+    def get_watermark(name: str) -> Optional[RollupWatermark]:
+        """
+        Retrieves the watermark of a rollup job.
+        """
+        pass
+
+    @abstractmethod
+    def save_watermark(
+        watermark: RollupWatermark, last_message_id: int, last_message_at: Optional[datetime], gaps: list,
+    ) -> None:
+        """
+        Advances the watermark of a rollup job.
+        """
+        pass
+
+    @abstractmethod
+    def get_messages_after(message_id: int, limit: int) -> List[tuple]:
+        """
+        Retrieves the messages created after a message id, in id order.
+        """
+        pass
+
+    @abstractmethod
+    def get_messages_in(gaps: list) -> List[tuple]:
+        """
+        Retrieves the messages whose ids fall in the gaps of a watermark, in id order.
+        """
+        pass
+
+    @abstractmethod
+    def get_pending(chat_ids: Iterable[int]) -> Dict[int, datetime]:
+        """
+        Retrieves since when the given chats wait for an agent.
+        """
+        pass
+
+    @abstractmethod
+    def save_pending(answered: Iterable[int], waiting: Dict[int, datetime]) -> None:
+        """
+        Removes the answered chats and stores the waiting ones.
+        """
+        pass
+
+    @abstractmethod
+    def add_service_rollups(totals: Dict[tuple, dict]) -> None:
+        """
+        Adds counts to the hourly rollups of the chat services.
+        """
+        pass
+
+    @abstractmethod
+    def add_agent_rollups(totals: Dict[tuple, dict]) -> None:
+        """
+        Adds counts to the hourly rollups of the support agents.
+        """
+        pass
+
+    @abstractmethod
+    def get_service_periods(start: datetime, end: datetime, interval: str, service: Optional[str] = None) -> List[dict]:
+        """
+        Retrieves the service rollups between two dates, summed per period.
+        """
+        pass
+
+    @abstractmethod
+    def get_agent_totals(start: datetime, end: datetime) -> List[dict]:
+        """
+        Retrieves the agent rollups between two dates, summed per agent.
+        """
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable
+
+from chat.models import Chat
+
+
+class AbstractWaitingChatRepository(ABC):
+    """
+    Abstract base class for waiting chat repositories.
+    Define the operations for finding the open chats waiting for an agent reply.
+    """
+
+    @abstractmethod
+    def get_waiting() -> Dict[int, datetime]:
+        """
+        Retrieves the open chats waiting for an agent and since when.
+        """
+        pass
+
+    @abstractmethod
+    def get_open_by_ids(chat_ids: Iterable[int]) -> Dict[int, Chat]:
+        """
+        Retrieves the open chats among the given ids.
+        """
+        pass
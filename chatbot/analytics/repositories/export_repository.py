@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+
+from django.db.models import F
+
+from analytics.models import ExportWatermark
+from analytics.repositories.abstract_export_repository import AbstractExportRepository
+from analytics.utils.id_gaps import gaps_filter
+from chat.models import Chat
+from config.db_router import get_read_database
+from contact.models import Contact
+from message.models import Message
+
+# Exported tables: the model, the timestamp the files are partitioned by and the
+# (field, Arrow type) of each column; foreign keys are exported as their ids.
+EXPORT_TABLES = {
+    'messages': {
+        'model': Message,
+        'date': 'created_at',
+        'columns': [
+            ('id', 'int64'), ('chat_id', 'int64'), ('sender_type', 'int8'), ('message_content', 'string'),
+            ('sender_object_id', 'int64'), ('provider_message_id', 'string'), ('created_at', 'timestamp'),
+            ('edited_at', 'timestamp'),
+        ],
+    },
+    'chats': {
+        'model': Chat,
+        'date': 'start_time',
+        'columns': [
+            ('id', 'int64'), ('chat', 'string'), ('service', 'string'), ('bot_id', 'int64'),
+            ('support_agent_id', 'int64'), ('contact_id', 'int64'), ('start_time', 'timestamp'),
+            ('closing_time', 'timestamp'), ('last_activity_at', 'timestamp'),
+        ],
+    },
+    'contacts': {
+        'model': Contact,
+        'date': None,
+        'columns': [
+            ('id', 'int64'), ('name', 'string'), ('email', 'string'), ('telephone', 'string'), ('cpf', 'string'),
+            ('bot_id', 'int64'),
+        ],
+    },
+}
+
+
+@dataclass
+class ExportRepository(AbstractExportRepository):
+    """
+    Concrete implementation of the AbstractExportRepository class.
+
+    Exported rows are read from a read replica; the watermarks live on the primary.
+    """
+
+    @staticmethod
+    def get_rows(
+        table: str, after_id: int = 0, start: Optional[datetime] = None, end: Optional[datetime] = None,
+        chunk_size: int = 2000,
+    ) -> Iterator[tuple]:
+        """
+        Iterates over the rows of an exported table after an id, in id order. The
+        rows are fetched `chunk_size` at a time with a server-side cursor where the
+        database has one, without building model instances.
+
+        Args:
+            table (str): A key of EXPORT_TABLES.
+            after_id (int): Only the rows with a greater id.
+            start (datetime, optional): Only the rows whose partition timestamp is at or after it;
+                ignored for tables without one.
+            end (datetime, optional): Only the rows whose partition timestamp is before it;
+                ignored for tables without one.
+            chunk_size (int): The rows fetched per round trip.
+
+        Returns:
+            Iterator[tuple]: The values of the table columns, in EXPORT_TABLES order.
+        """
+        spec = EXPORT_TABLES[table]
+        rows = spec['model'].objects.using(get_read_database()).filter(id__gt=after_id)
+        if spec['date'] and start is not None:
+            rows = rows.filter(**{f"{spec['date']}__gte": start})
+        if spec['date'] and end is not None:
+            rows = rows.filter(**{f"{spec['date']}__lt": end})
+        # `chat_id` and friends are the names of the foreign keys, so their values are the related ids.
+        names = [name for name, _ in spec['columns']]
+        return rows.order_by('id').values_list(*names).iterator(chunk_size=chunk_size)
+
+    @staticmethod
+    def get_rows_in(table: str, gaps: list, chunk_size: int = 2000) -> Iterator[tuple]:
+        """
+        Iterates over the rows of an exported table whose ids fall in the gaps of
+        a watermark (committed after the export moved past them), in id order.
+
+        Args:
+            table (str): A key of EXPORT_TABLES.
+            gaps (list): The gaps, as [first id, last id, first seen].
+            chunk_size (int): The rows fetched per round trip.
+
+        Returns:
+            Iterator[tuple]: The values of the table columns, in EXPORT_TABLES order.
+        """
+        spec = EXPORT_TABLES[table]
+        names = [name for name, _ in spec['columns']]
+        return (
+            spec['model'].objects.using(get_read_database()).filter(gaps_filter(gaps))
+            .order_by('id').values_list(*names).iterator(chunk_size=chunk_size)
+        )
+
+    @staticmethod
+    def get_watermark(table: str, file_format: str) -> ExportWatermark:
+        """
+        Retrieves (creating it if needed) the export watermark of a table.
+
+        Args:
+            table (str): The exported table.
+            file_format (str): 'parquet' or 'arrow'.
+
+        Returns:
+            ExportWatermark: The watermark.
+        """
+        return ExportWatermark.objects.get_or_create(table=table, file_format=file_format)[0]
+
+    @staticmethod
+    def save_watermark(watermark: ExportWatermark, last_id: int, rows: int, gaps: list) -> None:
+        """
+        Advances the export watermark of a table.
+
+        Args:
+            watermark (ExportWatermark): The watermark.
+            last_id (int): The id of the last exported row; 0 restarts the export.
+            rows (int): The rows exported by the run; ignored (and the count reset) when restarting.
+            gaps (list): The id ranges still to re-scan below `last_id`.
+        """
+        watermark.last_id = last_id
+        watermark.rows = F('rows') + rows if last_id else 0
+        watermark.gaps = gaps
+        watermark.save(update_fields=['last_id', 'rows', 'gaps', 'exported_at'])
+        watermark.refresh_from_db(fields=['rows'])
@@ -0,0 +1,235 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Sum
+from django.db.models.functions import Trunc
+
+from analytics.models import AgentHourlyRollup, PendingResponse, RollupWatermark, ServiceHourlyRollup
+from analytics.repositories.abstract_rollup_repository import AbstractRollupRepository
+from analytics.utils.id_gaps import gaps_filter
+from config.db_router import get_read_database
+from message.models import Message
+from supportAgent.models import SupportAgent
+
+SERVICE_COUNTS = ('user_messages', 'bot_messages', 'agent_messages', 'responses', 'response_seconds')
+AGENT_COUNTS = ('messages', 'responses', 'response_seconds')
+
+
+@dataclass
+class RollupRepository(AbstractRollupRepository):
+    """
+    Concrete implementation of the AbstractRollupRepository class.
+
+    The rollup job runs on the primary database; the dashboard reads
+    (`get_service_periods`, `get_agent_totals`) are served by a read replica
+    unless the request is pinned to the primary.
+    """
+
+    @staticmethod
+    def lock_watermark(name: str) -> RollupWatermark:
+        """
+        Retrieves (creating it if needed) and locks the watermark of a rollup job
+        until the end of the current transaction, so two runs never add the same
+        messages.
+
+        Args:
+            name (str): The rollup job.
+
+        Returns:
+            RollupWatermark: The locked watermark.
+        """
+        RollupWatermark.objects.get_or_create(name=name)
+        return RollupWatermark.objects.select_for_update().get(name=name)
+
+    @staticmethod
+    def get_watermark(name: str) -> Optional[RollupWatermark]:
+        """
+        Retrieves the watermark of a rollup job, from a read replica.
+
+        Returns:
+            RollupWatermark: The watermark, or None if the job never ran.
+        """
+        return RollupWatermark.objects.using(get_read_database()).filter(name=name).first()
+
+    @staticmethod
+    def save_watermark(
+        watermark: RollupWatermark, last_message_id: int, last_message_at: Optional[datetime], gaps: list,
+    ) -> None:
+        """
+        Advances the watermark of a rollup job.
+
+        Args:
+            watermark (RollupWatermark): The locked watermark.
+            last_message_id (int): The id of the last message added to the rollups.
+            last_message_at (datetime): The creation time of that message.
+            gaps (list): The id ranges still to re-scan below `last_message_id`.
+        """
+        watermark.last_message_id = last_message_id
+        watermark.last_message_at = last_message_at
+        watermark.gaps = gaps
+        watermark.save(update_fields=['last_message_id', 'last_message_at', 'gaps', 'updated_at'])
+
+    @staticmethod
+    def get_messages_after(message_id: int, limit: int) -> List[tuple]:
+        """
+        Retrieves the messages created after a message id, in id order, without
+        loading the models.
+
+        Args:
+            message_id (int): The last message already read.
+            limit (int): The maximum number of messages.
+
+        Returns:
+            List[tuple]: (id, chat id, chat service, sender type, sender content type id,
+            sender object id, created_at) of each message.
+        """
+        return list(
+            Message.objects.filter(id__gt=message_id).order_by('id').values_list(
+                'id', 'chat_id', 'chat_id__service', 'sender_type', 'sender_content_type_id', 'sender_object_id',
+                'created_at',
+            )[:limit]
+        )
+
+    @staticmethod
+    def get_messages_in(gaps: list) -> List[tuple]:
+        """
+        Retrieves the messages whose ids fall in the gaps of a watermark (committed
+        after the watermark moved past them), in id order.
+
+        Args:
+            gaps (list): The gaps, as [first id, last id, first seen].
+
+        Returns:
+            List[tuple]: The same values as `get_messages_after`.
+        """
+        return list(
+            Message.objects.filter(gaps_filter(gaps)).order_by('id').values_list(
+                'id', 'chat_id', 'chat_id__service', 'sender_type', 'sender_content_type_id', 'sender_object_id',
+                'created_at',
+            )
+        )
+
+    @staticmethod
+    def get_pending(chat_ids: Iterable[int]) -> Dict[int, datetime]:
+        """
+        Retrieves since when the given chats wait for an agent.
+
+        Args:
+            chat_ids (Iterable[int]): The chats.
+
+        Returns:
+            Dict[int, datetime]: The `waiting_since` of each waiting chat.
+        """
+        return dict(PendingResponse.objects.filter(chat_id__in=set(chat_ids)).values_list('chat_id', 'waiting_since'))
+
+    @staticmethod
+    def save_pending(answered: Iterable[int], waiting: Dict[int, datetime]) -> None:
+        """
+        Removes the chats that no longer wait and stores the ones that started waiting.
+
+        Args:
+            answered (Iterable[int]): The chats to remove.
+            waiting (Dict[int, datetime]): The `waiting_since` of each chat to store.
+        """
+        PendingResponse.objects.filter(chat_id__in=set(answered) | set(waiting)).delete()
+        PendingResponse.objects.bulk_create(
+            [PendingResponse(chat_id=chat_id, waiting_since=since) for chat_id, since in waiting.items()]
+        )
+
+    @staticmethod
+    def add_service_rollups(totals: Dict[tuple, dict]) -> None:
+        """
+        Adds counts to the hourly rollups of the chat services.
+
+        Args:
+            totals (Dict[tuple, dict]): The counts to add per (bucket, service).
+        """
+        _add_to_rollups(ServiceHourlyRollup, 'service', SERVICE_COUNTS, totals)
+
+    @staticmethod
+    def add_agent_rollups(totals: Dict[tuple, dict]) -> None:
+        """
+        Adds counts to the hourly rollups of the support agents.
+
+        Args:
+            totals (Dict[tuple, dict]): The counts to add per (bucket, support agent id).
+        """
+        _add_to_rollups(AgentHourlyRollup, 'support_agent_id', AGENT_COUNTS, totals)
+
+    @staticmethod
+    def get_service_periods(start: datetime, end: datetime, interval: str, service: Optional[str] = None) -> List[dict]:
+        """
+        Retrieves the service rollups of the hours starting in [start, end), summed
+        per period, from a read replica. Only rollup rows are read, so the cost
+        depends on the number of hours, not of messages.
+
+        Args:
+            start (datetime): Inclusive lower bound of the hours.
+            end (datetime): Exclusive upper bound of the hours.
+            interval (str): The period: 'hour', 'day', 'week' or 'month'.
+            service (str, optional): Only the chats of this service.
+
+        Returns:
+            List[dict]: The `period` and the summed counts of each period with messages, in order.
+        """
+        rollups = ServiceHourlyRollup.objects.using(get_read_database()).filter(bucket__gte=start, bucket__lt=end)
+        if service is not None:
+            rollups = rollups.filter(service=service)
+        return list(
+            rollups.annotate(period=Trunc('bucket', interval)).values('period')
+            .annotate(**{field: Sum(field) for field in SERVICE_COUNTS}).order_by('period')
+        )
+
+    @staticmethod
+    def get_agent_totals(start: datetime, end: datetime) -> List[dict]:
+        """
+        Retrieves the agent rollups of the hours starting in [start, end), summed
+        per agent, from a read replica.
+
+        Args:
+            start (datetime): Inclusive lower bound of the hours.
+            end (datetime): Exclusive upper bound of the hours.
+
+        Returns:
+            List[dict]: The `support_agent` id, its `name` (None for a removed agent)
+            and the summed counts of each agent, busiest first.
+        """
+        database = get_read_database()
+        totals = list(
+            AgentHourlyRollup.objects.using(database).filter(bucket__gte=start, bucket__lt=end)
+            .values('support_agent_id').annotate(**{field: Sum(field) for field in AGENT_COUNTS})
+            .order_by('-messages', 'support_agent_id')
+        )
+        agents = SupportAgent.objects.using(database).in_bulk([row['support_agent_id'] for row in totals])
+        for row in totals:
+            agent = agents.get(row['support_agent_id'])
+            row['support_agent'] = row.pop('support_agent_id')
+            row['name'] = str(agent) if agent is not None else None
+        return totals
+
+
+def _add_to_rollups(model, key_field: str, fields: tuple, totals: Dict[tuple, dict]) -> None:
+    """
+    Adds counts to existing rollup rows with one UPDATE batch and creates the
+    missing rows with one INSERT batch. Runs inside the rollup job's
+    transaction, which holds the watermark lock, so no other writer races it.
+    """
+    if not totals:
+        return
+    missing = dict(totals)
+    existing = model.objects.filter(
+        bucket__in={bucket for bucket, _ in totals}, **{f'{key_field}__in': {key for _, key in totals}}
+    )
+    updated = []
+    for rollup in existing:
+        counts = missing.pop((rollup.bucket, getattr(rollup, key_field)), None)
+        if counts is None:
+            continue
+        for field, value in counts.items():
+            setattr(rollup, field, getattr(rollup, field) + value)
+        updated.append(rollup)
+    model.objects.bulk_update(updated, fields)
+    model.objects.bulk_create(
+        [model(bucket=bucket, **{key_field: key}, **counts) for (bucket, key), counts in missing.items()]
+    )
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from analytics.repositories.abstract_waiting_chat_repository import AbstractWaitingChatRepository
+from chat.models import Chat
+from message.models import Message
+
+USER, SUPPORT_AGENT = 1, 3
+NEVER = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class WaitingChatRepository(AbstractWaitingChatRepository):
+    """
+    Concrete implementation of the AbstractWaitingChatRepository class.
+
+    Runs on the primary database: a replica lagging behind would report chats
+    that were just answered as waiting.
+    """
+
+    @staticmethod
+    def get_waiting() -> Dict[int, datetime]:
+        """
+        Retrieves, in one query, the open chats whose contact wrote after the last
+        agent message (or that have no agent message), with the creation time of
+        the first of those contact messages. The query walks the open chats
+        (`chat_open_activity_idx`) and makes two seeks per chat in
+        `message_chat_sender_idx`: its last agent message and its first contact
+        message after it.
+
+        Returns:
+            Dict[int, datetime]: {chat id: waiting since}.
+        """
+        last_answer = Message.objects.filter(
+            chat_id=OuterRef('id'), sender_type=SUPPORT_AGENT
+        ).order_by('-created_at').values('created_at')[:1]
+        first_waiting = Message.objects.filter(
+            chat_id=OuterRef('id'), sender_type=USER, created_at__gt=OuterRef('last_answer')
+        ).order_by('created_at').values('created_at')[:1]
+        chats = (
+            Chat.objects.filter(closing_time__isnull=True)
+            .annotate(last_answer=Coalesce(Subquery(last_answer), Value(NEVER)))
+            .annotate(since=Subquery(first_waiting)).values_list('id', 'since')
+        )
+        return {chat_id: since for chat_id, since in chats if since is not None}
+
+    @staticmethod
+    def get_open_by_ids(chat_ids: Iterable[int]) -> Dict[int, Chat]:
+        """
+        Retrieves the open chats among the given ids.
+
+        Args:
+            chat_ids (Iterable[int]): The chat ids.
+
+        Returns:
+            Dict[int, Chat]: The open chats by id.
+        """
+        return Chat.objects.filter(closing_time__isnull=True).in_bulk(list(chat_ids))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the analytics endpoints.
+
+    Fields:
+        - start (datetime): Inclusive lower bound; ANALYTICS_DEFAULT_DAYS before `end` by default.
+        - end (datetime): Exclusive upper bound; now by default.
+        - interval (str): The period of the message stats: 'hour', 'day' (default), 'week' or 'month'.
+        - service (str): Only chats of this service ('0' = Telegram, '1' = Discord).
+    """
+
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    interval = serializers.ChoiceField(choices=['hour', 'day', 'week', 'month'], default='day')
+    service = serializers.ChoiceField(choices=['0', '1'], required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.now())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=settings.ANALYTICS_DEFAULT_DAYS))
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError("`start` must be before `end`.")
+        return attrs
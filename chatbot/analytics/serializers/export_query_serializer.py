@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the export endpoint.
+
+    Fields:
+        - file_format (str): 'parquet' (default) or 'arrow' (an Arrow IPC stream).
+        - after (int): Only the rows with a greater id, to export incrementally.
+        - start (datetime): Only the rows created at or after it (ignored for contacts).
+        - end (datetime): Only the rows created before it (ignored for contacts).
+    """
+
+    file_format = serializers.ChoiceField(choices=['parquet', 'arrow'], default='parquet')
+    after = serializers.IntegerField(min_value=0, default=0)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class AbstractAnalyticsService(ABC):
+    """
+    Abstract class for defining methods related to conversation analytics.
+    """
+
+    @abstractmethod
+    def rollup(self, limit: Optional[int] = None) -> dict:
+        """
+        Method to add the messages created since the last run to the hourly rollups.
+
+        Args:
+            limit (int, optional): The maximum number of messages to read.
+
+        Returns:
+            dict: The number of `messages` added and the `last_message_id` of the watermark.
+        """
+        pass
+
+    @abstractmethod
+    def get_message_stats(
+        self, start: datetime, end: datetime, interval: str = 'day', service: Optional[str] = None,
+    ) -> dict:
+        """
+        Method to retrieve the message counts and first-response times per period.
+
+        Args:
+            start (datetime): Inclusive lower bound.
+            end (datetime): Exclusive upper bound.
+            interval (str): The period: 'hour', 'day', 'week' or 'month'.
+            service (str, optional): Only the chats of this service.
+
+        Returns:
+            dict: The periods and how recent the rollups are.
+        """
+        pass
+
+    @abstractmethod
+    def get_agent_stats(self, start: datetime, end: datetime) -> dict:
+        """
+        Method to retrieve the load and first-response times of each support agent.
+
+        Args:
+            start (datetime): Inclusive lower bound.
+            end (datetime): Exclusive upper bound.
+
+        Returns:
+            dict: The agents and how recent the rollups are.
+        """
+        pass
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class AbstractExportService(ABC):
+    """
+    Abstract class for defining methods related to the columnar exports.
+    """
+
+    @abstractmethod
+    def export(self, table: str, file_format: str = 'parquet', directory: Optional[Path] = None,
+               full: bool = False) -> dict:
+        """
+        Method to write the rows added since the last export of a table to date-partitioned files.
+
+        Args:
+            table (str): 'messages', 'chats' or 'contacts'.
+            file_format (str): 'parquet' or 'arrow'.
+            directory (Path, optional): The export root; EXPORT_ROOT by default.
+            full (bool): Removes the previous files and exports every row.
+
+        Returns:
+            dict: The number of `rows` and `files` written and the `last_id` of the watermark.
+        """
+        pass
+
+    @abstractmethod
+    def stream(self, table: str, file_format: str = 'parquet', after_id: int = 0,
+               start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[bytes]:
+        """
+        Method to stream the rows of a table as one Parquet file or Arrow IPC stream.
+
+        Args:
+            table (str): 'messages', 'chats' or 'contacts'.
+            file_format (str): 'parquet' or 'arrow'.
+            after_id (int): Only the rows with a greater id.
+            start (datetime, optional): Only the rows created at or after it.
+            end (datetime, optional): Only the rows created before it.
+
+        Returns:
+            Iterator[bytes]: The content, chunk by chunk.
+        """
+        pass
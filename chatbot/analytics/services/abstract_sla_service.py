@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+
+class AbstractSlaService(ABC):
+    """
+    Abstract class for defining methods related to the response-time SLA of the open chats.
+    """
+
+    @abstractmethod
+    def record(self, chat_id: int, sender_type: int, created_at: datetime) -> None:
+        """
+        Method to update the waiting chats with a new message.
+
+        Args:
+            chat_id (int): The chat of the message.
+            sender_type (int): 1 = USER, 2 = BOT, 3 = SUPPORT_AGENT.
+            created_at (datetime): The creation time of the message.
+        """
+        pass
+
+    @abstractmethod
+    def oldest_waiting(self, limit: int) -> List[dict]:
+        """
+        Method to retrieve the open chats that have waited longest for an agent reply.
+
+        Args:
+            limit (int): How many chats to return at most.
+
+        Returns:
+            List[dict]: The chats, longest wait first.
+        """
+        pass
+
+    @abstractmethod
+    def metrics(self) -> dict:
+        """
+        Method to retrieve the gauges of the waiting chats.
+
+        Returns:
+            dict: The number of waiting chats, of chats over the SLA and the longest wait in seconds.
+        """
+        pass
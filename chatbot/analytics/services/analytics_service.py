@@ -0,0 +1,165 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import takewhile
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from analytics.repositories.rollup_repository import RollupRepository
+from analytics.services.abstract_analytics_service import AbstractAnalyticsService
+from analytics.utils.id_gaps import expire_gaps, fill_gaps, track_gaps
+from supportAgent.models import SupportAgent
+
+MESSAGES_WATERMARK = 'messages'
+USER, BOT = 1, 2
+
+
+@dataclass
+class AnalyticsService(AbstractAnalyticsService):
+    """
+    Service class responsible for the conversation analytics.
+
+    `python manage.py rollup_messages` reads the messages created after the
+    watermark, ANALYTICS_BATCH_SIZE at a time, and adds them to hourly rollups
+    per chat service and per support agent; the rollups, the waiting chats and
+    the watermark are written in one transaction, so each message is counted
+    exactly once. Dashboard queries only read rollup rows.
+
+    A first response is the first agent message of a chat after a contact
+    message; its time is measured from the first contact message not yet
+    answered by an agent (bot replies do not count as answers).
+
+    Messages younger than ANALYTICS_ROLLUP_DELAY seconds are left for the next
+    run, so rows of transactions still being committed are rarely skipped. Ids
+    skipped by the watermark anyway (a long transaction committing after a
+    later id) are kept as gaps and re-scanned by each run for
+    ANALYTICS_RESCAN_WINDOW seconds; messages found there are counted
+    then, in the hour they were created.
+    """
+
+    rollup_repository = RollupRepository()
+
+    def rollup(self, limit: Optional[int] = None) -> dict:
+        """
+        Method to add the messages created since the last run to the hourly rollups.
+
+        Args:
+            limit (int, optional): The maximum number of messages to read; all of them by default.
+
+        Returns:
+            dict: The number of `messages` added and the `last_message_id` of the watermark.
+        """
+        now = timezone.now()
+        cutoff = now - timedelta(seconds=settings.ANALYTICS_ROLLUP_DELAY)
+        agent_type = ContentType.objects.get_for_model(SupportAgent).id
+        added, last_message_id, rescan = 0, None, True
+        while limit is None or added < limit:
+            batch_size = settings.ANALYTICS_BATCH_SIZE
+            if limit is not None:
+                batch_size = min(batch_size, limit - added)
+            with transaction.atomic():
+                watermark = self.rollup_repository.lock_watermark(MESSAGES_WATERMARK)
+                gaps = expire_gaps(watermark.gaps, now.timestamp(), settings.ANALYTICS_RESCAN_WINDOW)
+                late = self.rollup_repository.get_messages_in(gaps) if rescan and gaps else []
+                gaps = fill_gaps(gaps, [row[0] for row in late])
+                rows = self.rollup_repository.get_messages_after(watermark.last_message_id, batch_size)
+                ready = list(track_gaps(
+                    takewhile(lambda row: row[-1] < cutoff, rows), watermark.last_message_id, gaps, now.timestamp()
+                ))
+                if late or ready:
+                    self._add(sorted(late + ready, key=lambda row: (row[-1], row[0])), agent_type)
+                last = ready[-1] if ready else None
+                self.rollup_repository.save_watermark(
+                    watermark,
+                    last[0] if last else watermark.last_message_id,
+                    last[-1] if last else watermark.last_message_at,
+                    gaps,
+                )
+                last_message_id = watermark.last_message_id
+            added += len(late) + len(ready)
+            rescan = False
+            if len(ready) < batch_size:
+                break
+        return {'messages': added, 'last_message_id': last_message_id}
+
+    def get_message_stats(
+        self, start: datetime, end: datetime, interval: str = 'day', service: Optional[str] = None,
+    ) -> dict:
+        """
+        Method to retrieve the message counts and first-response times per period.
+        Hours are counted whole: an hour is included when it starts in [start, end).
+
+        Args:
+            start (datetime): Inclusive lower bound.
+            end (datetime): Exclusive upper bound.
+            interval (str): The period: 'hour', 'day', 'week' or 'month'.
+            service (str, optional): Only the chats of this service.
+
+        Returns:
+            dict: `results`, one entry per period with messages, and `up_to`, the
+            creation time of the last message in the rollups.
+        """
+        periods = self.rollup_repository.get_service_periods(start, end, interval, service)
+        for period in periods:
+            period['messages'] = period['user_messages'] + period['bot_messages'] + period['agent_messages']
+            period['average_response_seconds'] = _average(period.pop('response_seconds'), period['responses'])
+        return {'interval': interval, 'up_to': self._up_to(), 'results': periods}
+
+    def get_agent_stats(self, start: datetime, end: datetime) -> dict:
+        """
+        Method to retrieve the load and first-response times of each support agent.
+
+        Args:
+            start (datetime): Inclusive lower bound.
+            end (datetime): Exclusive upper bound.
+
+        Returns:
+            dict: `results`, one entry per agent with messages, busiest first, and
+            `up_to`, the creation time of the last message in the rollups.
+        """
+        agents = self.rollup_repository.get_agent_totals(start, end)
+        for agent in agents:
+            agent['average_response_seconds'] = _average(agent.pop('response_seconds'), agent['responses'])
+        return {'up_to': self._up_to(), 'results': agents}
+
+    def _add(self, rows: list, agent_type: int) -> None:
+        waiting = self.rollup_repository.get_pending(row[1] for row in rows)
+        initial = dict(waiting)
+        services, agents = defaultdict(Counter), defaultdict(Counter)
+        for _, chat_id, service, sender_type, sender_type_id, sender_id, created_at in rows:
+            bucket = created_at.replace(minute=0, second=0, microsecond=0)
+            counts = services[(bucket, service)]
+            if sender_type == USER:
+                counts['user_messages'] += 1
+                waiting.setdefault(chat_id, created_at)
+                continue
+            if sender_type == BOT:
+                counts['bot_messages'] += 1
+                continue
+            counts['agent_messages'] += 1
+            agent = agents[(bucket, sender_id)] if sender_type_id == agent_type and sender_id else Counter()
+            agent['messages'] += 1
+            since = waiting.pop(chat_id, None)
+            if since is not None:
+                seconds = max((created_at - since).total_seconds(), 0.0)
+                for target in (counts, agent):
+                    target['responses'] += 1
+                    target['response_seconds'] += seconds
+        self.rollup_repository.save_pending(
+            [chat_id for chat_id in initial if chat_id not in waiting],
+            {chat_id: since for chat_id, since in waiting.items() if initial.get(chat_id) != since},
+        )
+        self.rollup_repository.add_service_rollups(services)
+        self.rollup_repository.add_agent_rollups(agents)
+
+    def _up_to(self) -> Optional[datetime]:
+        watermark = self.rollup_repository.get_watermark(MESSAGES_WATERMARK)
+        return watermark.last_message_at if watermark is not None else None
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 1) if count else None
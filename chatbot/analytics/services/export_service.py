@@ -0,0 +1,108 @@
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from itertools import chain
+
+from django.conf import settings
+from django.utils import timezone
+
+from analytics.repositories.export_repository import EXPORT_TABLES, ExportRepository
+from analytics.services.abstract_export_service import AbstractExportService
+from analytics.utils.id_gaps import expire_gaps, fill_gaps, track_gaps
+
+
+@dataclass
+class ExportService(AbstractExportService):
+    """
+    Service class responsible for the columnar (Parquet / Arrow IPC) exports of
+    messages, chats and contacts for offline analysis.
+
+    `python manage.py export_analytics` writes, per table and format, the rows
+    added since the export watermark to `EXPORT_ROOT/<format>/<table>/date=YYYY-MM-DD/`
+    files; `/analytics/export/<table>/` streams a single file. Rows are read
+    EXPORT_CHUNK_SIZE at a time and written as record batches of that size, so
+    memory does not grow with the table.
+
+    Rows are exported as they are when first exported: later changes (edited
+    messages, closed chats) are only picked up by a `full` export. Ids skipped
+    by the watermark (rows committed after a later id) are kept as gaps and
+    re-scanned by each export for ANALYTICS_RESCAN_WINDOW seconds; rows found
+    there are written to new part files of their date partition.
+    """
+
+    export_repository = ExportRepository()
+
+    def export(self, table: str, file_format: str = 'parquet', directory: Optional[Path] = None,
+               full: bool = False) -> dict:
+        """
+        Method to write the rows added since the last export of a table to date-partitioned files.
+
+        Args:
+            table (str): 'messages', 'chats' or 'contacts'.
+            file_format (str): 'parquet' or 'arrow'.
+            directory (Path, optional): The export root; EXPORT_ROOT by default.
+            full (bool): Removes the previous files of the table and exports every row.
+
+        Returns:
+            dict: The number of `rows` and `files` written and the `last_id` of the watermark.
+        """
+        # pyarrow is only loaded by the processes that export.
+        from analytics.utils.columnar_export import export_partitioned
+
+        spec = EXPORT_TABLES[table]
+        table_directory = Path(directory or settings.EXPORT_ROOT) / file_format / table
+        watermark = self.export_repository.get_watermark(table, file_format)
+        if full:
+            shutil.rmtree(table_directory, ignore_errors=True)
+            self.export_repository.save_watermark(watermark, 0, 0, [])
+        now = timezone.now().timestamp()
+        gaps = expire_gaps(watermark.gaps, now, settings.ANALYTICS_RESCAN_WINDOW)
+        late_ids = []
+        late = self.export_repository.get_rows_in(table, gaps, settings.EXPORT_CHUNK_SIZE) if gaps else ()
+        rows = self.export_repository.get_rows(table, watermark.last_id, chunk_size=settings.EXPORT_CHUNK_SIZE)
+        result = export_partitioned(
+            chain(
+                _noting_ids(late, late_ids),
+                track_gaps(rows, watermark.last_id, gaps, now),
+            ),
+            spec['columns'], table_directory, file_format, spec['date'],
+            settings.EXPORT_CHUNK_SIZE, settings.EXPORT_MAX_OPEN_PARTITIONS,
+        )
+        gaps = fill_gaps(gaps, late_ids)
+        if result['rows'] or gaps != watermark.gaps:
+            # Late rows come first: the last row is a new one whenever there is one.
+            last_id = max(watermark.last_id, result['last_id'] or 0)
+            self.export_repository.save_watermark(watermark, last_id, result['rows'], gaps)
+        return {'rows': result['rows'], 'files': result['files'], 'last_id': watermark.last_id}
+
+    def stream(self, table: str, file_format: str = 'parquet', after_id: int = 0,
+               start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[bytes]:
+        """
+        Method to stream the rows of a table as one Parquet file or Arrow IPC stream.
+
+        Args:
+            table (str): 'messages', 'chats' or 'contacts'.
+            file_format (str): 'parquet' or 'arrow'.
+            after_id (int): Only the rows with a greater id.
+            start (datetime, optional): Only the rows created at or after it (not for contacts).
+            end (datetime, optional): Only the rows created before it (not for contacts).
+
+        Returns:
+            Iterator[bytes]: The content, chunk by chunk.
+        """
+        from analytics.utils.columnar_export import stream
+
+        rows = self.export_repository.get_rows(table, after_id, start, end, settings.EXPORT_CHUNK_SIZE)
+        return stream(rows, EXPORT_TABLES[table]['columns'], file_format, settings.EXPORT_CHUNK_SIZE)
+
+
+def _noting_ids(rows: Iterator[tuple], ids: list) -> Iterator[tuple]:
+    """
+    Yields rows, appending their ids to `ids`.
+    """
+    for row in rows:
+        ids.append(row[0])
+        yield row
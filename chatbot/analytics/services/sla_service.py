@@ -0,0 +1,123 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import ClassVar, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from analytics.repositories.waiting_chat_repository import WaitingChatRepository
+from analytics.services.abstract_sla_service import AbstractSlaService
+from analytics.utils.waiting_chats import WaitingChats
+
+USER, SUPPORT_AGENT = 1, 3
+
+
+@dataclass
+class SlaService(AbstractSlaService):
+    """
+    Service class responsible for tracking, live, the open chats waiting for an
+    agent reply.
+
+    The waiting chats are kept in memory, in the WaitingChats heap of the
+    process, keyed by their first unanswered contact message: every message
+    stored by MessageService.create or by a broadcast updates it once
+    committed (a contact message starts the wait, an agent message ends it;
+    bot replies do not), so reading the longest waits never touches the messages.
+
+    The heap is built from the database by one indexed query on the first read
+    and again on reads every SLA_RESYNC_INTERVAL seconds; recording a message
+    never queries, so the webhook path is unchanged. With several workers, each
+    one only sees its own messages between rebuilds, and chats closed by
+    `sweep_chats` leave the heap on the next rebuild (or as soon as they are read).
+    """
+
+    waiting_chat_repository = WaitingChatRepository()
+    _waiting: ClassVar[Optional[WaitingChats]] = None
+    _synced_at: ClassVar[float] = float('-inf')
+    _sync_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @property
+    def waiting(self) -> WaitingChats:
+        if time.monotonic() - SlaService._synced_at >= settings.SLA_RESYNC_INTERVAL:
+            self.resync()
+        return SlaService._waiting
+
+    def resync(self) -> None:
+        """
+        Rebuilds the waiting chats from the database. The messages recorded
+        while the query runs are replayed on the rebuilt heap.
+        """
+        with self._sync_lock:
+            if SlaService._waiting is None:
+                SlaService._waiting = WaitingChats()
+            SlaService._waiting.rebuild(self.waiting_chat_repository.get_waiting)
+            SlaService._synced_at = time.monotonic()
+
+    def record(self, chat_id: int, sender_type: int, created_at: datetime) -> None:
+        """
+        Method to update the waiting chats with a new message.
+
+        Args:
+            chat_id (int): The chat of the message.
+            sender_type (int): 1 = USER, 2 = BOT, 3 = SUPPORT_AGENT.
+            created_at (datetime): The creation time of the message.
+        """
+        # Never queries: before the first read builds the heap, there is nothing to update.
+        waiting = SlaService._waiting
+        if waiting is None:
+            return
+        if sender_type == USER:
+            waiting.wait(chat_id, created_at)
+        elif sender_type == SUPPORT_AGENT:
+            waiting.answer(chat_id)
+
+    def oldest_waiting(self, limit: int) -> List[dict]:
+        """
+        Method to retrieve the open chats that have waited longest for an agent
+        reply. Chats found closed are dropped from the heap.
+
+        Args:
+            limit (int): How many chats to return at most.
+
+        Returns:
+            List[dict]: The `chat` id, its provider `chat_id`, `service`, `waiting_since`,
+            `waiting_seconds` and whether the SLA is `breached`, longest wait first.
+        """
+        waiting, now = self.waiting, timezone.now()
+        while True:
+            oldest = waiting.oldest(limit)
+            chats = self.waiting_chat_repository.get_open_by_ids(chat_id for chat_id, _ in oldest)
+            closed = [chat_id for chat_id, _ in oldest if chat_id not in chats]
+            if not closed:
+                break
+            for chat_id in closed:
+                waiting.answer(chat_id)
+        return [
+            {
+                'chat': chat_id,
+                'chat_id': chats[chat_id].chat,
+                'service': chats[chat_id].service,
+                'waiting_since': since,
+                'waiting_seconds': round((now - since).total_seconds(), 1),
+                'breached': (now - since).total_seconds() > settings.SLA_TARGET_SECONDS,
+            }
+            for chat_id, since in oldest
+        ]
+
+    def metrics(self) -> dict:
+        """
+        Method to retrieve the gauges of the waiting chats.
+
+        Returns:
+            dict: `waiting_chats`, `breached_chats` (waiting over SLA_TARGET_SECONDS) and
+            `oldest_wait_seconds` (0 when no chat waits).
+        """
+        waiting, now = self.waiting, timezone.now()
+        oldest = waiting.oldest(1)
+        return {
+            'waiting_chats': len(waiting),
+            'breached_chats': waiting.waiting_since(now - timedelta(seconds=settings.SLA_TARGET_SECONDS)),
+            'oldest_wait_seconds': max((now - oldest[0][1]).total_seconds(), 0.0) if oldest else 0.0,
+        }
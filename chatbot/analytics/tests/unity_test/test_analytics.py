@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from analytics.models import PendingResponse, RollupWatermark, ServiceHourlyRollup
+from analytics.services.analytics_service import AnalyticsService
+from chat.models import Chat
+from contact.models import Contact
+from message.models import Message
+from supportAgent.models import SupportAgent
+
+DAY = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def conversation(settings):
+    settings.ANALYTICS_BATCH_SIZE = 3
+    contact = Contact.objects.create(name="Ana")
+    agent = SupportAgent.objects.create(first_name="Rita", last_name="Lima", password="secret")
+    telegram = Chat.objects.create(chat="1001", service="0", contact_id=contact)
+    discord = Chat.objects.create(chat="2002", service="1", contact_id=contact)
+    agent_type = ContentType.objects.get_for_model(SupportAgent)
+
+    def message(chat, sender_type, minutes, by_agent=False):
+        sender = {"sender_content_type": agent_type, "sender_object_id": agent.id} if by_agent else {}
+        return Message.objects.create(
+            chat_id=chat, sender_type=sender_type, message_content="...",
+            created_at=DAY + timedelta(minutes=minutes), **sender,
+        )
+
+    message(telegram, 1, 0)
+    message(telegram, 2, 1)
+    message(telegram, 1, 5)
+    message(telegram, 3, 10, by_agent=True)
+    message(telegram, 3, 12, by_agent=True)
+    message(discord, 1, 50)
+    message(discord, 3, 70, by_agent=True)
+    message(discord, 1, 60 * 25)
+    return agent, telegram, discord, message
+
+
+@pytest.mark.django_db
+def test_rollup_counts_messages_and_first_responses_incrementally(conversation):
+    agent, telegram, discord, message = conversation
+
+    assert AnalyticsService().rollup(limit=4)["messages"] == 4
+    assert AnalyticsService().rollup()["messages"] == 4
+    assert AnalyticsService().rollup()["messages"] == 0
+
+    first_hour = ServiceHourlyRollup.objects.get(bucket=DAY, service="0")
+    assert (first_hour.user_messages, first_hour.bot_messages, first_hour.agent_messages) == (2, 1, 2)
+    assert (first_hour.responses, first_hour.response_seconds) == (1, 600)
+    assert dict(PendingResponse.objects.values_list("chat_id", "waiting_since")) == {
+        discord.id: DAY + timedelta(minutes=60 * 25)
+    }
+
+    message(telegram, 1, 30)
+    message(telegram, 3, 45, by_agent=True)
+    assert AnalyticsService().rollup()["messages"] == 2
+    first_hour.refresh_from_db()
+    assert (first_hour.user_messages, first_hour.responses, first_hour.response_seconds) == (3, 2, 1500)
+
+
+@pytest.mark.django_db
+def test_rollup_leaves_the_newest_messages_for_the_next_run(conversation, settings):
+    agent, telegram, discord, message = conversation
+    settings.ANALYTICS_ROLLUP_DELAY = 60
+    Message.objects.create(chat_id=telegram, sender_type=1, message_content="agora")
+
+    result = AnalyticsService().rollup()
+
+    assert result["messages"] == 8
+    assert result["last_message_id"] == Message.objects.order_by("-id")[1].id
+
+
+@pytest.mark.django_db
+def test_rollup_counts_messages_committed_after_a_later_id(conversation, settings):
+    agent, telegram, discord, message = conversation
+    # Two messages still being committed when the job runs: their ids are taken but not visible.
+    in_flight = list(Message.objects.filter(chat_id=telegram).order_by("id").values()[1:3])
+    Message.objects.filter(id__in=[row["id"] for row in in_flight]).delete()
+
+    assert AnalyticsService().rollup()["messages"] == 6
+    assert RollupWatermark.objects.get().gaps[0][:2] == [in_flight[0]["id"], in_flight[1]["id"]]
+
+    Message.objects.create(**in_flight[0])
+    assert AnalyticsService().rollup()["messages"] == 1
+    settings.ANALYTICS_RESCAN_WINDOW = 0
+    Message.objects.create(**in_flight[1])
+    assert AnalyticsService().rollup()["messages"] == 0
+    assert RollupWatermark.objects.get().gaps == []
+
+    first_hour = ServiceHourlyRollup.objects.get(bucket=DAY, service="0")
+    assert (first_hour.user_messages, first_hour.bot_messages, first_hour.agent_messages) == (1, 1, 2)
+
+@pytest.mark.django_db
+def test_dashboard_endpoints_only_read_rollups(conversation):
+    agent, telegram, discord, _ = conversation
+    AnalyticsService().rollup()
+    client = APIClient()
+    params = {"start": "2026-03-01T00:00:00Z", "end": "2026-03-08T00:00:00Z"}
+
+    with CaptureQueriesContext(connection) as queries:
+        daily = client.get("/analytics/messages/", params).json()
+        agents = client.get("/analytics/agents/", params).json()
+
+    assert not any(Message._meta.db_table in query["sql"] for query in queries.captured_queries)
+    assert [(day["period"][:10], day["messages"], day["responses"]) for day in daily["results"]] == [
+        ("2026-03-02", 7, 2), ("2026-03-03", 1, 0),
+    ]
+    assert daily["results"][0]["average_response_seconds"] == 900.0
+    assert daily["up_to"].startswith("2026-03-03T10:00")
+    assert agents["results"] == [{
+        "support_agent": agent.id, "name": "Rita Lima", "messages": 3, "responses": 2,
+        "average_response_seconds": 900.0,
+    }]
+
+    hourly = client.get("/analytics/messages/", {**params, "interval": "hour", "service": "1"}).json()
+    assert [hour["period"][:13] for hour in hourly["results"]] == ["2026-03-02T09", "2026-03-02T10", "2026-03-03T10"]
+    assert client.get("/analytics/messages/", {**params, "interval": "minute"}).status_code == 400
+    assert client.get("/analytics/agents/", {"start": params["end"], "end": params["start"]}).status_code == 400
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+from rest_framework.test import APIClient
+
+from analytics.services.export_service import ExportService
+from chat.models import Chat
+from contact.models import Contact
+from message.models import Message
+
+DAY = datetime(2026, 3, 2, 22, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def history(settings, tmp_path):
+    settings.EXPORT_ROOT = tmp_path
+    settings.EXPORT_CHUNK_SIZE = 4
+    contact = Contact.objects.create(name="Ana", email="ana@example.com")
+    chat = Chat.objects.create(chat="1001", service="0", contact_id=contact, start_time=DAY)
+    for index in range(10):
+        Message.objects.create(
+            chat_id=chat, sender_type=1 + index % 2, message_content=f"mensagem {index}",
+            created_at=DAY + timedelta(hours=index),
+        )
+    return chat
+
+
+@pytest.mark.django_db
+def test_export_writes_date_partitions_incrementally(history, tmp_path):
+    result = ExportService().export("messages")
+
+    assert (result["rows"], result["files"]) == (10, 2)
+    directory = tmp_path / "parquet" / "messages"
+    assert sorted(path.name for path in directory.iterdir()) == ["date=2026-03-02", "date=2026-03-03"]
+    table = ds.dataset(directory, format="parquet", partitioning="hive").to_table()
+    assert table.num_rows == 10
+    assert sorted(table.column("message_content").to_pylist())[:2] == ["mensagem 0", "mensagem 1"]
+    assert pq.ParquetFile(next((directory / "date=2026-03-03").iterdir())).metadata.num_row_groups == 3
+
+    assert ExportService().export("messages")["rows"] == 0
+    Message.objects.create(chat_id=history, message_content="nova", created_at=DAY + timedelta(days=1))
+    result = ExportService().export("messages")
+    assert (result["rows"], result["last_id"]) == (1, Message.objects.latest("id").id)
+    assert ds.dataset(directory, format="parquet", partitioning="hive").to_table().num_rows == 11
+
+    assert ExportService().export("messages", full=True)["rows"] == 11
+    assert ds.dataset(directory, format="parquet", partitioning="hive").to_table().num_rows == 11
+    assert not list(directory.rglob("*.tmp"))
+
+
+@pytest.mark.django_db
+def test_export_picks_up_rows_committed_after_a_later_id(history, tmp_path):
+    in_flight = Message.objects.order_by("id").values()[3]
+    Message.objects.filter(id=in_flight["id"]).delete()
+    assert ExportService().export("messages")["rows"] == 9
+
+    Message.objects.create(**in_flight)
+    result = ExportService().export("messages")
+    assert (result["rows"], result["last_id"]) == (1, Message.objects.latest("id").id)
+    assert ExportService().export("messages")["rows"] == 0
+
+    table = ds.dataset(tmp_path / "parquet" / "messages", format="parquet", partitioning="hive").to_table()
+    assert sorted(table.column("id").to_pylist()) == sorted(Message.objects.values_list("id", flat=True))
+
+@pytest.mark.django_db
+def test_export_writes_arrow_files_for_every_table(history, tmp_path):
+    for table in ("messages", "chats", "contacts"):
+        ExportService().export(table, "arrow")
+
+    chats = ds.dataset(tmp_path / "arrow" / "chats", format="arrow", partitioning="hive").to_table()
+    assert chats.column("chat").to_pylist() == ["1001"]
+    contact_file = next((tmp_path / "arrow" / "contacts").iterdir())
+    contacts = pa.ipc.open_file(contact_file).read_all()
+    assert contacts.column("email").to_pylist() == ["ana@example.com"]
+
+
+@pytest.mark.django_db
+def test_export_endpoint_streams_parquet_and_arrow(history, admin_user):
+    client = APIClient()
+    assert client.get("/analytics/export/contacts/").status_code in (401, 403)
+    client.force_authenticate(admin_user)
+    first = Message.objects.order_by("id").first().id
+
+    response = client.get("/analytics/export/messages/", {"after": first, "end": "2026-03-03T00:00:00Z"})
+    assert response["Content-Type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(pa.BufferReader(b"".join(response.streaming_content)))
+    assert table.column("id").to_pylist() == [first + 1]
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+
+    response = client.get("/analytics/export/contacts/", {"file_format": "arrow"})
+    assert pa.ipc.open_stream(b"".join(response.streaming_content)).read_all().num_rows == 1
+    assert client.get("/analytics/export/messages/", {"file_format": "csv"}).status_code == 400
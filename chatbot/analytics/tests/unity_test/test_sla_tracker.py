@@ -0,0 +1,107 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.utils import timezone as django_timezone
+from rest_framework.test import APIClient
+
+from analytics.services.sla_service import SlaService
+from analytics.utils.waiting_chats import WaitingChats
+from chat.models import Chat
+from contact.models import Contact
+from message.models import Message
+from message.services.message_service import MessageService
+
+START = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def tracker(settings):
+    settings.SLA_TARGET_SECONDS = 300
+    settings.SLA_RESYNC_INTERVAL = 3600
+    SlaService._waiting, SlaService._synced_at = None, float("-inf")
+    yield
+    SlaService._waiting, SlaService._synced_at = None, float("-inf")
+
+
+def test_waiting_chats_match_a_sorted_scan():
+    rng = random.Random(7)
+    waiting, expected = WaitingChats(), {}
+    for step in range(5000):
+        chat_id = rng.randrange(300)
+        if rng.random() < 0.5:
+            waiting.wait(chat_id, START + timedelta(seconds=step))
+            expected.setdefault(chat_id, START + timedelta(seconds=step))
+        else:
+            waiting.answer(chat_id)
+            expected.pop(chat_id, None)
+
+    ordered = sorted(expected.items(), key=lambda item: (item[1], item[0]))
+    assert waiting.oldest(10) == ordered[:10]
+    assert len(waiting) == len(expected)
+    cutoff = START + timedelta(seconds=2500)
+    assert waiting.waiting_since(cutoff) == sum(since < cutoff for since in expected.values())
+
+
+def test_resync_replays_the_messages_recorded_during_the_query(monkeypatch):
+    service = SlaService()
+
+    def get_waiting():
+        # Committed after the query read the messages: only the records know them.
+        service.record(1, 1, START + timedelta(minutes=5))
+        service.record(2, 3, START + timedelta(minutes=6))
+        return {2: START, 3: START + timedelta(minutes=1)}
+
+    monkeypatch.setattr(service.waiting_chat_repository, "get_waiting", get_waiting)
+    service.resync()
+
+    assert SlaService._waiting.oldest(10) == [(3, START + timedelta(minutes=1)), (1, START + timedelta(minutes=5))]
+
+
+@pytest.mark.django_db
+def test_tracker_is_rebuilt_from_the_database_and_follows_new_messages(django_capture_on_commit_callbacks):
+    contact = Contact.objects.create(name="Ana")
+    now = django_timezone.now()
+    chats = [Chat.objects.create(chat=str(1000 + index), service="0", contact_id=contact) for index in range(4)]
+    for chat, sender_types in zip(chats, ([1, 2, 1], [1, 3], [1, 3, 1, 1], [1])):
+        for minute, sender_type in enumerate(sender_types):
+            Message.objects.create(
+                chat_id=chat, sender_type=sender_type, message_content="...",
+                created_at=now - timedelta(minutes=30 - 10 * chats.index(chat) - minute),
+            )
+    Chat.objects.filter(id=chats[3].id).update(closing_time=now)
+
+    service = SlaService()
+    assert [row["chat"] for row in service.oldest_waiting(10)] == [chats[0].id, chats[2].id]
+    assert service.oldest_waiting(1)[0]["waiting_since"] == now - timedelta(minutes=30)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        MessageService().create({"chat_id": chats[0], "sender_type": 3, "message_content": "Olá!"})
+        MessageService().create({"chat_id": chats[1], "sender_type": 1, "message_content": "Oi?"})
+
+    assert [row["chat"] for row in service.oldest_waiting(10)] == [chats[2].id, chats[1].id]
+    assert service.metrics()["waiting_chats"] == 2
+    assert service.metrics()["breached_chats"] == 1
+
+
+@pytest.mark.django_db
+def test_waiting_endpoint_and_metrics(django_capture_on_commit_callbacks):
+    contact = Contact.objects.create(name="Ana")
+    chat = Chat.objects.create(chat="1001", service="1", contact_id=contact)
+    Message.objects.create(
+        chat_id=chat, sender_type=1, message_content="Alguém?", created_at=django_timezone.now() - timedelta(minutes=10)
+    )
+    client = APIClient()
+
+    body = client.get("/analytics/waiting/", {"limit": 5}).json()
+    assert body["waiting"] == 1
+    assert (body["results"][0]["chat_id"], body["results"][0]["breached"]) == ("1001", True)
+    assert body["results"][0]["waiting_seconds"] >= 600
+    metrics = client.get("/analytics/metrics/").content.decode()
+    assert "chatbot_waiting_chats 1" in metrics
+    assert "chatbot_sla_breached_chats 1" in metrics
+
+    Chat.objects.filter(id=chat.id).update(closing_time=django_timezone.now())
+    assert client.get("/analytics/waiting/").json()["results"] == []
+    assert "chatbot_waiting_chats 0" in client.get("/analytics/metrics/").content.decode()
+    assert client.get("/analytics/waiting/", {"limit": "x"}).status_code == 400
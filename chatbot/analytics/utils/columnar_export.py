@@ -0,0 +1,230 @@
+"""
+Columnar (Parquet / Arrow IPC) export of database rows.
+
+Rows arrive as tuples from a chunked `.values_list().iterator()` read and are
+turned into Arrow record batches of `chunk_size` rows, one array per column,
+so memory is bounded by a few batches whatever the size of the table.
+
+`export_partitioned` writes Hive-style date partitions that pyarrow.dataset,
+DuckDB, Spark or pandas read directly:
+
+    <directory>/date=2026-03-02/part-000000001234.parquet
+
+Files are written under a `.tmp` name and renamed once every partition of the
+run is complete. Their names derive from the id of the first row they hold,
+so a run repeated after a crash overwrites its own files instead of
+duplicating rows, and two runs never write the same file.
+
+`stream` yields the bytes of a single file as it is written, for HTTP responses.
+
+pyarrow is imported by this module: import it lazily, from the code paths that
+export, so web workers do not load it at startup.
+"""
+import io
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORMATS = {
+    'parquet': {'extension': 'parquet', 'content_type': 'application/vnd.apache.parquet'},
+    'arrow': {'extension': 'arrow', 'content_type': 'application/vnd.apache.arrow.stream'},
+}
+ARROW_TYPES = {
+    'int8': pa.int8(),
+    'int64': pa.int64(),
+    'string': pa.string(),
+    'timestamp': pa.timestamp('us', tz='UTC'),
+}
+PARQUET_COMPRESSION = 'zstd'
+
+
+def build_schema(columns: Iterable[tuple[str, str]]) -> pa.Schema:
+    """
+    Returns the Arrow schema of a list of (column name, type name) pairs;
+    type names are the keys of ARROW_TYPES.
+    """
+    return pa.schema([(name, ARROW_TYPES[type_name]) for name, type_name in columns])
+
+
+def to_record_batch(rows: list, schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Converts row tuples, in schema column order, to a record batch.
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+    )
+
+
+def _writer(sink, schema: pa.Schema, file_format: str, streaming: bool = False):
+    if file_format == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    # The IPC file format can be memory-mapped by readers; HTTP clients get the stream format.
+    return pa.ipc.new_stream(sink, schema) if streaming else pa.ipc.new_file(sink, schema)
+
+
+class _Partition:
+    """
+    Rows buffered for one date partition and its open writer.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rows = []
+        self.writer = None
+
+
+def export_partitioned(
+    rows: Iterable[tuple], columns: list[tuple[str, str]], directory: Path, file_format: str,
+    date_column: Optional[str], chunk_size: int, max_open: int = 32,
+) -> dict:
+    """
+    Writes rows to date-partitioned files.
+
+    Rows are buffered per partition and written as one record batch (one
+    Parquet row group) per partition once `chunk_size` rows are buffered in
+    total; the other partitions are then closed, since rows arrive in id order
+    and so mostly by date. At most `max_open` partitions are kept open; the
+    least recently used one is closed beyond that. A later row of a closed
+    partition opens a new part file.
+
+    Args:
+        rows (Iterable[tuple]): The rows, in `columns` order, the first column being the id.
+        columns (list[tuple[str, str]]): (name, type name) of each column.
+        directory (Path): The directory of the table.
+        file_format (str): 'parquet' or 'arrow'.
+        date_column (str, optional): The timestamp column the rows are partitioned by
+            (UTC date); None writes every row to the table directory.
+        chunk_size (int): The rows per record batch.
+        max_open (int): The maximum number of partitions written at once.
+
+    Returns:
+        dict: The number of `rows` and `files` written and the `last_id` exported (None if no row).
+    """
+    schema = build_schema(columns)
+    extension = FORMATS[file_format]['extension']
+    date_index = [name for name, _ in columns].index(date_column) if date_column else None
+    partitions = OrderedDict()
+    written, count, buffered, last_id = [], 0, 0, None
+
+    def flush(partition: _Partition) -> None:
+        if not partition.rows:
+            return
+        if partition.writer is None:
+            partition.writer = _writer(str(partition.path), schema, file_format)
+        partition.writer.write_batch(to_record_batch(partition.rows, schema))
+        partition.rows = []
+
+    def close(key: str) -> None:
+        nonlocal buffered
+        partition = partitions.pop(key)
+        buffered -= len(partition.rows)
+        flush(partition)
+        partition.writer.close()
+        written.append(partition.path)
+
+    try:
+        for row in rows:
+            key = _partition_key(row[date_index]) if date_index is not None else ''
+            partition = partitions.get(key)
+            if partition is None:
+                if len(partitions) >= max_open:
+                    close(next(iter(partitions)))
+                path = directory / key / f"part-{row[0]:012d}.{extension}.tmp"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                partition = partitions[key] = _Partition(path)
+            else:
+                partitions.move_to_end(key)
+            partition.rows.append(row)
+            buffered += 1
+            if buffered >= chunk_size:
+                # Rows arrive in id order, so the dates left behind rarely come back: close them.
+                for stale in [other for other in partitions if other != key]:
+                    close(stale)
+                flush(partition)
+                buffered = 0
+            count += 1
+            last_id = row[0]
+        while partitions:
+            close(next(iter(partitions)))
+    except BaseException:
+        for partition in partitions.values():
+            if partition.writer is not None:
+                partition.writer.close()
+            written.append(partition.path)
+        for path in written:
+            if path.exists():
+                path.unlink()
+        raise
+    for path in written:
+        os.replace(path, path.with_suffix(''))
+    return {'rows': count, 'files': len(written), 'last_id': last_id}
+
+
+def _partition_key(moment: Optional[datetime]) -> str:
+    if moment is None:
+        return 'date=__unknown__'
+    return f"date={moment.astimezone(timezone.utc):%Y-%m-%d}"
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object that keeps the bytes written since the last `drain`.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream(
+    rows: Iterable[tuple], columns: list[tuple[str, str]], file_format: str, chunk_size: int,
+) -> Iterator[bytes]:
+    """
+    Yields the bytes of a Parquet file or an Arrow IPC stream as each record
+    batch of `chunk_size` rows is written.
+
+    Args:
+        rows (Iterable[tuple]): The rows, in `columns` order.
+        columns (list[tuple[str, str]]): (name, type name) of each column.
+        file_format (str): 'parquet' or 'arrow'.
+        chunk_size (int): The rows per record batch.
+
+    Returns:
+        Iterator[bytes]: The content, chunk by chunk.
+    """
+    schema = build_schema(columns)
+    sink = _ChunkSink()
+    writer = _writer(sink, schema, file_format, streaming=True)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            writer.write_batch(to_record_batch(batch, schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_batch(to_record_batch(batch, schema))
+    writer.close()
+    yield sink.drain()
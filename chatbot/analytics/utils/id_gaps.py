@@ -0,0 +1,70 @@
+"""
+Id gaps left behind a watermark.
+
+Ids are handed out when a row is inserted but the row only becomes visible when
+its transaction commits, so a job reading "the rows after the watermark" may
+see id 12 while id 11 is still being committed. Moving the watermark past 12
+would skip 11 forever.
+
+Each gap in the ids read is kept with the watermark as [first id, last id,
+first seen (epoch seconds)] and re-scanned by the next runs until its rows show
+up or it is older than the re-scan window: ids of rolled back transactions are
+never used, so a gap may never fill.
+"""
+from typing import Iterable, Iterator
+
+from django.db.models import Q
+
+
+def expire_gaps(gaps: list, now: float, window: float) -> list:
+    """
+    Returns the gaps first seen less than `window` seconds before `now`.
+    """
+    return [list(gap) for gap in gaps if now - gap[2] < window]
+
+
+def gaps_filter(gaps: list) -> Q:
+    """
+    Returns a filter matching the ids of the gaps.
+    """
+    query = Q(pk__in=[])
+    for first, last, _ in gaps:
+        query |= Q(id__range=(first, last))
+    return query
+
+
+def fill_gaps(gaps: list, ids: Iterable[int]) -> list:
+    """
+    Returns the gaps without the given ids, splitting the ranges they fall in.
+    """
+    found = sorted(set(ids))
+    if not found:
+        return gaps
+    remaining = []
+    for first, last, seen in gaps:
+        for row_id in (row_id for row_id in found if first <= row_id <= last):
+            if row_id > first:
+                remaining.append([first, row_id - 1, seen])
+            first = row_id + 1
+        if first <= last:
+            remaining.append([first, last, seen])
+    return remaining
+
+
+def track_gaps(rows: Iterable[tuple], after_id: int, gaps: list, now: float) -> Iterator[tuple]:
+    """
+    Yields rows read in id order after `after_id`, appending to `gaps` the ids
+    skipped between them.
+
+    Args:
+        rows (Iterable[tuple]): The rows, the first value being the id.
+        after_id (int): The watermark the rows were read after.
+        gaps (list): The gaps of the watermark, extended in place.
+        now (float): Epoch seconds recorded as the time the new gaps were seen.
+    """
+    previous = after_id
+    for row in rows:
+        if row[0] > previous + 1:
+            gaps.append([previous + 1, row[0] - 1, now])
+        previous = row[0]
+        yield row
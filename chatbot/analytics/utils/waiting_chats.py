@@ -0,0 +1,144 @@
+"""
+In-memory priority queue of the chats waiting for an agent reply.
+
+A chat waits from its first contact message after the last agent message; the
+queue is a binary heap of (waiting since, chat id) entries with lazy deletion:
+an answered chat is only dropped from the `since` map, and its heap entry is
+skipped when it reaches the top (or when the heap is compacted, once it holds
+more stale entries than live ones). Recording a message is O(log n), the
+longest-waiting chat is read in O(1) and the k longest-waiting ones in
+O(k log k), without ever scanning the messages.
+
+While the queue is rebuilt from the database, the waits and answers recorded
+during the query are journaled and replayed on the rebuilt heap in the same
+critical section that swaps it in.
+"""
+import heapq
+import threading
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+COMPACT_MIN_ENTRIES = 64
+
+
+class WaitingChats:
+    """
+    Heap of the waiting chats, ordered by how long they have waited.
+    """
+
+    def __init__(self, waiting: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self._journal: Optional[list] = None
+        self.reset(waiting or {})
+
+    def __len__(self) -> int:
+        return len(self._since)
+
+    def reset(self, waiting: dict) -> None:
+        """
+        Replaces the queue with the given chats.
+
+        Args:
+            waiting (dict): {chat id: datetime of its first unanswered contact message}.
+        """
+        heap = [(since, chat_id) for chat_id, since in waiting.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            self._since, self._heap = dict(waiting), heap
+
+    def rebuild(self, load: Callable[[], dict]) -> None:
+        """
+        Replaces the queue with the chats returned by `load`, then replays the
+        waits and answers recorded while it ran, so none is lost in the swap.
+
+        Args:
+            load (Callable[[], dict]): Returns {chat id: datetime of its first unanswered contact message}.
+        """
+        with self._lock:
+            self._journal = []
+        try:
+            waiting = load()
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        heap = [(since, chat_id) for chat_id, since in waiting.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self._since, self._heap = dict(waiting), heap
+            for chat_id, since in journal:
+                if since is None:
+                    self._answer(chat_id)
+                else:
+                    self._wait(chat_id, since)
+
+    def wait(self, chat_id: int, since: datetime) -> None:
+        """
+        Marks a chat as waiting since `since`, unless it already waits.
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((chat_id, since))
+            self._wait(chat_id, since)
+
+    def answer(self, chat_id: int) -> None:
+        """
+        Marks a chat as no longer waiting.
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((chat_id, None))
+            self._answer(chat_id)
+
+    def _wait(self, chat_id: int, since: datetime) -> None:
+        if chat_id not in self._since:
+            self._since[chat_id] = since
+            heapq.heappush(self._heap, (since, chat_id))
+
+    def _answer(self, chat_id: int) -> None:
+        if self._since.pop(chat_id, None) is not None and len(self._heap) > max(
+            COMPACT_MIN_ENTRIES, 2 * len(self._since)
+        ):
+            self._heap = [(since, chat_id) for chat_id, since in self._since.items()]
+            heapq.heapify(self._heap)
+
+    def oldest(self, limit: int) -> list[tuple[int, datetime]]:
+        """
+        Returns the chats that have waited longest.
+
+        Args:
+            limit (int): How many chats to return at most.
+
+        Returns:
+            list[tuple[int, datetime]]: (chat id, waiting since) pairs, longest wait first.
+        """
+        with self._lock:
+            return [entry for _, entry in zip(range(limit), self._iter_oldest())]
+
+    def waiting_since(self, before: datetime) -> int:
+        """
+        Returns how many chats wait since before `before`, in time proportional to that number.
+        """
+        with self._lock:
+            count = 0
+            for _, since in self._iter_oldest():
+                if since >= before:
+                    break
+                count += 1
+            return count
+
+    def _iter_oldest(self) -> Iterator[tuple[int, datetime]]:
+        # Walks the heap in order with a second heap of the frontier, so reading
+        # k entries costs O(k log k) and leaves the queue untouched.
+        heap, since_of = self._heap, self._since
+        while heap and since_of.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            (since, chat_id), index = heapq.heappop(frontier)
+            if since_of.get(chat_id) == since:
+                yield chat_id, since
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
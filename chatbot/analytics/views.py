@@ -0,0 +1,193 @@
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+
+from analytics.serializers.analytics_query_serializer import AnalyticsQuerySerializer
+from analytics.serializers.export_query_serializer import ExportQuerySerializer
+from analytics.services.abstract_analytics_service import AbstractAnalyticsService
+from analytics.services.abstract_export_service import AbstractExportService
+from analytics.services.abstract_sla_service import AbstractSlaService
+from analytics.services.analytics_service import AnalyticsService
+from analytics.services.export_service import ExportService
+from analytics.services.sla_service import SlaService
+
+EXPORT_CONTENT_TYPES = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+
+class AnalyticsViewSet(ViewSet):
+    """
+    Viewset for the dashboard statistics of the conversations.
+
+    Every endpoint reads the hourly rollups kept by `python manage.py rollup_messages`,
+    so it answers in time proportional to the number of hours asked for, whatever the
+    number of messages. `up_to` tells how recent the rollups are.
+
+    Methods:
+        messages: Messages per period and first-response times.
+        agents: Load and first-response times per support agent.
+        export: Messages, chats or contacts as a Parquet file or an Arrow IPC stream (staff only).
+        waiting: The open chats that have waited longest for an agent reply.
+        metrics: Gauges of the waiting chats, in the Prometheus text format.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def __init__(
+        self,
+        analytics_service: AbstractAnalyticsService = AnalyticsService(),
+        export_service: AbstractExportService = ExportService(),
+        sla_service: AbstractSlaService = SlaService(),
+        **kwargs,
+    ):
+        """
+        Initializes the AnalyticsViewSet with the analytics, export and SLA services.
+
+        Args:
+            analytics_service (AbstractAnalyticsService, optional): The service used to read the rollups.
+            export_service (AbstractExportService, optional): The service used to export tables.
+            sla_service (AbstractSlaService, optional): The service tracking the waiting chats.
+        """
+        super().__init__(**kwargs)
+        self.analytics_service = analytics_service
+        self.export_service = export_service
+        self.sla_service = sla_service
+
+    @action(detail=False, methods=["get"], url_path="messages")
+    def messages(self, request) -> Response:
+        """
+        Lists the messages sent by contacts, the bot and the agents per period, with
+        the number of first responses and their average time in seconds.
+
+        Query parameters: `start`, `end` (ISO 8601), `interval` (hour, day, week or month)
+        and `service`.
+
+        Args:
+            request (Request): The HTTP request.
+
+        Returns:
+            Response: The periods, or a 400 for invalid parameters.
+        """
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        stats = self.analytics_service.get_message_stats(
+            params['start'], params['end'], params['interval'], params.get('service')
+        )
+        return Response(stats, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="agents")
+    def agents(self, request) -> Response:
+        """
+        Lists the messages and first responses of each support agent, with their
+        average response time in seconds.
+
+        Query parameters: `start` and `end` (ISO 8601).
+
+        Args:
+            request (Request): The HTTP request.
+
+        Returns:
+            Response: The agents, busiest first, or a 400 for invalid parameters.
+        """
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        stats = self.analytics_service.get_agent_stats(params['start'], params['end'])
+        return Response(stats, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False, methods=["get"], url_path=r"export/(?P<table>messages|chats|contacts)",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def export(self, request, table: str):
+        """
+        Streams a table as a Parquet file or an Arrow IPC stream, written record
+        batch by record batch while the rows are read, so the response starts at
+        once and memory stays bounded however many rows there are.
+
+        The files hold whole tables, contact personal data (email, telephone,
+        CPF) and message contents included, so only staff users may export.
+
+        Query parameters: `file_format` (parquet or arrow), `after` (only rows with a
+        greater id) and `start`, `end` (ISO 8601, on the creation time).
+
+        Args:
+            request (Request): The HTTP request.
+            table (str): 'messages', 'chats' or 'contacts'.
+
+        Returns:
+            StreamingHttpResponse: The file, or a 400 for invalid parameters.
+        """
+        query = ExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        content_type, extension = EXPORT_CONTENT_TYPES[params['file_format']]
+        response = StreamingHttpResponse(
+            self.export_service.stream(
+                table, params['file_format'], params['after'], params.get('start'), params.get('end')
+            ),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{table}.{extension}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="waiting")
+    def waiting(self, request) -> Response:
+        """
+        Lists the open chats that have waited longest for an agent reply, read from
+        the in-memory SLA tracker.
+
+        Query parameters: `limit` (default 20, at most 500).
+
+        Args:
+            request (Request): The HTTP request.
+
+        Returns:
+            Response: The number of `waiting` chats, the SLA target and the longest-waiting chats.
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 500)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        results = self.sla_service.oldest_waiting(limit)
+        return Response(
+            {
+                "waiting": self.sla_service.metrics()['waiting_chats'],
+                "sla_target_seconds": settings.SLA_TARGET_SECONDS,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="metrics")
+    def metrics(self, request) -> HttpResponse:
+        """
+        Exposes the gauges of the waiting chats in the Prometheus text format.
+
+        Args:
+            request (Request): The HTTP request.
+
+        Returns:
+            HttpResponse: The `chatbot_waiting_chats`, `chatbot_sla_breached_chats` and
+            `chatbot_oldest_wait_seconds` gauges.
+        """
+        gauges = self.sla_service.metrics()
+        lines = []
+        for name, help_text, value in (
+            ("chatbot_waiting_chats", "Open chats waiting for an agent reply.", gauges['waiting_chats']),
+            ("chatbot_sla_breached_chats", "Open chats waiting longer than the SLA target.",
+             gauges['breached_chats']),
+            ("chatbot_oldest_wait_seconds", "Seconds the longest-waiting chat has waited.",
+             gauges['oldest_wait_seconds']),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4")
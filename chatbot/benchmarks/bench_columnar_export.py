@@ -0,0 +1,137 @@
+"""
+Columnar export (analytics/services/export_service.py) against the JSON listing.
+
+--messages messages are inserted into a temporary SQLite database. The script
+times serializing them all with MessageListSerializer + json.dumps, the way
+`/message/` pages them, then the incremental Parquet export, and reports the
+rows per second, the output size and the peak resident memory of each (measured
+in a fresh process per mode). It fails when the export is not --target times
+faster than JSON, or when its memory grows with the table.
+
+    python benchmarks/bench_columnar_export.py
+    python benchmarks/bench_columnar_export.py --messages 1000000 --format arrow
+
+Target: at least SPEEDUP_TARGET (5x) the JSON throughput.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+SPEEDUP_TARGET = 5.0
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+
+def populate(count: int) -> None:
+    setup_django()
+    from datetime import datetime, timedelta, timezone
+
+    from django.core.management import call_command
+
+    from chat.models import Chat
+    from message.models import Message
+
+    call_command("migrate", verbosity=0, skip_checks=True)
+    chats = Chat.objects.bulk_create([Chat(chat=str(1000 + index), service="0") for index in range(500)])
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for index in range(count):
+        batch.append(Message(
+            chat_id=chats[index % len(chats)], sender_type=1 + index % 3,
+            message_content=f"Olá, preciso de ajuda com o pedido {index}, ele ainda não chegou.",
+            created_at=start + timedelta(seconds=index * 30),
+        ))
+        if len(batch) == 5000:
+            Message.objects.bulk_create(batch)
+            batch = []
+    Message.objects.bulk_create(batch)
+
+
+def run_mode(mode: str, file_format: str, output: str) -> dict:
+    setup_django()
+    from django.conf import settings
+
+    from message.models import Message
+    from message.serializers.message_list_serializer import MessageListSerializer
+
+    started = time.perf_counter()
+    if mode == "json":
+        size = 0
+        for start in range(0, Message.objects.count(), settings.EXPORT_CHUNK_SIZE):
+            page = Message.objects.order_by("id")[start:start + settings.EXPORT_CHUNK_SIZE]
+            size += len(json.dumps(MessageListSerializer(page, many=True).data, default=str).encode())
+        rows = Message.objects.count()
+    else:
+        from analytics.services.export_service import ExportService
+
+        rows = ExportService().export("messages", file_format, Path(output), full=True)["rows"]
+        size = sum(path.stat().st_size for path in Path(output).rglob("*") if path.is_file())
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows, "seconds": elapsed, "bytes": size,
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--format", dest="file_format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--target", type=float, default=SPEEDUP_TARGET)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run == "populate":
+        populate(args.messages)
+        return
+    if args.run:
+        print(json.dumps(run_mode(args.run, args.file_format, args.output)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE="config.settings", DJANGO_SECRET_KEY="benchmark",
+            DATABASE_NAME=str(Path(directory) / "bench.sqlite3"), DATABASE_REPLICA_NAMES="",
+        )
+
+        def run(mode: str, messages: int = args.messages) -> dict:
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", mode, "--messages", str(messages),
+                 "--format", args.file_format, "--output", str(Path(directory) / "export")],
+                env=env, cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+            ).stdout
+            return json.loads(output.strip().splitlines()[-1]) if mode != "populate" else {}
+
+        run("populate", args.messages // 10)
+        small = run("export")
+        run("populate", args.messages - args.messages // 10)
+        results = {"json": run("json"), "export": run("export")}
+
+    print(f"{'mode':<10}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'MB':>8}{'peak RSS MB':>13}")
+    for mode, result in results.items():
+        print(f"{mode:<10}{result['rows']:>10}{result['seconds']:>10.2f}{result['rows'] / result['seconds']:>12.0f}"
+              f"{result['bytes'] / 2 ** 20:>8.1f}{result['peak_mb']:>13.0f}")
+    speedup = results["json"]["seconds"] / results["export"]["seconds"]
+    growth = results["export"]["peak_mb"] - small["peak_mb"]
+    print(f"speedup: {speedup:.1f}x (target {args.target:.0f}x)  export RSS growth for 10x the rows: {growth:.0f} MB")
+    if speedup < args.target or growth > 64:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+CompactSerializer (message/utils/compact_serializer.py) against the DRF list serializers.
+
+--messages messages and --contacts contacts are inserted into a temporary
+SQLite database. The script serializes them all with MessageListSerializer and
+ContactListSerializer, the way the listing endpoints did, then with their
+CompactSerializer, renders both with DRF's JSONRenderer, checks the bytes are
+identical and reports the rows per second of each path.
+
+    python benchmarks/bench_compact_serializer.py
+    python benchmarks/bench_compact_serializer.py --messages 200000 --repeat 5
+
+Target: at least SPEEDUP_TARGET (3x) the rows per second of the DRF serializers.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+SPEEDUP_TARGET = 3.0
+
+
+def setup_django(database: str) -> None:
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.update(
+        DJANGO_SETTINGS_MODULE="config.settings", DJANGO_SECRET_KEY="benchmark",
+        DATABASE_NAME=database, DATABASE_REPLICA_NAMES="",
+    )
+    import django
+
+    django.setup()
+
+
+def populate(messages: int, contacts: int) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from django.core.management import call_command
+
+    from chat.models import Chat
+    from contact.models import Contact
+    from message.models import Message
+
+    call_command("migrate", verbosity=0, skip_checks=True)
+    Contact.objects.bulk_create([
+        Contact(name=f"Cliente {index}", email=f"cliente{index}@example.com", cpf=f"{index:011d}",
+                telephone=f"6199{index:07d}")
+        for index in range(contacts)
+    ], batch_size=5000)
+    chats = Chat.objects.bulk_create([Chat(chat=str(1000 + index), service="0") for index in range(500)])
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    Message.objects.bulk_create([
+        Message(
+            chat_id=chats[index % len(chats)], sender_type=1 + index % 3,
+            message_content=f"Olá, preciso de ajuda com o pedido {index}, ele ainda não chegou.",
+            created_at=start + timedelta(seconds=index * 30),
+        )
+        for index in range(messages)
+    ], batch_size=5000)
+
+
+def measure(serialize, queryset, repeat: int) -> tuple[float, bytes]:
+    from rest_framework.renderers import JSONRenderer
+
+    best, content = None, b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        content = JSONRenderer().render(serialize(queryset.all()))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--contacts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target", type=float, default=SPEEDUP_TARGET)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(str(Path(directory) / "bench.sqlite3"))
+        populate(args.messages, args.contacts)
+
+        from contact.models import Contact
+        from contact.serializers.contact_list_serializer import ContactListSerializer
+        from message.models import Message
+        from message.serializers.message_list_serializer import MessageListSerializer
+        from message.utils.compact_serializer import CompactSerializer
+
+        print(f"{'serializer':<24}{'rows':>10}{'DRF rows/s':>14}{'compact rows/s':>16}{'speedup':>9}")
+        speedups = []
+        for serializer_class, queryset in (
+            (MessageListSerializer, Message.objects.order_by("id")),
+            (ContactListSerializer, Contact.objects.order_by("id")),
+        ):
+            rows = queryset.count()
+            drf, expected = measure(lambda data: serializer_class(data, many=True).data, queryset, args.repeat)
+            compact, content = measure(CompactSerializer(serializer_class).serialize, queryset, args.repeat)
+            if content != expected:
+                print(f"{serializer_class.__name__}: the compact JSON differs from the serializer's")
+                sys.exit(1)
+            speedups.append(drf / compact)
+            print(f"{serializer_class.__name__:<24}{rows:>10}{rows / drf:>14.0f}{rows / compact:>16.0f}"
+                  f"{drf / compact:>8.1f}x")
+
+    print(f"speedup: {min(speedups):.1f}x (target {args.target:.0f}x), identical JSON")
+    if min(speedups) < args.target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Concurrent-write throughput of the database profiles in config/databases.py.
+
+Each profile runs in its own process against a fresh database: N threads each
+replay M webhook-shaped write transactions (a chat upsert plus a message insert),
+like concurrent Telegram deliveries hitting `receive_messages`.
+
+    python benchmarks/bench_concurrent_writes.py
+    python benchmarks/bench_concurrent_writes.py --threads 16 --writes 200 --profiles sqlite,sqlite-wal
+
+The `postgres` profile needs a reachable server configured with the POSTGRES_*
+variables; its tables are flushed before the run.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    "sqlite": {"DJANGO_ENV": "development", "DATABASE_ENGINE": "sqlite"},
+    "sqlite-wal": {"DJANGO_ENV": "production", "DATABASE_ENGINE": "sqlite"},
+    "postgres": {"DJANGO_ENV": "production", "DATABASE_ENGINE": "postgres"},
+    "postgres-pool": {"DJANGO_ENV": "production", "DATABASE_ENGINE": "postgres", "DATABASE_POOL": "1"},
+}
+
+
+def run_profile(threads: int, writes: int) -> dict:
+    sys.path.insert(0, str(PROJECT_DIR))
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import OperationalError, connection, transaction
+
+    from chat.models import Chat
+    from message.models import Message
+
+    call_command("migrate", verbosity=0, skip_checks=True)
+    if connection.vendor == "postgresql":
+        call_command("flush", interactive=False, verbosity=0)
+    connection.close()
+
+    errors = []
+
+    def worker(worker_id: int):
+        from django.db import connections
+
+        for index in range(writes):
+            try:
+                with transaction.atomic():
+                    chat, _ = Chat.objects.get_or_create(chat=f"{worker_id}-{index % 10}", defaults={"service": "0"})
+                    Message.objects.create(chat_id=chat, message_content=f"message {index}")
+            except OperationalError as error:
+                errors.append(str(error))
+        connections.close_all()
+
+    pool = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    committed = threads * writes - len(errors)
+    return {"committed": committed, "errors": len(errors), "seconds": elapsed, "per_second": committed / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="sqlite,sqlite-wal")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_profile(args.threads, args.writes)))
+        return
+
+    print(f"{'profile':<15}{'committed':>10}{'errors':>8}{'writes/s':>10}")
+    for profile in args.profiles.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, **PROFILES[profile])
+            env.update(
+                DJANGO_SETTINGS_MODULE="config.settings",
+                DJANGO_SECRET_KEY="benchmark",
+                DATABASE_NAME=str(Path(directory) / "bench.sqlite3"),
+                DATABASE_REPLICA_NAMES="",
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", profile, "--threads", str(args.threads),
+                 "--writes", str(args.writes)],
+                env=env, cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{profile:<15}{result['committed']:>10}{result['errors']:>8}{result['per_second']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Inference latency of the free-text intent classifier (chat/utils/intent_classifier.py).
+
+A model is trained from chat/data/intent_seed.json into a temporary file with
+the production bucket count, memory-mapped the way workers load it, and timed
+per message over a mix of seed texts, unseen texts and long messages. The script
+reports the load time and the p50/p99/max latency and fails when p99 misses the
+target.
+
+    python benchmarks/bench_intent_classifier.py
+    python benchmarks/bench_intent_classifier.py --messages 20000 --target-ms 0.5
+
+Target: under INFERENCE_TARGET_MS (1 ms) per message at p99, on one CPU core.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from chat.utils.intent_classifier import IntentClassifier, train_intent_model  # noqa: E402
+
+INFERENCE_TARGET_MS = 1.0
+
+UNSEEN = [
+    "oi, bom dia",
+    "meu chatbot não responde desde ontem, podem verificar?",
+    "queria entender a diferença entre o botbuilder e o studio",
+    "vocês fazem desconto para ONG?",
+    "obrigado!",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--buckets", type=int, default=2 ** 18)
+    parser.add_argument("--target-ms", type=float, default=INFERENCE_TARGET_MS)
+    args = parser.parse_args()
+
+    seed = json.loads((PROJECT_DIR / "chat" / "data" / "intent_seed.json").read_text(encoding="utf-8"))
+    examples = [(text, node) for node, texts in seed.items() for text in texts]
+    texts = [text for text, _ in examples] + UNSEEN + [" ".join(text for text, _ in examples[:20])]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "intents.bin"
+        started = time.perf_counter()
+        result = train_intent_model(examples, path, args.buckets)
+        train_ms = (time.perf_counter() - started) * 1000
+        size_mb = path.stat().st_size / 2 ** 20
+        started = time.perf_counter()
+        classifier = IntentClassifier(path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        latencies = []
+        for index in range(args.messages):
+            text = texts[index % len(texts)]
+            started = time.perf_counter()
+            classifier.predict(text)
+            latencies.append((time.perf_counter() - started) * 1000)
+        classifier.close()
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"model: {len(result['labels'])} intents, {result['examples']} examples, {size_mb:.1f} MB  "
+          f"train: {train_ms:.0f} ms  load (mmap): {load_ms:.2f} ms")
+    print(f"messages: {args.messages}  p50: {p50 * 1000:.1f} us  p99: {p99 * 1000:.1f} us  "
+          f"max: {latencies[-1] * 1000:.1f} us  target p99: {args.target_ms * 1000:.0f} us")
+    if p99 > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+JSON codec (config/json_codec.py) with orjson against the standard library.
+
+Two workloads, each timed with JSON_CODEC=json and JSON_CODEC=orjson:
+
+- webhook: --updates realistic Telegram updates (text messages, photos with
+  captions, callback queries) validated and decoded the way
+  TelegramProvider.parse reads them: before, BotValidator.validate_telegram
+  then json.loads; now, one BotValidator.decode_telegram with orjson;
+- listing: a --rows message listing, as returned by the list endpoints,
+  rendered by the project's DRF JSONRenderer.
+
+The script checks that both codecs agree (same updates, same response bytes),
+reports the operations per second of each and fails when orjson is not
+--target times faster on both workloads.
+
+    python benchmarks/bench_json_codec.py
+    python benchmarks/bench_json_codec.py --updates 50000 --rows 100000
+
+Target: at least SPEEDUP_TARGET (1.5x) the stdlib throughput on both workloads.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+SPEEDUP_TARGET = 1.5
+
+TEXTS = (
+    "Olá, boa tarde! Gostaria de saber o status do meu pedido, ele ainda não chegou.",
+    "Quero falar com um atendente 🙏",
+    "Meu boleto venceu ontem, consigo pagar com juros pelo app?",
+    "/start",
+)
+
+
+def build_updates(count: int, rng: random.Random) -> list:
+    updates = []
+    for index in range(count):
+        user = {"id": 100000 + index % 5000, "is_bot": False, "first_name": "Ana", "last_name": "Souza",
+                "username": f"ana{index % 5000}", "language_code": "pt-br"}
+        chat = {"id": user["id"], "first_name": "Ana", "last_name": "Souza", "username": user["username"],
+                "type": "private"}
+        message = {"message_id": index, "from": user, "chat": chat, "date": 1767225600 + index}
+        kind = index % 4
+        if kind == 3:
+            update = {"update_id": index, "callback_query": {
+                "id": str(index), "from": user, "chat_instance": str(-index),
+                "message": {**message, "text": "Escolha uma opção:", "reply_markup": {"inline_keyboard": [
+                    [{"text": f"Opção {option}", "callback_data": f"menu_{option}"}] for option in range(4)
+                ]}},
+                "data": "menu_2",
+            }}
+        elif kind == 2:
+            update = {"update_id": index, "message": {**message, "caption": "Comprovante", "photo": [
+                {"file_id": f"AgACAgEAAxkBAAI{index:08d}{size}", "file_unique_id": f"AQAD{index}{size}",
+                 "file_size": 1000 * size, "width": 90 * size, "height": 60 * size}
+                for size in (1, 4, 9)
+            ]}}
+        else:
+            update = {"update_id": index, "message": {**message, "text": rng.choice(TEXTS)}}
+        updates.append(json.dumps(update, ensure_ascii=rng.random() < 0.5).encode())
+    return updates
+
+
+def build_listing(rows: int) -> dict:
+    return {
+        "results": [
+            {"id": index, "chat_id_id": index % 500, "sender_type": 1 + index % 3,
+             "sender_type_display": ("USER", "BOT", "SUPPORT_AGENT")[index % 3],
+             "message_content": TEXTS[index % len(TEXTS)], "created_at": f"2026-03-01T12:{index % 60:02d}:00.123456Z"}
+            for index in range(rows)
+        ],
+        "count": rows, "num_pages": 1, "current_page": 1, "next": False, "previous": False,
+    }
+
+
+def timed(function, repeat: int) -> tuple[float, object]:
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target", type=float, default=SPEEDUP_TARGET)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    from chat.utils.bot_validator import BotValidator
+    from config import json_codec
+
+    if json_codec.orjson is None:
+        print("orjson is not installed: JSON_CODEC=orjson falls back to the standard library.")
+        sys.exit(1)
+
+    updates = build_updates(args.updates, random.Random(7))
+    listing = build_listing(args.rows)
+    # Before: validate_telegram, then a second json.loads in TelegramProvider.parse.
+    workloads = {
+        "webhook": (
+            len(updates),
+            ("json", lambda: [json.loads(body) for body in updates if BotValidator.validate_telegram(body)]),
+            ("orjson", lambda: [BotValidator.decode_telegram(body) for body in updates]),
+        ),
+        "listing": (
+            args.rows,
+            ("json", lambda: json_codec.JSONRenderer().render(listing)),
+            ("orjson", lambda: json_codec.JSONRenderer().render(listing)),
+        ),
+    }
+
+    print(f"{'workload':<10}{'items':>10}{'json items/s':>15}{'orjson items/s':>17}{'speedup':>9}")
+    speedups = []
+    for name, (items, *runs) in workloads.items():
+        results = {}
+        for codec, function in runs:
+            settings.JSON_CODEC = codec
+            results[codec] = timed(function, args.repeat)
+        if results["json"][1] != results["orjson"][1]:
+            print(f"{name}: the codecs disagree")
+            sys.exit(1)
+        speedup = results["json"][0] / results["orjson"][0]
+        speedups.append(speedup)
+        print(f"{name:<10}{items:>10}{items / results['json'][0]:>15.0f}{items / results['orjson'][0]:>17.0f}"
+              f"{speedup:>8.1f}x")
+
+    print(f"speedup: {min(speedups):.1f}x (target {args.target:.1f}x)")
+    if min(speedups) < args.target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
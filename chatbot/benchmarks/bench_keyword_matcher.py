@@ -0,0 +1,103 @@
+"""
+Keyword automaton (chat/utils/keyword_matcher.py) against naive per-pattern loops.
+
+A rule set of --patterns patterns (1k by default: the rules of
+chat/data/matcher_rules.json plus generated two-word keywords, commands and
+moderation phrases) is compiled once, then both implementations scan the same
+mix of short and long messages. The script checks that they find the same
+rules, reports the time per message of each and fails when the automaton is not
+at least --min-speedup times faster than the loops.
+
+    python benchmarks/bench_keyword_matcher.py
+    python benchmarks/bench_keyword_matcher.py --patterns 5000 --messages 2000
+
+Target: MIN_SPEEDUP (10x) over the naive loops with 1k patterns.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from chat.utils.keyword_matcher import RULE_KINDS, KeywordMatcher, fold_text, naive_match  # noqa: E402
+
+MIN_SPEEDUP = 10.0
+
+WORDS = (
+    "weni plano cliente suporte conta fatura boleto login senha acesso canal whatsapp fluxo "
+    "contato produto integração relatório agente campanha mensagem atendimento cobrança"
+).split()
+
+
+def build_rules(pattern_count: int, rng: random.Random) -> dict:
+    rules = json.loads((PROJECT_DIR / "chat" / "data" / "matcher_rules.json").read_text(encoding="utf-8"))
+    count = sum(len(patterns) for kind in RULE_KINDS for patterns in rules[kind].values())
+    index = 0
+    while count < pattern_count:
+        kind = RULE_KINDS[index % len(RULE_KINDS)]
+        if kind == "commands":
+            pattern = f"/{rng.choice(WORDS)}{index}"
+        else:
+            pattern = f"{rng.choice(WORDS)} {rng.choice(WORDS)}{index}"
+        rules[kind].setdefault(f"rule_{index % 100}", []).append(pattern)
+        index += 1
+        count += 1
+    return rules
+
+
+def build_messages(count: int, rules: dict, rng: random.Random) -> list:
+    patterns = [pattern for kind in RULE_KINDS for group in rules[kind].values() for pattern in group]
+    messages = []
+    for index in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.choice((6, 12, 40)))]
+        if index % 2:
+            words.insert(rng.randrange(len(words)), rng.choice(patterns))
+        messages.append(" ".join(words))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patterns", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--min-speedup", type=float, default=MIN_SPEEDUP)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rules = build_rules(args.patterns, rng)
+    messages = build_messages(args.messages, rules, rng)
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(rules)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    automaton = [matcher.match(message) for message in messages]
+    automaton_us = (time.perf_counter() - started) * 1e6 / len(messages)
+
+    # The loops get folded patterns, so they are only charged for the search.
+    folded = {kind: {name: [fold_text(pattern) for pattern in group] for name, group in rules[kind].items()}
+              for kind in RULE_KINDS}
+    started = time.perf_counter()
+    naive = [naive_match(folded, message) for message in messages]
+    naive_us = (time.perf_counter() - started) * 1e6 / len(messages)
+
+    mismatches = sum(
+        any(sorted(getattr(found, kind)) != sorted(getattr(expected, kind)) for kind in RULE_KINDS)
+        for found, expected in zip(automaton, naive)
+    )
+    speedup = naive_us / automaton_us
+    print(f"patterns: {matcher.pattern_count}  compile: {compile_ms:.1f} ms  messages: {len(messages)}  "
+          f"with hits: {sum(map(bool, automaton))}")
+    print(f"automaton: {automaton_us:.1f} us/message  naive: {naive_us:.1f} us/message  "
+          f"speedup: {speedup:.1f}x  target: {args.min_speedup:.0f}x  mismatches: {mismatches}")
+    if mismatches or speedup < args.min_speedup:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
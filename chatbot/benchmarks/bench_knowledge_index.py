@@ -0,0 +1,114 @@
+"""
+Search latency and rebuild cost of the FAQ index (chat/utils/knowledge_index.py).
+
+--articles synthetic articles (the fixtures of chat/fixtures/faq_articles.json
+plus generated ones) are indexed into a temporary file with the production
+bucket count. The script times a full build, an incremental rebuild after
+editing 1% of the articles, and top-k searches over the memory-mapped index,
+and fails when the search p99 misses the target.
+
+    python benchmarks/bench_knowledge_index.py
+    python benchmarks/bench_knowledge_index.py --articles 20000 --target-ms 20
+
+Target: under SEARCH_TARGET_MS (10 ms) per question at p99 with 5k articles.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from chat.utils.knowledge_index import KnowledgeIndex, build_knowledge_index  # noqa: E402
+
+SEARCH_TARGET_MS = 10.0
+
+WORDS = (
+    "de o a que e do da em um para é com não uma os no se na por mais as dos como "
+    "weni plano cliente suporte conta fatura boleto login senha acesso canal whatsapp fluxo contato "
+    "produto integração relatório agente campanha mensagem atendimento cobrança chatbot studio módulo "
+    "ferramenta equipe usuário permissão webhook api token exportação importação horário fila"
+).split()
+
+QUESTIONS = [
+    "o que é o botbuilder?",
+    "como integrar com whatsapp",
+    "tem atendimento humano?",
+    "como exportar o relatório de atendimento da fila?",
+    "meu token da api não funciona no webhook",
+    "oi",
+]
+
+
+def random_text(words: int, vocabulary: list, rng: random.Random) -> str:
+    # Word frequencies follow Zipf's law, like real text.
+    return " ".join(vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)] for _ in range(words))
+
+
+def build_articles(count: int, rng: random.Random) -> list:
+    fixtures = json.loads((PROJECT_DIR / "chat" / "fixtures" / "faq_articles.json").read_text(encoding="utf-8"))
+    articles = [
+        (item["pk"], "v1", "\n".join((item["fields"]["title"], item["fields"]["question"], item["fields"]["answer"])))
+        for item in fixtures
+    ]
+    vocabulary = WORDS + [f"{rng.choice(WORDS)}{index}" for index in range(20000)]
+    for article_id in range(len(articles) + 1, count + 1):
+        question = random_text(8, vocabulary, rng) + "?"
+        answer = random_text(60, vocabulary, rng)
+        articles.append((article_id, "v1", f"{question}\n{answer}"))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--buckets", type=int, default=2 ** 18)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--target-ms", type=float, default=SEARCH_TARGET_MS)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    articles = build_articles(args.articles, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "faq.idx"
+        started = time.perf_counter()
+        build_knowledge_index(articles, path, args.buckets)
+        full_ms = (time.perf_counter() - started) * 1000
+
+        edited = set(rng.sample(range(len(articles)), max(1, len(articles) // 100)))
+        articles = [
+            (article_id, "v2", text + " atualizado") if index in edited else (article_id, version, text)
+            for index, (article_id, version, text) in enumerate(articles)
+        ]
+        started = time.perf_counter()
+        result = build_knowledge_index(articles, path, args.buckets, previous=KnowledgeIndex(path))
+        incremental_ms = (time.perf_counter() - started) * 1000
+        size_mb = path.stat().st_size / 2 ** 20
+
+        index = KnowledgeIndex(path)
+        latencies = []
+        for search in range(args.searches):
+            started = time.perf_counter()
+            index.search(QUESTIONS[search % len(QUESTIONS)], args.top_k)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"articles: {len(articles)}  index: {size_mb:.1f} MB  full build: {full_ms:.0f} ms  "
+          f"incremental ({result['embedded']} edited): {incremental_ms:.0f} ms")
+    print(f"searches: {args.searches}  top-k: {args.top_k}  p50: {p50:.2f} ms  p99: {p99:.2f} ms  "
+          f"max: {latencies[-1]:.2f} ms  target p99: {args.target_ms:.0f} ms")
+    if p99 > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Cold-start cost of a web worker: a fresh interpreter that loads the WSGI
+application and the URLconf, like a gunicorn worker before its first request.
+
+Each run is a new process started with `python -X importtime`; the script reports
+the median wall time, the median import time and the slowest top-level imports,
+and fails when the median wall time misses the target or when a module that must
+stay lazy (provider SDKs) was imported at startup.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --target-ms 1500 --top 15
+
+Target: a worker must be ready to serve in under COLD_START_TARGET_MS (1 s) on a
+developer machine, with no provider SDK imported until its first update.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+COLD_START_TARGET_MS = 1000
+
+# SDKs that providers import on first use only.
+LAZY_MODULES = ["telebot", "discord", "chat.providers.telegram_provider", "chat.providers.discord_provider"]
+
+BOOTSTRAP = (
+    "import os;"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings');"
+    "from config.wsgi import application;"
+    "import config.urls"
+)
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_once() -> dict:
+    """
+    Starts one worker-like process and parses its `-X importtime` report.
+
+    Returns:
+        dict: The wall time (ms), the imported modules with their cumulative time (us),
+        the top-level imports and the direct imports of config.wsgi and config.urls.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOTSTRAP],
+        cwd=PROJECT_DIR, env=os.environ.copy(), capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+
+    modules, top_level, bootstrap = {}, {}, {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        if len(indent) == 1:
+            top_level[name] = int(cumulative)
+        elif len(indent) == 3:
+            bootstrap[name] = int(cumulative)
+    return {"wall_ms": wall_ms, "modules": modules, "top_level": top_level, "bootstrap": bootstrap}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=COLD_START_TARGET_MS)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    wall_ms = statistics.median(run["wall_ms"] for run in runs)
+    import_ms = statistics.median(sum(run["top_level"].values()) / 1000 for run in runs)
+    print(f"runs: {args.runs}  median wall: {wall_ms:.0f} ms  median imports: {import_ms:.0f} ms  "
+          f"target: {args.target_ms:.0f} ms")
+
+    print("\nslowest imports of config.wsgi and config.urls (cumulative, last run):")
+    for name, cumulative in sorted(runs[-1]["bootstrap"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = [name for name in LAZY_MODULES if name in runs[-1]["modules"]]
+    if eager:
+        print(f"\nimported at startup but should be lazy: {', '.join(eager)}")
+    if eager or wall_ms > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
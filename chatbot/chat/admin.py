@@ -1,13 +1,33 @@
 from django.contrib import admin
 
-from .models import Chat
+from .models import Bot, Chat, FaqArticle
+
+
+@admin.register(Bot)
+class BotAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the Bot model.
+    Displays 'id', 'name', 'service', 'webhook_key', 'is_active' and 'created_at' in the list view.
+    """
+    list_display = ('id', 'name', 'service', 'webhook_key', 'is_active', 'created_at')
+    search_fields = ('name', 'webhook_key')
 
 
 @admin.register(Chat)
 class ChatAdmin(admin.ModelAdmin):
     """
     Admin configuration for the Chat model.
-    Displays 'id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', and 'service' in the list view.
+    Displays 'id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', 'last_activity_at' and 'service' in the list view.
     """
-    list_display = ('id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', 'service')
+    list_display = ('id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', 'last_activity_at', 'service')
     search_fields = ('support_agent_id__name', 'contact_id__name', 'service')
+
+
+@admin.register(FaqArticle)
+class FaqArticleAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the FaqArticle model.
+    Displays 'id', 'title', 'is_active' and 'updated_at' in the list view.
+    """
+    list_display = ('id', 'title', 'is_active', 'updated_at')
+    search_fields = ('title', 'question', 'answer')
@@ -1,6 +1,15 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class ChannelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chat'
+
+    def ready(self):
+        from chat import signals  # noqa: F401
+        from chat.services.chat_state_service import ChatStateService
+
+        # Conversation states are written behind; persist the pending ones when the worker stops.
+        atexit.register(ChatStateService().flush)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from chat.services.knowledge_base_service import KnowledgeBaseService
+
+
+class Command(BaseCommand):
+    """
+    Builds the FAQ index from the active articles.
+
+    Saving or deleting an article already rebuilds it; run this after loading
+    articles in bulk (e.g. `loaddata faq_articles`) or to embed every article again:
+        python manage.py build_faq_index --full
+    """
+
+    help = "Build the FAQ vector index (FAQ_INDEX_PATH) from the active FaqArticle rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Embed every article, not only the changed ones.")
+
+    def handle(self, *args, **options):
+        result = KnowledgeBaseService().rebuild(full=options["full"])
+        self.stdout.write(
+            f"articles={result['articles']} embedded={result['embedded']} reused={result['reused']}"
+        )
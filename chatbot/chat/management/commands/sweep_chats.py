@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from chat.services.chat_lifecycle_service import ChatLifecycleService
+
+
+class Command(BaseCommand):
+    """
+    Closes idle chats and archives old closed chats.
+
+    Run it from cron, or keep it running with `--loop` as a scheduled sweeper:
+        python manage.py sweep_chats --loop --interval 60
+    """
+
+    help = "Close chats idle past CHAT_IDLE_TTL and archive chats closed past CHAT_ARCHIVE_AFTER."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep sweeping every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between sweeps with --loop.")
+
+    def handle(self, *args, **options):
+        lifecycle_service = ChatLifecycleService()
+        while True:
+            result = lifecycle_service.sweep()
+            self.stdout.write(f"closed={result['closed']} archived={result['archived']}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from chat.services.intent_service import IntentService
+
+
+class Command(BaseCommand):
+    """
+    Trains the free-text intent model from the message history.
+
+    Run it offline (e.g. nightly) and restart the workers to load the new model:
+        python manage.py train_intents --epochs 20
+    """
+
+    help = "Train the intent classifier from chat/data/intent_seed.json and the stored messages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--epochs", type=int, default=20, help="Passes over the examples.")
+
+    def handle(self, *args, **options):
+        result = IntentService().train(options["epochs"])
+        self.stdout.write(
+            f"labels={','.join(result['labels'])} examples={result['examples']} accuracy={result['accuracy']:.3f}"
+        )
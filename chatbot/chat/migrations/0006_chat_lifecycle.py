@@ -0,0 +1,96 @@
+# Generated by Django 5.1.3 on 2026-10-19 12:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0005_rename_chat_id_chat_chat"),
+        ("contact", "0002_alter_contact_email_alter_contact_name"),
+        ("supportAgent", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedChat",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("chat", models.CharField(blank=True, max_length=150, null=True)),
+                ("start_time", models.DateTimeField()),
+                ("closing_time", models.DateTimeField()),
+                (
+                    "service",
+                    models.CharField(
+                        choices=[("0", "Telegram"), ("1", "Discord")], max_length=2
+                    ),
+                ),
+                ("last_activity_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="last_activity_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", True)),
+                fields=["chat"],
+                name="chat_open_chat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", True)),
+                fields=["last_activity_at"],
+                name="chat_open_activity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", False)),
+                fields=["chat", "closing_time"],
+                name="chat_closed_chat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", False)),
+                fields=["closing_time"],
+                name="chat_closed_time_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedchat",
+            name="contact_id",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_chats",
+                to="contact.contact",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedchat",
+            name="support_agent_id",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_chats",
+                to="supportAgent.supportagent",
+            ),
+        ),
+    ]
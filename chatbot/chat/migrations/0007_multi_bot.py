@@ -0,0 +1,80 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0006_chat_lifecycle"),
+        ("contact", "0002_alter_contact_email_alter_contact_name"),
+        ("supportAgent", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Bot",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=150)),
+                (
+                    "service",
+                    models.CharField(
+                        choices=[("0", "Telegram"), ("1", "Discord")], max_length=2
+                    ),
+                ),
+                ("token", models.CharField(max_length=255)),
+                ("webhook_key", models.SlugField(max_length=64, unique=True)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="chat",
+            name="chat_open_chat_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="chat",
+            name="chat_closed_chat_idx",
+        ),
+        migrations.AddField(
+            model_name="archivedchat",
+            name="bot_id",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_chats",
+                to="chat.bot",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="bot_id",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="bot_chats",
+                to="chat.bot",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", True)),
+                fields=["bot_id", "chat"],
+                name="chat_open_chat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("closing_time__isnull", False)),
+                fields=["bot_id", "chat", "closing_time"],
+                name="chat_closed_chat_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0007_multi_bot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bot",
+            name="webhook_secret",
+            field=models.CharField(blank=True, default="", max_length=256),
+        ),
+    ]
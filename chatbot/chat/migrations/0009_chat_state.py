@@ -0,0 +1,36 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0008_bot_webhook_secret"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatState",
+            fields=[
+                (
+                    "chat_id",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="state",
+                        serialize=False,
+                        to="chat.chat",
+                    ),
+                ),
+                ("node", models.CharField(default="start", max_length=64)),
+                ("slots", models.JSONField(blank=True, default=dict)),
+                (
+                    "last_activity_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+    ]
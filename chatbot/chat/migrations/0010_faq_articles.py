@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0009_chat_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FaqArticle",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("question", models.TextField(blank=True, default="")),
+                ("answer", models.TextField()),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0010_faq_articles"),
+        ("supportAgent", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReadCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "last_read_message",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                ("unread_count", models.PositiveIntegerField(default=0)),
+                (
+                    "last_activity_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("read_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "chat_id",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="read_cursors",
+                        to="chat.chat",
+                    ),
+                ),
+                (
+                    "support_agent_id",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="read_cursors",
+                        to="supportAgent.supportagent",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["support_agent_id", "last_activity_at"],
+                        name="read_cursor_agent_activity_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("chat_id", "support_agent_id"),
+                        name="read_cursor_chat_agent_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -5,6 +5,37 @@ from contact.models import Contact
 from supportAgent.models import SupportAgent
 
 
+class Bot(models.Model):
+    """
+    Model to store the bots served by this deployment.
+    Fields:
+        - id: Unique identifier for each bot (Primary Key).
+        - name: Display name of the bot.
+        - service: The provider of the bot (e.g., 'telegram', 'discord').
+        - token: The provider API token of the bot.
+        - webhook_key: Unique path segment of the bot webhook
+          (`/channel/receive-messages/<provider>/<webhook_key>/`).
+        - webhook_secret: Secret expected in the provider secret header (the
+          `secret_token` of Telegram's setWebhook); empty disables the check.
+        - is_active: Inactive bots do not accept updates.
+        - created_at: Timestamp of the bot registration.
+    """
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=150)
+    service = models.CharField(max_length=2, choices=[('0', 'Telegram'), ('1', 'Discord')])
+    token = models.CharField(max_length=255)
+    webhook_key = models.SlugField(max_length=64, unique=True)
+    webhook_secret = models.CharField(max_length=256, blank=True, default='')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """
+        Return the name of the bot as a string.
+        """
+        return self.name
+
+
 class Chat(models.Model):
     """
     Model to store chat information.
@@ -15,9 +46,14 @@ class Chat(models.Model):
         - start_time: Timestamp of the chat's start time (default: current timestamp).
         - closing_time: Timestamp of the chat's closing time (optional).
         - service: The service used for the chat (e.g., 'telegram', 'wpp').
+        - last_activity_at: Timestamp of the last inbound update, used by the idle sweeper.
+        - bot_id: ForeignKey reference to the bot that owns the chat (None for the default bot).
     """
     id = models.AutoField(primary_key=True)
     chat = models.CharField(max_length=150, null=True, blank=True)
+    bot_id = models.ForeignKey(
+        Bot, on_delete=models.CASCADE, related_name='bot_chats', null=True, blank=True
+    )
     support_agent_id = models.ForeignKey(
         SupportAgent, on_delete=models.CASCADE, related_name='support_chats', null=True, blank=True
     )
@@ -27,9 +63,150 @@ class Chat(models.Model):
     start_time = models.DateTimeField(default=timezone.now)
     closing_time = models.DateTimeField(null=True, blank=True)
     service = models.CharField(max_length=2, choices=[('0', 'Telegram'), ('1', 'Discord')])
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['bot_id', 'chat'], condition=models.Q(closing_time__isnull=True), name='chat_open_chat_idx'
+            ),
+            models.Index(
+                fields=['last_activity_at'], condition=models.Q(closing_time__isnull=True),
+                name='chat_open_activity_idx'
+            ),
+            models.Index(
+                fields=['bot_id', 'chat', 'closing_time'], condition=models.Q(closing_time__isnull=False),
+                name='chat_closed_chat_idx'
+            ),
+            models.Index(
+                fields=['closing_time'], condition=models.Q(closing_time__isnull=False),
+                name='chat_closed_time_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Return a string representation of the chat, showing the chat id and service.
         """
         return f"Chat {self.id} ({self.service}{self.support_agent_id}{self.contact_id})"
+
+
+class ChatState(models.Model):
+    """
+    Conversation state of a chat: where the user is in the bot flow.
+    Rows are written behind the in-memory store of ChatStateService, so they can
+    lag the live state by up to CHAT_STATE_FLUSH_INTERVAL seconds.
+    Fields:
+        - chat_id: The chat of the conversation (Primary Key).
+        - node: The current node of the bot flow (e.g., 'start', 'welcome', 'support_weni').
+        - slots: Answers collected along the flow.
+        - last_activity_at: Timestamp of the last transition.
+    """
+    chat_id = models.OneToOneField(Chat, on_delete=models.CASCADE, primary_key=True, related_name='state')
+    node = models.CharField(max_length=64, default='start')
+    slots = models.JSONField(default=dict, blank=True)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """
+        Return a string representation of the state, showing the chat and its node.
+        """
+        return f"Chat {self.chat_id_id} at {self.node}"
+
+
+class ReadCursor(models.Model):
+    """
+    How far a support agent has read a chat, with the number of contact
+    messages received since. The counter and the activity timestamp are kept up
+    to date by every message written (`ReadCursorRepository.record`), so an
+    agent inbox is read from this table alone, in last activity order, without
+    counting messages.
+    Fields:
+        - chat_id: The chat read.
+        - support_agent_id: The agent reading it.
+        - last_read_message: The id of the last message the agent has read (None before the first read).
+        - unread_count: Contact messages written after `last_read_message`.
+        - last_activity_at: Timestamp of the last message of the chat.
+        - read_at: Timestamp of the last read (optional).
+    """
+    chat_id = models.ForeignKey(Chat, on_delete=models.CASCADE, related_name='read_cursors')
+    support_agent_id = models.ForeignKey(SupportAgent, on_delete=models.CASCADE, related_name='read_cursors')
+    last_read_message = models.PositiveIntegerField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['support_agent_id', 'last_activity_at'], name='read_cursor_agent_activity_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['chat_id', 'support_agent_id'], name='read_cursor_chat_agent_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Return a string representation of the cursor, showing the chat, the agent and the unread count.
+        """
+        return f"Chat {self.chat_id_id} for agent {self.support_agent_id_id}: {self.unread_count} unread"
+
+
+class ArchivedChat(models.Model):
+    """
+    Cold storage for chats that were closed longer than `CHAT_ARCHIVE_AFTER`.
+    Mirrors the Chat columns, keeping the original primary key, so the hot
+    table only holds open and recently closed chats.
+    Fields:
+        - id: The primary key the chat had in the hot table.
+        - archived_at: Timestamp of when the chat was moved to the archive.
+    """
+    id = models.IntegerField(primary_key=True)
+    chat = models.CharField(max_length=150, null=True, blank=True)
+    bot_id = models.ForeignKey(
+        Bot, on_delete=models.SET_NULL, related_name='archived_chats', null=True, blank=True
+    )
+    support_agent_id = models.ForeignKey(
+        SupportAgent, on_delete=models.SET_NULL, related_name='archived_chats', null=True, blank=True
+    )
+    contact_id = models.ForeignKey(
+        Contact, on_delete=models.SET_NULL, related_name='archived_chats', null=True, blank=True
+    )
+    start_time = models.DateTimeField()
+    closing_time = models.DateTimeField()
+    service = models.CharField(max_length=2, choices=[('0', 'Telegram'), ('1', 'Discord')])
+    last_activity_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """
+        Return a string representation of the archived chat.
+        """
+        return f"Archived chat {self.id} ({self.service})"
+
+
+class FaqArticle(models.Model):
+    """
+    Knowledge-base article used to answer free-text questions.
+    Active articles are embedded into the FAQ index (`FAQ_INDEX_PATH`), which is
+    rebuilt incrementally whenever an article is saved or deleted.
+    Fields:
+        - id: The primary key of the article.
+        - title: Short title, sent above the answer.
+        - question: Questions the article answers, one per line.
+        - answer: The answer sent to the user.
+        - is_active: Whether the article is indexed.
+        - updated_at: Timestamp of the last change; an article is embedded again when it changes.
+    """
+    id = models.AutoField(primary_key=True)
+    title = models.CharField(max_length=255)
+    question = models.TextField(blank=True, default='')
+    answer = models.TextField()
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """
+        Return a string representation of the article, showing its title.
+        """
+        return self.title
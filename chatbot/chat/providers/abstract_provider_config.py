@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, Optional
 
 
 class AbstractProviderConfig(ABC):
@@ -7,9 +8,41 @@ class AbstractProviderConfig(ABC):
     for a communication chat. This class serves as a template for 
     implementing specific chat configurations.
 
+    Providers are registered in `settings.CHAT_PROVIDERS` and loaded on first
+    use by `chat.providers.registry.ProviderRegistry`, which routes each webhook
+    request to one of them by its URL path or header.
+
+    Attributes
+    ----------
+    name : str
+        Registry key and webhook path segment (`/channel/receive-messages/<name>/`).
+    service : str
+        Value stored in `Chat.service` for chats of this provider.
+    token : str
+        API token of the bot served by this instance; None for the default bot.
+        The registry keeps one instance per token.
+
     Methods
     -------
-    verify_commands():
+    authenticate(request, bot):
+        Abstract method to check the secret header of a webhook request.
+
+    parse(request_body):
+        Abstract method to decode and validate a webhook body.
+
+    persist(update, bot):
+        Abstract method to store the contact, chat and message of an update.
+
+    respond(update, message, chat):
+        Abstract method to run the bot flow for an update after it is stored.
+
+    download_file(file_reference):
+        Abstract method to stream a file sent to the bot, in chunks.
+
+    verify_existing_message(message):
+        Abstract method to tell whether a text may be answered (False on moderation hits).
+
+    verify_commands(message):
         Abstract method to validate and interpret commands received 
         in the communication chat. Subclasses must define the logic for 
         command verification.
@@ -19,12 +52,137 @@ class AbstractProviderConfig(ABC):
         through the communication chat. Subclasses must implement this.
     """
 
+    name: str
+    service: str
+
+    def __init__(self, token: Optional[str] = None):
+        self.token = token
+
+    @abstractmethod
+    def authenticate(self, request, bot: Optional[object] = None) -> bool:
+        """
+        Check the secret header of a webhook request, without reading its body.
+
+        Implementations must compare secrets in constant time
+        (`hmac.compare_digest`).
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The webhook request.
+        bot : Bot, optional
+            The registered bot that received the update; None for the default bot.
+
+        Returns
+        -------
+        bool
+            True if the request carries the expected secret, or no secret is configured.
+        """
+        pass
+
+    @abstractmethod
+    def parse(self, request_body: bytes) -> dict:
+        """
+        Decode and validate a webhook body.
+
+        Parameters
+        ----------
+        request_body : bytes
+            The raw body of the webhook request.
+
+        Returns
+        -------
+        dict
+            The decoded update.
+
+        Raises
+        ------
+        rest_framework.exceptions.ValidationError
+            If the body is not a supported update of this provider.
+        """
+        pass
+
+    @abstractmethod
+    def persist(self, update: dict, bot: Optional[object] = None) -> tuple:
+        """
+        Store the contact, chat and message of an update.
+
+        Parameters
+        ----------
+        update : dict
+            The update returned by `parse`.
+        bot : Bot, optional
+            The registered bot that received the update; None for the default bot.
+
+        Returns
+        -------
+        tuple
+            The Chat of the update and the stored Message, or None when the
+            update carries no message.
+        """
+        pass
+
+    @abstractmethod
+    def respond(self, update: dict, message: Optional[object] = None, chat: Optional[object] = None) -> None:
+        """
+        Run the bot flow for an update that was already stored.
+
+        The flow reads and moves the conversation state of the chat
+        (`ChatStateService`), which is kept in memory.
+
+        Parameters
+        ----------
+        update : dict
+            The update returned by `parse`.
+        message : Message, optional
+            The message stored by `persist`, if any.
+        chat : Chat, optional
+            The chat returned by `persist`; defaults to the chat of `message`.
+
+        Returns
+        -------
+        None
+        """
+        pass
+
+    @abstractmethod
+    def download_file(self, file_reference: str) -> Iterator[bytes]:
+        """
+        Stream a file sent to the bot, in chunks of ATTACHMENT_CHUNK_SIZE bytes.
+
+        Implementations must never read the whole file at once.
+
+        Parameters
+        ----------
+        file_reference : str
+            The `provider_file_id` of a MessageAttachment.
+
+        Returns
+        -------
+        Iterator[bytes]
+            The content of the file.
+        """
+        pass
+
     @abstractmethod
     def verify_existing_message(self, message: str) -> bool:
+        """
+        Tell whether a text may be answered by the bot.
+
+        Parameters
+        ----------
+        message : str
+            The message text.
+
+        Returns
+        -------
+        bool
+            False if the text hits a moderation rule.
+        """
         pass
 
     @abstractmethod
-    def verify_commands(self):
+    def verify_commands(self, message: str) -> Optional[dict]:
         """
         Validate and interpret commands received in the chat.
 
@@ -34,7 +192,8 @@ class AbstractProviderConfig(ABC):
 
         Parameters
         ----------
-        None
+        message : str
+            The message text.
 
         Returns
         -------
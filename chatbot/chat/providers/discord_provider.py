@@ -0,0 +1,184 @@
+import hmac
+from dataclasses import asdict
+from typing import Iterator, Optional
+from urllib.error import HTTPError
+from urllib.request import HTTPRedirectHandler, Request, build_opener, urlopen
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from chat.providers.abstract_provider_config import AbstractProviderConfig
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.services.knowledge_base_service import KnowledgeBaseService
+from chat.services.matcher_service import MatcherService
+from chat.utils.chat_state_store import START_NODE
+from config import json_codec
+from message.utils.attachments import is_discord_cdn_url
+
+DISCORD_MESSAGE_MAX_LENGTH = 2000
+
+
+class _CdnRedirectHandler(HTTPRedirectHandler):
+    """
+    Follows a redirect only to another Discord CDN URL.
+    """
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if not is_discord_cdn_url(newurl):
+            raise HTTPError(newurl, code, "Redirect outside the Discord CDN.", headers, fp)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+class DiscordProvider(AbstractProviderConfig):
+    """
+    DiscordProvider class handles interactions with the Discord REST API.
+
+    Discord delivers messages over its gateway, so updates reach the webhook
+    through a relay that posts each `MESSAGE_CREATE` and `MESSAGE_UPDATE` event as received
+    (`{"t": "MESSAGE_CREATE", "d": {...}}`). Replies are sent with the token of
+    the bot (`settings.DISCORD_BOT_TOKEN` for the default bot) to
+    `settings.DISCORD_API_BASE`, which can point to a local stub of the API.
+
+    Methods:
+        - authenticate(request, bot: Bot) -> bool: Checks the `X-Discord-Relay-Secret` header.
+        - parse(request_body: bytes) -> dict: Decodes and validates a `MESSAGE_CREATE` event.
+        - persist(update: dict, bot: Bot) -> tuple: Stores the contact, chat and message of the event.
+        - respond(update: dict, message, chat): Greets users at the start of a conversation and answers FAQ questions.
+        - download_file(url: str) -> Iterator[bytes]: Streams an attachment from the Discord CDN.
+        - reply(chat_id: str, text: str): Sends a message to a Discord channel.
+    """
+
+    name = 'discord'
+    service = '1'
+    chat_state_service = ChatStateService()
+    matcher_service = MatcherService()
+    knowledge_base_service = KnowledgeBaseService()
+
+    def __init__(self, token: Optional[str] = None, inbound_update_service: Optional[InboundUpdateService] = None):
+        super().__init__(token)
+        self.inbound_update_service = inbound_update_service or InboundUpdateService()
+
+    def authenticate(self, request, bot=None) -> bool:
+        """
+        Checks the `X-Discord-Relay-Secret` header set by the gateway relay, in
+        constant time.
+
+        Args:
+            request (HttpRequest): The webhook request.
+            bot (Bot, optional): The registered bot; None for the default bot.
+
+        Returns:
+            bool: True if the header matches, or no secret is configured.
+        """
+        expected = bot.webhook_secret if bot else settings.DISCORD_RELAY_SECRET
+        if not expected:
+            return True
+        received = request.headers.get('X-Discord-Relay-Secret', '')
+        return hmac.compare_digest(received.encode(), expected.encode())
+
+    def parse(self, request_body: bytes) -> dict:
+        """
+        Decodes and validates a Discord `MESSAGE_CREATE` or `MESSAGE_UPDATE` event.
+
+        Args:
+            request_body (bytes): The raw body of the webhook request.
+
+        Returns:
+            dict: The decoded event.
+        """
+        try:
+            data = json_codec.loads(request_body)
+        except json_codec.JSONDecodeError:
+            raise ValidationError("Invalid Discord event.")
+        if not isinstance(data, dict) or data.get('t') not in ('MESSAGE_CREATE', 'MESSAGE_UPDATE') \
+                or not isinstance(data.get('d'), dict):
+            raise ValidationError("Unsupported Discord event.")
+        event = data['d']
+        if not all(key in event for key in ('id', 'channel_id')):
+            raise ValidationError("Invalid Discord event.")
+        if data['t'] == 'MESSAGE_CREATE' and 'username' not in event.get('author', {}):
+            raise ValidationError("Invalid Discord event.")
+        return data
+
+    def persist(self, update: dict, bot=None) -> tuple:
+        return self.inbound_update_service.persist_discord_message(update, bot)
+
+    def respond(self, update: dict, message=None, chat=None) -> None:
+        """
+        Sends the welcome text on the first message of a conversation or on the
+        start command; texts that hit a moderation rule are only recorded in the
+        `moderation` slot, questions get the closest FAQ articles, and other
+        messages wait for a support agent.
+        """
+        if message is None or update['d'].get('author', {}).get('bot'):
+            return
+        state = self.chat_state_service.get(chat or message.chat_id)
+        matches = self.matcher_service.match(message.message_content)
+        if matches.moderation:
+            self.chat_state_service.transition(state, state.node, moderation=matches.moderation[0])
+        elif state.node == START_NODE or 'start' in matches.commands:
+            welcome_text = (
+                "Olá! Antes de continuar, posso perguntar se você já utiliza algum dos produtos da Weni? "
+                "Isso vai me ajudar a oferecer as informações mais relevantes para você. 😊"
+            )
+            self.reply(update['d']['channel_id'], welcome_text)
+            self.chat_state_service.transition(state, 'welcome')
+        elif articles := self.knowledge_base_service.search(message.message_content):
+            text = "Encontrei estas respostas na nossa base de conhecimento:\n\n" + "\n\n".join(
+                f"**{article.title}**\n{article.answer}" for article, _ in articles
+            )
+            self.reply(update['d']['channel_id'], text[:DISCORD_MESSAGE_MAX_LENGTH])
+            self.chat_state_service.transition(state, state.node, faq=[article.id for article, _ in articles])
+
+    def download_file(self, url: str) -> Iterator[bytes]:
+        """
+        Streams a message attachment from its Discord CDN URL, in
+        ATTACHMENT_CHUNK_SIZE chunks. Only DISCORD_ATTACHMENT_ORIGINS URLs are
+        requested, and redirects are followed only within them.
+
+        Args:
+            url (str): The `url` of the attachment.
+
+        Returns:
+            Iterator[bytes]: The content of the file.
+
+        Raises:
+            ValueError: If the URL is not on the Discord CDN.
+        """
+        if not is_discord_cdn_url(url):
+            raise ValueError("Unsupported attachment URL.")
+        opener = build_opener(_CdnRedirectHandler)
+        with opener.open(Request(url), timeout=settings.ATTACHMENT_DOWNLOAD_TIMEOUT) as response:
+            while chunk := response.read(settings.ATTACHMENT_CHUNK_SIZE):
+                yield chunk
+
+    def verify_existing_message(self, message: str) -> bool:
+        return not self.matcher_service.match(message).moderation
+
+    def verify_commands(self, message: str) -> Optional[dict]:
+        matches = self.matcher_service.match(message)
+        return asdict(matches) if matches else None
+
+    def reply(self, chat_id: str, text: str) -> dict:
+        """
+        Sends a message to a Discord channel.
+
+        Args:
+            chat_id (str): The Discord channel id.
+            text (str): The message content.
+
+        Returns:
+            dict: The message created by Discord.
+        """
+        request = Request(
+            f"{settings.DISCORD_API_BASE}/channels/{chat_id}/messages",
+            data=json_codec.dumps({"content": text}),
+            headers={
+                "Authorization": f"Bot {self.token or settings.DISCORD_BOT_TOKEN}",
+                "Content-Type": "application/json",
+            },
+            method="POST",
+        )
+        with urlopen(request, timeout=10) as response:
+            return json_codec.loads(response.read() or b"{}")
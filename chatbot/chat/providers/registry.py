@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from chat.providers.abstract_provider_config import AbstractProviderConfig
+from chat.utils.bot_validator import BotValidator
+
+
+class ProviderRegistry:
+    """
+    Routes webhook requests to the configured chat providers.
+
+    Providers are declared in `settings.AVAILABLE_CHAT_PROVIDERS` (dotted class
+    path and detection header) and enabled by `settings.CHAT_PROVIDERS`. A provider
+    module is only imported when its first update arrives. Instances are pooled
+    per (provider, token): the default bot and every registered bot get their own
+    instance, and the `settings.CHAT_PROVIDER_POOL_SIZE` most recently used ones
+    are kept.
+
+    Detection never parses the body when the request names its provider:
+        - by path: the `<name>` segment of `/channel/receive-messages/<name>/`,
+          a dict lookup;
+        - by header: the detection header of each enabled provider;
+        - otherwise the body is checked against the Telegram format, for
+          webhooks registered before per-provider paths existed. This fallback
+          is off once TELEGRAM_WEBHOOK_SECRET is set: Telegram then always sends
+          the header, and unauthenticated bodies are never parsed.
+    """
+
+    def __init__(self, available: Optional[dict] = None, enabled: Optional[list] = None):
+        self._available = available
+        self._enabled = enabled
+        self._providers = OrderedDict()
+
+    @property
+    def available(self) -> dict:
+        if self._available is None:
+            return settings.AVAILABLE_CHAT_PROVIDERS
+        return self._available
+
+    @property
+    def enabled(self) -> list:
+        if self._enabled is None:
+            return settings.CHAT_PROVIDERS
+        return self._enabled
+
+    def get(self, name: str, token: Optional[str] = None) -> Optional[AbstractProviderConfig]:
+        """
+        Returns the provider registered under `name` for a bot token, importing it
+        on first use.
+
+        Args:
+            name (str): The provider name, e.g. 'telegram'.
+            token (str, optional): The token of a registered bot; None for the default bot.
+
+        Returns:
+            Optional[AbstractProviderConfig]: The provider, or None if it is not enabled.
+        """
+        key = (name, token)
+        if key in self._providers:
+            self._providers.move_to_end(key)
+            return self._providers[key]
+        if name not in self.enabled or name not in self.available:
+            return None
+        provider = import_string(self.available[name]['class'])(token=token)
+        self._providers[key] = provider
+        if len(self._providers) > settings.CHAT_PROVIDER_POOL_SIZE:
+            self._providers.popitem(last=False)
+        return provider
+
+    def get_by_service(self, service: str, token: Optional[str] = None) -> Optional[AbstractProviderConfig]:
+        """
+        Returns the provider of the chats stored with a `Chat.service` value.
+
+        Args:
+            service (str): The service of the chat, e.g. '0' for Telegram.
+            token (str, optional): The token of the bot of the chat; None for the default bot.
+
+        Returns:
+            Optional[AbstractProviderConfig]: The provider, or None if it is not enabled.
+        """
+        for name in self.enabled:
+            provider = self.get(name)
+            if provider is not None and provider.service == service:
+                return self.get(name, token)
+        return None
+
+    def detect(self, request, name: Optional[str] = None) -> Optional[AbstractProviderConfig]:
+        """
+        Finds the provider of a webhook request.
+
+        Args:
+            request (HttpRequest): The webhook request.
+            name (str, optional): The provider segment of the request path, if any.
+
+        Returns:
+            Optional[AbstractProviderConfig]: The provider, or None if no enabled provider matches.
+        """
+        if name:
+            return self.get(name)
+        for provider_name in self.enabled:
+            header = self.available.get(provider_name, {}).get('header')
+            if header and header in request.headers:
+                return self.get(provider_name)
+        if not settings.TELEGRAM_WEBHOOK_SECRET and BotValidator().identify_bot(request.body) == 'telegram':
+            return self.get('telegram')
+        return None
+
+
+provider_registry = ProviderRegistry()
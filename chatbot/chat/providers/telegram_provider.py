@@ -1,13 +1,72 @@
 
+from __future__ import annotations
+
+import hmac
 import os
+from dataclasses import asdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator
 
-from telebot import TeleBot
-from telebot.types import Chat, Message, User
-from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
 
 from chat.providers.abstract_provider_config import AbstractProviderConfig
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.services.intent_service import IntentService
+from chat.services.knowledge_base_service import KnowledgeBaseService
+from chat.services.matcher_service import MatcherService
+from chat.utils.bot_validator import BotValidator
+from chat.utils.chat_state_store import MENU_SLOTS, START_NODE, ConversationState
+
+if TYPE_CHECKING:
+    from telebot import TeleBot
+    from telebot.types import Message
+
+
+TELEGRAM_CLIENT_CACHE_SIZE = 4096
+TELEGRAM_MESSAGE_MAX_LENGTH = 4096
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """
+    Returns the HTTP session shared by every TeleBot client of the process, so
+    all bots reuse the same keep-alive connections to the Bot API.
+    """
+    import requests
+    from django.conf import settings
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=settings.TELEGRAM_HTTP_POOL_SIZE
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+@lru_cache(maxsize=TELEGRAM_CLIENT_CACHE_SIZE)
+def get_bot(token: str | None = None) -> TeleBot:
+    """
+    Returns the TeleBot client of a token, built on first use.
+
+    telebot (and the HTTP stack under it) is only imported here, so processes
+    that never talk to Telegram (migrations, tests, other providers) skip it.
+    Clients only hold their token; requests go through the shared session.
+
+    Args:
+        token (str, optional): The bot token. Defaults to TELEGRAM_API_KEY.
+
+    Returns:
+        TeleBot: The client, shared by every call with the same token.
+    """
+    from telebot import TeleBot, apihelper
+
+    if apihelper.session is None:
+        apihelper.session = get_session()
+    return TeleBot(token or os.environ.get('TELEGRAM_API_KEY'))
+
 
-BOT = TeleBot(os.environ.get('TELEGRAM_API_KEY'))
 class TelegramProvider(AbstractProviderConfig):
     """
     TelegramProvider class handles interactions with the Telegram Bot API.
@@ -16,14 +75,93 @@ class TelegramProvider(AbstractProviderConfig):
     and to send responses back via the Telegram Bot.
 
     Methods:
+        - authenticate(request, bot: Bot) -> bool: Checks the `X-Telegram-Bot-Api-Secret-Token` header.
+        - parse(request_body: bytes) -> dict: Decodes and validates a Telegram update.
+        - persist(update: dict, bot: Bot) -> tuple: Stores the contact, chat and message of the update.
+        - respond(update: dict, message, chat): Runs the menu flow for the update from the conversation state.
+        - download_file(file_id: str) -> Iterator[bytes]: Streams a file sent to the bot.
         - transform_data_to_message(message: dict) -> Message: Converts raw incoming Telegram data into a `Message` object.
-        - verify_commands(): Verifies and executes bot commands (overrides method from AbstractProviderConfig).
+        - verify_commands(message: str) -> dict | None: Returns the commands, keywords and moderation hits of a text.
         - reply(message: Message, supportMessage: str): Sends a reply to a given Telegram message.
 
     Attributes:
-        - BOT: Instance of the TeleBot initialized with the Telegram API key.
+        - bot: The TeleBot client, built on first use by `get_bot`.
     """
 
+    name = 'telegram'
+    service = '0'
+    chat_state_service = ChatStateService()
+    intent_service = IntentService()
+    matcher_service = MatcherService()
+    knowledge_base_service = KnowledgeBaseService()
+
+    @property
+    def bot(self) -> TeleBot:
+        return get_bot(self.token)
+
+    def authenticate(self, request, bot=None) -> bool:
+        """
+        Checks the `X-Telegram-Bot-Api-Secret-Token` header against the secret the
+        webhook was registered with, in constant time.
+
+        Args:
+            request (HttpRequest): The webhook request.
+            bot (Bot, optional): The registered bot; None for the default bot.
+
+        Returns:
+            bool: True if the header matches, or no secret is configured.
+        """
+        expected = bot.webhook_secret if bot else settings.TELEGRAM_WEBHOOK_SECRET
+        if not expected:
+            return True
+        received = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+        return hmac.compare_digest(received.encode(), expected.encode())
+
+    def parse(self, request_body: bytes) -> dict:
+        """
+        Decodes and validates a Telegram update (`message`, `edited_message` or `callback_query`).
+
+        Args:
+            request_body (bytes): The raw body of the webhook request.
+
+        Returns:
+            dict: The decoded update.
+        """
+        update = BotValidator.decode_telegram(request_body)
+        if update is None:
+            raise ValidationError("Invalid Telegram update.")
+        return update
+
+    def persist(self, update: dict, bot=None) -> tuple:
+        return InboundUpdateService().persist_telegram_update(update, bot)
+
+    def respond(self, update: dict, message=None, chat=None) -> None:
+        if message is None and 'callback_query' not in update:
+            return
+        chat = chat if chat is not None else getattr(message, 'chat_id', None)
+        state = self.chat_state_service.get(chat) if chat is not None else None
+        if message:
+            self.setup_handlers(data=update, message=message.message_content, state=state)
+        else:
+            self.setup_handlers(data=update, state=state)
+
+    def download_file(self, file_id: str) -> Iterator[bytes]:
+        """
+        Streams a file sent to the bot: `getFile` resolves its path, then the file
+        is read from the Bot API file endpoint in ATTACHMENT_CHUNK_SIZE chunks over
+        the shared session.
+
+        Args:
+            file_id (str): The Telegram `file_id`.
+
+        Returns:
+            Iterator[bytes]: The content of the file.
+        """
+        url = self.bot.get_file_url(file_id)
+        with get_session().get(url, stream=True, timeout=settings.ATTACHMENT_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=settings.ATTACHMENT_CHUNK_SIZE)
+
     def transform_data_to_message(self, message: dict) -> Message:
         """
         Transforms raw Telegram message data into a `Message` object.
@@ -34,6 +172,8 @@ class TelegramProvider(AbstractProviderConfig):
         Returns:
             Message: A structured Message object containing information about the chat and user.
         """
+        from telebot.types import Chat, Message, User
+
         message = message["message"]
         chat_data = message['chat']
         chat = Chat(
@@ -66,24 +206,78 @@ class TelegramProvider(AbstractProviderConfig):
         )
         return message_obj
 
-    def verify_existing_message(self, message:str) -> bool:
-        return True
+    def verify_existing_message(self, message: str) -> bool:
+        """
+        Returns False for texts that hit a moderation rule.
+        """
+        return not self.matcher_service.match(message).moderation
 
     def create_keyboard(self, buttons):
+        from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+
         keyboard = InlineKeyboardMarkup()
         for text, callback_data in buttons:
             keyboard.add(InlineKeyboardButton(text, callback_data=callback_data))
         return keyboard
 
-    def setup_handlers(self, data: dict, message: str = 'callback'):
+    def setup_handlers(self, data: dict, message: str = 'callback', state: ConversationState | None = None):
         """
         Sets up the command and message handlers for the bot.
+
+        With the conversation state of the chat, texts that hit a moderation rule
+        are only recorded in the `moderation` slot. Otherwise the welcome menu is
+        sent on the first message of a conversation or on the start command, each
+        menu answer or command moves the conversation to its node, and the text
+        sent after choosing support is kept in the `problem` slot. Other free text
+        is answered with the closest FAQ articles, or else routed by its keywords,
+        then by the intent model, and answered like the button of its node.
+        Without a state, only messages containing 'start' get the welcome menu.
         """
-        if "start" in message.lower():
-            message_telegram = self.transform_data_to_message(data)
-            self.handle_start(message_telegram)
-        elif 'callback_query' in data:
+        if 'callback_query' in data:
             self.handle_query(data)
+            if state is not None:
+                self.route_to_node(data, state, data['callback_query']['data'], answer=False)
+            return
+        if state is None:
+            if "start" in message.lower():
+                self.handle_start(self.transform_data_to_message(data))
+            return
+
+        matches = self.matcher_service.match(message)
+        if matches.moderation:
+            self.chat_state_service.transition(state, state.node, moderation=matches.moderation[0])
+        elif state.node == START_NODE or 'start' in matches.commands:
+            self.handle_start(self.transform_data_to_message(data))
+            self.chat_state_service.transition(state, 'welcome')
+        elif matches.commands:
+            self.route_to_node(data, state, matches.commands[0])
+        elif state.node == 'support_weni':
+            self.chat_state_service.transition(state, 'waiting_agent', problem=message)
+        elif articles := self.knowledge_base_service.search(message):
+            self.handle_faq(data['message']['chat']['id'], articles)
+            self.chat_state_service.transition(state, state.node, faq=[article.id for article, _ in articles])
+        elif matches.keywords:
+            self.route_to_node(data, state, matches.keywords[0], text=message)
+        elif (node := self.intent_service.classify(message)) is not None:
+            self.route_to_node(data, state, node, text=message)
+
+    def route_to_node(self, data: dict, state: ConversationState, node: str, text: str | None = None,
+                      answer: bool = True):
+        """
+        Moves the conversation to a menu node, first answering the text message
+        like the button of that node unless `answer` is False.
+
+        When the node sets the `intent` slot, the free text that asked for it is
+        kept in the `intent_text` slot (cleared for buttons and commands), so
+        the intent model is trained on the message that led to the intent only.
+        """
+        if answer:
+            self.handle_intent(data['message']['chat']['id'], node)
+        slot = MENU_SLOTS.get(node)
+        slots = {slot[0]: slot[1]} if slot else {}
+        if 'intent' in slots:
+            slots['intent_text'] = text
+        self.chat_state_service.transition(state, node, **slots)
 
     def handle_start(self, message: Message):
         """
@@ -100,14 +294,53 @@ class TelegramProvider(AbstractProviderConfig):
             ("Sim, já utilizo produtos Weni", "use_weni"),
             ("Não, ainda não utilizo produtos Weni", "dont_use_weni")
         ]
-        BOT.send_message(message.chat.id, welcome_text, reply_markup=self.create_keyboard(buttons))
+        self.bot.send_message(message.chat.id, welcome_text, reply_markup=self.create_keyboard(buttons))
 
 
-    @BOT.callback_query_handler(func=lambda call: True)
     def handle_query(self, call: dict):
-        answer = call['callback_query']['data']
+        """
+        Answers a menu button by editing the menu message.
+        """
+        response = self.menu_response(call['callback_query']['data'])
+        if response is None:
+            return
+        text, buttons = response
         message_id = call['callback_query']['message']['message_id']
         chat_id = call['callback_query']['from']['id']
+        if buttons:
+            self.bot.edit_message_text(text, chat_id, message_id, reply_markup=self.create_keyboard(buttons))
+        else:
+            self.bot.edit_message_text(text, chat_id, message_id)
+
+    def handle_intent(self, chat_id: int, node: str):
+        """
+        Answers a free-text message classified into a menu node with the text of
+        that node's button, as a new message.
+        """
+        response = self.menu_response(node)
+        if response is None:
+            return
+        text, buttons = response
+        if buttons:
+            self.bot.send_message(chat_id, text, reply_markup=self.create_keyboard(buttons))
+        else:
+            self.bot.send_message(chat_id, text)
+
+    def handle_faq(self, chat_id: int, articles: list):
+        """
+        Answers a question with the FAQ articles found for it, best first, in a
+        single message.
+        """
+        text = "Encontrei estas respostas na nossa base de conhecimento:\n\n" + "\n\n".join(
+            f"{article.title}\n{article.answer}" for article, _ in articles
+        )
+        self.bot.send_message(chat_id, text[:TELEGRAM_MESSAGE_MAX_LENGTH])
+
+    def menu_response(self, answer: str):
+        """
+        Returns the text and the buttons (or None) that answer a menu node, or
+        None for nodes without an automatic answer.
+        """
         if answer == "use_weni":
             text = (
                 "Que ótimo saber que você já utiliza produtos da Weni! 😊\n\n"
@@ -118,7 +351,7 @@ class TelegramProvider(AbstractProviderConfig):
                 ("Preciso de suporte para algum produto Weni", "support_weni"),
                 ("Quero adquirir novos produtos Weni", "new_products_weni")
             ]
-            BOT.edit_message_text(text, chat_id, message_id, reply_markup=self.create_keyboard(buttons))
+            return text, buttons
         
         elif answer == "dont_use_weni":
             text = (
@@ -129,11 +362,11 @@ class TelegramProvider(AbstractProviderConfig):
                 ("Gostaria de saber mais sobre os produtos Weni", "product_details"),
                 ("Gostaria de contratar os serviços/Falar com especialista", "hire_services")
             ]
-            BOT.edit_message_text(text, chat_id, message_id, reply_markup=self.create_keyboard(buttons))
+            return text, buttons
         
         elif answer == "support_weni":
             text = "Vou transferir você para o suporte agora. 😊\n\nPor favor, descreva qual é o problema que você está enfrentando e com qual produto Weni."
-            BOT.edit_message_text(text, chat_id, message_id)
+            return text, None
         
         elif answer == "new_products_weni":
             text = (
@@ -145,7 +378,7 @@ class TelegramProvider(AbstractProviderConfig):
                 ("Receber explicações sobre produtos", "product_details"),
                 ("Falar com um especialista", "talk_specialist"),
             ]
-            BOT.edit_message_text(text, chat_id, message_id, reply_markup=self.create_keyboard(buttons))
+            return text, buttons
 
         elif answer == "product_details":
             text = (
@@ -168,24 +401,28 @@ class TelegramProvider(AbstractProviderConfig):
             buttons = [
                 ("Falar com um especialista", "talk_specialist"),
             ]
-            BOT.edit_message_text(text, chat_id, message_id, reply_markup=self.create_keyboard(buttons))
+            return text, buttons
 
         elif answer == "hire_services":
             text = "Entendido! Vou conectar você com um especialista para te ajudar a contratar nossos serviços. 😊"
-            BOT.edit_message_text(text, chat_id, message_id)
-        
+            return text, None
+        return None
 
-    def verify_commands(self):
+    def verify_commands(self, message: str) -> dict | None:
         """
-        Verifies and processes any bot commands.
+        Returns the commands, keywords and moderation hits of a text, found in a
+        single scan by the keyword automaton.
+
+        Args:
+            message (str): The message text.
 
-        This method can be extended to handle specific Telegram commands
-        by overriding the parent method.
+        Returns:
+            dict | None: The matched rule names by kind, or None when nothing matches.
         """
-        return super().verify_commands()
+        matches = self.matcher_service.match(message)
+        return asdict(matches) if matches else None
 
-    @BOT.message_handler()
     def reply(self, message: Message, supportMessage: str):
-        BOT.send_message(message, supportMessage)
+        self.bot.send_message(message, supportMessage)
 
 
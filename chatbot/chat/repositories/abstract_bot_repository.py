@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from chat.models import Bot
+
+
+class AbstractBotRepository(ABC):
+    """
+    Abstract base class for a Bot Repository.
+
+    Purpose:
+        - Serves as a blueprint for repository implementations that read the
+          bots registered in this deployment.
+
+    Methods:
+        - get_active_by_webhook_key(webhook_key: str) -> Bot: Abstract method to retrieve an active bot by its webhook key.
+    """
+
+    @abstractmethod
+    def get_active_by_webhook_key(self, webhook_key: str) -> Optional[Bot]:
+        """
+        Retrieves the active bot of a webhook key.
+
+        Returns:
+            - Bot: The Bot instance, or None.
+        """
+        pass
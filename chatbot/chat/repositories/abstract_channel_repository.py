@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
 
-from chat.models import Chat
+from chat.models import Bot, Chat
 
 
 class AbstractChannelRepository(ABC):
@@ -68,3 +70,77 @@ class AbstractChannelRepository(ABC):
             - QuerySet: A QuerySet of all Chat instances.
         """
         pass
+
+    @abstractmethod
+    def get_by_id(self, chat_id: int) -> Chat:
+        """
+        Retrieves a Chat instance with its bot.
+
+        Returns:
+            - Chat: The Chat instance, or None.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_chat_id(self, chat_id: str, bot: Bot = None) -> Chat:
+        """
+        Retrieves the open Chat instance for a provider chat id of a bot.
+
+        Returns:
+            - Chat: The open Chat instance, or None.
+        """
+        pass
+
+    @abstractmethod
+    def get_last_closed_by_chat_id(self, chat_id: str, closed_after: datetime, bot: Bot = None) -> Chat:
+        """
+        Retrieves the most recently closed Chat for a provider chat id of a bot.
+
+        Returns:
+            - Chat: The closed Chat instance, or None.
+        """
+        pass
+
+    @abstractmethod
+    def touch(self, chat: Chat) -> None:
+        """
+        Records inbound activity on a Chat.
+        """
+        pass
+
+    @abstractmethod
+    def reopen(self, chat: Chat) -> None:
+        """
+        Reopens a closed Chat.
+        """
+        pass
+
+    @abstractmethod
+    def close_idle(self, idle_since: datetime, limit: int) -> int:
+        """
+        Closes open Chats idle since before `idle_since`.
+
+        Returns:
+            - int: The number of Chats closed.
+        """
+        pass
+
+    @abstractmethod
+    def get_inbox(self, message_count: int, status: str = 'open', support_agent: Optional[int] = None):
+        """
+        Retrieves the chats of an inbox with their contact, agent and last messages.
+
+        Returns:
+            - QuerySet: The chats, most recently active first.
+        """
+        pass
+
+    @abstractmethod
+    def get_detail(self, chat_id: int, message_count: int) -> Chat:
+        """
+        Retrieves a Chat with its contact, agent and last messages.
+
+        Returns:
+            - Chat: The Chat instance, or None.
+        """
+        pass
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class AbstractChatArchiveRepository(ABC):
+    """
+    Abstract base class for a Chat Archive Repository.
+
+    Purpose:
+        - Serves as a blueprint for repository implementations that move closed
+          chats and their messages from the hot tables to the archive tables.
+
+    Methods:
+        - get_archivable_ids(closed_before: datetime, limit: int) -> list[int]: Abstract method to select a batch of chats.
+        - archive(chat_ids: list[int]) -> int: Abstract method to move a batch of chats to the archive.
+    """
+
+    @abstractmethod
+    def get_archivable_ids(self, closed_before: datetime, limit: int) -> list[int]:
+        """
+        Retrieves the ids of up to `limit` chats closed before `closed_before`.
+
+        Returns:
+            - list[int]: The ids of the chats to archive.
+        """
+        pass
+
+    @abstractmethod
+    def archive(self, chat_ids: list[int]) -> int:
+        """
+        Moves the given chats and their messages to the archive tables.
+
+        Args:
+            - chat_ids (list[int]): The ids of the chats to archive.
+
+        Returns:
+            - int: The number of chats archived.
+        """
+        pass
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from chat.models import ChatState
+
+
+class AbstractChatStateRepository(ABC):
+    """
+    Abstract base class for a Chat State Repository.
+
+    Methods:
+        - get_by_chat_id(chat_id: int) -> ChatState: Abstract method to retrieve the stored state of a chat.
+        - save_many(states: List[ChatState]) -> None: Abstract method to insert or update many states at once.
+        - get_intent_examples() -> List[tuple]: Abstract method to list the user texts that led chats to an intent.
+    """
+
+    @abstractmethod
+    def get_by_chat_id(self, chat_id: int) -> Optional[ChatState]:
+        """
+        Retrieves the stored state of a chat.
+
+        Returns:
+            - ChatState: The ChatState instance, or None.
+        """
+        pass
+
+    @abstractmethod
+    def save_many(self, states: List[ChatState]) -> None:
+        """
+        Inserts or updates many chat states at once.
+
+        Parameters:
+            - states (List[ChatState]): The states to write.
+        """
+        pass
+
+    @abstractmethod
+    def get_intent_examples(self) -> List[tuple]:
+        """
+        Lists the texts sent by users that moved their conversation to an intent.
+
+        Returns:
+            - List[tuple]: (message content, intent slot) pairs.
+        """
+        pass
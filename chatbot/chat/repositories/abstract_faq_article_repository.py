@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class AbstractFaqArticleRepository(ABC):
+    """
+    Abstract base class for a FAQ Article Repository.
+
+    Methods:
+        - get_index_rows() -> List[tuple]: Abstract method to list the id, version and text of the active articles.
+        - get_by_ids(ids: List[int]) -> dict: Abstract method to retrieve articles by their ids.
+    """
+
+    @abstractmethod
+    def get_index_rows(self) -> List[tuple]:
+        """
+        Lists the active articles to index.
+
+        Returns:
+            - List[tuple]: (id, version, text) of each active article.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_ids(self, ids: List[int]) -> dict:
+        """
+        Retrieves the active articles with the given ids.
+
+        Returns:
+            - dict: The FaqArticle instances by id.
+        """
+        pass
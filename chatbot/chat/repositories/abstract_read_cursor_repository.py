@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, Optional
+
+from chat.models import Chat, ReadCursor
+
+
+class AbstractReadCursorRepository(ABC):
+    """
+    Abstract base class for a Read Cursor Repository.
+
+    Methods:
+        - record(chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> int: Abstract method to
+          count a new message in the cursors of its chats.
+        - ensure(chat: Chat) -> None: Abstract method to create the cursor of the agent of a chat.
+        - drop(chat_id: int, support_agent_id: int) -> None: Abstract method to delete the cursor of an agent.
+        - mark_read(chat: Chat, support_agent_id: int, message_id: int) -> ReadCursor: Abstract method to move
+          the cursor of an agent.
+        - get_inbox(support_agent_id: int, message_count: int, status: str): Abstract method to list the
+          chats of an agent.
+    """
+
+    @abstractmethod
+    def record(self, chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> int:
+        """
+        Counts a message written in each of the given chats in their cursors.
+
+        Returns:
+            - int: The number of cursors updated.
+        """
+        pass
+
+    @abstractmethod
+    def ensure(self, chat: Chat) -> None:
+        """
+        Creates the cursor of the support agent of a Chat, if it has none.
+        """
+        pass
+
+    @abstractmethod
+    def drop(self, chat_id: int, support_agent_id: int) -> None:
+        """
+        Deletes the cursor of a support agent on a Chat.
+        """
+        pass
+
+    @abstractmethod
+    def mark_read(self, chat: Chat, support_agent_id: int, message_id: Optional[int] = None) -> ReadCursor:
+        """
+        Marks a Chat as read by a support agent up to one of its messages.
+
+        Returns:
+            - ReadCursor: The cursor, or None if the message is not one of the chat.
+        """
+        pass
+
+    @abstractmethod
+    def get_inbox(self, support_agent_id: int, message_count: int, status: str = 'open'):
+        """
+        Retrieves the cursors of a support agent with their chats, most recently active first.
+
+        Returns:
+            - QuerySet: The cursors.
+        """
+        pass
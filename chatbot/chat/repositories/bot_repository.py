@@ -0,0 +1,25 @@
+from typing import Optional
+
+from chat.models import Bot
+from chat.repositories.abstract_bot_repository import AbstractBotRepository
+from config.db_router import get_read_database
+
+
+class BotRepository(AbstractBotRepository):
+    """
+    Concrete implementation of the AbstractBotRepository.
+
+    Methods:
+        - get_active_by_webhook_key(webhook_key: str) -> Bot: Retrieves an active bot by its webhook key.
+    """
+
+    @staticmethod
+    def get_active_by_webhook_key(webhook_key: str) -> Optional[Bot]:
+        """
+        Retrieves the active bot of a webhook key from a read replica, unless the
+        request is pinned to the primary. Served by the unique `webhook_key` index.
+
+        Returns:
+            - Bot: The Bot instance, or None.
+        """
+        return Bot.objects.using(get_read_database()).filter(webhook_key=webhook_key, is_active=True).first()
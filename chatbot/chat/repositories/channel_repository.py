@@ -1,4 +1,14 @@
-from chat.models import Chat
+from datetime import datetime
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from django.utils import timezone
+
+from chat.models import Bot, Chat
+from config.db_router import get_read_database
+from message.models import ListingVersion, Message
+from message.repositories.listing_version_repository import ListingVersionRepository
 from chat.repositories.abstract_channel_repository import \
     AbstractChannelRepository
 
@@ -12,6 +22,14 @@ class ChannelRepository(AbstractChannelRepository):
         - update(data: dict, chat: Chat) -> Chat: Updates an existing Chat instance with the given data.
         - delete(chat_id: int): Deletes a Chat instance identified by its ID.
         - get_all() -> QuerySet: Retrieves all Chat instances.
+        - get_by_id(chat_id: int) -> Chat: Retrieves a Chat with its bot.
+        - get_by_chat_id(chat_id: str, bot: Bot) -> Chat: Retrieves the open Chat for a provider chat id.
+        - get_last_closed_by_chat_id(chat_id: str, closed_after: datetime, bot: Bot) -> Chat: Retrieves a recently closed Chat.
+        - touch(chat: Chat): Records inbound activity on a Chat.
+        - reopen(chat: Chat): Clears the closing time of a Chat.
+        - close_idle(idle_since: datetime, limit: int) -> int: Closes open Chats idle since the given time.
+        - get_inbox(message_count: int, ...) -> QuerySet: Chats with their contact, agent and last messages.
+        - get_detail(chat_id: int, message_count: int) -> Chat: One Chat loaded like the inbox.
     """
 
     @staticmethod
@@ -25,15 +43,12 @@ class ChannelRepository(AbstractChannelRepository):
         Returns:
             - Chat: The created Chat instance.
         """
-        data_copy = data
-        chat = Chat.objects.create(**data_copy)
-        chat.save()
-        return chat
+        return Chat.objects.create(**data)
     
     @staticmethod
     def update(data: dict, chat: Chat) -> Chat:
         """
-        Updates an existing Chat instance.
+        Updates an existing Chat instance, writing only the columns present in `data`.
 
         Args:
             - data (dict): A dictionary with updated data for the chat.
@@ -42,16 +57,15 @@ class ChannelRepository(AbstractChannelRepository):
         Returns:
             - Chat: The updated Chat instance.
         """
-        support_agent = data.pop("support_agent_id")
-        for key, value in data.item():
+        for key, value in data.items():
             setattr(chat, key, value)
-        chat.support_agent_id.set(support_agent[0])
-        chat.save()
+        chat.save(update_fields=list(data))
+        return chat
     
     @staticmethod
     def delete(chat_id: int) -> Chat:
         """
-        Deletes a Chat instance.
+        Deletes a Chat instance with its messages.
 
         Args:
             - chat_id (int): The unique identifier of the Chat to delete.
@@ -59,27 +73,145 @@ class ChannelRepository(AbstractChannelRepository):
         Returns:
             - None
         """
-        Chat.objects.filter(id=chat_id).delete()
+        with transaction.atomic():
+            Chat.objects.filter(id=chat_id).delete()
+            ListingVersionRepository.bump(ListingVersion.MESSAGES)
 
     @staticmethod
     def get_all() -> Chat:
         """
-        Retrieves all Chat instances.
+        Retrieves all Chat instances from a read replica, unless the request is
+        pinned to the primary.
 
         Returns:
             - QuerySet: A QuerySet of all Chat instances.
         """
-        chats = Chat.objects.all()
+        chats = Chat.objects.using(get_read_database()).all()
         return chats
     
     @staticmethod
-    def get_by_chat_id(chat_id: str) -> Chat:
+    def get_by_id(chat_id: int) -> Chat:
+        """
+        Retrieves a Chat instance with its bot (for the reply token), in one query.
+
+        Returns:
+            - Chat: The Chat instance, or None.
+        """
+        return Chat.objects.select_related('bot_id').filter(id=chat_id).first()
+
+    @staticmethod
+    def get_by_chat_id(chat_id: str, bot: Bot = None) -> Chat:
+        """
+        Retrieves the open Chat instance for a provider chat id of a bot (the
+        default bot when `bot` is None).
+        Served by the `chat_open_chat_idx` partial index.
+
+        Returns:
+            - Chat: The open Chat instance, or None.
+        """
+        chat = Chat.objects.filter(bot_id=bot, chat=chat_id, closing_time__isnull=True).first()
+        return chat
+
+    @staticmethod
+    def get_last_closed_by_chat_id(chat_id: str, closed_after: datetime, bot: Bot = None) -> Chat:
         """
-        Retrieves a Chat instance.
+        Retrieves the most recently closed Chat for a provider chat id of a bot, if
+        it was closed after `closed_after`.
 
         Returns:
-            - QuerySet: A Chat instances.
+            - Chat: The closed Chat instance, or None.
         """
-        chat = Chat.objects.filter(chat=chat_id).first()
+        chat = Chat.objects.filter(
+            bot_id=bot, chat=chat_id, closing_time__isnull=False, closing_time__gte=closed_after
+        ).order_by('-closing_time').first()
         return chat
 
+    @staticmethod
+    def touch(chat: Chat) -> None:
+        """
+        Records inbound activity on a Chat without rewriting the whole row.
+
+        Args:
+            - chat (Chat): The Chat instance that received an update.
+        """
+        chat.last_activity_at = timezone.now()
+        Chat.objects.filter(id=chat.id).update(last_activity_at=chat.last_activity_at)
+
+    @staticmethod
+    def reopen(chat: Chat) -> None:
+        """
+        Reopens a closed Chat and records the inbound activity that reopened it.
+
+        Args:
+            - chat (Chat): The closed Chat instance.
+        """
+        chat.closing_time = None
+        chat.last_activity_at = timezone.now()
+        Chat.objects.filter(id=chat.id).update(closing_time=None, last_activity_at=chat.last_activity_at)
+
+    @staticmethod
+    def close_idle(idle_since: datetime, limit: int) -> int:
+        """
+        Closes up to `limit` open Chats whose last activity is older than `idle_since`.
+        Served by the `chat_open_activity_idx` partial index.
+
+        Args:
+            - idle_since (datetime): Chats idle since before this moment are closed.
+            - limit (int): Maximum number of Chats closed in one call.
+
+        Returns:
+            - int: The number of Chats closed.
+        """
+        chat_ids = list(
+            Chat.objects.filter(closing_time__isnull=True, last_activity_at__lt=idle_since)
+            .order_by('last_activity_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not chat_ids:
+            return 0
+        return Chat.objects.filter(id__in=chat_ids, closing_time__isnull=True).update(closing_time=timezone.now())
+
+    @staticmethod
+    def _with_conversation(chats: QuerySet, message_count: int) -> QuerySet:
+        # Contact and agent come in the chat query; the last `message_count`
+        # messages of every chat of the page come in one more query, numbered
+        # per chat by a ROW_NUMBER() window (Django's sliced Prefetch).
+        recent = Message.objects.using(chats.db).order_by('-created_at', '-id')[:message_count]
+        return chats.select_related('contact_id', 'support_agent_id').prefetch_related(
+            Prefetch('messages', queryset=recent, to_attr='recent_messages')
+        )
+
+    @staticmethod
+    def get_inbox(message_count: int, status: str = 'open', support_agent: Optional[int] = None) -> QuerySet:
+        """
+        Retrieves the chats of an inbox, most recently active first, each with its
+        contact, its support agent and its last `message_count` messages (newest
+        first, in `recent_messages`). A page of the result costs two queries
+        whatever its size. Open chats are served by `chat_open_activity_idx`.
+
+        Args:
+            - message_count (int): The number of messages loaded per chat.
+            - status (str): 'open' (default), 'closed' or 'all'.
+            - support_agent (int, optional): Only the chats of this support agent.
+
+        Returns:
+            - QuerySet: The chats, to be sliced into pages.
+        """
+        chats = Chat.objects.using(get_read_database()).order_by('-last_activity_at', '-id')
+        if status != 'all':
+            chats = chats.filter(closing_time__isnull=status == 'open')
+        if support_agent is not None:
+            chats = chats.filter(support_agent_id=support_agent)
+        return ChannelRepository._with_conversation(chats, message_count)
+
+    @staticmethod
+    def get_detail(chat_id: int, message_count: int) -> Chat:
+        """
+        Retrieves a Chat with its contact, support agent and last `message_count`
+        messages (newest first, in `recent_messages`), in two queries.
+
+        Returns:
+            - Chat: The Chat instance, or None.
+        """
+        chats = Chat.objects.using(get_read_database()).filter(id=chat_id)
+        return ChannelRepository._with_conversation(chats, message_count).first()
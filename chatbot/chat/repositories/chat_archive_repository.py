@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from chat.models import ArchivedChat, Chat
+from chat.repositories.abstract_chat_archive_repository import \
+    AbstractChatArchiveRepository
+from message.models import ArchivedMessage, ListingVersion, Message
+from message.repositories.listing_version_repository import ListingVersionRepository
+from message.repositories.message_partition_repository import \
+    MessagePartitionRepository
+
+CHAT_COLUMNS = (
+    'id', 'chat', 'bot_id_id', 'support_agent_id_id', 'contact_id_id', 'start_time',
+    'closing_time', 'service', 'last_activity_at',
+)
+MESSAGE_COLUMNS = (
+    'id', 'chat_id_id', 'sender_type', 'message_content', 'created_at',
+    'sender_content_type_id', 'sender_object_id', 'provider_message_id', 'edited_at',
+)
+
+
+class ChatArchiveRepository(AbstractChatArchiveRepository):
+    """
+    Concrete implementation of the AbstractChatArchiveRepository.
+
+    Each batch is copied to ArchivedChat/ArchivedMessage with INSERT ... SELECT,
+    so the rows never leave the database, and then removed from the hot tables
+    and the message partitions inside a single transaction: a chat is never
+    visible in both places nor lost between them.
+    """
+
+    @staticmethod
+    def get_archivable_ids(closed_before: datetime, limit: int) -> list[int]:
+        """
+        Retrieves the ids of up to `limit` chats closed before `closed_before`.
+        Served by the `chat_closed_time_idx` partial index.
+
+        Returns:
+            - list[int]: The ids of the chats to archive.
+        """
+        return list(
+            Chat.objects.filter(closing_time__isnull=False, closing_time__lt=closed_before)
+            .order_by('closing_time')
+            .values_list('id', flat=True)[:limit]
+        )
+
+    @staticmethod
+    def archive(chat_ids: list[int]) -> int:
+        """
+        Moves the given chats and their messages to the archive tables, the
+        messages already moved to the monthly partitions of their lifetime
+        (`start_time` to `closing_time`) included.
+
+        Args:
+            - chat_ids (list[int]): The ids of the chats to archive.
+
+        Returns:
+            - int: The number of chats archived.
+        """
+        if not chat_ids:
+            return 0
+        bounds = Chat.objects.filter(id__in=chat_ids).aggregate(start=Min('start_time'), end=Max('closing_time'))
+        if bounds['start'] is None:
+            return 0
+        # Attaches the partitions on SQLite, which must happen outside the transaction.
+        partitions = MessagePartitionRepository().get_tables(bounds['start'], bounds['end'] + timedelta(seconds=1))
+        quote = connection.ops.quote_name
+        chats = ', '.join(['%s'] * len(chat_ids))
+        chat_columns = ', '.join(quote(Chat._meta.get_field(name).column) for name in CHAT_COLUMNS)
+        message_columns = ', '.join(quote(Message._meta.get_field(name).column) for name in MESSAGE_COLUMNS)
+        message_chat = quote(Message._meta.get_field('chat_id').column)
+        archived_at = ArchivedChat._meta.get_field('archived_at').get_db_prep_save(timezone.now(), connection)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote(ArchivedChat._meta.db_table)} ({chat_columns}, {quote("archived_at")}) '
+                f'SELECT {chat_columns}, %s FROM {quote(Chat._meta.db_table)} WHERE {quote(Chat._meta.pk.column)} IN ({chats})',
+                [archived_at, *chat_ids],
+            )
+            archived = cursor.rowcount
+            for table in (quote(Message._meta.db_table), *partitions):
+                cursor.execute(
+                    f'INSERT INTO {quote(ArchivedMessage._meta.db_table)} ({message_columns}) '
+                    f'SELECT {message_columns} FROM {table} WHERE {message_chat} IN ({chats})',
+                    chat_ids,
+                )
+            for table in partitions:
+                cursor.execute(f'DELETE FROM {table} WHERE {message_chat} IN ({chats})', chat_ids)
+            Message.objects.filter(chat_id__in=chat_ids).delete()
+            Chat.objects.filter(id__in=chat_ids).delete()
+            ListingVersionRepository.bump(ListingVersion.MESSAGES)
+        return archived
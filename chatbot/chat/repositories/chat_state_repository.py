@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+from django.db import connection
+
+from chat.models import Chat, ChatState
+from config.db_router import get_read_database
+from chat.repositories.abstract_chat_state_repository import AbstractChatStateRepository
+
+# Rows per INSERT: keeps each statement under SQLite's bound-parameter limit.
+SAVE_BATCH_SIZE = 200
+
+
+class ChatStateRepository(AbstractChatStateRepository):
+    """
+    Concrete implementation of the AbstractChatStateRepository.
+
+    Methods:
+        - get_by_chat_id(chat_id: int) -> ChatState: Retrieves the stored state of a chat.
+        - save_many(states: List[ChatState]) -> None: Upserts many states at once.
+        - get_intent_examples() -> List[tuple]: Lists the user texts that led chats to an intent.
+    """
+
+    @staticmethod
+    def get_by_chat_id(chat_id: int) -> Optional[ChatState]:
+        """
+        Retrieves the stored state of a chat from the primary: a state written
+        by another worker a moment ago must not be missed.
+
+        Returns:
+            - ChatState: The ChatState instance, or None.
+        """
+        return ChatState.objects.filter(chat_id=chat_id).first()
+
+    @staticmethod
+    def save_many(states: List[ChatState]) -> None:
+        """
+        Inserts or updates many chat states with INSERT ... ON CONFLICT, in batches.
+        States of chats deleted in the meantime (archived) are skipped.
+
+        A stored state is only replaced by one at least as recent
+        (`last_activity_at`): a worker flushing an older copy of a chat never
+        overwrites the transition another worker already wrote.
+
+        Parameters:
+            - states (List[ChatState]): The states to write.
+        """
+        existing = set(Chat.objects.filter(id__in=[state.chat_id_id for state in states]).values_list('id', flat=True))
+        states = [state for state in states if state.chat_id_id in existing]
+        if not states:
+            return
+        quote = connection.ops.quote_name
+        table = quote(ChatState._meta.db_table)
+        fields = [ChatState._meta.get_field(name) for name in ('chat_id', 'node', 'slots', 'last_activity_at')]
+        columns = [quote(field.column) for field in fields]
+        activity = quote(fields[-1].column)
+        updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in columns[1:])
+        row = '(' + ', '.join(['%s'] * len(fields)) + ')'
+        with connection.cursor() as cursor:
+            for start in range(0, len(states), SAVE_BATCH_SIZE):
+                batch = states[start:start + SAVE_BATCH_SIZE]
+                cursor.execute(
+                    f'INSERT INTO {table} ({", ".join(columns)}) VALUES {", ".join([row] * len(batch))} '
+                    f'ON CONFLICT ({columns[0]}) DO UPDATE SET {updates} '
+                    f'WHERE EXCLUDED.{activity} >= {table}.{activity}',
+                    [
+                        field.get_db_prep_save(getattr(state, field.attname), connection)
+                        for state in batch for field in fields
+                    ],
+                )
+
+    @staticmethod
+    def get_intent_examples() -> List[tuple]:
+        """
+        Lists, from a read replica, the free texts that moved a conversation to
+        its intent (the `intent_text` slot) with that intent. Chats whose intent
+        was chosen with a button have no such text and are left out: the other
+        messages of the chat were not about the intent.
+
+        Returns:
+            - List[tuple]: (message content, intent slot) pairs.
+        """
+        rows = (
+            ChatState.objects.using(get_read_database())
+            .filter(slots__intent__isnull=False, slots__intent_text__isnull=False)
+            .values_list('slots__intent_text', 'slots__intent')
+        )
+        return [(text, intent) for text, intent in rows if isinstance(text, str) and text.strip()]
@@ -0,0 +1,43 @@
+from typing import List
+
+from chat.models import FaqArticle
+from chat.repositories.abstract_faq_article_repository import AbstractFaqArticleRepository
+from config.db_router import get_read_database
+
+
+class FaqArticleRepository(AbstractFaqArticleRepository):
+    """
+    Concrete implementation of the AbstractFaqArticleRepository.
+
+    Methods:
+        - get_index_rows() -> List[tuple]: Lists the id, version and text of the active articles.
+        - get_by_ids(ids: List[int]) -> dict: Retrieves active articles by their ids.
+    """
+
+    @staticmethod
+    def get_index_rows() -> List[tuple]:
+        """
+        Lists the active articles to index, from the primary: the index is
+        rebuilt right after an article changes. The version of an article is its
+        last update time.
+
+        Returns:
+            - List[tuple]: (id, version, text) of each active article.
+        """
+        rows = FaqArticle.objects.filter(is_active=True).order_by('id').values_list(
+            'id', 'updated_at', 'title', 'question', 'answer'
+        )
+        return [
+            (article_id, updated_at.isoformat(), "\n".join((title, question, answer)))
+            for article_id, updated_at, title, question, answer in rows
+        ]
+
+    @staticmethod
+    def get_by_ids(ids: List[int]) -> dict:
+        """
+        Retrieves the active articles with the given ids, from a read replica.
+
+        Returns:
+            - dict: The FaqArticle instances by id.
+        """
+        return FaqArticle.objects.using(get_read_database()).filter(is_active=True).in_bulk(ids)
@@ -0,0 +1,151 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.db.models import Count, DateTimeField, F, Prefetch, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from chat.models import Chat, ReadCursor
+from config.db_router import get_read_database
+from message.models import Message
+from chat.repositories.abstract_read_cursor_repository import AbstractReadCursorRepository
+
+CONTACT_SENDER = 1
+
+
+class ReadCursorRepository(AbstractReadCursorRepository):
+    """
+    Concrete implementation of the AbstractReadCursorRepository.
+
+    Unread counters are denormalized: every message written increments the
+    counters of its chat in one UPDATE, and a read resets them, so neither the
+    inbox nor the counters ever count the messages of a chat.
+
+    Methods:
+        - record(chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> int: Counts a new message.
+        - ensure(chat: Chat) -> None: Creates the cursor of the agent of a chat.
+        - drop(chat_id: int, support_agent_id: int) -> None: Deletes the cursor of an agent.
+        - mark_read(chat: Chat, support_agent_id: int, message_id: int) -> ReadCursor: Moves a cursor.
+        - get_inbox(support_agent_id: int, message_count: int, status: str) -> QuerySet: Lists the chats of an agent.
+    """
+
+    @staticmethod
+    def record(chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> int:
+        """
+        Records a message written in each of the given chats: the cursors of
+        these chats take its time as last activity (unless they already have a
+        later one: a backfilled message does not move a chat down the inbox)
+        and, for a contact message, one more unread message. Both are computed
+        by the database (`unread_count + 1`), so concurrent messages are all counted.
+
+        Args:
+            - chat_ids (Iterable[int]): The chats the message was written in.
+            - created_at (datetime): When the message was written.
+            - from_contact (bool): Whether the message was sent by the contact.
+
+        Returns:
+            - int: The number of cursors updated.
+        """
+        changes = {
+            'last_activity_at': Greatest(F('last_activity_at'), Value(created_at, output_field=DateTimeField())),
+        }
+        if from_contact:
+            changes['unread_count'] = F('unread_count') + 1
+        return ReadCursor.objects.filter(chat_id__in=list(chat_ids)).update(**changes)
+
+    @staticmethod
+    def ensure(chat: Chat) -> None:
+        """
+        Creates the cursor of the support agent of a Chat if it has none, with
+        the contact messages already in the chat as unread: the only time the
+        messages of a chat are counted is when an agent takes it.
+
+        Parameters:
+            - chat (Chat): The chat; nothing is done if it has no support agent.
+        """
+        if chat.support_agent_id_id is None:
+            return
+        if ReadCursor.objects.filter(chat_id=chat.id, support_agent_id=chat.support_agent_id_id).exists():
+            return
+        ReadCursor.objects.get_or_create(
+            chat_id_id=chat.id, support_agent_id_id=chat.support_agent_id_id,
+            defaults={
+                'unread_count': Message.objects.filter(chat_id=chat.id, sender_type=CONTACT_SENDER).count(),
+                'last_activity_at': chat.last_activity_at,
+            },
+        )
+
+    @staticmethod
+    def drop(chat_id: int, support_agent_id: int) -> None:
+        """
+        Deletes the cursor of a support agent on a Chat, taking the chat out of
+        the agent inbox.
+        """
+        ReadCursor.objects.filter(chat_id=chat_id, support_agent_id=support_agent_id).delete()
+
+    @staticmethod
+    def mark_read(chat: Chat, support_agent_id: int, message_id: Optional[int] = None) -> Optional[ReadCursor]:
+        """
+        Marks a Chat as read by a support agent up to one of its messages (the
+        last one by default), creating the cursor on the agent's first read. The
+        unread counter becomes the number of contact messages after that
+        message, counted in the same UPDATE, so a message written meanwhile is
+        not lost.
+
+        Args:
+            - chat (Chat): The chat read.
+            - support_agent_id (int): The agent reading it.
+            - message_id (int, optional): The last message read; the last message of the chat by default.
+
+        Returns:
+            - ReadCursor: The cursor, or None if the message is not one of the chat
+              (or the chat has no message yet).
+        """
+        messages = Message.objects.filter(chat_id=chat.id)
+        if message_id is not None:
+            messages = messages.filter(id=message_id)
+        message_id = messages.order_by('-id').values_list('id', flat=True).first()
+        if message_id is None:
+            return None
+        unread = Message.objects.filter(
+            chat_id=chat.id, id__gt=message_id, sender_type=CONTACT_SENDER
+        ).order_by().values('chat_id').annotate(total=Count('id')).values('total')
+        changes = {
+            'last_read_message': message_id,
+            'unread_count': Coalesce(Subquery(unread), Value(0)),
+            'read_at': timezone.now(),
+        }
+        cursors = ReadCursor.objects.filter(chat_id=chat.id, support_agent_id=support_agent_id)
+        if not cursors.update(**changes):
+            ReadCursor.objects.get_or_create(
+                chat_id_id=chat.id, support_agent_id_id=support_agent_id,
+                defaults={'last_activity_at': chat.last_activity_at},
+            )
+            cursors.update(**changes)
+        return cursors.get()
+
+    @staticmethod
+    def get_inbox(support_agent_id: int, message_count: int, status: str = 'open') -> QuerySet:
+        """
+        Retrieves the cursors of a support agent, most recently active first
+        (read from `read_cursor_agent_activity_idx`), each with its chat, the
+        chat contact and the last `message_count` messages of the chat (newest
+        first, in `chat_id.recent_messages`). A page of the result costs two
+        queries whatever its size and the length of the chats.
+
+        Args:
+            - support_agent_id (int): The agent.
+            - message_count (int): The number of messages loaded per chat.
+            - status (str): 'open' (default), 'closed' or 'all' chats.
+
+        Returns:
+            - QuerySet: The cursors, to be sliced into pages.
+        """
+        database = get_read_database()
+        cursors = ReadCursor.objects.using(database).filter(support_agent_id=support_agent_id)
+        if status != 'all':
+            cursors = cursors.filter(chat_id__closing_time__isnull=status == 'open')
+        recent = Message.objects.using(database).order_by('-created_at', '-id')[:message_count]
+        return cursors.order_by('-last_activity_at', '-id').select_related(
+            'chat_id', 'chat_id__contact_id', 'chat_id__support_agent_id'
+        ).prefetch_related(Prefetch('chat_id__messages', queryset=recent, to_attr='recent_messages'))
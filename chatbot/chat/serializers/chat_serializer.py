@@ -9,4 +9,4 @@ class ChatSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Chat
-        fields = ['id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', 'service']
+        fields = ['id', 'bot_id', 'support_agent_id', 'contact_id', 'start_time', 'closing_time', 'last_activity_at', 'service']
@@ -0,0 +1,41 @@
+from rest_framework import serializers
+from chat.models import Chat
+
+
+class DiscordInputSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Chat model.
+    Converts a Discord `MESSAGE_CREATE` event into chat data.
+
+    The contact of the chat is resolved by the caller and passed in the
+    `contact` context key (and its bot, if any, in `bot`), so validating an event issues no queries.
+    """
+    class Meta:
+        model = Chat
+        fields = [
+            'id',
+            'chat',
+            'service',
+        ]
+
+    def to_internal_value(self, data: dict):
+        """
+        Customizes the deserialization process by injecting additional fields or transforming input data.
+
+        Args:
+            - data (dict): The `d` payload of a `MESSAGE_CREATE` event.
+
+        Returns:
+            - dict: The validated chat data, including the `contact_id` taken from the context.
+
+        Custom Logic:
+            - Uses the Discord channel id as `chat`.
+            - Sets `service` to Discord and `contact_id` to the contact in the context.
+        """
+        if 'channel_id' not in data:
+            raise serializers.ValidationError("Invalid data structure, must contain 'channel_id'.")
+
+        validated_data = super().to_internal_value({'chat': str(data['channel_id']), 'service': '1'})
+        validated_data['contact_id'] = self.context['contact']
+        validated_data['bot_id'] = self.context.get('bot')
+        return validated_data
@@ -0,0 +1,50 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class InboxQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the inbox and chat detail endpoints.
+
+    Fields:
+        - page (int): The page of chats, from 1.
+        - page_size (int): Chats per page; CHAT_INBOX_PAGE_SIZE by default, at most CHAT_INBOX_MAX_PAGE_SIZE.
+        - messages (int): Last messages loaded per chat; CHAT_INBOX_MESSAGES by default,
+          at most CHAT_INBOX_MAX_MESSAGES.
+        - status (str): 'open' (default), 'closed' or 'all'.
+        - support_agent (int): Only the chats of this support agent.
+    """
+
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, required=False)
+    messages = serializers.IntegerField(min_value=0, required=False)
+    status = serializers.ChoiceField(choices=['open', 'closed', 'all'], default='open')
+    support_agent = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_page_size(self, value):
+        if value > settings.CHAT_INBOX_MAX_PAGE_SIZE:
+            raise serializers.ValidationError(f"At most {settings.CHAT_INBOX_MAX_PAGE_SIZE} chats per page.")
+        return value
+
+    def validate_messages(self, value):
+        if value > settings.CHAT_INBOX_MAX_MESSAGES:
+            raise serializers.ValidationError(f"At most {settings.CHAT_INBOX_MAX_MESSAGES} messages per chat.")
+        return value
+
+    def validate(self, attrs):
+        attrs.setdefault('page_size', settings.CHAT_INBOX_PAGE_SIZE)
+        attrs.setdefault('messages', settings.CHAT_INBOX_MESSAGES)
+        return attrs
+
+
+class MarkReadSerializer(serializers.Serializer):
+    """
+    Validates the body of the mark-as-read endpoint.
+
+    Fields:
+        - support_agent (int): The agent who read the chat.
+        - message (int): The last message read; the last message of the chat by default.
+    """
+
+    support_agent = serializers.IntegerField(min_value=1)
+    message = serializers.IntegerField(min_value=1, required=False)
@@ -0,0 +1,58 @@
+from rest_framework import serializers
+
+from chat.models import Chat, ReadCursor
+from contact.serializers.contact_list_serializer import ContactListSerializer
+from message.serializers.message_list_serializer import MessageListSerializer
+from supportAgent.models import SupportAgent
+
+
+class InboxSupportAgentSerializer(serializers.ModelSerializer):
+    """
+    Public fields of the support agent of a chat.
+    """
+    class Meta:
+        model = SupportAgent
+        fields = ['id', 'first_name', 'last_name']
+
+
+class InboxChatSerializer(serializers.ModelSerializer):
+    """
+    Serializer of a chat with what a chat view shows: its contact, its support
+    agent and its last messages (newest first).
+
+    Expects the chats loaded by `ChannelRepository.get_inbox` / `get_detail`, with
+    the contact and agent selected and the messages prefetched in `recent_messages`.
+    """
+    contact = ContactListSerializer(source='contact_id', read_only=True)
+    support_agent = InboxSupportAgentSerializer(source='support_agent_id', read_only=True)
+    messages = MessageListSerializer(source='recent_messages', many=True, read_only=True)
+
+    class Meta:
+        model = Chat
+        fields = [
+            'id', 'chat', 'service', 'bot_id', 'start_time', 'closing_time', 'last_activity_at',
+            'contact', 'support_agent', 'messages',
+        ]
+
+
+class ReadCursorSerializer(serializers.ModelSerializer):
+    """
+    Serializer of the read cursor of a support agent on a chat.
+    """
+    class Meta:
+        model = ReadCursor
+        fields = ['chat_id', 'support_agent_id', 'last_read_message', 'unread_count', 'last_activity_at', 'read_at']
+
+
+class AgentInboxSerializer(serializers.ModelSerializer):
+    """
+    Serializer of an entry of an agent inbox: the unread counter of the agent
+    and the chat, as InboxChatSerializer shows it.
+
+    Expects the cursors loaded by `ReadCursorRepository.get_inbox`.
+    """
+    chat = InboxChatSerializer(source='chat_id', read_only=True)
+
+    class Meta:
+        model = ReadCursor
+        fields = ['unread_count', 'last_read_message', 'last_activity_at', 'read_at', 'chat']
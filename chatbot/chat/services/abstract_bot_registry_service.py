@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from chat.models import Bot
+
+
+class AbstractBotRegistryService(ABC):
+    """
+    Abstract class for defining the interface of a Bot Registry Service.
+
+    This class ensures that all subclasses resolve the bot of a webhook request.
+    """
+
+    @abstractmethod
+    def get_by_webhook_key(self, webhook_key: str) -> Optional[Bot]:
+        """
+        Abstract method to retrieve the active bot of a webhook key.
+
+        Args:
+            webhook_key (str): The webhook key taken from the request path.
+
+        Returns:
+            Optional[Bot]: The bot, or None if there is no active bot with this key.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, webhook_key: Optional[str] = None) -> None:
+        """
+        Abstract method to drop cached bots.
+
+        Args:
+            webhook_key (str, optional): The key to drop; every key when None.
+        """
+        pass
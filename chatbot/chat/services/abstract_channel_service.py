@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
-from chat.models import Chat
+from chat.models import Bot, Chat
 
 
 class AbstractChannelService(ABC):
@@ -55,6 +56,26 @@ class AbstractChannelService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_open_chat(self, chat_id: str, bot: Bot = None) -> Chat:
+        """
+        Abstract method to retrieve the open chat of a provider chat id, without creating one.
+
+        Returns:
+            Chat: The open chat instance, or None.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_id(self, chat_id: int) -> Chat:
+        """
+        Abstract method to retrieve a chat by its primary key.
+
+        Returns:
+            Chat: The chat instance.
+        """
+        pass
+
     @abstractmethod
     def get_by_chat_id(self) -> Chat:
         """
@@ -64,3 +85,23 @@ class AbstractChannelService(ABC):
             Chat: Retrieves a chat instance.
         """
         pass
+
+    @abstractmethod
+    def get_inbox(self, message_count: int, status: str = 'open', support_agent: Optional[int] = None):
+        """
+        Abstract method to retrieve the chats of an inbox with their contact, agent and last messages.
+
+        Returns:
+            QuerySet: The chats, most recently active first.
+        """
+        pass
+
+    @abstractmethod
+    def get_detail(self, chat_id: int, message_count: int) -> Chat:
+        """
+        Abstract method to retrieve a chat with its contact, agent and last messages.
+
+        Returns:
+            Chat: The chat instance.
+        """
+        pass
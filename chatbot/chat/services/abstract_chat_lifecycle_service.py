@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractChatLifecycleService(ABC):
+    """
+    Abstract class for defining the interface of a Chat Lifecycle Service.
+
+    This class ensures that all subclasses implement the operations that keep
+    the hot chat tables small: closing idle chats and archiving closed ones.
+    """
+
+    @abstractmethod
+    def close_idle_chats(self) -> int:
+        """
+        Abstract method to close the chats idle for longer than the configured TTL.
+
+        Returns:
+            int: The number of chats closed.
+        """
+        pass
+
+    @abstractmethod
+    def archive_closed_chats(self) -> int:
+        """
+        Abstract method to move chats closed long enough ago to the archive tables.
+
+        Returns:
+            int: The number of chats archived.
+        """
+        pass
+
+    @abstractmethod
+    def sweep(self) -> dict:
+        """
+        Abstract method to run a full lifecycle pass (close, then archive).
+
+        Returns:
+            dict: The number of chats closed and archived.
+        """
+        pass
@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+
+from chat.models import Chat
+from chat.utils.chat_state_store import ConversationState
+
+
+class AbstractChatStateService(ABC):
+    """
+    Abstract class for defining the interface of a Chat State Service.
+
+    This class ensures that all subclasses keep the conversation state of each chat.
+    """
+
+    @abstractmethod
+    def get(self, chat: Chat) -> ConversationState:
+        """
+        Abstract method to retrieve the conversation state of a chat.
+
+        Args:
+            chat (Chat): The chat.
+
+        Returns:
+            ConversationState: The state; a chat without state starts at the `start` node.
+        """
+        pass
+
+    @abstractmethod
+    def transition(self, state: ConversationState, node: str, **slots) -> ConversationState:
+        """
+        Abstract method to move a conversation to another node.
+
+        Args:
+            state (ConversationState): The state of the chat.
+            node (str): The new node.
+            **slots: Answers to store with the state.
+
+        Returns:
+            ConversationState: The updated state.
+        """
+        pass
+
+    @abstractmethod
+    def flush(self) -> int:
+        """
+        Abstract method to persist the states changed since the last flush.
+
+        Returns:
+            int: The number of states written.
+        """
+        pass
@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from chat.models import Bot, Chat
+from message.models import Message
+
+
+class AbstractInboundUpdateService(ABC):
+    """
+    Abstract class for defining the interface of an Inbound Update Service.
+
+    This class ensures that all subclasses persist a provider update (contact,
+    chat and message) as a single unit of work.
+    """
+
+    @abstractmethod
+    def persist_telegram_update(self, data: dict, bot: Optional[Bot] = None) -> tuple[Chat, Optional[Message]]:
+        """
+        Abstract method to persist a Telegram update.
+
+        Args:
+            data (dict): The decoded Telegram update.
+            bot (Bot, optional): The bot that received the update; None for the default bot.
+
+        Returns:
+            tuple[Chat, Optional[Message]]: The chat of the update and the stored message, if any.
+        """
+        pass
+
+    @abstractmethod
+    def persist_discord_message(self, data: dict, bot: Optional[Bot] = None) -> tuple[Chat, Optional[Message]]:
+        """
+        Abstract method to persist a Discord `MESSAGE_CREATE` event.
+
+        Args:
+            data (dict): The decoded Discord event.
+            bot (Bot, optional): The bot that received the event; None for the default bot.
+
+        Returns:
+            tuple[Chat, Optional[Message]]: The chat of the channel and the stored message, if any.
+        """
+        pass
+
+    @abstractmethod
+    def persist_edit(
+        self, chat_id: str, provider_message_id: str, content: str, edited_at: datetime, bot: Optional[Bot] = None
+    ) -> tuple[Optional[Chat], None]:
+        """
+        Abstract method to apply a provider edit to a stored message.
+
+        Args:
+            chat_id (str): The provider chat id.
+            provider_message_id (str): The provider id of the edited message.
+            content (str): The new content.
+            edited_at (datetime): When the edit was made.
+            bot (Bot, optional): The bot that received the edit; None for the default bot.
+
+        Returns:
+            tuple[Optional[Chat], None]: The open chat of the message, if any.
+        """
+        pass
+
+    @abstractmethod
+    def create_message(self, chat: Chat, data: dict) -> Optional[Message]:
+        """
+        Abstract method to insert the message of an update, unless a concurrent
+        delivery of the same update already stored it.
+
+        Args:
+            chat (Chat): The chat of the message.
+            data (dict): The validated message data.
+
+        Returns:
+            Optional[Message]: The stored message, or None for a duplicate.
+        """
+        pass
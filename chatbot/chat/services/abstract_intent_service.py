@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class AbstractIntentService(ABC):
+    """
+    Abstract class for defining the interface of an Intent Service.
+
+    This class ensures that all subclasses classify free-text messages into nodes of the bot flow.
+    """
+
+    @abstractmethod
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Abstract method to find the flow node a free-text message asks for.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            Optional[str]: The node, or None when no intent is recognized.
+        """
+        pass
+
+    @abstractmethod
+    def train(self, epochs: int) -> dict:
+        """
+        Abstract method to train the intent model from the message history.
+
+        Args:
+            epochs (int): Passes over the examples.
+
+        Returns:
+            dict: The labels, the number of examples and the training accuracy.
+        """
+        pass
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class AbstractKnowledgeBaseService(ABC):
+    """
+    Abstract class for defining the interface of a Knowledge Base Service.
+
+    This class ensures that all subclasses answer free-text questions with FAQ articles.
+    """
+
+    @abstractmethod
+    def search(self, text: str, limit: Optional[int] = None) -> List[tuple]:
+        """
+        Abstract method to find the articles that answer a question.
+
+        Args:
+            text (str): The question.
+            limit (int, optional): How many articles to return at most.
+
+        Returns:
+            List[tuple]: (FaqArticle, score) pairs, best first.
+        """
+        pass
+
+    @abstractmethod
+    def rebuild(self, full: bool = False) -> dict:
+        """
+        Abstract method to rebuild the index from the active articles.
+
+        Args:
+            full (bool): Embed every article again instead of only the changed ones.
+
+        Returns:
+            dict: The number of indexed, embedded and reused articles.
+        """
+        pass
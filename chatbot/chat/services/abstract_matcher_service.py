@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+
+from chat.utils.keyword_matcher import MatchResult
+
+
+class AbstractMatcherService(ABC):
+    """
+    Abstract class for defining the interface of a Matcher Service.
+
+    This class ensures that all subclasses find the commands, keywords and moderation hits of a message.
+    """
+
+    @abstractmethod
+    def match(self, text: str) -> MatchResult:
+        """
+        Abstract method to find the rules a message matches.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            MatchResult: The matched commands, keywords and moderation categories.
+        """
+        pass
+
+    @abstractmethod
+    def reload(self) -> int:
+        """
+        Abstract method to compile the rules again.
+
+        Returns:
+            int: The number of compiled patterns.
+        """
+        pass
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, Optional
+
+from chat.models import Chat, ReadCursor
+
+
+class AbstractReadCursorService(ABC):
+    """
+    Abstract class for defining the interface of a Read Cursor Service.
+
+    This class ensures that all subclasses keep what each support agent has read
+    of each chat and serve the agent inboxes.
+    """
+
+    @abstractmethod
+    def record(self, chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> None:
+        """
+        Abstract method to count a new message in the cursors of its chats.
+
+        Args:
+            chat_ids (Iterable[int]): The chats the message was written in.
+            created_at (datetime): When the message was written.
+            from_contact (bool): Whether the message was sent by the contact.
+        """
+        pass
+
+    @abstractmethod
+    def follow_assignment(self, chat: Chat, previous_support_agent_id: Optional[int] = None) -> None:
+        """
+        Abstract method to move a chat to the inbox of its new support agent.
+
+        Args:
+            chat (Chat): The chat.
+            previous_support_agent_id (int, optional): The agent the chat was assigned to before.
+        """
+        pass
+
+    @abstractmethod
+    def mark_read(self, chat_id: int, support_agent_id: int, message_id: Optional[int] = None) -> ReadCursor:
+        """
+        Abstract method to mark a chat as read by a support agent.
+
+        Args:
+            chat_id (int): The chat read.
+            support_agent_id (int): The agent reading it.
+            message_id (int, optional): The last message read.
+
+        Returns:
+            ReadCursor: The cursor of the agent.
+        """
+        pass
+
+    @abstractmethod
+    def get_inbox(self, support_agent_id: int, message_count: int, status: str = 'open'):
+        """
+        Abstract method to retrieve the chats of a support agent with their unread counters.
+
+        Returns:
+            QuerySet: The cursors, most recently active first.
+        """
+        pass
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+from django.conf import settings
+
+from chat.models import Bot
+from chat.repositories.bot_repository import BotRepository
+from chat.services.abstract_bot_registry_service import \
+    AbstractBotRegistryService
+
+
+@dataclass
+class BotRegistryService(AbstractBotRegistryService):
+    """
+    Serviço responsável por resolver o bot de cada webhook.
+
+    Os bots ficam no banco e são carregados sob demanda, um por vez, na primeira
+    atualização recebida por cada um; a inicialização não depende do número de
+    bots. Cada bot encontrado fica em memória por `BOT_REGISTRY_TTL` segundos,
+    em um LRU de no máximo `BOT_REGISTRY_CACHE_SIZE` bots, e o cache do processo
+    é limpo sempre que um bot é salvo ou removido. Chaves desconhecidas não são
+    guardadas: elas vêm de URLs não autenticadas, e guardá-las deixaria qualquer
+    um crescer a memória dos workers tentando chaves aleatórias.
+    """
+
+    bot_repository = BotRepository()
+    _cache: ClassVar[OrderedDict] = OrderedDict()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def get_by_webhook_key(self, webhook_key: str) -> Optional[Bot]:
+        """
+        Recupera o bot ativo de uma chave de webhook.
+
+        Args:
+            webhook_key (str): A chave do caminho do webhook.
+
+        Returns:
+            Optional[Bot]: O bot, ou None se não houver bot ativo com essa chave.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(webhook_key)
+            if cached is not None and cached[1] > now:
+                self._cache.move_to_end(webhook_key)
+                return cached[0]
+        bot = self.bot_repository.get_active_by_webhook_key(webhook_key)
+        with self._lock:
+            if bot is None:
+                self._cache.pop(webhook_key, None)
+                return None
+            self._cache[webhook_key] = (bot, now + settings.BOT_REGISTRY_TTL)
+            self._cache.move_to_end(webhook_key)
+            while len(self._cache) > settings.BOT_REGISTRY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return bot
+
+    def invalidate(self, webhook_key: Optional[str] = None) -> None:
+        """
+        Remove bots do cache em memória.
+
+        Args:
+            webhook_key (str, optional): A chave a remover; todas quando None.
+        """
+        with self._lock:
+            if webhook_key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(webhook_key, None)
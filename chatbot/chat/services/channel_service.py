@@ -1,10 +1,15 @@
 from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
 
-from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
 
-from chat.models import Chat
+from chat.models import Bot, Chat
 from chat.repositories.channel_repository import ChannelRepository
 from chat.services.abstract_channel_service import AbstractChannelService
+from config.db_router import pin_to_primary
 
 
 @dataclass
@@ -22,17 +27,30 @@ class ChannelService(AbstractChannelService):
         """
         Cria um novo canal (Chat) com base nos dados fornecidos.
 
+        Se já existir um chat aberto para o mesmo `chat` e bot (`bot_id`), ele é reutilizado; se o
+        último chat foi fechado há menos de `CHAT_REOPEN_WINDOW` segundos, ele é
+        reaberto. Caso contrário, um novo chat é iniciado. As leituras seguintes da
+        requisição passam a usar o banco primário (read-your-writes).
+
         Args:
             data (dict): Dados necessários para criar o chat.
 
         Returns:
             Chat: A instância do chat criado.
         """
+        pin_to_primary()
         chat_id = data.get('chat')
         if chat_id:
-            channel_existing = self.channel_repository.get_by_chat_id(chat_id)
-        if isinstance(channel_existing, Chat):
-            return channel_existing
+            bot = data.get('bot_id')
+            channel_existing = self.channel_repository.get_by_chat_id(chat_id, bot)
+            if isinstance(channel_existing, Chat):
+                self.channel_repository.touch(channel_existing)
+                return channel_existing
+            closed_after = timezone.now() - timedelta(seconds=settings.CHAT_REOPEN_WINDOW)
+            channel_closed = self.channel_repository.get_last_closed_by_chat_id(chat_id, closed_after, bot)
+            if isinstance(channel_closed, Chat):
+                self.channel_repository.reopen(channel_closed)
+                return channel_closed
         return self.channel_repository.create(data)
     
     def update(self, data: dict, chat: Chat) -> None:
@@ -69,8 +87,74 @@ class ChannelService(AbstractChannelService):
         """
         return self.channel_repository.get_all()
 
+    def get_open_chat(self, chat_id: str, bot: Bot = None) -> Chat:
+        """
+        Recupera o chat aberto de um `chat` do provedor, sem criar, tocar ou reabrir chats.
+
+        Args:
+            chat_id (str): O id do chat no provedor.
+            bot (Bot, optional): O bot do chat; None para o bot padrão.
+
+        Returns:
+            Chat: A instância do chat aberto, ou None.
+        """
+        return self.channel_repository.get_by_chat_id(chat_id, bot)
+
+    def get_by_id(self, chat_id: int) -> Chat:
+        """
+        Recupera um chat pela chave primária, com o seu bot.
+
+        Args:
+            chat_id (int): O id do chat.
+
+        Returns:
+            Chat: A instância do chat.
+
+        Raises:
+            NotFound: Se o chat não existir.
+        """
+        chat = self.channel_repository.get_by_id(chat_id)
+        if chat is None:
+            raise NotFound(detail="There is no chat with this id")
+        return chat
+
     def get_by_chat_id(self, chat_id: int) -> Chat:
         chat = self.channel_repository.get_by_chat_id(chat_id)
         if chat:
             raise ValidationError(detail="There is no chat with this id")
         return chat
+
+    def get_inbox(self, message_count: int, status: str = 'open', support_agent: Optional[int] = None):
+        """
+        Recupera os chats da caixa de entrada, do mais recentemente ativo ao menos,
+        cada um com o contato, o atendente e as últimas `message_count` mensagens
+        (`recent_messages`, da mais nova à mais antiga).
+
+        Args:
+            message_count (int): Quantas mensagens carregar por chat.
+            status (str): 'open' (padrão), 'closed' ou 'all'.
+            support_agent (int, optional): Apenas os chats deste atendente.
+
+        Returns:
+            QuerySet: Os chats, a serem paginados.
+        """
+        return self.channel_repository.get_inbox(message_count, status, support_agent)
+
+    def get_detail(self, chat_id: int, message_count: int) -> Chat:
+        """
+        Recupera um chat com o contato, o atendente e as últimas `message_count` mensagens.
+
+        Args:
+            chat_id (int): O id do chat.
+            message_count (int): Quantas mensagens carregar.
+
+        Returns:
+            Chat: A instância do chat.
+
+        Raises:
+            NotFound: Se o chat não existir.
+        """
+        chat = self.channel_repository.get_detail(chat_id, message_count)
+        if chat is None:
+            raise NotFound(detail="There is no chat with this id")
+        return chat
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from chat.repositories.channel_repository import ChannelRepository
+from chat.repositories.chat_archive_repository import ChatArchiveRepository
+from chat.services.abstract_chat_lifecycle_service import \
+    AbstractChatLifecycleService
+
+
+@dataclass
+class ChatLifecycleService(AbstractChatLifecycleService):
+    """
+    Serviço responsável pelo ciclo de vida dos canais (Chats): fecha os chats
+    ociosos há mais de `CHAT_IDLE_TTL` segundos e arquiva, em lotes, os chats
+    fechados há mais de `CHAT_ARCHIVE_AFTER` segundos.
+    """
+
+    channel_repository = ChannelRepository()
+    chat_archive_repository = ChatArchiveRepository()
+
+    def close_idle_chats(self) -> int:
+        """
+        Fecha os chats sem atividade desde `agora - CHAT_IDLE_TTL`, em lotes de
+        `CHAT_ARCHIVE_BATCH_SIZE`.
+
+        Returns:
+            int: Quantidade de chats fechados.
+        """
+        idle_since = timezone.now() - timedelta(seconds=settings.CHAT_IDLE_TTL)
+        closed = 0
+        while True:
+            count = self.channel_repository.close_idle(idle_since, settings.CHAT_ARCHIVE_BATCH_SIZE)
+            closed += count
+            if count < settings.CHAT_ARCHIVE_BATCH_SIZE:
+                return closed
+
+    def archive_closed_chats(self) -> int:
+        """
+        Move para as tabelas de arquivo os chats fechados antes de
+        `agora - CHAT_ARCHIVE_AFTER`, junto com suas mensagens.
+
+        Returns:
+            int: Quantidade de chats arquivados.
+        """
+        closed_before = timezone.now() - timedelta(seconds=settings.CHAT_ARCHIVE_AFTER)
+        archived = 0
+        while True:
+            chat_ids = self.chat_archive_repository.get_archivable_ids(
+                closed_before, settings.CHAT_ARCHIVE_BATCH_SIZE
+            )
+            archived += self.chat_archive_repository.archive(chat_ids)
+            if len(chat_ids) < settings.CHAT_ARCHIVE_BATCH_SIZE:
+                return archived
+
+    def sweep(self) -> dict:
+        """
+        Executa uma passada completa do ciclo de vida.
+
+        Returns:
+            dict: Quantidade de chats fechados e arquivados.
+        """
+        return {
+            "closed": self.close_idle_chats(),
+            "archived": self.archive_closed_chats(),
+        }
@@ -0,0 +1,116 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import ClassVar, Optional
+
+from django.conf import settings
+
+from chat.models import Chat, ChatState
+from chat.repositories.chat_state_repository import ChatStateRepository
+from chat.services.abstract_chat_state_service import AbstractChatStateService
+from chat.utils.chat_state_store import ChatStateStore, ConversationState
+
+
+@dataclass
+class ChatStateService(AbstractChatStateService):
+    """
+    Serviço responsável pelo estado da conversa de cada chat (nó atual do fluxo,
+    respostas coletadas e última atividade).
+
+    Os estados ficam em memória, no ChatStateStore do processo: depois da
+    primeira leitura de um chat, ler e alterar seu estado não acessa o banco. As
+    alterações são gravadas na tabela ChatState em lote (escrita atrasada),
+    quando `CHAT_STATE_FLUSH_BATCH_SIZE` estados mudaram ou a cada
+    `CHAT_STATE_FLUSH_INTERVAL` segundos, e ao encerrar o processo. Chats sem
+    atividade por `CHAT_STATE_IDLE_TTL` segundos, ou além dos
+    `CHAT_STATE_CACHE_SIZE` mais recentes, saem da memória.
+
+    O cache é de cada processo: com vários workers, um worker que já tem o chat
+    em memória não vê as transições feitas por outro até o chat sair do cache.
+    """
+
+    chat_state_repository = ChatStateRepository()
+    _store: ClassVar[Optional[ChatStateStore]] = None
+    _last_flush: ClassVar[float] = 0.0
+
+    @property
+    def store(self) -> ChatStateStore:
+        if ChatStateService._store is None:
+            ChatStateService._store = ChatStateStore(settings.CHAT_STATE_CACHE_SIZE, settings.CHAT_STATE_IDLE_TTL)
+            ChatStateService._last_flush = time.monotonic()
+        return ChatStateService._store
+
+    def get(self, chat: Chat) -> ConversationState:
+        """
+        Recupera o estado da conversa de um chat; só a primeira leitura de cada
+        chat no processo consulta o banco.
+
+        Args:
+            chat (Chat): O chat.
+
+        Returns:
+            ConversationState: O estado; um chat sem estado começa no nó `start`.
+        """
+        state = self.store.get(chat.pk)
+        if state is None:
+            row = self.chat_state_repository.get_by_chat_id(chat.pk)
+            if row is None:
+                state = ConversationState(chat.pk)
+            else:
+                state = ConversationState(chat.pk, row.node, dict(row.slots), row.last_activity_at.timestamp())
+            self.store.put(state)
+        self._flush_if_due()
+        return state
+
+    def transition(self, state: ConversationState, node: str, **slots) -> ConversationState:
+        """
+        Move a conversa para outro nó, guardando as respostas informadas. A
+        gravação no banco fica para o próximo lote.
+
+        Args:
+            state (ConversationState): O estado do chat.
+            node (str): O novo nó.
+            **slots: Respostas a guardar no estado.
+
+        Returns:
+            ConversationState: O estado atualizado.
+        """
+        state.node = node
+        state.slots.update(slots)
+        state.last_activity = time.time()
+        self.store.put(state, dirty=True)
+        self._flush_if_due()
+        return state
+
+    def flush(self) -> int:
+        """
+        Grava no banco os estados alterados desde a última gravação, com um único upsert.
+        Se a gravação falhar, os estados voltam a ficar pendentes para o próximo lote.
+
+        Returns:
+            int: O número de estados gravados.
+        """
+        ChatStateService._last_flush = time.monotonic()
+        states = self.store.take_dirty()
+        if not states:
+            return 0
+        try:
+            self.chat_state_repository.save_many([
+                ChatState(
+                    chat_id_id=state.chat_id,
+                    node=state.node,
+                    slots=dict(state.slots),
+                    last_activity_at=datetime.fromtimestamp(state.last_activity, tz=timezone.utc),
+                )
+                for state in states
+            ])
+        except Exception:
+            self.store.requeue(states)
+            raise
+        return len(states)
+
+    def _flush_if_due(self) -> None:
+        if self.store.dirty_count >= settings.CHAT_STATE_FLUSH_BATCH_SIZE or (
+            self.store.dirty_count and time.monotonic() - self._last_flush >= settings.CHAT_STATE_FLUSH_INTERVAL
+        ):
+            self.flush()
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
+
+from chat.models import Bot, Chat
+from chat.serializers.discord_input_serializer import DiscordInputSerializer
+from chat.serializers.telegram_input_serializer import TelegramInputSerializer
+from chat.services.abstract_inbound_update_service import \
+    AbstractInboundUpdateService
+from chat.services.channel_service import ChannelService
+from contact.services.contact_service import ContactService
+from message.models import Message
+from message.serializers.message_create_serializer import \
+    MessageCreateSerializer
+from message.services.attachment_service import AttachmentService
+from message.services.message_service import MessageService
+
+
+@dataclass
+class InboundUpdateService(AbstractInboundUpdateService):
+    """
+    Serviço responsável por persistir as atualizações recebidas pelo webhook.
+
+    Cada atualização é gravada em uma única transação e com o mínimo de comandos:
+    o contato é lido (e criado só se não existir), o chat aberto é lido e tocado
+    (ou reaberto/criado) e a mensagem é inserida uma única vez.
+
+    Entregas repetidas são descartadas pelo índice único (chat, id da mensagem no
+    provedor), inclusive quando chegam ao mesmo tempo, e edições atualizam a mensagem original no lugar, guardando o
+    conteúdo anterior no histórico, sem criar chats, contatos ou mensagens.
+
+    Arquivos enviados com a mensagem (fotos, documentos, áudios) só são
+    registrados aqui, com um único INSERT; o download é feito depois por
+    `python manage.py fetch_attachments`, fora do tempo de resposta do webhook.
+    """
+
+    channel_service = ChannelService()
+    contact_service = ContactService()
+    message_service = MessageService()
+    attachment_service = AttachmentService()
+
+    def persist_telegram_update(self, data: dict, bot: Optional[Bot] = None) -> tuple[Chat, Optional[Message]]:
+        """
+        Persiste uma atualização do Telegram (`message`, `edited_message` ou `callback_query`).
+
+        Args:
+            data (dict): A atualização do Telegram já decodificada.
+            bot (Bot, optional): O bot que recebeu a atualização; None para o bot padrão.
+
+        Returns:
+            tuple[Chat, Optional[Message]]: O chat da atualização e a mensagem gravada,
+            ou None para `callback_query`, edições e entregas repetidas.
+        """
+        if 'edited_message' in data:
+            edited = data['edited_message']
+            return self.persist_edit(
+                str(edited['chat']['id']), str(edited['message_id']), edited.get('text', edited.get('caption', '')),
+                datetime.fromtimestamp(edited['edit_date'], tz=timezone.utc), bot,
+            )
+        message_data = data.get('message') or data['callback_query']['message']
+        with transaction.atomic():
+            contact = self.contact_service.get_or_create_by_name(message_data['chat']['first_name'], bot)
+            serializer = TelegramInputSerializer(data=data, context={"contact": contact, "bot": bot})
+            serializer.is_valid(raise_exception=True)
+            chat = self.channel_service.create(serializer.validated_data)
+            if 'message' not in data:
+                return chat, None
+            if self.message_service.get_by_provider_id(chat, str(data['message']['message_id'])):
+                return chat, None
+            message_serializer = MessageCreateSerializer(data={**data, 'chat_id': chat}, context={"sender": contact})
+            message_serializer.is_valid(raise_exception=True)
+            message = self.create_message(chat, message_serializer.validated_data)
+            if message is not None:
+                self.attachment_service.add_from_telegram(message, data['message'])
+        return chat, message
+
+    def persist_discord_message(self, data: dict, bot: Optional[Bot] = None) -> tuple[Chat, Optional[Message]]:
+        """
+        Persiste um evento `MESSAGE_CREATE` do Discord.
+
+        Args:
+            data (dict): O evento do Discord já decodificado.
+            bot (Bot, optional): O bot que recebeu o evento; None para o bot padrão.
+
+        Returns:
+            tuple[Chat, Optional[Message]]: O chat do canal e a mensagem gravada,
+            ou None para mensagens sem texto nem arquivos, edições e entregas repetidas.
+        """
+        event = data['d']
+        if data['t'] == 'MESSAGE_UPDATE':
+            if 'content' not in event:
+                return None, None
+            edited_at = parse_datetime(event.get('edited_timestamp') or '') or datetime.now(timezone.utc)
+            return self.persist_edit(str(event['channel_id']), str(event['id']), event['content'], edited_at, bot)
+        author = event['author']
+        with transaction.atomic():
+            contact = self.contact_service.get_or_create_by_name(author.get('global_name') or author['username'], bot)
+            serializer = DiscordInputSerializer(data=event, context={"contact": contact, "bot": bot})
+            serializer.is_valid(raise_exception=True)
+            chat = self.channel_service.create(serializer.validated_data)
+            if not (event.get('content') or event.get('attachments')) \
+                    or self.message_service.get_by_provider_id(chat, str(event['id'])):
+                return chat, None
+            message_data = {
+                'message': {
+                    'message_id': event['id'],
+                    'text': event.get('content'),
+                    'attachments': event.get('attachments'),
+                    'from': {'is_bot': author.get('bot', False)},
+                },
+                'chat_id': chat,
+            }
+            message_serializer = MessageCreateSerializer(data=message_data, context={"sender": contact})
+            message_serializer.is_valid(raise_exception=True)
+            message = self.create_message(chat, message_serializer.validated_data)
+            if message is not None:
+                self.attachment_service.add_from_discord(message, event)
+        return chat, message
+
+    def create_message(self, chat: Chat, data: dict) -> Optional[Message]:
+        """
+        Insere a mensagem de uma atualização em um savepoint. Se uma entrega
+        repetida processada ao mesmo tempo já gravou a mesma mensagem, o índice
+        único a recusa e ela é descartada como as demais repetições.
+
+        Args:
+            chat (Chat): O chat da mensagem.
+            data (dict): Os dados validados da mensagem.
+
+        Returns:
+            Optional[Message]: A mensagem gravada, ou None se ela já existia.
+        """
+        try:
+            with transaction.atomic():
+                return self.message_service.create(data)
+        except IntegrityError:
+            provider_message_id = data.get('provider_message_id')
+            if provider_message_id is None or self.message_service.get_by_provider_id(chat, provider_message_id) is None:
+                raise
+            return None
+
+    def persist_edit(
+        self, chat_id: str, provider_message_id: str, content: str, edited_at: datetime, bot: Optional[Bot] = None
+    ) -> tuple[Optional[Chat], None]:
+        """
+        Aplica a edição de uma mensagem já gravada.
+
+        Edições de mensagens desconhecidas (de chats já fechados ou nunca gravadas)
+        são ignoradas.
+
+        Args:
+            chat_id (str): O id do chat no provedor.
+            provider_message_id (str): O id da mensagem editada no provedor.
+            content (str): O novo conteúdo.
+            edited_at (datetime): Quando a edição foi feita.
+            bot (Bot, optional): O bot que recebeu a edição; None para o bot padrão.
+
+        Returns:
+            tuple[Optional[Chat], None]: O chat aberto da mensagem, se houver.
+        """
+        with transaction.atomic():
+            chat = self.channel_service.get_open_chat(chat_id, bot)
+            if chat is None:
+                return None, None
+            message = self.message_service.get_by_provider_id(chat, provider_message_id)
+            if message is not None:
+                self.message_service.edit(message, content, edited_at)
+        return chat, None
@@ -0,0 +1,81 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from django.conf import settings
+
+from chat.repositories.chat_state_repository import ChatStateRepository
+from chat.services.abstract_intent_service import AbstractIntentService
+from chat.utils.chat_state_store import MENU_SLOTS, START_COMMANDS
+from chat.utils.intent_classifier import IntentClassifier, train_intent_model
+
+INTENT_SEED_PATH = Path(__file__).resolve().parent.parent / 'data' / 'intent_seed.json'
+
+
+@dataclass
+class IntentService(AbstractIntentService):
+    """
+    Serviço responsável por classificar mensagens de texto livre nos mesmos nós
+    do fluxo que os botões do menu (`support_weni`, `product_details`, ...).
+
+    O modelo é treinado offline por `python manage.py train_intents`, a partir
+    dos exemplos de `chat/data/intent_seed.json` e das mensagens de texto livre
+    que levaram cada conversa à sua intenção, e gravado em `INTENT_MODEL_PATH`. Cada
+    processo mapeia o arquivo em memória na primeira classificação; sem modelo,
+    nenhuma mensagem é classificada.
+    """
+
+    chat_state_repository = ChatStateRepository()
+    _classifier: ClassVar[Optional[IntentClassifier]] = None
+    _loaded: ClassVar[bool] = False
+
+    @property
+    def classifier(self) -> Optional[IntentClassifier]:
+        if not IntentService._loaded:
+            path = Path(settings.INTENT_MODEL_PATH)
+            IntentService._classifier = IntentClassifier(path) if path.exists() else None
+            IntentService._loaded = True
+        return IntentService._classifier
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Encontra o nó do fluxo pedido por uma mensagem de texto livre.
+
+        Args:
+            text (str): O texto da mensagem.
+
+        Returns:
+            Optional[str]: O nó, ou None se não houver modelo ou se a probabilidade
+            ficar abaixo de `INTENT_MIN_CONFIDENCE`.
+        """
+        if self.classifier is None:
+            return None
+        node, probability = self.classifier.predict(text)
+        return node if probability >= settings.INTENT_MIN_CONFIDENCE else None
+
+    def train(self, epochs: int = 20) -> dict:
+        """
+        Treina o modelo com os exemplos iniciais e o histórico de mensagens e o
+        grava em `INTENT_MODEL_PATH`. O processo atual passa a usar o novo modelo;
+        os demais workers o carregam ao reiniciar.
+
+        Args:
+            epochs (int): Número de passadas sobre os exemplos.
+
+        Returns:
+            dict: Os rótulos, o número de exemplos e a acurácia de treino.
+        """
+        nodes = {value: node for node, (slot, value) in MENU_SLOTS.items() if slot == 'intent'}
+        with open(INTENT_SEED_PATH, encoding='utf-8') as seed_file:
+            examples = [(text, node) for node, texts in json.load(seed_file).items() for text in texts]
+        examples += [
+            (text, nodes[intent])
+            for text, intent in self.chat_state_repository.get_intent_examples()
+            if intent in nodes and text.strip().lower() not in START_COMMANDS
+        ]
+        result = train_intent_model(examples, settings.INTENT_MODEL_PATH, settings.INTENT_HASH_BUCKETS, epochs)
+        if IntentService._classifier is not None:
+            IntentService._classifier.close()
+        IntentService._classifier, IntentService._loaded = None, False
+        return result
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from chat.repositories.faq_article_repository import FaqArticleRepository
+from chat.services.abstract_knowledge_base_service import AbstractKnowledgeBaseService
+from chat.utils.knowledge_index import KnowledgeIndex, build_knowledge_index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class KnowledgeBaseService(AbstractKnowledgeBaseService):
+    """
+    Serviço responsável por responder perguntas em texto livre com os artigos
+    da base de conhecimento (`FaqArticle`).
+
+    Os artigos ativos ficam em um índice vetorial gravado em `FAQ_INDEX_PATH`,
+    que cada processo mapeia em memória na primeira pergunta. O índice é
+    reconstruído de forma incremental (só os artigos alterados são vetorizados
+    de novo) `FAQ_REBUILD_DELAY` segundos depois que um artigo é salvo ou
+    removido, em segundo plano: as alterações feitas nesse intervalo entram na
+    mesma reconstrução. Os demais workers percebem o novo arquivo em até
+    `FAQ_INDEX_RELOAD_INTERVAL` segundos; o índice substituído é desmapeado na
+    verificação seguinte, quando nenhuma busca ainda o usa.
+    """
+
+    faq_article_repository = FaqArticleRepository()
+    _index: ClassVar[Optional[KnowledgeIndex]] = None
+    _retired: ClassVar[Optional[KnowledgeIndex]] = None
+    _mtime: ClassVar[Optional[int]] = None
+    _checked_at: ClassVar[float] = float('-inf')
+    _rebuild_lock: ClassVar[threading.Lock] = threading.Lock()
+    _scheduled: ClassVar[Optional[threading.Timer]] = None
+    _schedule_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @property
+    def index(self) -> Optional[KnowledgeIndex]:
+        now = time.monotonic()
+        if now - KnowledgeBaseService._checked_at < settings.FAQ_INDEX_RELOAD_INTERVAL:
+            return KnowledgeBaseService._index
+        KnowledgeBaseService._checked_at = now
+        if KnowledgeBaseService._retired is not None:
+            KnowledgeBaseService._retired.close()
+            KnowledgeBaseService._retired = None
+        mtime = self._index_mtime()
+        if mtime != KnowledgeBaseService._mtime:
+            path = Path(settings.FAQ_INDEX_PATH)
+            KnowledgeBaseService._retired = KnowledgeBaseService._index
+            KnowledgeBaseService._index = KnowledgeIndex(path) if mtime is not None else None
+            KnowledgeBaseService._mtime = mtime
+        return KnowledgeBaseService._index
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[tuple]:
+        """
+        Encontra os artigos que respondem uma pergunta.
+
+        Args:
+            text (str): A pergunta.
+            limit (int, optional): Quantos artigos devolver no máximo; padrão `FAQ_TOP_K`.
+
+        Returns:
+            List[tuple]: Pares (FaqArticle, pontuação), do melhor para o pior, só
+            com pontuação a partir de `FAQ_MIN_SCORE`; vazio se não houver índice.
+        """
+        index = self.index
+        if index is None or not text.strip():
+            return []
+        hits = [
+            (article_id, score) for article_id, score in index.search(text, limit or settings.FAQ_TOP_K)
+            if score >= settings.FAQ_MIN_SCORE
+        ]
+        if not hits:
+            return []
+        articles = self.faq_article_repository.get_by_ids([article_id for article_id, _ in hits])
+        return [(articles[article_id], score) for article_id, score in hits if article_id in articles]
+
+    def rebuild(self, full: bool = False) -> dict:
+        """
+        Reconstrói o índice com os artigos ativos, reaproveitando os vetores dos
+        artigos que não mudaram desde o índice atual. O processo atual passa a
+        usar o novo índice na próxima pergunta.
+
+        Args:
+            full (bool): Vetoriza todos os artigos de novo.
+
+        Returns:
+            dict: O número de artigos indexados, vetorizados e reaproveitados.
+        """
+        with self._rebuild_lock:
+            path = Path(settings.FAQ_INDEX_PATH)
+            previous = None if full or not path.exists() else KnowledgeIndex(path)
+            try:
+                result = build_knowledge_index(
+                    self.faq_article_repository.get_index_rows(), path, settings.FAQ_HASH_BUCKETS, previous
+                )
+            finally:
+                if previous is not None:
+                    previous.close()
+            KnowledgeBaseService._checked_at = float('-inf')
+            return result
+
+    def schedule_rebuild(self) -> None:
+        """
+        Agenda a reconstrução do índice para daqui a `FAQ_REBUILD_DELAY`
+        segundos, numa thread do processo; se já houver uma agendada, a
+        alteração entra nela. Com `FAQ_REBUILD_DELAY` igual a 0, reconstrói na hora.
+        """
+        if settings.FAQ_REBUILD_DELAY <= 0:
+            self.rebuild()
+            return
+        with self._schedule_lock:
+            if KnowledgeBaseService._scheduled is not None:
+                return
+            timer = KnowledgeBaseService._scheduled = threading.Timer(
+                settings.FAQ_REBUILD_DELAY, self._run_scheduled_rebuild
+            )
+            timer.daemon = True
+        timer.start()
+
+    def _run_scheduled_rebuild(self) -> None:
+        # Cleared before the articles are read: a change committed from now on schedules another rebuild.
+        with self._schedule_lock:
+            KnowledgeBaseService._scheduled = None
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Could not rebuild the FAQ index.")
+        finally:
+            connection.close()
+
+    def _index_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(Path(settings.FAQ_INDEX_PATH)).st_mtime_ns
+        except FileNotFoundError:
+            return None
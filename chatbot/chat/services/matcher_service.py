@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from django.conf import settings
+
+from chat.services.abstract_matcher_service import AbstractMatcherService
+from chat.utils.keyword_matcher import RULE_KINDS, KeywordMatcher, MatchResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MatcherService(AbstractMatcherService):
+    """
+    Serviço responsável por encontrar, numa única leitura da mensagem, os
+    comandos, as palavras-chave e os termos de moderação das regras de
+    `MATCHER_RULES_PATH`.
+
+    Todas as regras são compiladas em um autômato Aho-Corasick na primeira
+    mensagem do processo. A data de modificação do arquivo é conferida a cada
+    `MATCHER_RELOAD_INTERVAL` segundos e, se mudou, as regras são compiladas de
+    novo e trocadas de uma vez, sem reiniciar os workers. Se o arquivo não
+    puder ser lido ou não for válido, o erro é registrado no log e as regras
+    anteriores continuam valendo (nenhuma, se ainda não havia regras) até o
+    arquivo mudar de novo.
+    """
+
+    _matcher: ClassVar[Optional[KeywordMatcher]] = None
+    _mtime: ClassVar[Optional[float]] = None
+    _checked_at: ClassVar[float] = 0.0
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        now = time.monotonic()
+        if MatcherService._matcher is None:
+            self._try_reload()
+        elif now - MatcherService._checked_at >= settings.MATCHER_RELOAD_INTERVAL:
+            MatcherService._checked_at = now
+            if self._rules_mtime() != MatcherService._mtime:
+                self._try_reload()
+        return MatcherService._matcher
+
+    def match(self, text: str) -> MatchResult:
+        """
+        Encontra as regras de uma mensagem.
+
+        Args:
+            text (str): O texto da mensagem.
+
+        Returns:
+            MatchResult: Os comandos, palavras-chave e categorias de moderação encontrados.
+        """
+        return self.matcher.match(text)
+
+    def reload(self) -> int:
+        """
+        Compila as regras de `MATCHER_RULES_PATH` e passa a usá-las.
+
+        Returns:
+            int: O número de padrões compilados.
+
+        Raises:
+            OSError: Se o arquivo não puder ser lido.
+            ValueError: Se o arquivo não for um objeto JSON de regras.
+        """
+        mtime = self._rules_mtime()
+        with open(settings.MATCHER_RULES_PATH, encoding='utf-8') as rules_file:
+            rules = json.load(rules_file)
+        if not isinstance(rules, dict) or not all(isinstance(rules.get(kind, {}), dict) for kind in RULE_KINDS):
+            raise ValueError(f"{settings.MATCHER_RULES_PATH} is not a JSON object of rules.")
+        matcher = KeywordMatcher(rules)
+        MatcherService._matcher, MatcherService._mtime = matcher, mtime
+        MatcherService._checked_at = time.monotonic()
+        return matcher.pattern_count
+
+    def _try_reload(self) -> None:
+        try:
+            self.reload()
+        except (OSError, ValueError):
+            logger.exception("Could not load the matcher rules; keeping the previous ones.")
+            if MatcherService._matcher is None:
+                MatcherService._matcher = KeywordMatcher({})
+            # Retried when the file changes again.
+            MatcherService._mtime = self._rules_mtime()
+            MatcherService._checked_at = time.monotonic()
+
+    def _rules_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(Path(settings.MATCHER_RULES_PATH)).st_mtime
+        except FileNotFoundError:
+            return None
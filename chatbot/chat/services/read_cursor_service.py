@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from rest_framework.exceptions import NotFound
+
+from chat.models import Chat, ReadCursor
+from chat.repositories.channel_repository import ChannelRepository
+from chat.repositories.read_cursor_repository import ReadCursorRepository
+from chat.services.abstract_read_cursor_service import AbstractReadCursorService
+
+
+@dataclass
+class ReadCursorService(AbstractReadCursorService):
+    """
+    Serviço responsável pelas caixas de entrada dos atendentes.
+
+    Cada par (chat, atendente) tem um cursor com a última mensagem lida e o
+    número de mensagens do contato recebidas depois dela. O contador é
+    incrementado pelo banco a cada mensagem gravada e zerado na leitura, então
+    abrir a caixa de entrada custa o tamanho da página, e não o histórico.
+    """
+
+    read_cursor_repository = ReadCursorRepository()
+    channel_repository = ChannelRepository()
+
+    def record(self, chat_ids: Iterable[int], created_at: datetime, from_contact: bool) -> None:
+        """
+        Conta uma nova mensagem nos cursores dos chats em que ela foi gravada.
+
+        Args:
+            chat_ids (Iterable[int]): Os chats da mensagem.
+            created_at (datetime): Quando a mensagem foi escrita.
+            from_contact (bool): Se a mensagem foi enviada pelo contato (só estas contam como não lidas).
+        """
+        self.read_cursor_repository.record(chat_ids, created_at, from_contact)
+
+    def follow_assignment(self, chat: Chat, previous_support_agent_id: Optional[int] = None) -> None:
+        """
+        Leva um chat para a caixa de entrada do seu atendente: cria o cursor do
+        atendente, se ainda não existir, e remove o do atendente anterior.
+
+        Args:
+            chat (Chat): O chat.
+            previous_support_agent_id (int, optional): O atendente anterior do chat.
+        """
+        if previous_support_agent_id is not None and previous_support_agent_id != chat.support_agent_id_id:
+            self.read_cursor_repository.drop(chat.id, previous_support_agent_id)
+        self.read_cursor_repository.ensure(chat)
+
+    def mark_read(self, chat_id: int, support_agent_id: int, message_id: Optional[int] = None) -> ReadCursor:
+        """
+        Marca um chat como lido por um atendente até uma mensagem (a última, por padrão).
+
+        Args:
+            chat_id (int): O chat lido.
+            support_agent_id (int): O atendente.
+            message_id (int, optional): A última mensagem lida.
+
+        Returns:
+            ReadCursor: O cursor do atendente, com o contador atualizado.
+
+        Raises:
+            NotFound: Se o chat não existir, se a mensagem não for dele ou se ele não tiver mensagens.
+        """
+        chat = self.channel_repository.get_by_id(chat_id)
+        if chat is None:
+            raise NotFound(detail="There is no chat with this id")
+        cursor = self.read_cursor_repository.mark_read(chat, support_agent_id, message_id)
+        if cursor is None:
+            raise NotFound(detail="There is no such message in this chat")
+        return cursor
+
+    def get_inbox(self, support_agent_id: int, message_count: int, status: str = 'open'):
+        """
+        Recupera os chats de um atendente, do mais recentemente ativo ao menos,
+        com o contador de não lidas, o contato e as últimas `message_count` mensagens.
+
+        Args:
+            support_agent_id (int): O atendente.
+            message_count (int): Quantas mensagens carregar por chat.
+            status (str): 'open' (padrão), 'closed' ou 'all'.
+
+        Returns:
+            QuerySet: Os cursores, a serem paginados.
+        """
+        return self.read_cursor_repository.get_inbox(support_agent_id, message_count, status)
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from chat.models import Bot, Chat, FaqArticle
+from chat.services.bot_registry_service import BotRegistryService
+from chat.services.knowledge_base_service import KnowledgeBaseService
+from chat.services.read_cursor_service import ReadCursorService
+
+
+@receiver([post_save, post_delete], sender=Bot)
+def invalidate_bot_registry(sender, instance: Bot, **kwargs):
+    """
+    Drops the cached bots of this process when a bot changes; a renamed
+    webhook key must stop resolving to its bot right away.
+    """
+    BotRegistryService().invalidate()
+
+
+@receiver([post_save, post_delete], sender=FaqArticle)
+def rebuild_knowledge_base(sender, instance: FaqArticle, **kwargs):
+    """
+    Schedules a rebuild of the FAQ index once the change is committed; changes
+    made within FAQ_REBUILD_DELAY seconds share one rebuild, and only the
+    changed articles are embedded again. Fixture loads (`raw` saves) are left
+    to `build_faq_index`.
+    """
+    if kwargs.get('raw'):
+        return
+    transaction.on_commit(KnowledgeBaseService().schedule_rebuild)
+
+
+@receiver(pre_save, sender=Chat)
+def remember_support_agent(sender, instance: Chat, update_fields=None, **kwargs):
+    """
+    Keeps the support agent a saved chat had, to move it between inboxes on
+    reassignment. Only saves that can change the agent of an existing chat
+    read it.
+    """
+    instance._previous_support_agent_id = None
+    if kwargs.get('raw') or instance._state.adding or (
+        update_fields is not None and 'support_agent_id' not in update_fields
+    ):
+        return
+    instance._previous_support_agent_id = (
+        Chat.objects.filter(id=instance.id).values_list('support_agent_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Chat)
+def follow_assigned_chat(sender, instance: Chat, **kwargs):
+    """
+    Gives the support agent of a chat its read cursor, so the chat shows up in
+    the agent inbox with its unread messages, and takes it out of the inbox of
+    the previous agent. Chats without agent (every chat created by the
+    webhooks) cost no query.
+    """
+    previous = getattr(instance, '_previous_support_agent_id', None)
+    if kwargs.get('raw') or (instance.support_agent_id_id is None and previous is None):
+        return
+    ReadCursorService().follow_assignment(instance, previous)
@@ -0,0 +1,37 @@
+import pytest
+
+from chat.services.chat_state_service import ChatStateService
+
+
+@pytest.fixture
+def telegram_text():
+    """
+    Builds the Telegram update of a text message sent by the same private chat.
+    """
+
+    def build(text, message_id):
+        user = {"id": 1001, "is_bot": False, "first_name": "Ana", "language_code": "pt-br"}
+        return {
+            "update_id": message_id,
+            "message": {
+                "message_id": message_id,
+                "from": user,
+                "chat": {"id": 1001, "first_name": "Ana", "type": "private"},
+                "date": 1732400000,
+                "text": text,
+            },
+        }
+
+    return build
+
+
+@pytest.fixture
+def chat_state_store(settings):
+    """
+    Starts and ends the test with an empty conversation state cache, written
+    when a batch is full or on an explicit flush only.
+    """
+    settings.CHAT_STATE_FLUSH_INTERVAL = 3600
+    ChatStateService._store = None
+    yield settings
+    ChatStateService._store = None
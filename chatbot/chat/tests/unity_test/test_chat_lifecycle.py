@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from chat.models import ArchivedChat, Chat
+from chat.services.channel_service import ChannelService
+from chat.services.chat_lifecycle_service import ChatLifecycleService
+from message.models import ArchivedMessage, Message
+from message.repositories.message_repository import MessageRepository
+from message.services.message_retention_service import MessageRetentionService
+
+
+@pytest.fixture
+def lifecycle_settings(settings):
+    settings.CHAT_IDLE_TTL = 60
+    settings.CHAT_REOPEN_WINDOW = 600
+    settings.CHAT_ARCHIVE_AFTER = 3600
+    settings.CHAT_ARCHIVE_BATCH_SIZE = 2
+    return settings
+
+
+def create_chat(chat_id, idle_for=0, closed_for=None):
+    now = timezone.now()
+    return Chat.objects.create(
+        chat=chat_id,
+        service='0',
+        last_activity_at=now - timedelta(seconds=idle_for),
+        closing_time=None if closed_for is None else now - timedelta(seconds=closed_for),
+    )
+
+
+@pytest.mark.django_db
+def test_sweep_closes_only_idle_chats(lifecycle_settings):
+    idle = [create_chat(str(chat_id), idle_for=120) for chat_id in range(5)]
+    active = create_chat('active', idle_for=10)
+
+    result = ChatLifecycleService().sweep()
+
+    assert result['closed'] == 5
+    assert Chat.objects.filter(id__in=[chat.id for chat in idle], closing_time__isnull=True).count() == 0
+    active.refresh_from_db()
+    assert active.closing_time is None
+
+
+@pytest.mark.django_db
+def test_inbound_update_reopens_recently_closed_chat(lifecycle_settings):
+    closed = create_chat('42', idle_for=300, closed_for=120)
+
+    chat = ChannelService().create({'chat': '42', 'service': '0'})
+
+    assert chat.id == closed.id
+    closed.refresh_from_db()
+    assert closed.closing_time is None
+
+
+@pytest.mark.django_db
+def test_inbound_update_starts_new_chat_after_reopen_window(lifecycle_settings):
+    closed = create_chat('42', idle_for=2000, closed_for=1200)
+
+    chat = ChannelService().create({'chat': '42', 'service': '0'})
+
+    assert chat.id != closed.id
+    assert chat.closing_time is None
+
+
+@pytest.mark.django_db
+def test_sweep_archives_closed_chats_with_messages_in_batches(lifecycle_settings):
+    old = [create_chat(str(chat_id), idle_for=8000, closed_for=7200) for chat_id in range(5)]
+    for chat in old:
+        Message.objects.create(chat_id=chat, message_content=f"hello {chat.chat}")
+    recent = create_chat('recent', idle_for=200, closed_for=100)
+
+    result = ChatLifecycleService().sweep()
+
+    assert result['archived'] == 5
+    assert list(Chat.objects.values_list('id', flat=True)) == [recent.id]
+    assert not Message.objects.exists()
+    assert ArchivedChat.objects.count() == 5
+    archived_message = ArchivedMessage.objects.get(chat_id=old[0].id)
+    assert archived_message.message_content == "hello 0"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_archive_moves_partitioned_messages_too(lifecycle_settings, tmp_path):
+    lifecycle_settings.MESSAGE_PARTITION_DIR = tmp_path
+    lifecycle_settings.MESSAGE_HOT_MONTHS = 1
+    lifecycle_settings.MESSAGE_RETENTION_MONTHS = 12
+    now = timezone.now()
+    chat = create_chat('old', idle_for=8000, closed_for=7200)
+    Chat.objects.filter(id=chat.id).update(start_time=now - timedelta(days=100))
+    kept = create_chat('kept', idle_for=8000, closed_for=10)
+    Chat.objects.filter(id=kept.id).update(start_time=now - timedelta(days=100))
+    for days in (95, 90, 0):
+        Message.objects.create(chat_id=chat, message_content=f"{days} days ago", created_at=now - timedelta(days=days))
+    Message.objects.create(chat_id=kept, message_content="kept", created_at=now - timedelta(days=95))
+    MessageRetentionService().rotate()
+    assert Message.objects.count() == 1
+
+    result = ChatLifecycleService().sweep()
+
+    assert result['archived'] == 1
+    assert sorted(ArchivedMessage.objects.values_list('message_content', flat=True)) == [
+        "0 days ago", "90 days ago", "95 days ago"
+    ]
+    remaining = MessageRepository.get_by_range(now - timedelta(days=120), now + timedelta(days=1))
+    assert [message.message_content for message in remaining] == ["kept"]
+
+
+@pytest.mark.django_db
+def test_open_chat_lookup_uses_partial_index():
+    plan = Chat.objects.filter(chat='42', closing_time__isnull=True).explain()
+
+    assert 'chat_open_chat_idx' in plan
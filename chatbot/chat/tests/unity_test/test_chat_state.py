@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
+from chat.models import Chat, ChatState
+from chat.providers.telegram_provider import TelegramProvider
+from chat.repositories.chat_state_repository import ChatStateRepository
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from contact.models import Contact
+
+
+@pytest.fixture
+def telegram_answer(telegram_text):
+    def build(data, message_id):
+        update = telegram_text("Olá!", message_id)
+        message = update.pop("message")
+        update["callback_query"] = {"id": str(message_id), "from": message["from"], "message": message, "data": data}
+        return update
+
+    return build
+
+
+@pytest.fixture(autouse=True)
+def state_settings(chat_state_store):
+    chat_state_store.CHAT_STATE_FLUSH_BATCH_SIZE = 100
+    return chat_state_store
+
+
+@pytest.fixture
+def chats():
+    contact = Contact.objects.create(name="Ana")
+    return [Chat.objects.create(chat=str(1001 + index), service="0", contact_id=contact) for index in range(2)]
+
+
+@pytest.mark.django_db
+def test_hot_reads_and_transitions_skip_the_database(chats):
+    service = ChatStateService()
+    service.get(chats[0])
+
+    with CaptureQueriesContext(connection) as queries:
+        state = service.transition(service.get(chats[0]), "support_weni", intent="support")
+        assert service.get(chats[0]).node == "support_weni"
+
+    assert len(queries) == 0
+    assert not ChatState.objects.exists()
+    assert service.flush() == 1
+    ChatStateService._store = None
+    reloaded = ChatStateService().get(chats[0])
+    assert (reloaded.node, reloaded.slots) == ("support_weni", {"intent": "support"})
+    assert reloaded is not state
+
+
+@pytest.mark.django_db
+def test_states_are_written_in_batches(chats, state_settings):
+    state_settings.CHAT_STATE_FLUSH_BATCH_SIZE = 2
+    service = ChatStateService()
+
+    service.transition(service.get(chats[0]), "welcome")
+    assert not ChatState.objects.exists()
+    service.transition(service.get(chats[1]), "welcome")
+
+    assert ChatState.objects.filter(node="welcome").count() == 2
+
+
+@pytest.mark.django_db
+def test_evicted_states_keep_pending_writes(chats, state_settings):
+    state_settings.CHAT_STATE_CACHE_SIZE = 1
+    service = ChatStateService()
+    service.transition(service.get(chats[0]), "welcome")
+    service.get(chats[1])
+
+    assert len(service.store) == 1
+    with CaptureQueriesContext(connection) as queries:
+        assert service.get(chats[0]).node == "welcome"
+    assert len(queries) == 0
+    assert service.flush() == 1
+
+
+@pytest.mark.django_db
+def test_telegram_menu_follows_the_conversation_state(telegram_text, telegram_answer, monkeypatch):
+    ContentType.objects.get_for_model(Contact)
+    provider = TelegramProvider()
+    welcomes = []
+    monkeypatch.setattr(provider, "handle_start", welcomes.append)
+    monkeypatch.setattr(provider, "handle_query", lambda call: None)
+
+    for update in (
+        telegram_text("oi", 1),
+        telegram_text("restarting is not a command", 2),
+        telegram_answer("support_weni", 3),
+        telegram_text("my invoice is wrong", 4),
+    ):
+        chat, message = InboundUpdateService().persist_telegram_update(update)
+        provider.respond(update, message, chat)
+
+    state = ChatStateService().get(chat)
+    assert len(welcomes) == 1
+    assert state.node == "waiting_agent"
+    assert state.slots == {"intent": "support", "intent_text": None, "problem": "my invoice is wrong"}
+
+
+@pytest.mark.django_db
+def test_a_failed_flush_keeps_the_states_pending(chats, monkeypatch):
+    service = ChatStateService()
+    service.transition(service.get(chats[0]), "welcome")
+
+    def fail(states):
+        raise DatabaseError("database is gone")
+
+    monkeypatch.setattr(service.chat_state_repository, "save_many", fail)
+    with pytest.raises(DatabaseError):
+        service.flush()
+    monkeypatch.undo()
+
+    assert service.store.dirty_count == 1
+    assert service.flush() == 1
+    assert ChatState.objects.get(chat_id=chats[0]).node == "welcome"
+
+
+@pytest.mark.django_db
+def test_an_older_state_never_overwrites_a_newer_one(chats):
+    newer = datetime(2024, 11, 24, 12, 0, tzinfo=timezone.utc)
+    ChatState.objects.create(chat_id=chats[0], node="waiting_agent", slots={"intent": "support"}, last_activity_at=newer)
+
+    ChatStateRepository.save_many([
+        ChatState(chat_id_id=chats[0].id, node="welcome", slots={}, last_activity_at=newer - timedelta(seconds=1)),
+        ChatState(chat_id_id=chats[1].id, node="welcome", slots={}, last_activity_at=newer),
+    ])
+    assert ChatState.objects.get(chat_id=chats[0]).node == "waiting_agent"
+    assert ChatState.objects.get(chat_id=chats[1]).node == "welcome"
+
+    ChatStateRepository.save_many([
+        ChatState(chat_id_id=chats[0].id, node="welcome", slots={"intent": "other"}, last_activity_at=newer + timedelta(seconds=1)),
+    ])
+    state = ChatState.objects.get(chat_id=chats[0])
+    assert (state.node, state.slots, state.last_activity_at) == ("welcome", {"intent": "other"}, newer + timedelta(seconds=1))
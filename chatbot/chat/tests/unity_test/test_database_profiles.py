@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from config.databases import SQLITE_PRODUCTION_OPTIONS, build_databases
+
+BASE_DIR = Path('/srv/chatbot')
+
+
+@pytest.fixture
+def environment(monkeypatch):
+    for name in (
+        'DATABASE_ENGINE', 'DATABASE_NAME', 'DATABASE_POOL', 'DATABASE_REPLICA_NAMES',
+        'POSTGRES_HOST', 'DATABASE_CONN_MAX_AGE', 'DATABASE_POOL_MIN_SIZE', 'DATABASE_POOL_MAX_SIZE',
+        'DATABASE_POOL_TIMEOUT',
+    ):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_sqlite_without_replicas_is_only_the_primary(environment):
+    databases, replicas = build_databases(BASE_DIR, production=False)
+
+    assert replicas == []
+    assert databases == {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'},
+    }
+
+
+def test_sqlite_production_uses_wal_and_immediate_transactions_on_every_alias(environment):
+    environment.setenv('DATABASE_NAME', 'primary.sqlite3')
+    environment.setenv('DATABASE_REPLICA_NAMES', 'replica_a.sqlite3, ,replica_b.sqlite3')
+
+    databases, replicas = build_databases(BASE_DIR, production=True)
+
+    assert replicas == ['replica_0', 'replica_1']
+    assert [databases[alias]['NAME'] for alias in ('default', *replicas)] == [
+        BASE_DIR / 'primary.sqlite3', BASE_DIR / 'replica_a.sqlite3', BASE_DIR / 'replica_b.sqlite3',
+    ]
+    for database in databases.values():
+        assert database['OPTIONS'] == SQLITE_PRODUCTION_OPTIONS
+        assert 'PRAGMA journal_mode=WAL' in database['OPTIONS']['init_command']
+        assert database['OPTIONS']['transaction_mode'] == 'IMMEDIATE'
+    assert databases['replica_0']['OPTIONS'] is not databases['default']['OPTIONS']
+    assert 'TEST' not in databases['default']
+    assert databases['replica_1']['TEST'] == {'MIRROR': 'default'}
+
+
+def test_postgres_replicas_are_hosts_of_the_same_database(environment):
+    environment.setenv('DATABASE_ENGINE', 'postgres')
+    environment.setenv('POSTGRES_HOST', 'primary.internal')
+    environment.setenv('DATABASE_REPLICA_NAMES', 'replica.internal')
+    environment.setenv('DATABASE_CONN_MAX_AGE', '60')
+
+    databases, replicas = build_databases(BASE_DIR, production=True)
+
+    assert replicas == ['replica_0']
+    assert databases['default']['ENGINE'] == 'django.db.backends.postgresql'
+    assert databases['default']['HOST'] == 'primary.internal'
+    assert databases['replica_0']['HOST'] == 'replica.internal'
+    assert databases['replica_0']['NAME'] == databases['default']['NAME']
+    assert databases['replica_0']['TEST'] == {'MIRROR': 'default'}
+    for database in databases.values():
+        assert database['CONN_MAX_AGE'] == 60
+        assert database['CONN_HEALTH_CHECKS'] is True
+        assert 'OPTIONS' not in database
+
+
+def test_postgres_pool_disables_persistent_connections(environment):
+    environment.setenv('DATABASE_ENGINE', 'postgres')
+    environment.setenv('DATABASE_POOL', '1')
+
+    databases, replicas = build_databases(BASE_DIR, production=False)
+
+    assert replicas == []
+    assert list(databases) == ['default']
+    assert databases['default']['HOST'] == 'localhost'
+    assert databases['default']['CONN_MAX_AGE'] == 0
+    assert databases['default']['OPTIONS']['pool'] == {'min_size': 2, 'max_size': 10, 'timeout': 10}
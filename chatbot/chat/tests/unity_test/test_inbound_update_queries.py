@@ -0,0 +1,181 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from chat.models import Chat
+from chat.services.inbound_update_service import InboundUpdateService
+from message.services.message_service import MessageService
+from contact.models import Contact
+from message.models import Message, MessageEdit
+
+
+def telegram_message(text="hello"):
+    user = {"id": 1001, "is_bot": False, "first_name": "Ana", "language_code": "pt-br"}
+    return {
+        "update_id": 1,
+        "message": {
+            "message_id": 10,
+            "from": user,
+            "chat": {"id": 1001, "first_name": "Ana", "type": "private"},
+            "date": 1732400000,
+            "text": text,
+        },
+    }
+
+
+def telegram_edit(text="hello, edited", message_id=10):
+    update = telegram_message(text)
+    update["update_id"] = 3
+    update["message"]["message_id"] = message_id
+    update["message"]["edit_date"] = 1732400100
+    update["edited_message"] = update.pop("message")
+    return update
+
+
+def telegram_callback(data="use_weni"):
+    user = {"id": 1001, "is_bot": False, "first_name": "Ana", "language_code": "pt-br"}
+    bot = {"id": 2002, "is_bot": True, "first_name": "WeniBot", "language_code": "pt-br"}
+    return {
+        "update_id": 2,
+        "callback_query": {
+            "id": "1",
+            "from": user,
+            "message": {
+                "message_id": 11,
+                "from": bot,
+                "chat": {"id": 1001, "first_name": "Ana", "type": "private"},
+                "date": 1732400001,
+                "text": "Olá!",
+            },
+            "data": data,
+        },
+    }
+
+
+def statements(queries):
+    """
+    Returns the SQL of the captured queries, asserting they ran in one transaction.
+    """
+    sql = [query['sql'] for query in queries]
+    assert sql[0] == 'BEGIN' and sql[-1] == 'COMMIT'
+    assert 'BEGIN' not in sql[1:-1]
+    return sql[1:-1]
+
+
+@pytest.fixture
+def known_contact():
+    ContentType.objects.get_for_model(Contact)
+    contact = Contact.objects.create(name="Ana")
+    Chat.objects.create(chat="1001", service="0", contact_id=contact)
+    return contact
+
+
+@pytest.mark.django_db(transaction=True)
+def test_first_message_from_new_contact_query_budget():
+    ContentType.objects.get_for_model(Contact)
+
+    with CaptureQueriesContext(connection) as queries:
+        chat, message = InboundUpdateService().persist_telegram_update(telegram_message())
+
+    # contact select + insert, open chat select, recently closed chat select,
+    # chat insert, duplicate delivery select, savepoint, message insert, read
+    # cursors update, savepoint release
+    assert len(statements(queries)) == 10
+    assert message.chat_id == chat
+    assert message.sender == chat.contact_id
+
+
+@pytest.mark.django_db(transaction=True)
+def test_message_on_open_chat_query_budget(known_contact):
+    with CaptureQueriesContext(connection) as queries:
+        InboundUpdateService().persist_telegram_update(telegram_message())
+
+    # contact select, open chat select, last_activity_at update, duplicate
+    # delivery select, savepoint, message insert, read cursors update, release
+    sql = statements(queries)
+    assert len(sql) == 8
+    assert sql[2].startswith('UPDATE "chat_chat" SET "last_activity_at"')
+    assert sql[6].startswith('UPDATE "chat_readcursor" SET "last_activity_at"')
+    assert Message.objects.get().sender == known_contact
+
+
+@pytest.mark.django_db(transaction=True)
+def test_callback_query_query_budget(known_contact):
+    with CaptureQueriesContext(connection) as queries:
+        chat, message = InboundUpdateService().persist_telegram_update(telegram_callback())
+
+    # contact select, open chat select, last_activity_at update
+    assert len(statements(queries)) == 3
+    assert message is None
+    assert chat.chat == "1001"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_update_is_rolled_back_as_a_whole(known_contact):
+    update = telegram_message(text="")
+
+    with pytest.raises(Exception):
+        InboundUpdateService().persist_telegram_update(update)
+
+    assert not Message.objects.exists()
+    assert Contact.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_duplicate_delivery_is_dropped(known_contact):
+    InboundUpdateService().persist_telegram_update(telegram_message())
+
+    with CaptureQueriesContext(connection) as queries:
+        _, message = InboundUpdateService().persist_telegram_update(telegram_message())
+
+    # contact select, open chat select, last_activity_at update, duplicate delivery select
+    assert len(statements(queries)) == 4
+    assert message is None
+    assert Message.objects.get().provider_message_id == "10"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_duplicate_delivery_is_dropped(known_contact, monkeypatch):
+    InboundUpdateService().persist_telegram_update(telegram_message())
+    get_by_provider_id, checks = MessageService.get_by_provider_id, []
+
+    def racing_get_by_provider_id(self, chat, provider_message_id):
+        # The retry looks for the message before the first delivery commits it.
+        checks.append(provider_message_id)
+        return None if len(checks) == 1 else get_by_provider_id(self, chat, provider_message_id)
+
+    monkeypatch.setattr(MessageService, "get_by_provider_id", racing_get_by_provider_id)
+
+    chat, message = InboundUpdateService().persist_telegram_update(telegram_message())
+
+    assert message is None and chat.chat == "1001"
+    assert checks == ["10", "10"]
+    assert Message.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_edit_updates_message_in_place(known_contact):
+    InboundUpdateService().persist_telegram_update(telegram_message())
+
+    with CaptureQueriesContext(connection) as queries:
+        InboundUpdateService().persist_telegram_update(telegram_edit())
+
+    # open chat select, message select, history insert, message update, listing version bump
+    sql = statements(queries)
+    assert len(sql) == 5
+    assert sql[3].startswith('UPDATE "message_message" SET "message_content" = \'hello, edited\', "edited_at"')
+    message = Message.objects.get()
+    assert message.message_content == "hello, edited"
+    assert message.edited_at is not None
+    assert list(MessageEdit.objects.values_list("previous_content", flat=True)) == ["hello"]
+
+
+@pytest.mark.django_db
+def test_edit_of_unknown_message_creates_nothing(known_contact):
+    InboundUpdateService().persist_telegram_update(telegram_edit(message_id=99))
+    InboundUpdateService().persist_telegram_update(telegram_edit())
+
+    assert not Message.objects.exists()
+    assert not MessageEdit.objects.exists()
+    assert Chat.objects.count() == 1
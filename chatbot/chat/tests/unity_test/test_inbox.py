@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from chat.models import Chat
+from contact.models import Contact
+from message.models import Message
+from supportAgent.models import SupportAgent
+
+START = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def create_chats(count: int, messages: int = 4, agent: SupportAgent = None) -> list:
+    chats, first = [], Chat.objects.count()
+    for index in range(first, first + count):
+        contact = Contact.objects.create(name=f"Contato {index}", email=f"c{index}@example.com")
+        chat = Chat.objects.create(
+            chat=str(1000 + index), service="0", contact_id=contact, support_agent_id=agent,
+            last_activity_at=START + timedelta(hours=index),
+        )
+        for number in range(messages):
+            Message.objects.create(
+                chat_id=chat, sender_type=1, message_content=f"{index}-{number}",
+                created_at=START + timedelta(hours=index, minutes=number),
+            )
+        chats.append(chat)
+    return chats
+
+
+@pytest.fixture
+def agent():
+    return SupportAgent.objects.create(first_name="Bia", last_name="Lima", password="secret")
+
+
+@pytest.mark.django_db
+def test_inbox_returns_chats_by_activity_with_their_last_messages(agent):
+    chats = create_chats(3, agent=agent)
+    response = APIClient().get("/channel/inbox/", {"messages": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3 and body["current_page"] == 1 and not body["next"]
+    assert [chat["id"] for chat in body["results"]] == [chat.id for chat in reversed(chats)]
+    newest = body["results"][0]
+    assert newest["contact"]["name"] == "Contato 2"
+    assert newest["support_agent"] == {"id": agent.id, "first_name": "Bia", "last_name": "Lima"}
+    assert [message["message_content"] for message in newest["messages"]] == ["2-3", "2-2"]
+
+
+@pytest.mark.django_db
+def test_inbox_query_count_does_not_grow_with_the_page(agent):
+    create_chats(2, agent=agent)
+    client = APIClient()
+    with CaptureQueriesContext(connection) as small:
+        client.get("/channel/inbox/")
+    create_chats(8, agent=agent)
+    with CaptureQueriesContext(connection) as large:
+        response = client.get("/channel/inbox/")
+
+    assert len(response.json()["results"]) == 10
+    assert len(large) == len(small) == 3
+
+
+@pytest.mark.django_db
+def test_inbox_filters_and_validates(agent):
+    open_chat, closed_chat, other_chat = create_chats(3, messages=1)
+    closed_chat.closing_time = START
+    closed_chat.save()
+    open_chat.support_agent_id = agent
+    open_chat.save()
+    client = APIClient()
+
+    assert [chat["id"] for chat in client.get("/channel/inbox/").json()["results"]] == [other_chat.id, open_chat.id]
+    assert [chat["id"] for chat in client.get("/channel/inbox/", {"status": "closed"}).json()["results"]] == [closed_chat.id]
+    assert client.get("/channel/inbox/", {"status": "all"}).json()["count"] == 3
+    assert [chat["id"] for chat in client.get("/channel/inbox/", {"support_agent": agent.id}).json()["results"]] == [open_chat.id]
+    assert client.get("/channel/inbox/", {"page_size": 1, "page": 2}).json()["results"][0]["id"] == open_chat.id
+    assert client.get("/channel/inbox/", {"page": 9}).status_code == 404
+    assert client.get("/channel/inbox/", {"messages": 10_000}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_conversation_returns_one_chat_in_two_queries(agent):
+    chat, = create_chats(1, messages=30, agent=agent)
+    client = APIClient()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/channel/{chat.id}/conversation/", {"messages": 5})
+
+    assert response.status_code == 200 and len(queries) == 2
+    assert [message["message_content"] for message in response.json()["messages"]] == [
+        f"0-{number}" for number in range(29, 24, -1)
+    ]
+    assert len(client.get(f"/channel/{chat.id}/conversation/").json()["messages"]) == 20
+    assert client.get(f"/channel/{chat.id + 1}/conversation/").status_code == 404
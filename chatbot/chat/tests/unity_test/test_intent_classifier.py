@@ -0,0 +1,68 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from chat.models import Chat, ChatState
+from chat.providers.telegram_provider import TelegramProvider
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.services.intent_service import IntentService
+from contact.models import Contact
+from message.models import Message
+
+
+@pytest.fixture
+def trained_service(chat_state_store, settings, tmp_path):
+    settings.INTENT_MODEL_PATH = tmp_path / "intents.bin"
+    settings.INTENT_HASH_BUCKETS = 2 ** 12
+    contact = Contact.objects.create(name="Ana")
+    chat = Chat.objects.create(chat="2002", service="0", contact_id=contact)
+    text = "manda a tabela de valores da licença anual"
+    ChatState.objects.create(chat_id=chat, node="hire_services", slots={"intent": "hire_services", "intent_text": text})
+    Message.objects.create(chat_id=chat, message_content="bom dia")
+    Message.objects.create(chat_id=chat, message_content=text)
+    # Intent chosen with a button: none of the texts of the chat is an example.
+    other = Chat.objects.create(chat="2003", service="0", contact_id=contact)
+    ChatState.objects.create(chat_id=other, node="support_weni", slots={"intent": "support", "intent_text": None})
+    Message.objects.create(chat_id=other, message_content="bom dia")
+    service = IntentService()
+    result = service.train(epochs=30)
+    yield service, result
+    IntentService._classifier, IntentService._loaded = None, False
+
+
+@pytest.mark.django_db
+def test_trains_from_seed_and_history_and_classifies(trained_service):
+    service, result = trained_service
+
+    assert result["examples"] == 33
+    assert service.classify("deu erro no login, preciso de suporte") == "support_weni"
+    assert service.classify("me passa a tabela de valores da licença") == "hire_services"
+    assert service.classify("xyzzy") is None
+
+
+@pytest.mark.django_db
+def test_model_is_memory_mapped_and_loaded_once(trained_service):
+    service, _ = trained_service
+    classifier = service.classifier
+
+    assert IntentService().classifier is classifier
+    assert classifier._weights.obj is classifier._mmap
+
+
+@pytest.mark.django_db
+def test_free_text_is_routed_to_the_menu_node(trained_service, telegram_text, monkeypatch):
+    ContentType.objects.get_for_model(Contact)
+    provider = TelegramProvider()
+    answers = []
+    monkeypatch.setattr(provider, "handle_start", lambda message: None)
+    monkeypatch.setattr(provider, "handle_intent", lambda chat_id, node: answers.append((chat_id, node)))
+
+    for update in (telegram_text("oi", 1), telegram_text("quero falar com um especialista", 2)):
+        chat, message = InboundUpdateService().persist_telegram_update(update)
+        provider.respond(update, message, chat)
+
+    state = ChatStateService().get(chat)
+    assert answers == [(1001, "talk_specialist")]
+    assert (state.node, state.slots) == (
+        "talk_specialist", {"intent": "talk_specialist", "intent_text": "quero falar com um especialista"}
+    )
@@ -0,0 +1,73 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+
+from chat.utils.bot_validator import BotValidator
+from config import json_codec
+
+TELEGRAM_UPDATE = (
+    '{"update_id":1,"message":{"message_id":7,"from":{"id":42,"is_bot":false,"first_name":"Ana",'
+    '"language_code":"pt-br"},"chat":{"id":42,"first_name":"Ana","type":"private"},"date":1767225600,'
+    '"text":"Olá, \\u00e9 aqui o suporte? 🙂"}}'
+).encode()
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, settings):
+    settings.JSON_CODEC = request.param
+    return request.param
+
+
+def test_codecs_decode_and_encode_alike(codec):
+    update = json_codec.loads(TELEGRAM_UPDATE)
+
+    assert update["message"]["text"] == "Olá, é aqui o suporte? 🙂"
+    assert BotValidator.decode_telegram(TELEGRAM_UPDATE) == update
+    assert json_codec.dumps({1: "é", "big": 2 ** 70}) == '{"1":"é","big":1180591620717411303424}'.encode()
+    for body in (b'{"update_id": ', b'\xff\xfe', b""):
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.loads(body)
+    assert BotValidator.decode_telegram(b"\xff") is None
+    with pytest.raises(ParseError):
+        json_codec.JSONParser().parse(io.BytesIO(b"[1,"), parser_context={})
+
+
+def test_codecs_accept_the_same_numbers(codec):
+    big = 123456789012345678901234567890
+
+    assert json_codec.loads(f'{{"id":{big},"low":{-2 ** 63 - 1},"x":1e16}}') == {
+        "id": big, "low": -2 ** 63 - 1, "x": 1e16,
+    }
+    assert json_codec.loads(b'{"snowflake":"12000000000000000001","id":1200000000000000001}') == {
+        "snowflake": "12000000000000000001", "id": 1200000000000000001,
+    }
+    values = json_codec.loads(b"[NaN, 1e400, -Infinity]")
+    assert values[0] != values[0] and values[1:] == [float("inf"), float("-inf")]
+    assert json_codec.loads(b'"\\ud800"') == "\ud800"
+
+def test_renderer_matches_drf_renderer(codec):
+    data = {
+        "results": [
+            {"id": index, "created_at": datetime(2026, 3, 1, 12, 0, index, 500, tzinfo=timezone.utc),
+             "price": Decimal("9.90"), "message_content": "linha nova \"aspas\" ✓", "cpf": None}
+            for index in range(3)
+        ],
+        "count": 3,
+    }
+
+    assert json_codec.JSONRenderer().render(data) == renderers.JSONRenderer().render(data)
+    assert json_codec.JSONRenderer().render(
+        data, "application/json; indent=2"
+    ) == renderers.JSONRenderer().render(data, "application/json; indent=2")
+
+
+def test_unknown_codec_is_rejected(settings):
+    settings.JSON_CODEC = "simplejson"
+
+    with pytest.raises(ImproperlyConfigured):
+        json_codec.loads(b"{}")
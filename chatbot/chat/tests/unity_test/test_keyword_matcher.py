@@ -0,0 +1,115 @@
+import json
+import os
+import random
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from chat.providers.telegram_provider import TelegramProvider
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.services.matcher_service import MatcherService
+from chat.utils.keyword_matcher import RULE_KINDS, KeywordMatcher, naive_match
+from contact.models import Contact
+
+RULES = {
+    "commands": {"start": ["/start", "start"], "support_weni": ["/suporte"]},
+    "keywords": {"hire_services": ["preço", "quanto custa"], "support_weni": ["erro", "não funciona"]},
+    "moderation": {"spam": ["ganhe dinheiro", "renda extra"]},
+}
+
+
+@pytest.fixture
+def matcher_settings(chat_state_store, settings, tmp_path):
+    settings.MATCHER_RULES_PATH = tmp_path / "rules.json"
+    settings.MATCHER_RULES_PATH.write_text(json.dumps(RULES), encoding="utf-8")
+    settings.MATCHER_RELOAD_INTERVAL = 0
+    MatcherService._matcher = None
+    yield settings
+    MatcherService._matcher = None
+
+
+def test_matches_whole_words_of_folded_text():
+    matcher = KeywordMatcher(RULES)
+
+    result = matcher.match("Qual o PRECO? Deu erro, não funciona. Ganhe dinheiro: /start")
+
+    assert result.commands == ["start"]
+    assert result.keywords == ["hire_services", "support_weni"]
+    assert result.moderation == ["spam"]
+    assert not matcher.match("terror no restart, startup precoce")
+    assert matcher.pattern_count == 9
+
+
+def test_agrees_with_naive_loops():
+    rng = random.Random(7)
+    words = ["ab", "abc", "bca", "cab", "a", "b", "c", "abab"]
+    rules = {
+        kind: {f"{kind}_{index}": [" ".join(rng.choices(words, k=rng.randint(1, 2)))] for index in range(20)}
+        for kind in RULE_KINDS
+    }
+    matcher = KeywordMatcher(rules)
+
+    for _ in range(300):
+        text = " ".join(rng.choices(words + ["x", "-", "/"], k=rng.randint(0, 12)))
+        found, expected = matcher.match(text), naive_match(rules, text)
+        for kind in RULE_KINDS:
+            assert sorted(getattr(found, kind)) == sorted(getattr(expected, kind)), text
+
+
+def test_rules_are_reloaded_when_the_file_changes(matcher_settings):
+    service = MatcherService()
+    assert service.match("quanto custa?").keywords == ["hire_services"]
+
+    rules = {**RULES, "keywords": {"product_details": ["quanto custa"]}}
+    matcher_settings.MATCHER_RULES_PATH.write_text(json.dumps(rules), encoding="utf-8")
+    mtime = os.stat(matcher_settings.MATCHER_RULES_PATH).st_mtime + 1
+    os.utime(matcher_settings.MATCHER_RULES_PATH, (mtime, mtime))
+
+    assert service.match("quanto custa?").keywords == ["product_details"]
+
+
+
+def test_a_broken_rules_file_keeps_the_previous_rules(matcher_settings, caplog):
+    service = MatcherService()
+    assert service.match("quanto custa?").keywords == ["hire_services"]
+
+    for content in ("{not json", "[]"):
+        matcher_settings.MATCHER_RULES_PATH.write_text(content, encoding="utf-8")
+        mtime = os.stat(matcher_settings.MATCHER_RULES_PATH).st_mtime + 1
+        os.utime(matcher_settings.MATCHER_RULES_PATH, (mtime, mtime))
+        assert service.match("quanto custa?").keywords == ["hire_services"]
+    assert "Could not load the matcher rules" in caplog.text
+
+    MatcherService._matcher = None
+    matcher_settings.MATCHER_RULES_PATH.unlink()
+    assert service.match("quanto custa?").keywords == []
+
+@pytest.mark.django_db
+def test_telegram_routes_commands_keywords_and_moderation(matcher_settings, telegram_text, monkeypatch):
+    ContentType.objects.get_for_model(Contact)
+    provider = TelegramProvider()
+    welcomes, answers = [], []
+    monkeypatch.setattr(provider, "handle_start", welcomes.append)
+    monkeypatch.setattr(provider, "handle_intent", lambda chat_id, node: answers.append(node))
+
+    states = []
+    for message_id, text in enumerate(("oi", "qual o preço?", "ganhe dinheiro fácil", "/suporte", "/start"), 1):
+        update = telegram_text(text, message_id)
+        chat, message = InboundUpdateService().persist_telegram_update(update)
+        provider.respond(update, message, chat)
+        state = ChatStateService().get(chat)
+        states.append((state.node, dict(state.slots)))
+
+    assert len(welcomes) == 2
+    assert answers == ["hire_services", "support_weni"]
+    assert states[2] == (
+        "hire_services", {"intent": "hire_services", "intent_text": "qual o preço?", "moderation": "spam"}
+    )
+    assert states[3][0] == "support_weni"
+    assert states[4][0] == "welcome"
+    assert provider.verify_existing_message("renda extra") is False
+    assert provider.verify_commands("/suporte: erro") == {
+        "commands": ["support_weni"], "keywords": ["support_weni"], "moderation": [],
+    }
+    assert provider.verify_commands("bom dia") is None
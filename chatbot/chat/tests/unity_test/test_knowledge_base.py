@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+
+from chat.models import FaqArticle
+from chat.providers.telegram_provider import TelegramProvider
+from chat.services.chat_state_service import ChatStateService
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.services.knowledge_base_service import KnowledgeBaseService
+from chat.utils.knowledge_index import KnowledgeIndex
+from contact.models import Contact
+
+
+@pytest.fixture
+def knowledge_base(chat_state_store, settings, tmp_path):
+    settings.FAQ_INDEX_PATH = tmp_path / "faq.idx"
+    settings.FAQ_HASH_BUCKETS = 2 ** 12
+    settings.FAQ_REBUILD_DELAY = 0
+    KnowledgeBaseService._index, KnowledgeBaseService._retired, KnowledgeBaseService._mtime = None, None, None
+    KnowledgeBaseService._checked_at = float("-inf")
+    call_command("loaddata", "faq_articles", verbosity=0)
+    service = KnowledgeBaseService()
+    yield service, service.rebuild()
+    KnowledgeBaseService._index, KnowledgeBaseService._retired, KnowledgeBaseService._mtime = None, None, None
+
+
+@pytest.mark.django_db
+def test_questions_get_the_closest_articles(knowledge_base):
+    service, result = knowledge_base
+
+    titles = [article.title for article, _ in service.search("o que é o botbilder?")]
+
+    assert result == {"articles": 4, "embedded": 4, "reused": 0}
+    assert titles[0] == "BotBuilder"
+    assert service.search("como integrar com o whatsapp", limit=1)[0][0].title == "Canais & Integrações"
+    assert service.search("quero pedir uma pizza") == []
+    assert isinstance(service.index, KnowledgeIndex)
+
+
+@pytest.mark.django_db
+def test_article_changes_rebuild_the_index_incrementally(knowledge_base, django_capture_on_commit_callbacks):
+    service, _ = knowledge_base
+    article = FaqArticle.objects.get(title="Weni Chats")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FaqArticle.objects.create(
+            title="Planos", question="Quanto custa a Weni?\nQuais são os planos?",
+            answer="Os planos dependem do volume de atendimentos; fale com um especialista.",
+        )
+    assert service.rebuild() == {"articles": 5, "embedded": 0, "reused": 5}
+
+    article.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        article.save()
+
+    assert service.rebuild() == {"articles": 4, "embedded": 0, "reused": 4}
+    assert service.search("quais são os planos?")[0][0].title == "Planos"
+    assert all(found.title != "Weni Chats" for found, _ in service.search("tem atendimento humano?"))
+    assert service.rebuild(full=True)["embedded"] == 4
+
+
+@pytest.mark.django_db
+def test_changes_share_one_background_rebuild(knowledge_base, settings, monkeypatch):
+    service, _ = knowledge_base
+    settings.FAQ_REBUILD_DELAY = 0.05
+    rebuilt = threading.Event()
+    calls = []
+    monkeypatch.setattr(KnowledgeBaseService, "rebuild", lambda self: calls.append(1) or rebuilt.set())
+
+    for _ in range(3):
+        service.schedule_rebuild()
+
+    assert rebuilt.wait(2)
+    time.sleep(0.1)
+    assert calls == [1]
+    assert KnowledgeBaseService._scheduled is None
+
+
+@pytest.mark.django_db
+def test_replaced_indexes_are_unmapped(knowledge_base, settings):
+    service, _ = knowledge_base
+    settings.FAQ_INDEX_RELOAD_INTERVAL = 0
+    first = service.index
+
+    FaqArticle.objects.create(title="Planos", question="Quanto custa?", answer="Depende do volume.")
+    service.rebuild()
+    second = service.index
+    assert second is not first and not first._mmap.closed
+    service.search("quanto custa?")
+    assert first._mmap.closed and not second._mmap.closed
+
+
+@pytest.mark.django_db
+def test_telegram_answers_free_text_questions(knowledge_base, telegram_text, monkeypatch):
+    ContentType.objects.get_for_model(Contact)
+    provider = TelegramProvider()
+    answers = []
+    monkeypatch.setattr(provider, "handle_start", lambda message: None)
+    monkeypatch.setattr(provider, "handle_faq", lambda chat_id, articles: answers.append(articles[0][0].title))
+
+    for message_id, text in enumerate(("oi", "o que é o weni chats?"), 1):
+        update = telegram_text(text, message_id)
+        chat, message = InboundUpdateService().persist_telegram_update(update)
+        provider.respond(update, message, chat)
+
+    state = ChatStateService().get(chat)
+    assert answers == ["Weni Chats"]
+    assert state.slots["faq"][0] == FaqArticle.objects.get(title="Weni Chats").id
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from chat.models import Bot, Chat
+from chat.providers.discord_provider import DiscordProvider
+from chat.providers.registry import provider_registry
+from chat.services.bot_registry_service import BotRegistryService
+from contact.models import Contact
+
+
+def discord_event(content: str = "hello") -> dict:
+    return {
+        "t": "MESSAGE_CREATE",
+        "d": {
+            "id": "1300000000000000001",
+            "channel_id": "1200000000000000001",
+            "content": content,
+            "author": {"id": "1100000000000000001", "username": "manu"},
+        },
+    }
+
+
+@pytest.fixture
+def bots(settings):
+    settings.CHAT_PROVIDERS = ["telegram", "discord"]
+    BotRegistryService().invalidate()
+    return (
+        Bot.objects.create(name="Loja A", service="1", token="token-a", webhook_key="loja-a"),
+        Bot.objects.create(name="Loja B", service="1", token="token-b", webhook_key="loja-b"),
+    )
+
+
+@pytest.mark.django_db
+def test_chats_and_contacts_are_scoped_by_bot(bots, monkeypatch):
+    replies = []
+    monkeypatch.setattr(DiscordProvider, "reply", lambda self, chat_id, text: replies.append(self.token))
+    client = APIClient()
+
+    for bot in bots:
+        response = client.post(
+            f"/channel/receive-messages/discord/{bot.webhook_key}/",
+            data=json.dumps(discord_event("start")), content_type="application/json",
+        )
+        assert response.status_code == 200
+
+    assert Chat.objects.filter(chat="1200000000000000001").count() == 2
+    assert set(Chat.objects.values_list("bot_id", flat=True)) == {bot.id for bot in bots}
+    assert Contact.objects.filter(name="manu").count() == 2
+    assert replies == ["token-a", "token-b"]
+    assert provider_registry.get("discord", "token-a") is provider_registry.get("discord", "token-a")
+
+
+@pytest.mark.django_db
+def test_unknown_or_inactive_bot_is_rejected(bots):
+    Bot.objects.filter(pk=bots[1].pk).update(is_active=False)
+    client = APIClient()
+
+    for webhook_key in ("missing", bots[1].webhook_key):
+        response = client.post(
+            f"/channel/receive-messages/discord/{webhook_key}/",
+            data=json.dumps(discord_event()), content_type="application/json",
+        )
+        assert response.status_code == 404
+    assert not Chat.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bot_registry_caches_lookups_until_a_bot_changes(bots, django_assert_num_queries):
+    registry = BotRegistryService()
+
+    with django_assert_num_queries(1):
+        assert registry.get_by_webhook_key("loja-a") == bots[0]
+        assert registry.get_by_webhook_key("loja-a") == bots[0]
+
+    bots[0].webhook_key = "loja-a2"
+    bots[0].save()
+
+    with django_assert_num_queries(1):
+        assert registry.get_by_webhook_key("loja-a") is None
+
+
+@pytest.mark.django_db
+def test_bot_registry_cache_is_bounded_and_skips_unknown_keys(bots, settings):
+    settings.BOT_REGISTRY_CACHE_SIZE = 1
+    registry = BotRegistryService()
+
+    for number in range(50):
+        assert registry.get_by_webhook_key(f"random-{number}") is None
+    assert len(BotRegistryService._cache) == 0
+
+    registry.get_by_webhook_key("loja-a")
+    registry.get_by_webhook_key("loja-b")
+    assert list(BotRegistryService._cache) == ["loja-b"]
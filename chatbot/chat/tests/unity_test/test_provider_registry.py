@@ -0,0 +1,119 @@
+import json
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from django.test import RequestFactory
+from rest_framework.exceptions import ValidationError
+
+from chat.models import Chat
+from chat.providers.discord_provider import DiscordProvider
+from chat.providers.registry import ProviderRegistry
+from message.models import Message
+
+DISCORD_EVENT = {
+    "t": "MESSAGE_CREATE",
+    "d": {
+        "id": "1300000000000000001",
+        "channel_id": "1200000000000000001",
+        "content": "start",
+        "author": {"id": "1100000000000000001", "username": "manu", "global_name": "Manu"},
+    },
+}
+
+
+@pytest.fixture
+def registry():
+    return ProviderRegistry(
+        available={
+            "telegram": {"class": "chat.providers.telegram_provider.TelegramProvider", "header": "X-Telegram-Bot-Api-Secret-Token"},
+            "discord": {"class": "chat.providers.discord_provider.DiscordProvider", "header": "X-Discord-Event"},
+        },
+        enabled=["discord"],
+    )
+
+
+@pytest.fixture
+def discord_api(settings):
+    """
+    Local stub of the Discord REST API that records the messages it receives.
+    """
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            received.append({"path": self.path, "authorization": self.headers["Authorization"], "body": body})
+            payload = json.dumps({"id": "1", **body}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.DISCORD_API_BASE = f"http://127.0.0.1:{server.server_port}"
+    settings.DISCORD_BOT_TOKEN = "stub-token"
+    yield received
+    server.shutdown()
+    server.server_close()
+
+
+def test_detects_provider_by_path_and_header(registry):
+    factory = RequestFactory()
+    by_header = factory.post("/channel/receive-messages/", data=b"{}", content_type="application/json",
+                             headers={"X-Discord-Event": "MESSAGE_CREATE"})
+
+    assert isinstance(registry.detect(factory.post("/"), "discord"), DiscordProvider)
+    assert isinstance(registry.detect(by_header), DiscordProvider)
+    assert registry.get("discord") is registry.get("discord")
+
+
+def test_disabled_providers_are_never_loaded(registry):
+    request = RequestFactory().post("/", data=b"{}", content_type="application/json",
+                                    headers={"X-Telegram-Bot-Api-Secret-Token": "secret"})
+
+    assert registry.detect(request) is None
+    assert registry.get("telegram") is None
+    assert ("telegram", None) not in registry._providers
+
+
+def test_discord_parse_rejects_other_events():
+    with pytest.raises(ValidationError):
+        DiscordProvider().parse(json.dumps({"t": "TYPING_START", "d": {}}).encode())
+
+
+@pytest.mark.django_db
+def test_discord_update_is_stored_and_answered(registry, discord_api):
+    provider = registry.detect(RequestFactory().post("/"), "discord")
+
+    update = provider.parse(json.dumps(DISCORD_EVENT).encode())
+    chat, message = provider.persist(update)
+    provider.respond(update, message)
+
+    assert Chat.objects.get(pk=chat.pk).service == "1"
+    assert chat.chat == DISCORD_EVENT["d"]["channel_id"]
+    assert chat.contact_id.name == "Manu"
+    assert Message.objects.get(pk=message.pk).message_content == "start"
+    assert discord_api[0]["path"] == f"/channels/{DISCORD_EVENT['d']['channel_id']}/messages"
+    assert discord_api[0]["authorization"] == "Bot stub-token"
+    assert discord_api[0]["body"]["content"].startswith("Olá!")
+
+
+def test_startup_does_not_import_provider_sdks():
+    code = (
+        "import os, sys;"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings');"
+        "from config.wsgi import application; import config.urls;"
+        "print(sorted(name for name in ('telebot', 'drf_yasg.views', 'chat.providers.telegram_provider') if name in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
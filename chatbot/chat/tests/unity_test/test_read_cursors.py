@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from chat.models import Chat, ReadCursor
+from contact.models import Contact
+from message.models import Message
+from message.services.message_service import MessageService
+from supportAgent.models import SupportAgent
+
+START = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def agent():
+    return SupportAgent.objects.create(first_name="Bia", last_name="Lima", password="secret")
+
+
+def assigned_chat(agent: SupportAgent, index: int = 0) -> Chat:
+    contact = Contact.objects.create(name=f"Contato {index}", email=f"c{index}@example.com")
+    return Chat.objects.create(
+        chat=str(1000 + index), service="0", contact_id=contact, support_agent_id=agent, last_activity_at=START,
+    )
+
+
+def write(chat: Chat, sender_type: int = 1, minutes: int = 0) -> Message:
+    return MessageService().create({
+        "chat_id": chat, "sender_type": sender_type, "message_content": "oi",
+        "created_at": START + timedelta(minutes=minutes),
+    })
+
+
+@pytest.mark.django_db
+def test_contact_messages_are_counted_and_a_read_resets_the_counter(agent):
+    chat = assigned_chat(agent)
+    write(chat, minutes=1)
+    write(chat, sender_type=2, minutes=2)
+    last = write(chat, minutes=3)
+
+    cursor = ReadCursor.objects.get(chat_id=chat, support_agent_id=agent)
+    assert cursor.unread_count == 2 and cursor.last_activity_at == START + timedelta(minutes=3)
+
+    client = APIClient()
+    response = client.post(f"/channel/{chat.id}/read/", {"support_agent": agent.id}, format="json")
+    assert response.status_code == 200
+    assert response.json()["unread_count"] == 0 and response.json()["last_read_message"] == last.id
+
+    write(chat, minutes=-60)
+    assert ReadCursor.objects.get().last_activity_at == START + timedelta(minutes=3)
+
+    write(chat, minutes=4)
+    first = Message.objects.filter(chat_id=chat).order_by("id").first()
+    partial = client.post(f"/channel/{chat.id}/read/", {"support_agent": agent.id, "message": first.id}, format="json")
+    assert partial.json()["unread_count"] == 3
+
+
+@pytest.mark.django_db
+def test_cursor_of_an_agent_taking_a_chat_counts_its_history(agent):
+    chat = Chat.objects.create(chat="1000", service="0")
+    write(chat)
+    write(chat, minutes=1)
+    assert not ReadCursor.objects.exists()
+
+    chat.support_agent_id = agent
+    chat.save()
+
+    assert ReadCursor.objects.get().unread_count == 2
+
+
+@pytest.mark.django_db
+def test_reassigned_chat_leaves_the_inbox_of_the_previous_agent(agent):
+    chat = assigned_chat(agent)
+    write(chat)
+    other = SupportAgent.objects.create(first_name="Caio", last_name="Reis", password="secret")
+
+    chat.support_agent_id = other
+    chat.save()
+
+    assert list(ReadCursor.objects.values_list("support_agent_id", "unread_count")) == [(other.id, 1)]
+    chat.support_agent_id = None
+    chat.save(update_fields=["support_agent_id"])
+    assert not ReadCursor.objects.exists()
+
+
+@pytest.mark.django_db
+def test_first_read_of_another_agent_creates_its_cursor(agent):
+    chat = assigned_chat(agent)
+    write(chat)
+    other = SupportAgent.objects.create(first_name="Caio", last_name="Reis", password="secret")
+    client = APIClient()
+
+    assert client.post(f"/channel/{chat.id}/read/", {"support_agent": other.id}, format="json").status_code == 200
+    write(chat, minutes=1)
+
+    assert dict(ReadCursor.objects.values_list("support_agent_id", "unread_count")) == {agent.id: 2, other.id: 1}
+    assert client.post(f"/channel/{chat.id}/read/", {"support_agent": 999}, format="json").status_code == 404
+    assert client.post(f"/channel/{chat.id}/read/", {}, format="json").status_code == 400
+
+
+@pytest.mark.django_db
+def test_read_of_a_missing_chat_or_of_a_message_of_another_chat_is_a_404(agent):
+    chat, other_chat = assigned_chat(agent), assigned_chat(agent, 1)
+    write(chat)
+    other_message = write(other_chat, minutes=1)
+    client = APIClient()
+
+    body = {"support_agent": agent.id, "message": other_message.id}
+    missing = client.post(f"/channel/{other_chat.id + 1}/read/", body, format="json")
+    foreign = client.post(f"/channel/{chat.id}/read/", body, format="json")
+
+    assert missing.status_code == foreign.status_code == 404
+    assert ReadCursor.objects.get(chat_id=chat).unread_count == 1
+
+
+@pytest.mark.django_db
+def test_agent_inbox_is_sorted_by_activity_in_a_fixed_number_of_queries(agent):
+    chats = [assigned_chat(agent, index) for index in range(3)]
+    for minutes, chat in enumerate([chats[1], chats[0], chats[2], chats[0]]):
+        write(chat, minutes=minutes)
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as small:
+        body = client.get(f"/channel/inbox/{agent.id}/", {"messages": 1}).json()
+    assert [entry["chat"]["id"] for entry in body["results"]] == [chats[0].id, chats[2].id, chats[1].id]
+    assert [entry["unread_count"] for entry in body["results"]] == [2, 1, 1]
+    assert len(body["results"][0]["chat"]["messages"]) == 1
+
+    for index in range(3, 10):
+        write(assigned_chat(agent, index), minutes=10 + index)
+    with CaptureQueriesContext(connection) as large:
+        body = client.get(f"/channel/inbox/{agent.id}/").json()
+    assert body["count"] == 10 and len(large) == len(small) == 3
+    assert client.get(f"/channel/inbox/{agent.id + 1}/").json()["count"] == 0
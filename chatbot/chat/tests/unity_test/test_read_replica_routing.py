@@ -0,0 +1,54 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from chat.models import Chat
+from chat.repositories.channel_repository import ChannelRepository
+from chat.services.channel_service import ChannelService
+from config.db_router import PrimaryReplicaRouter, get_read_database, reset_pin
+from config.middleware import PrimaryDatabaseStickinessMiddleware
+from contact.repositories.contact_repository import ContactRepository
+from message.repositories.message_repository import MessageRepository
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica_0']
+    token = reset_pin()
+    yield settings
+    reset_pin(token)
+
+
+def test_listing_reads_go_to_replica(replicas):
+    assert ChannelRepository.get_all().db == 'replica_0'
+    assert ContactRepository.get_all().db == 'replica_0'
+    assert MessageRepository.get_all().db == 'replica_0'
+
+
+def test_reads_stick_to_primary_after_a_write(replicas):
+    PrimaryReplicaRouter().db_for_write(Chat)
+
+    assert get_read_database() == 'default'
+    assert ContactRepository.get_all().db == 'default'
+    assert PrimaryReplicaRouter().db_for_read(Chat) == 'default'
+
+
+@pytest.mark.django_db
+def test_channel_service_create_pins_request_to_primary(replicas):
+    ChannelService().create({'chat': '42', 'service': '0'})
+
+    assert MessageRepository.get_all().db == 'default'
+
+
+def test_stickiness_is_scoped_to_one_request(replicas):
+    def write_view(request):
+        PrimaryReplicaRouter().db_for_write(Chat)
+        return HttpResponse(get_read_database())
+
+    def read_view(request):
+        return HttpResponse(get_read_database())
+
+    request = RequestFactory().get('/')
+
+    assert PrimaryDatabaseStickinessMiddleware(write_view)(request).content == b'default'
+    assert PrimaryDatabaseStickinessMiddleware(read_view)(request).content == b'replica_0'
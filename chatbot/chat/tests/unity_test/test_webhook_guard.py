@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from chat.models import Bot, Chat
+from chat.providers.discord_provider import DiscordProvider
+from chat.services.bot_registry_service import BotRegistryService
+from config.middleware import TokenBucketLimiter
+
+DISCORD_EVENT = {
+    "t": "MESSAGE_CREATE",
+    "d": {
+        "id": "1",
+        "channel_id": "1200000000000000001",
+        "content": "hello",
+        "author": {"id": "2", "username": "manu"},
+    },
+}
+
+
+@pytest.fixture
+def secured_bot(settings, monkeypatch):
+    settings.CHAT_PROVIDERS = ["telegram", "discord"]
+    settings.TELEGRAM_WEBHOOK_SECRET = "telegram-secret"
+    BotRegistryService().invalidate()
+    monkeypatch.setattr(DiscordProvider, "reply", lambda self, chat_id, text: None)
+    return Bot.objects.create(
+        name="Loja", service="1", token="token", webhook_key="loja", webhook_secret="relay-secret"
+    )
+
+
+def test_token_bucket_refills_at_rate():
+    limiter = TokenBucketLimiter(rate=1, burst=2, max_clients=10)
+
+    assert [limiter.allow("1.2.3.4", now=0) for _ in range(3)] == [True, True, False]
+    assert limiter.allow("5.6.7.8", now=0)
+    assert limiter.allow("1.2.3.4", now=1)
+    assert not limiter.allow("1.2.3.4", now=1)
+
+
+def test_token_bucket_bounds_tracked_clients():
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=4)
+
+    for index in range(100):
+        limiter.allow(f"10.0.0.{index}", now=0)
+
+    assert len(limiter._buckets) <= 4
+
+
+@pytest.mark.django_db
+def test_requests_over_rate_or_size_are_rejected_before_the_view(settings):
+    settings.WEBHOOK_RATE_BURST = 2
+    settings.WEBHOOK_MAX_BODY_SIZE = 64
+    client = APIClient()
+
+    too_large = client.post("/channel/receive-messages/", data="x" * 65, content_type="application/json")
+    statuses = [
+        client.post("/channel/receive-messages/", data="{}", content_type="application/json").status_code
+        for _ in range(3)
+    ]
+    from_telegram = client.post(
+        "/channel/receive-messages/", data="{}", content_type="application/json", REMOTE_ADDR="149.154.167.1"
+    )
+
+    assert too_large.status_code == 413
+    assert statuses[-1] == 429
+    assert from_telegram.status_code != 429
+
+
+@pytest.mark.django_db
+def test_wrong_secret_is_rejected_without_parsing_the_body(secured_bot, monkeypatch):
+    monkeypatch.setattr(DiscordProvider, "parse", lambda self, body: pytest.fail("body parsed"))
+    client = APIClient()
+
+    wrong = client.post(
+        "/channel/receive-messages/discord/loja/", data=json.dumps(DISCORD_EVENT),
+        content_type="application/json", HTTP_X_DISCORD_RELAY_SECRET="guess",
+    )
+    telegram = client.post(
+        "/channel/receive-messages/telegram/", data="{}", content_type="application/json",
+        HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN="guess",
+    )
+
+    assert wrong.status_code == 403
+    assert telegram.status_code == 403
+    assert not Chat.objects.exists()
+
+
+@pytest.mark.django_db
+def test_matching_secret_is_accepted(secured_bot):
+    response = APIClient().post(
+        "/channel/receive-messages/discord/loja/", data=json.dumps(DISCORD_EVENT),
+        content_type="application/json", HTTP_X_DISCORD_RELAY_SECRET="relay-secret",
+    )
+
+    assert response.status_code == 200
+    assert Chat.objects.get().bot_id == secured_bot
@@ -1,4 +1,12 @@
-import json
+from config import json_codec
+from message.utils.attachments import has_telegram_media
+
+# Keys every Telegram update of each kind carries (checked as key set inclusions).
+MESSAGE_KEYS = frozenset(["message_id", "from", "chat", "date"])
+CALLBACK_MESSAGE_KEYS = MESSAGE_KEYS | {"text"}
+CALLBACK_QUERY_KEYS = frozenset(["id", "from", "message", "data"])
+FROM_KEYS = frozenset(["id", "is_bot", "first_name", "language_code"])
+CHAT_KEYS = frozenset(["id", "first_name", "type"])
 
 
 class BotValidator:
@@ -10,6 +18,8 @@ class BotValidator:
     -------
     validate_telegram(request_body):
         Validates if the request body matches the Telegram bot message structure.
+    decode_telegram(request_body):
+        Returns the decoded Telegram update, or None if the body is not one.
     validate_other_bot(request_body):
         Placeholder for validation logic of other bots.
     identify_bot(request_body):
@@ -19,8 +29,9 @@ class BotValidator:
     @staticmethod
     def validate_telegram(request_body):
         """
-        Validates if the request body matches the Telegram bot message structure for both 
-        `callback_query` and `message` formats.
+        Validates if the request body matches the Telegram bot message structure for the 
+        `callback_query`, `message` and `edited_message` formats. A message carries a
+        `text`, or a file (photo, document, voice, ...) with an optional `caption`.
 
         Parameters
         ----------
@@ -30,52 +41,65 @@ class BotValidator:
         Returns
         -------
         bool
-            True if the structure matches either the `callback_query` or `message` format, otherwise False.
+            True if the structure matches the `callback_query`, `message` or `edited_message` format, otherwise False.
+        """
+        return BotValidator.decode_telegram(request_body) is not None
+
+    @staticmethod
+    def decode_telegram(request_body):
+        """
+        Decodes the request body and validates it like `validate_telegram`, so
+        callers that need the update decode the body only once.
+
+        Parameters
+        ----------
+        request_body : bytes
+            The raw body of the request, typically in JSON format.
+
+        Returns
+        -------
+        dict or None
+            The decoded update, or None if it is not a valid Telegram update.
         """
         try:
-            data = json.loads(request_body.decode("utf-8"))
+            data = json_codec.loads(request_body)
 
             if 'callback_query' in data:
-                required_keys = ["update_id", "callback_query"]
-                callback_query_keys = ["id", "from", "message", "data"]
-                from_keys = ["id", "is_bot", "first_name", "language_code"]
-                message_keys = ["message_id", "from", "chat", "date", "text"]
-                chat_keys = ["id", "first_name", "type"]
-
-                if not all(key in data for key in required_keys):
-                    return False
+                if not {"update_id", "callback_query"} <= data.keys():
+                    return None
                 callback_query = data['callback_query']
-                if not all(key in callback_query for key in callback_query_keys):
-                    return False
-                if not all(key in callback_query["from"] for key in from_keys):
-                    return False
-                if not all(key in callback_query["message"] for key in message_keys):
-                    return False
-                if not all(key in callback_query["message"]["chat"] for key in chat_keys):
-                    return False
-
-            elif 'message' in data:
-                required_keys = ["update_id", "message"]
-                message_keys = ["message_id", "from", "chat", "date", "text"]
-                from_keys = ["id", "is_bot", "first_name", "language_code"]
-                chat_keys = ["id", "first_name", "type"]
-
-                if not all(key in data for key in required_keys):
-                    return False
-                message = data['message']
-                if not all(key in message for key in message_keys):
-                    return False
-                if not all(key in message["from"] for key in from_keys):
-                    return False
-                if not all(key in message["chat"] for key in chat_keys):
-                    return False
+                if not CALLBACK_QUERY_KEYS <= callback_query.keys():
+                    return None
+                if not FROM_KEYS <= callback_query["from"].keys():
+                    return None
+                if not CALLBACK_MESSAGE_KEYS <= callback_query["message"].keys():
+                    return None
+                if not CHAT_KEYS <= callback_query["message"]["chat"].keys():
+                    return None
+
+            elif 'message' in data or 'edited_message' in data:
+                update_key = 'message' if 'message' in data else 'edited_message'
+
+                if not {"update_id", update_key} <= data.keys():
+                    return None
+                message = data[update_key]
+                if update_key == 'edited_message' and 'edit_date' not in message:
+                    return None
+                if not MESSAGE_KEYS <= message.keys():
+                    return None
+                if 'text' not in message and 'caption' not in message and not has_telegram_media(message):
+                    return None
+                if not FROM_KEYS <= message["from"].keys():
+                    return None
+                if not CHAT_KEYS <= message["chat"].keys():
+                    return None
             else:
-                return False
+                return None
 
-            return True
+            return data
 
-        except (json.JSONDecodeError, KeyError, AttributeError):
-            return False
+        except (json_codec.JSONDecodeError, KeyError, AttributeError, TypeError):
+            return None
 
     def identify_bot(self, request_body):
         if self.validate_telegram(request_body):
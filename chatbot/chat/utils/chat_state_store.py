@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+START_NODE = 'start'
+
+# Messages that send a conversation back to the start of the bot flow.
+START_COMMANDS = ('start', '/start')
+
+# Menu answers kept in the conversation slots, as (slot, value).
+MENU_SLOTS = {
+    'use_weni': ('uses_weni', True),
+    'dont_use_weni': ('uses_weni', False),
+    'support_weni': ('intent', 'support'),
+    'new_products_weni': ('intent', 'new_products'),
+    'product_details': ('intent', 'product_details'),
+    'hire_services': ('intent', 'hire_services'),
+    'talk_specialist': ('intent', 'talk_specialist'),
+}
+
+
+@dataclass(slots=True)
+class ConversationState:
+    """
+    Live conversation state of a chat, as kept in memory.
+
+    Attributes:
+        chat_id (int): The id of the Chat.
+        node (str): The current node of the bot flow.
+        slots (dict): Answers collected along the flow.
+        last_activity (float): Epoch seconds of the last transition.
+    """
+
+    chat_id: int
+    node: str = START_NODE
+    slots: dict = field(default_factory=dict)
+    last_activity: float = field(default_factory=time.time)
+
+
+class ChatStateStore:
+    """
+    Process-wide LRU store of conversation states with write-behind bookkeeping.
+
+    States are kept in access order with their access time, so the least
+    recently used chat is always first: evicting chats idle for `idle_ttl`
+    seconds only looks at the head. Changed states are marked
+    dirty and handed to the caller in batches by `take_dirty`; evicted dirty
+    states are kept until then, so an eviction never loses a write.
+    """
+
+    def __init__(self, max_size: int, idle_ttl: float):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._states = OrderedDict()
+        self._dirty = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def get(self, chat_id: int) -> Optional[ConversationState]:
+        """
+        Returns the state of a chat, if it is in memory, and marks it as recently used.
+        """
+        with self._lock:
+            entry = self._states.get(chat_id)
+            # An evicted state that was not persisted yet is newer than its row.
+            state = entry[0] if entry is not None else self._dirty.get(chat_id)
+            if state is None:
+                return None
+            self._states[chat_id] = (state, time.monotonic())
+            self._states.move_to_end(chat_id)
+            return state
+
+    def put(self, state: ConversationState, dirty: bool = False) -> None:
+        """
+        Stores a state as the most recently used one, evicting the idle and the
+        least recently used states past `max_size`.
+
+        Args:
+            state (ConversationState): The state.
+            dirty (bool): True if the state changed and must be persisted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._states[state.chat_id] = (state, now)
+            self._states.move_to_end(state.chat_id)
+            if dirty:
+                self._dirty[state.chat_id] = state
+            self._evict(now)
+
+    def take_dirty(self) -> list[ConversationState]:
+        """
+        Returns the states changed since the last call and clears them.
+        """
+        with self._lock:
+            dirty = list(self._dirty.values())
+            self._dirty.clear()
+            return dirty
+
+    def requeue(self, states: list[ConversationState]) -> None:
+        """
+        Marks states taken by `take_dirty` as dirty again, after their write
+        failed. A state changed again in the meantime is already dirty and kept.
+
+        Args:
+            states (list[ConversationState]): The states that were not persisted.
+        """
+        with self._lock:
+            for state in states:
+                self._dirty.setdefault(state.chat_id, state)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._dirty.clear()
+
+    def _evict(self, now: float) -> None:
+        while self._states:
+            chat_id, (_, accessed_at) = next(iter(self._states.items()))
+            if len(self._states) <= self.max_size and now - accessed_at < self.idle_ttl:
+                return
+            del self._states[chat_id]
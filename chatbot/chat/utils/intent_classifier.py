@@ -0,0 +1,225 @@
+"""
+Local intent classifier for free-text messages.
+
+Texts are turned into hashed TF-IDF vectors (word unigrams and bigrams, accents
+and case folded, hashed into `buckets` buckets with CRC32) and scored by a
+multinomial logistic regression. Everything runs in the standard library: no
+network access and no native dependency.
+
+The model file holds a JSON header (labels, biases, bucket count) followed by
+one row of float32 values per bucket, `[idf, weight of each label]`, in native
+byte order. `IntentClassifier` memory-maps it, so the weights are paged in on
+demand and shared through the page cache by every worker on the host, and a
+prediction only reads the rows of the ~20 features of the text.
+"""
+import json
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import tempfile
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional
+
+from chat.utils.keyword_matcher import fold_text
+
+MAGIC = b"INTENT1\0"
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercases a text, strips its accents and splits it into words.
+    """
+    return WORD.findall(fold_text(text))
+
+
+def extract_features(text: str, buckets: int) -> Counter:
+    """
+    Returns the hashed unigram and bigram counts of a text.
+
+    Args:
+        text (str): The text.
+        buckets (int): The number of hash buckets.
+
+    Returns:
+        Counter: The count of each bucket.
+    """
+    tokens = tokenize(text)
+    grams = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    return Counter(zlib.crc32(gram.encode()) % buckets for gram in grams)
+
+
+class IntentClassifier:
+    """
+    Memory-mapped intent model.
+
+    Attributes:
+        labels (list[str]): The intents the model predicts.
+        buckets (int): The number of hash buckets of the features.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as model_file:
+            self._mmap = mmap.mmap(model_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an intent model.")
+        (header_size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_size])
+        self.labels = header["labels"]
+        self.buckets = header["buckets"]
+        self._bias = header["bias"]
+        self._stride = len(self.labels) + 1
+        self._weights = memoryview(self._mmap)[header["offset"]:].cast("f")
+
+    def predict(self, text: str) -> tuple[Optional[str], float]:
+        """
+        Returns the most likely intent of a text.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            tuple[Optional[str], float]: The intent and its probability, or
+            (None, 0.0) when no word of the text was seen in training.
+        """
+        weights, stride = self._weights, self._stride
+        vector, norm = [], 0.0
+        for bucket, count in extract_features(text, self.buckets).items():
+            idf = weights[bucket * stride]
+            if idf:
+                value = count * idf
+                vector.append((bucket * stride + 1, value))
+                norm += value * value
+        if not vector:
+            return None, 0.0
+        norm = math.sqrt(norm)
+        scores = list(self._bias)
+        for row, value in vector:
+            value /= norm
+            for label in range(stride - 1):
+                scores[label] += value * weights[row + label]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        total = sum(math.exp(score - scores[best]) for score in scores)
+        return self.labels[best], 1.0 / total
+
+    def close(self) -> None:
+        self._weights.release()
+        self._mmap.close()
+
+
+def train_intent_model(
+    examples: Iterable[tuple[str, str]], path: Path, buckets: int, epochs: int = 20,
+    learning_rate: float = 2.0, l2: float = 1e-4, seed: int = 0,
+) -> dict:
+    """
+    Trains an intent model with stochastic gradient descent and writes it to
+    `path`. The file is written to a temporary name and renamed, so workers that
+    mapped the previous model keep reading it until they reload.
+
+    Args:
+        examples (Iterable[tuple[str, str]]): (text, intent) pairs.
+        path (Path): Where to write the model.
+        buckets (int): The number of hash buckets of the features.
+        epochs (int): Passes over the examples.
+        learning_rate (float): The initial SGD step, decayed per epoch.
+        l2 (float): The L2 regularization strength.
+        seed (int): Seed of the example shuffling.
+
+    Returns:
+        dict: The labels, the number of examples and the training accuracy.
+    """
+    documents = [(extract_features(text, buckets), label) for text, label in examples]
+    documents = [(features, label) for features, label in documents if features]
+    labels = sorted({label for _, label in documents})
+    if len(labels) < 2:
+        raise ValueError("At least two intents with examples are needed.")
+    label_index = {label: index for index, label in enumerate(labels)}
+
+    document_frequency = Counter(bucket for features, _ in documents for bucket in features)
+    idf = {
+        bucket: math.log((1 + len(documents)) / (1 + frequency)) + 1
+        for bucket, frequency in document_frequency.items()
+    }
+    vectors = []
+    for features, label in documents:
+        values = {bucket: count * idf[bucket] for bucket, count in features.items()}
+        norm = math.sqrt(sum(value * value for value in values.values()))
+        vectors.append(({bucket: value / norm for bucket, value in values.items()}, label_index[label]))
+
+    weights = {bucket: [0.0] * len(labels) for bucket in idf}
+    bias = [0.0] * len(labels)
+    order = list(range(len(vectors)))
+    shuffle = random.Random(seed).shuffle
+    for epoch in range(epochs):
+        step = learning_rate / (1 + epoch)
+        shuffle(order)
+        for index in order:
+            vector, target = vectors[index]
+            probabilities = _softmax(_scores(vector, weights, bias))
+            for label, probability in enumerate(probabilities):
+                gradient = probability - (label == target)
+                bias[label] -= step * gradient
+                for bucket, value in vector.items():
+                    row = weights[bucket]
+                    row[label] -= step * (gradient * value + l2 * row[label])
+
+    correct = sum(
+        max(range(len(labels)), key=_scores(vector, weights, bias).__getitem__) == target
+        for vector, target in vectors
+    )
+    _write_model(path, labels, bias, buckets, idf, weights)
+    return {"labels": labels, "examples": len(vectors), "accuracy": correct / len(vectors)}
+
+
+def _scores(vector: dict, weights: dict, bias: list) -> list:
+    scores = list(bias)
+    for bucket, value in vector.items():
+        for label, weight in enumerate(weights[bucket]):
+            scores[label] += value * weight
+    return scores
+
+
+def _softmax(scores: list) -> list:
+    top = max(scores)
+    exponentials = [math.exp(score - top) for score in scores]
+    total = sum(exponentials)
+    return [value / total for value in exponentials]
+
+
+def _write_model(path: Path, labels: list, bias: list, buckets: int, idf: dict, weights: dict) -> None:
+    stride = len(labels) + 1
+    table = array("f", bytes(4 * buckets * stride))
+    for bucket, value in idf.items():
+        table[bucket * stride] = value
+        table[bucket * stride + 1:bucket * stride + stride] = array("f", weights[bucket])
+
+    header = {"labels": labels, "bias": bias, "buckets": buckets, "offset": 0}
+    # The table starts at a 4-byte boundary after the header; the offset is part
+    # of the header, so its width is fixed before it is filled in.
+    header_size = len(json.dumps({**header, "offset": 10 ** 9}).encode())
+    offset = len(MAGIC) + 4 + header_size
+    offset += -offset % 4
+    header["offset"] = offset
+    header_bytes = json.dumps(header).encode().ljust(offset - len(MAGIC) - 4)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as model_file:
+            model_file.write(MAGIC)
+            model_file.write(struct.pack("<I", len(header_bytes)))
+            model_file.write(header_bytes)
+            table.tofile(model_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,175 @@
+"""
+Aho-Corasick matcher for commands, keywords and moderation rules.
+
+Every pattern of every rule is compiled into one automaton, so a message is
+scanned once, in time linear in its length plus the number of matches, however
+many patterns there are. Patterns and messages are accent- and case-folded, and
+a pattern only matches whole words (`/start` matches in "/start now", `preço`
+matches "Preco", `erro` does not match "terror").
+"""
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterator
+
+RULE_KINDS = ('commands', 'keywords', 'moderation')
+
+
+def fold_text(text: str) -> str:
+    """
+    Lowercases a text and strips its accents.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+@dataclass(slots=True)
+class MatchResult:
+    """
+    Rules matched by a message, in order of first match and without repeats.
+
+    Attributes:
+        commands (list[str]): The matched commands (e.g. 'start', 'support_weni').
+        keywords (list[str]): The matched keyword topics.
+        moderation (list[str]): The matched moderation categories (e.g. 'spam').
+    """
+
+    commands: list = field(default_factory=list)
+    keywords: list = field(default_factory=list)
+    moderation: list = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.commands or self.keywords or self.moderation)
+
+
+class KeywordMatcher:
+    """
+    Automaton compiled from a rule set.
+
+    The rule set maps each kind (`commands`, `keywords`, `moderation`) to rule
+    names and their patterns:
+        {"commands": {"start": ["/start", "start"]}, "moderation": {"spam": ["ganhe dinheiro"]}}
+
+    Attributes:
+        pattern_count (int): The number of compiled patterns.
+    """
+
+    def __init__(self, rules: dict):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self._patterns = []
+        for kind in RULE_KINDS:
+            for name, patterns in rules.get(kind, {}).items():
+                for pattern in patterns:
+                    self._add(fold_text(pattern), kind, name)
+        self.pattern_count = len(self._patterns)
+        self._link()
+
+    def _add(self, pattern: str, kind: str, name: str) -> None:
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (len(self._patterns),)
+        self._patterns.append((len(pattern), kind, name))
+
+    def _link(self) -> None:
+        # Breadth-first, so the fail state of a node is final before its children are linked;
+        # outputs are merged along the fail links so a scan never walks them.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._output[child] += self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str, str]]:
+        """
+        Yields every whole-word occurrence of a pattern in a text.
+
+        Args:
+            text (str): The text, not folded.
+
+        Returns:
+            Iterator[tuple[int, int, str, str]]: (start, end, kind, rule name) of each
+            match, by end position; positions refer to the folded text.
+        """
+        text = fold_text(text)
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                length, kind, name = patterns[pattern]
+                start, end = index - length + 1, index + 1
+                if (start == 0 or not _is_word(text[start - 1]) or not _is_word(text[start])) and (
+                    end == len(text) or not _is_word(text[end]) or not _is_word(text[index])
+                ):
+                    yield start, end, kind, name
+
+    def match(self, text: str) -> MatchResult:
+        """
+        Scans a text once and returns the rules it matches.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            MatchResult: The matched commands, keywords and moderation categories.
+        """
+        result = MatchResult()
+        for _, _, kind, name in self.iter_matches(text):
+            names = getattr(result, kind)
+            if name not in names:
+                names.append(name)
+        return result
+
+
+def naive_match(rules: dict, text: str) -> MatchResult:
+    """
+    Reference implementation that searches every pattern in turn; used to check
+    and benchmark KeywordMatcher. Names are listed in rule order.
+    """
+    matcher_rules = {kind: rules.get(kind, {}) for kind in RULE_KINDS}
+    text = fold_text(text)
+    result = MatchResult()
+    for kind, named_patterns in matcher_rules.items():
+        names = getattr(result, kind)
+        for name, patterns in named_patterns.items():
+            for pattern in patterns:
+                if name not in names and _contains_word(text, fold_text(pattern)):
+                    names.append(name)
+    return result
+
+
+def _contains_word(text: str, pattern: str) -> bool:
+    start = text.find(pattern)
+    while pattern and start != -1:
+        end = start + len(pattern)
+        if (start == 0 or not _is_word(text[start - 1]) or not _is_word(text[start])) and (
+            end == len(text) or not _is_word(text[end]) or not _is_word(text[end - 1])
+        ):
+            return True
+        start = text.find(pattern, start + 1)
+    return False
+
@@ -0,0 +1,226 @@
+"""
+Memory-mapped vector index of the FAQ articles.
+
+Articles and questions are embedded as hashed n-gram vectors: word unigrams and
+bigrams plus character trigrams of each word (so "botbilder" still lands near
+"BotBuilder"), accents and case folded, hashed with CRC32 into `buckets`
+buckets, sublinear term frequency, L2-normalized.
+
+The index file is an inverted index of those vectors, in native byte order:
+
+    MAGIC | header size (uint32) | JSON header | keys | starts | rows | weights
+
+`keys` (uint32) are the sorted buckets used by some article, the postings of
+`keys[i]` are `rows[starts[i]:starts[i + 1]]` (uint32, positions in the header's
+`articles` list) with their `weights` (float32). A search memory-maps the file,
+looks up the ~50 buckets of the question with a binary search and only reads
+their postings, so it costs milliseconds however large the file is.
+
+Article vectors carry no corpus statistics (the IDF of a bucket is derived from
+the length of its postings at query time), so an article's vector only changes
+when the article does: a rebuild reuses the vectors of unchanged articles from
+the previous file and only embeds the new or edited ones.
+"""
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from chat.utils.intent_classifier import tokenize
+
+MAGIC = b"FAQIDX1\0"
+TRIGRAM_WEIGHT = 0.5
+COMMON_RATIO = 0.2
+COMMON_MIN_POSTINGS = 100
+
+
+def embed(text: str, buckets: int) -> dict:
+    """
+    Returns the hashed n-gram vector of a text.
+
+    Args:
+        text (str): The text.
+        buckets (int): The number of hash buckets.
+
+    Returns:
+        dict: The L2-normalized weight of each bucket.
+    """
+    tokens = tokenize(text)
+    words = Counter(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])])
+    trigrams = Counter(
+        f"#{padded[index:index + 3]}" for padded in (f" {token} " for token in tokens)
+        for index in range(len(padded) - 2)
+    )
+    vector = defaultdict(float)
+    for grams, scale in ((words, 1.0), (trigrams, TRIGRAM_WEIGHT)):
+        for gram, count in grams.items():
+            vector[zlib.crc32(gram.encode()) % buckets] += scale * (1 + math.log(count))
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {bucket: value / norm for bucket, value in vector.items()} if norm else {}
+
+
+class KnowledgeIndex:
+    """
+    Memory-mapped FAQ index.
+
+    Attributes:
+        buckets (int): The number of hash buckets of the vectors.
+        articles (list[tuple]): (article id, version) of each indexed article.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a FAQ index.")
+        (header_size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_size])
+        self.buckets = header["buckets"]
+        self.articles = [tuple(article) for article in header["articles"]]
+        self._view, offset = memoryview(self._mmap), header["offset"]
+        sections = []
+        for code, length in (("I", header["keys"]), ("I", header["keys"] + 1), ("I", header["postings"]),
+                             ("f", header["postings"])):
+            sections.append(self._view[offset:offset + 4 * length].cast(code))
+            offset += 4 * length
+        self._keys, self._starts, self._rows, self._weights = sections
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def close(self) -> None:
+        """
+        Unmaps the file; the index cannot be searched afterwards.
+        """
+        for view in (self._keys, self._starts, self._rows, self._weights, self._view):
+            view.release()
+        self._mmap.close()
+
+    def search(self, text: str, limit: int) -> list[tuple[int, float]]:
+        """
+        Returns the articles closest to a text.
+
+        The question is weighted by the IDF of each bucket and scored against
+        the article vectors by dot product. Buckets found in more than
+        COMMON_RATIO of the articles (stop words, frequent trigrams) add little
+        to the score and most of the work, so their postings are skipped.
+
+        Args:
+            text (str): The question.
+            limit (int): How many articles to return at most.
+
+        Returns:
+            list[tuple[int, float]]: (article id, score) pairs, best first.
+        """
+        keys, starts, rows, weights = self._keys, self._starts, self._rows, self._weights
+        total = len(self.articles)
+        max_postings = max(COMMON_MIN_POSTINGS, int(total * COMMON_RATIO))
+        query, norm = [], 0.0
+        for bucket, value in embed(text, self.buckets).items():
+            index = bisect_left(keys, bucket)
+            found = index < len(keys) and keys[index] == bucket
+            start, end = (starts[index], starts[index + 1]) if found else (0, 0)
+            value *= math.log((1 + total) / (1 + end - start)) + 1
+            norm += value * value
+            if found and end - start <= max_postings:
+                query.append((start, end, value))
+        scores = defaultdict(float)
+        for start, end, value in query:
+            value /= math.sqrt(norm)
+            for posting in range(start, end):
+                scores[rows[posting]] += value * weights[posting]
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.articles[row][0], score) for row, score in best]
+
+    def vectors(self) -> dict:
+        """
+        Returns the vector of each indexed article, read back from the postings.
+
+        Returns:
+            dict: {(article id, version): {bucket: weight}}.
+        """
+        vectors = [{} for _ in self.articles]
+        for index, bucket in enumerate(self._keys):
+            for posting in range(self._starts[index], self._starts[index + 1]):
+                vectors[self._rows[posting]][bucket] = self._weights[posting]
+        return dict(zip(self.articles, vectors))
+
+
+def build_knowledge_index(
+    articles: Iterable[tuple[int, str, str]], path: Path, buckets: int, previous: Optional[KnowledgeIndex] = None,
+) -> dict:
+    """
+    Writes the index of a set of articles to `path`, reusing the vectors of the
+    articles whose version did not change since `previous` was built. The file
+    is written to a temporary name and renamed, so searches running on the
+    previous index are not disturbed.
+
+    Args:
+        articles (Iterable[tuple[int, str, str]]): (id, version, text) of each article.
+        path (Path): Where to write the index.
+        buckets (int): The number of hash buckets of the vectors.
+        previous (KnowledgeIndex, optional): The index being replaced.
+
+    Returns:
+        dict: The number of indexed, embedded and reused articles.
+    """
+    known = previous.vectors() if previous is not None and previous.buckets == buckets else {}
+    entries, embedded = [], 0
+    for article_id, version, text in articles:
+        vector = known.get((article_id, version))
+        if vector is None:
+            vector = embed(text, buckets)
+            embedded += 1
+        entries.append(((article_id, version), vector))
+
+    postings = defaultdict(list)
+    for row, (_, vector) in enumerate(entries):
+        for bucket, weight in vector.items():
+            postings[bucket].append((row, weight))
+    keys, starts, rows, weights = array("I"), array("I", [0]), array("I"), array("f")
+    for bucket in sorted(postings):
+        keys.append(bucket)
+        for row, weight in postings[bucket]:
+            rows.append(row)
+            weights.append(weight)
+        starts.append(len(rows))
+
+    header = {
+        "buckets": buckets, "articles": [list(key) for key, _ in entries],
+        "keys": len(keys), "postings": len(rows), "offset": 0,
+    }
+    # The arrays start at a 4-byte boundary after the header; the offset is part
+    # of the header, so its width is fixed before it is filled in.
+    header_size = len(json.dumps({**header, "offset": 10 ** 9}).encode())
+    offset = len(MAGIC) + 4 + header_size
+    offset += -offset % 4
+    header["offset"] = offset
+    header_bytes = json.dumps(header).encode().ljust(offset - len(MAGIC) - 4)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as index_file:
+            index_file.write(MAGIC)
+            index_file.write(struct.pack("<I", len(header_bytes)))
+            index_file.write(header_bytes)
+            for section in (keys, starts, rows, weights):
+                section.tofile(index_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return {"articles": len(entries), "embedded": embedded, "reused": len(entries) - embedded}
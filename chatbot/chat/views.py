@@ -1,28 +1,35 @@
-import json
-
 from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import permissions, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from chat.models import Chat
 
-from chat.providers.telegram_provider import TelegramProvider
+from chat.providers.registry import provider_registry
 from chat.serializers.chat_serializer import ChatSerializer
-from chat.serializers.telegram_input_serializer import TelegramInputSerializer
+from chat.serializers.inbox_query_serializer import InboxQuerySerializer, MarkReadSerializer
+from chat.serializers.inbox_serializer import AgentInboxSerializer, InboxChatSerializer, ReadCursorSerializer
+from chat.services.abstract_bot_registry_service import \
+    AbstractBotRegistryService
 from chat.services.abstract_channel_service import AbstractChannelService
+from chat.services.bot_registry_service import BotRegistryService
 from chat.services.channel_service import ChannelService
-from chat.utils.bot_validator import BotValidator
+from chat.services.abstract_read_cursor_service import AbstractReadCursorService
+from chat.services.read_cursor_service import ReadCursorService
+from config.db_router import pin_to_primary
 from contact.services.contact_service import ContactService
 from contact.services.abstract_contact_service import AbstractContactService
-from message.serializers.message_create_serializer import \
-    MessageCreateSerializer
+from message.serializers.broadcast_serializer import BroadcastCreateSerializer, BroadcastSerializer
+from message.services.abstract_broadcast_service import AbstractBroadcastService
 from message.services.abstract_message_service import AbstractMessageService
+from message.services.broadcast_service import BroadcastService
 from message.services.message_service import MessageService
-from supportAgent.views import SupportAgentService
+from message.utils.compact_serializer import CompactSerializer, parse_fields
+from message.utils.pagination import PaginatorConfig
+from supportAgent.services.support_agent_service import SupportAgentService
 
 
 class ChannelViewSet(ModelViewSet):
@@ -34,90 +41,325 @@ class ChannelViewSet(ModelViewSet):
     
     Methods:
         create: Handle incoming messages and create chats or messages based on bot type.
+        answer_messages: Send the answer of a support agent to a chat.
+        create_broadcast: Send one message to many chats, in the background.
+        broadcast_progress / change_broadcast: Follow, cancel and resume a broadcast.
+        inbox / conversation: Chats with their contact, agent and last messages.
+        agent_inbox / mark_read: The chats of an agent with their unread counters.
     """
     
     permission_classes = [permissions.AllowAny]
     serializer_class = ChatSerializer
     queryset = Chat.objects.all()
+    compact_serializer = CompactSerializer(ChatSerializer)
 
-    def __init__(self, channel_service: AbstractChannelService = ChannelService(), message_service: AbstractMessageService = MessageService(), contact_service: AbstractContactService= ContactService(), support_agent=  SupportAgentService(), **kwargs):
+    def __init__(self, channel_service: AbstractChannelService = ChannelService(), message_service: AbstractMessageService = MessageService(), contact_service: AbstractContactService= ContactService(), support_agent=  SupportAgentService(), bot_registry_service: AbstractBotRegistryService = BotRegistryService(), broadcast_service: AbstractBroadcastService = BroadcastService(), read_cursor_service: AbstractReadCursorService = ReadCursorService(), **kwargs):
         """
         Initializes the ChannelViewSet with a channel service.
         
         Args:
             channel_service (AbstractChannelService, optional): The service used to manage channels.
             message_service (AbstractMessageService, optional): The service used to manage messages.
+            bot_registry_service (AbstractBotRegistryService, optional): The service used to resolve per-bot webhooks.
+            broadcast_service (AbstractBroadcastService, optional): The service used to send broadcasts.
+            read_cursor_service (AbstractReadCursorService, optional): The service used for agent inboxes.
+            **kwargs: The view options set by the router, such as the permissions of an action.
         """
+        super().__init__(**kwargs)
         self.channel_service = channel_service
         self.message_service = message_service
         self.contact_service = contact_service
         self.support_agent_service = support_agent
+        self.bot_registry_service = bot_registry_service
+        self.broadcast_service = broadcast_service
+        self.read_cursor_service = read_cursor_service
+
+    def get_queryset(self):
+        """
+        Lists chats through the channel service (served by a read replica); every
+        other action reads from the primary.
+        """
+        if self.action == "list":
+            return self.channel_service.get_all()
+        return super().get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lists the chats from `.values_list()` rows; `fields=id,service` reads and
+        returns only some of the fields of ChatSerializer.
+
+        Args:
+            request (Request): The listing request.
+
+        Returns:
+            Response: The chats.
+        """
+        try:
+            fields = parse_fields(request.query_params.get('fields'))
+            chats = self.filter_queryset(self.get_queryset())
+            return Response(self.compact_serializer.serialize(chats, fields), status=status.HTTP_200_OK)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=["get"], url_path="inbox")
+    def inbox(self, request):
+        """
+        Lists a page of chats, most recently active first, each with its contact,
+        its support agent and its last messages, in three queries whatever the
+        page size: the count, the chats joined to their contact and agent, and
+        the last `messages` messages of all the chats of the page.
+
+        Query parameters: page, page_size, messages, status ('open', 'closed' or
+        'all') and support_agent, see InboxQuerySerializer.
+
+        Args:
+            request (Request): The inbox request.
+
+        Returns:
+            Response: The paginated chats.
+        """
+        query = InboxQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        chats = self.channel_service.get_inbox(params['messages'], params['status'], params.get('support_agent'))
+        data_paginator = PaginatorConfig().paging_data(chats, params['page'], params['page_size'])
+        if 'error' in data_paginator:
+            return Response(data_paginator, status=status.HTTP_404_NOT_FOUND)
+        data_paginator['results'] = InboxChatSerializer(data_paginator['results'], many=True).data
+        return Response(data_paginator, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="conversation")
+    def conversation(self, request, pk=None):
+        """
+        Returns a chat with its contact, its support agent and its last
+        `messages` messages, in two queries.
+
+        Args:
+            request (Request): The request.
+            pk (int): The id of the chat.
+
+        Returns:
+            Response: The chat, or 404.
+        """
+        query = InboxQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chat = self.channel_service.get_detail(int(pk), query.validated_data['messages'])
+            return Response(InboxChatSerializer(chat).data, status=status.HTTP_200_OK)
+        except (NotFound, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(detail=False, methods=["get"], url_path=r"inbox/(?P<support_agent>\d+)")
+    def agent_inbox(self, request, support_agent: int):
+        """
+        Lists a page of the chats followed by a support agent, most recently
+        active first, each with the number of contact messages the agent has
+        not read. Counters are maintained as messages are written, so the page
+        costs three queries whatever the length of the conversations.
+
+        Query parameters: page, page_size, messages and status, see InboxQuerySerializer.
+
+        Args:
+            request (Request): The inbox request.
+            support_agent (int): The id of the agent.
+
+        Returns:
+            Response: The paginated inbox entries.
+        """
+        query = InboxQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response({"error": query.errors}, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        cursors = self.read_cursor_service.get_inbox(int(support_agent), params['messages'], params['status'])
+        data_paginator = PaginatorConfig().paging_data(cursors, params['page'], params['page_size'])
+        if 'error' in data_paginator:
+            return Response(data_paginator, status=status.HTTP_404_NOT_FOUND)
+        data_paginator['results'] = AgentInboxSerializer(data_paginator['results'], many=True).data
+        return Response(data_paginator, status=status.HTTP_200_OK)
+
+    @method_decorator(csrf_exempt, name="dispatch")
+    @action(detail=True, methods=["post"], url_path="read")
+    def mark_read(self, request, pk=None):
+        """
+        Marks a chat as read by a support agent, up to `message` or to its last
+        message, and returns the cursor of the agent with its unread counter.
+
+        Args:
+            request (Request): The request, with `support_agent` and optionally `message`.
+            pk (int): The id of the chat.
+
+        Returns:
+            Response: The read cursor, or 404 if the agent or the chat messages do not exist.
+        """
+        body = MarkReadSerializer(data=request.data)
+        if not body.is_valid():
+            return Response({"error": body.errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            pin_to_primary()
+            support_agent = body.validated_data['support_agent']
+            if self.support_agent_service.get_by_id(support_agent) is None:
+                raise NotFound(detail="There is no support agent with this id")
+            cursor = self.read_cursor_service.mark_read(int(pk), support_agent, body.validated_data.get('message'))
+            return Response(ReadCursorSerializer(cursor).data, status=status.HTTP_200_OK)
+        except (NotFound, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
     @method_decorator(csrf_exempt, name="dispatch")
-    @action(detail=False, methods=["post"], url_path="receive-messages")
-    def receive_messages(self, request):
+    @action(
+        detail=False, methods=["post"],
+        url_path=r"receive-messages(?:/(?P<provider>[\w-]+)(?:/(?P<webhook_key>[\w-]+))?)?",
+    )
+    def receive_messages(self, request, provider: str = None, webhook_key: str = None):
         """
         Handle incoming messages from various bots (e.g., Telegram, Discord).
         
-        Depending on the bot type, a chat or message is created.
+        The provider is picked by the registry from the path
+        (`receive-messages/<provider>/`) or the provider header; it parses the
+        update, stores the chat and message in a single transaction and replies.
+        The provider secret header is checked before the body is read.
+        Registered bots post to `receive-messages/<provider>/<webhook_key>/` and
+        are answered by the provider instance of their own token.
         
         Args:
             request (Request): The request containing the message data.
+            provider (str, optional): The provider name taken from the path.
+            webhook_key (str, optional): The webhook key of a registered bot.
             
         Returns:
             Response: The response with the status of the operation.
         """
         try:
-            data = json.loads(request.body)
-            bot_validator = BotValidator()
-            bot_name = bot_validator.identify_bot(request.body)
-            if bot_name == 'unknown':
+            pin_to_primary()
+            bot_provider = provider_registry.detect(request, provider)
+            if bot_provider is None:
                 raise ValidationError("This bot is not supported.")
-            elif bot_name == "telegram":
-                if not data.get('callback_query'):
-                    contact_name = data['message']['chat']['first_name']
-                    contact = self.contact_service.get_contact_by_name_intern(contact_name)
-                    if not contact:
-                        contact = self.contact_service.create({"name":contact_name})
-                telegram_answer = TelegramProvider()
-                serializer_class = TelegramInputSerializer
-                serializer = serializer_class(data=data, context={"request": data})
-                serializer.is_valid(raise_exception=True)
-                chat_instance = self.channel_service.create(serializer.validated_data)
-                if not data.get('callback_query'):
-                    message_serializer_class = MessageCreateSerializer
-                    data['chat_id'] = chat_instance
-                    message_serializer = message_serializer_class(data=data)
-                    message_serializer.is_valid(raise_exception=True)
-                    message = self.message_service.create(message_serializer.validated_data)
-                    data= json.loads(request.body)
-                    telegram_answer.setup_handlers(data=data, message=message.message_content)
-                elif data.get('callback_query'):
-                    telegram_answer.setup_handlers(data=data)
+            bot = None
+            if webhook_key:
+                bot = self.bot_registry_service.get_by_webhook_key(webhook_key)
+                if bot is None or bot.service != bot_provider.service:
+                    raise NotFound("There is no bot with this webhook.")
+                bot_provider = provider_registry.get(provider, bot.token)
+            if not bot_provider.authenticate(request, bot):
+                raise PermissionDenied("Invalid webhook secret.")
+            update = bot_provider.parse(request.body)
+            chat, message = bot_provider.persist(update, bot)
+            bot_provider.respond(update, message, chat)
             return Response({"message_received": True}, status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except PermissionDenied as e:
+            return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        except NotFound as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @method_decorator(csrf_exempt, name="dispatch")
-    @action(detail=False, methods=["post"], url_path=r"answer-messages/(?P<chat_id>.+)")
+    @action(detail=False, methods=["post"], url_path=r"answer-messages/(?P<chat_id>\d+)")
     def answer_messages(self, request, chat_id: int):
+        """
+        Sends the answer of a support agent to a chat.
+
+        The answer is stored as a support agent message of the chat, then sent
+        through the provider of the chat with the token of its bot.
+
+        Args:
+            request (Request): `{"support_agent": <id>, "answer": "<text>"}`.
+            chat_id (int): The ID of the chat.
+
+        Returns:
+            Response: The response with the status of the operation.
+        """
         try:
-            bot_name =  request.data['bot_name']
-            if bot_name == "telegram":
-                serializer_class =  MessageCreateSerializer
-                support_agent = request.data['support_agent']
-                support_agent = self.support_agent_service.get_by_id(support_agent)
-                answer = request.data['answer']
-                message_serializer_class = MessageCreateSerializer
-                message_serializer = message_serializer_class(data=request.data)
-                message_serializer.is_valid(raise_exception=True)
-                self.message_service.create()
-                telegram_answer = TelegramProvider()
-                telegram_answer.reply(chat_id, answer)
+            pin_to_primary()
+            chat = self.channel_service.get_by_id(int(chat_id))
+            support_agent = self.support_agent_service.get_by_id(request.data['support_agent'])
+            if support_agent is None:
+                raise ValidationError("There is no support agent with this id.")
+            answer = request.data['answer']
+            if not isinstance(answer, str) or not answer.strip():
+                raise ValidationError("The answer cannot be empty.")
+            self.message_service.create({
+                'chat_id': chat, 'sender_type': 3, 'message_content': answer, 'sender': support_agent,
+            })
+            bot_provider = provider_registry.get_by_service(chat.service, chat.bot_id.token if chat.bot_id else None)
+            if bot_provider is None:
+                raise ValidationError("This bot is not supported.")
+            bot_provider.reply(chat.chat, answer)
             return Response({"message_send": True}, status=status.HTTP_200_OK)
+        except KeyError as e:
+            return Response({"error": f"Missing field: {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except NotFound as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @method_decorator(csrf_exempt, name="dispatch")
+    @action(detail=False, methods=["post"], url_path="broadcasts", permission_classes=[permissions.IsAdminUser])
+    def create_broadcast(self, request):
+        """
+        Creates a broadcast: one message sent to many chats, given as
+        `chat_ids` or as a `filter` (`service`, `bot_id`, `open_only`,
+        `active_since`).
+
+        The outbound messages are stored right away and sent in the background
+        by `python manage.py dispatch_broadcasts`; poll `broadcasts/<id>/` for
+        the progress. Broadcasts are restricted to staff users (`is_staff`).
+
+        Args:
+            request (Request): `{"message_content": "...", "support_agent": <id>, "chat_ids": [...]}`.
+
+        Returns:
+            Response: The created broadcast (202), with the number of target chats.
+        """
+        try:
+            pin_to_primary()
+            serializer = BroadcastCreateSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            data = serializer.validated_data
+            broadcast = self.broadcast_service.create(
+                data['message_content'], data.get('support_agent'), data.get('chat_ids'), data.get('filter'),
+            )
+            return Response(BroadcastSerializer(broadcast).data, status=status.HTTP_202_ACCEPTED)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(
+        detail=False, methods=["get"], url_path=r"broadcasts/(?P<broadcast_id>\d+)",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def broadcast_progress(self, request, broadcast_id: int):
+        """
+        Returns the progress of a broadcast: its status and how many deliveries
+        were sent, failed or are pending.
+        """
+        try:
+            pin_to_primary()
+            broadcast = self.broadcast_service.get_by_id(int(broadcast_id))
+            return Response(BroadcastSerializer(broadcast).data, status=status.HTTP_200_OK)
+        except NotFound as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    @method_decorator(csrf_exempt, name="dispatch")
+    @action(
+        detail=False, methods=["post"], url_path=r"broadcasts/(?P<broadcast_id>\d+)/(?P<operation>cancel|resume)",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def change_broadcast(self, request, broadcast_id: int, operation: str):
+        """
+        Cancels a running broadcast (the chunk being sent finishes) or resumes a
+        cancelled one from its pending deliveries.
+        """
+        try:
+            pin_to_primary()
+            change = self.broadcast_service.cancel if operation == "cancel" else self.broadcast_service.resume
+            broadcast = change(int(broadcast_id))
+            return Response(BroadcastSerializer(broadcast).data, status=status.HTTP_200_OK)
+        except NotFound as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
@@ -0,0 +1,97 @@
+"""
+Database profiles for config/settings.py.
+
+The profile is picked from the environment:
+    - DATABASE_ENGINE: `sqlite` (default) or `postgres`.
+    - DJANGO_ENV: `production` tunes SQLite for concurrent writers (WAL, busy
+      timeout, immediate transactions); `development` (default) keeps the plain
+      SQLite file.
+    - DATABASE_POOL: `1` to use a psycopg connection pool on Postgres instead of
+      persistent per-worker connections (Django refuses to combine both).
+"""
+import os
+
+SQLITE_PRODUCTION_OPTIONS = {
+    # WAL lets readers run while one writer commits; NORMAL sync is durable in WAL.
+    'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+    # Wait for the write lock instead of failing with "database is locked".
+    'timeout': 20,
+    # Take the write lock at BEGIN, so a read-then-write transaction never fails
+    # on lock upgrade after the busy timeout is already spent.
+    'transaction_mode': 'IMMEDIATE',
+}
+
+
+def sqlite_database(name, production: bool) -> dict:
+    """
+    Returns the settings of a SQLite database file.
+    """
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+    }
+    if production:
+        database['OPTIONS'] = dict(SQLITE_PRODUCTION_OPTIONS)
+    return database
+
+
+def postgres_database(host: str, pool: bool) -> dict:
+    """
+    Returns the settings of a Postgres server, read from the POSTGRES_* variables.
+
+    Without a pool each worker keeps its connection for DATABASE_CONN_MAX_AGE
+    seconds and checks it before reuse (CONN_HEALTH_CHECKS). With a pool,
+    connections are borrowed per request from a psycopg pool of
+    DATABASE_POOL_MIN_SIZE to DATABASE_POOL_MAX_SIZE connections.
+    """
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'chatbot'),
+        'USER': os.environ.get('POSTGRES_USER', 'chatbot'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': host,
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 600)),
+    }
+    if pool:
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+                'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+            },
+        }
+    return database
+
+
+def build_databases(base_dir, production: bool) -> tuple[dict, list]:
+    """
+    Builds DATABASES and the list of read replica aliases.
+
+    The primary is `default`. DATABASE_REPLICA_NAMES holds comma-separated replica
+    SQLite files (relative to `base_dir`) or Postgres hosts, each exposed as a
+    `replica_<n>` alias.
+
+    Returns:
+        tuple[dict, list]: DATABASES and DATABASE_REPLICAS.
+    """
+    engine = os.environ.get('DATABASE_ENGINE', 'sqlite')
+    pool = os.environ.get('DATABASE_POOL') == '1'
+    replica_names = [name.strip() for name in os.environ.get('DATABASE_REPLICA_NAMES', '').split(',') if name.strip()]
+
+    if engine == 'postgres':
+        databases = {'default': postgres_database(os.environ.get('POSTGRES_HOST', 'localhost'), pool)}
+        replicas = [postgres_database(host, pool) for host in replica_names]
+    else:
+        name = os.environ.get('DATABASE_NAME', 'db.sqlite3')
+        databases = {'default': sqlite_database(base_dir / name, production)}
+        replicas = [sqlite_database(base_dir / name, production) for name in replica_names]
+
+    aliases = []
+    for index, replica in enumerate(replicas):
+        replica['TEST'] = {'MIRROR': 'default'}
+        databases[f'replica_{index}'] = replica
+        aliases.append(f'replica_{index}')
+    return databases, aliases
@@ -0,0 +1,62 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+
+
+def get_read_database() -> str:
+    """
+    Returns the alias repositories should read listing and search data from.
+
+    A random replica from `DATABASE_REPLICAS`, unless there is none or the current
+    request already wrote (or asked for read-your-writes), in which case `default`.
+    """
+    if _pinned_to_primary.get() or not settings.DATABASE_REPLICAS:
+        return DEFAULT_DB_ALIAS
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def pin_to_primary() -> None:
+    """
+    Sends every following read of the current request to `default`.
+    """
+    _pinned_to_primary.set(True)
+
+
+def reset_pin(token=None):
+    """
+    Starts (no token) or ends (token returned by the start call) a request scope.
+    """
+    if token is None:
+        return _pinned_to_primary.set(False)
+    _pinned_to_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router for a primary (`default`) with read replicas.
+
+    Reads are not routed implicitly: a query only goes to a replica when its
+    repository asks for it with `.using(get_read_database())`, so any read that is
+    not known to tolerate replication lag stays on the primary. Every write goes to
+    the primary and pins the rest of the request to it, which gives
+    read-your-writes within a request.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _pinned_to_primary.get():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        _pinned_to_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
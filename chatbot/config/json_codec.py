@@ -0,0 +1,146 @@
+"""
+JSON encoding and decoding for webhook bodies, API requests and API responses.
+
+`settings.JSON_CODEC` picks the implementation: 'orjson' (the default, used
+when the package is installed, several times faster than the stdlib on both
+directions) or 'json' for the standard library.
+
+Decoding gives the same values with both codecs: documents orjson rejects
+(NaN / Infinity literals, numbers beyond a double, lone surrogates) or would
+decode differently (integers beyond 64 bits, which orjson turns into floats)
+are decoded by the stdlib instead, so the choice of codec never changes which
+payloads are accepted nor what they mean.
+
+Encoding produces compact UTF-8 bytes with both; values orjson cannot encode
+natively (datetimes, Decimals, lazy strings, ...) go through `default`, and
+anything orjson rejects (integers beyond 64 bits) is encoded by the stdlib.
+The bytes may still differ: orjson writes NaN and infinities as null (the
+stdlib writes the non-standard NaN / Infinity) and float exponents in their
+shortest form (1e16, 1e-7 instead of 1e+16, 1e-07).
+
+`JSONParser` and `JSONRenderer` plug the codec into DRF through
+`REST_FRAMEWORK['DEFAULT_PARSER_CLASSES']` / `['DEFAULT_RENDERER_CLASSES']`.
+"""
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Raised by `loads` for invalid JSON or invalid UTF-8, whichever codec is used
+# (orjson.JSONDecodeError is a subclass).
+JSONDecodeError = json.JSONDecodeError
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+# Digit runs that may be an integer outside orjson's [-2**63, 2**64) range; also
+# matches long digit strings, which merely take the stdlib path.
+BIG_INTEGER = re.compile(r'-\d{19}|\d{20}')
+BIG_INTEGER_BYTES = re.compile(BIG_INTEGER.pattern.encode())
+
+
+def use_orjson() -> bool:
+    """
+    Returns whether `settings.JSON_CODEC` selects orjson and it is installed.
+    """
+    codec = settings.JSON_CODEC
+    if codec == 'json':
+        return False
+    if codec != 'orjson':
+        raise ImproperlyConfigured(f"JSON_CODEC must be 'orjson' or 'json', not {codec!r}.")
+    return orjson is not None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decodes a JSON document.
+
+    Args:
+        data (bytes | str): The document, e.g. `request.body`.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        JSONDecodeError: If the document is not valid UTF-8 JSON.
+    """
+    if use_orjson():
+        big_integer = BIG_INTEGER if isinstance(data, str) else BIG_INTEGER_BYTES
+        if not big_integer.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Left to the stdlib: it accepts NaN, 1e400 and lone surrogates, and raises for invalid JSON.
+                pass
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        raise JSONDecodeError(str(e), '', 0) from e
+
+
+def dumps(value: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encodes a value as compact UTF-8 JSON.
+
+    Args:
+        value (Any): The value to encode.
+        default (Callable, optional): Called with the objects JSON cannot represent,
+            returns a representable replacement or raises TypeError.
+
+    Returns:
+        bytes: The document.
+    """
+    if use_orjson():
+        try:
+            return orjson.dumps(value, default=default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class JSONParser(parsers.JSONParser):
+    """
+    DRF JSON parser decoding request bodies with the configured codec.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return loads(stream.read())
+        except ValueError as e:
+            raise ParseError(f"JSON parse error - {e}")
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF JSON renderer encoding responses with the configured codec.
+
+    Compact output renders the same document as DRF's renderer, except that
+    NaN and infinities become null instead of raising and float exponents are
+    written in their shortest form (1e16 rather than 1e+16); indented output
+    (`Accept: application/json; indent=4`) and non-default UNICODE_JSON /
+    COMPACT_JSON settings are left to it.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            not use_orjson() or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        content = dumps(data, default=self.encoder_class().default)
+        # Like DRF: U+2028 / U+2029 are valid JSON but end lines in JavaScript.
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
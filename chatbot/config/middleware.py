@@ -0,0 +1,223 @@
+import gzip
+import ipaddress
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from config.db_router import reset_pin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class PrimaryDatabaseStickinessMiddleware:
+    """
+    Scopes the primary-database pin of `config.db_router` to a single request:
+    each request starts reading from replicas, and a write only pins the rest of
+    the request that made it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = reset_pin()
+        try:
+            return self.get_response(request)
+        finally:
+            reset_pin(token)
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: each key may spend `burst` requests at once and
+    regains `rate` requests per second.
+
+    Buckets live in process memory. When `max_clients` keys are tracked, the
+    buckets that refilled completely are dropped (they would be recreated
+    identical), then the least recently used ones.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: float = None) -> bool:
+        """
+        Spends one token of `key`.
+
+        Returns:
+            bool: False if the bucket of `key` is empty.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._prune(now)
+                bucket = self._buckets[key] = [float(self.burst), now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+    def _prune(self, now: float) -> None:
+        refill_seconds = self.burst / self.rate
+        for key in [key for key, (_, updated_at) in self._buckets.items() if now - updated_at >= refill_seconds]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_clients:
+            by_age = sorted(self._buckets, key=lambda key: self._buckets[key][1])
+            for key in by_age[:len(by_age) // 2 + 1]:
+                del self._buckets[key]
+
+
+@lru_cache(maxsize=4096)
+def is_exempt_address(address: str, networks: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in ipaddress.ip_network(network) for network in networks)
+
+
+class WebhookGuardMiddleware:
+    """
+    Cheap checks for webhook requests (paths under `WEBHOOK_PATH_PREFIX`), run
+    before any other middleware and before the body is read:
+        - a per-source-IP token bucket (`WEBHOOK_RATE_LIMIT` requests per second,
+          bursts of `WEBHOOK_RATE_BURST`), answered with 429. Provider networks in
+          `WEBHOOK_RATE_LIMIT_EXEMPT_NETWORKS` (Telegram's, by default) are not
+          limited, since every bot of the deployment is delivered from them;
+        - the declared body size of POST requests: 411 without Content-Length,
+          413 above `WEBHOOK_MAX_BODY_SIZE`.
+
+    The buckets are per process, so a deployment of N workers admits up to N
+    times the configured rate.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limiter = TokenBucketLimiter(
+            settings.WEBHOOK_RATE_LIMIT, settings.WEBHOOK_RATE_BURST, settings.WEBHOOK_RATE_MAX_CLIENTS
+        )
+
+    @staticmethod
+    def client_address(request) -> str:
+        if settings.WEBHOOK_CLIENT_IP_HEADER:
+            forwarded = request.META.get(settings.WEBHOOK_CLIENT_IP_HEADER)
+            if forwarded:
+                return forwarded.split(',')[-1].strip()
+        return request.META.get('REMOTE_ADDR', '')
+
+    def __call__(self, request):
+        if not request.path_info.startswith(settings.WEBHOOK_PATH_PREFIX):
+            return self.get_response(request)
+
+        address = self.client_address(request)
+        if not is_exempt_address(address, tuple(settings.WEBHOOK_RATE_LIMIT_EXEMPT_NETWORKS)):
+            if not self.limiter.allow(address):
+                response = JsonResponse({"error": "Too many requests."}, status=429)
+                response['Retry-After'] = str(max(1, round(1 / settings.WEBHOOK_RATE_LIMIT)))
+                return response
+
+        if request.method != 'POST':
+            return self.get_response(request)
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or -1)
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            return HttpResponse(status=411)
+        if content_length > settings.WEBHOOK_MAX_BODY_SIZE:
+            return JsonResponse({"error": "Request body too large."}, status=413)
+
+        return self.get_response(request)
+
+
+def accepted_encodings(header: str) -> dict:
+    """
+    Parses an Accept-Encoding header into {coding: q-value}.
+    """
+    encodings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli (when the `brotli` package is installed)
+    or gzip, as negotiated by Accept-Encoding (brotli wins ties, the q-values
+    of `*` apply to unlisted codings).
+
+    Only complete (non-streaming) responses of at least
+    `RESPONSE_COMPRESSION_MIN_SIZE` bytes and of a textual type (JSON, text,
+    JavaScript, XML) are compressed, at `RESPONSE_GZIP_LEVEL` /
+    `RESPONSE_BROTLI_QUALITY`; the compressed body is kept only when smaller.
+    Strong ETags become weak, since the bytes now depend on the encoding.
+    """
+
+    COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def choose_encoding(header: str) -> Optional[str]:
+        encodings = accepted_encodings(header)
+        wildcard = encodings.get('*', 0.0)
+        available = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best = max(available, key=lambda coding: encodings.get(coding, wildcard))
+        return best if encodings.get(best, wildcard) > 0 else None
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(self.COMPRESSIBLE_TYPES)
+            or len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        if encoding == 'br':
+            content = brotli.compress(response.content, quality=settings.RESPONSE_BROTLI_QUALITY)
+        else:
+            content = gzip.compress(response.content, compresslevel=settings.RESPONSE_GZIP_LEVEL, mtime=0)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -1,15 +1,34 @@
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from config.databases import build_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-SECRET_KEY = 'django-insecure-cb-550q)%5r9c(lwh!2)h(as^h_9!^3=ozz3f&2wgb^uy&t&&c'
+# Profile
+# DJANGO_ENV=production turns DEBUG off (so connections stop recording every
+# query in memory), requires DJANGO_SECRET_KEY and tunes the database for
+# concurrent writers (see config/databases.py).
+
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'development')
+
+PRODUCTION = DJANGO_ENV == 'production'
 
-DEBUG = True
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-cb-550q)%5r9c(lwh!2)h(as^h_9!^3=ozz3f&2wgb^uy&t&&c')
+
+if PRODUCTION and 'DJANGO_SECRET_KEY' not in os.environ:
+    raise ImproperlyConfigured("DJANGO_SECRET_KEY must be set when DJANGO_ENV=production.")
+
+DEBUG = not PRODUCTION
 
 ALLOWED_HOSTS = ['f1dc-2804-5b8-8c29-5500-3960-7753-a9cf-72d.ngrok-free.app', 'localhost:8000', "localhost"]
 
+ALLOWED_HOSTS += [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
+
 
 # Application definition
 
@@ -26,10 +45,13 @@ INSTALLED_APPS = [
     "chat",
     "supportAgent",
     "contact",
-    "message"
+    "message",
+    "analytics",
 ]
 
 MIDDLEWARE = [
+    'config.middleware.WebhookGuardMiddleware',
+    'config.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -37,14 +59,42 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.middleware.PrimaryDatabaseStickinessMiddleware',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly'
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.json_codec.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.json_codec.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# JSON codec
+# Webhook bodies, API requests and API responses are decoded and encoded by
+# config/json_codec.py with orjson when it is installed; JSON_CODEC=json forces
+# the standard library.
+
+JSON_CODEC = os.environ.get('JSON_CODEC', 'orjson')
+
+# Response compression
+# Responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are compressed with
+# brotli (if installed) or gzip, as negotiated by Accept-Encoding. Listings also
+# answer If-None-Match / If-Modified-Since with 304 from an index lookup.
+
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+
+RESPONSE_GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', 6))
+
+RESPONSE_BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', 5))
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -69,12 +119,17 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+DATABASES, DATABASE_REPLICAS = build_databases(BASE_DIR, PRODUCTION)
+
+# Read replicas
+# DATABASE_REPLICA_NAMES lists the replica SQLite files (or Postgres hosts), e.g.
+# locally with two SQLite files:
+#   cp db.sqlite3 db.replica.sqlite3
+#   DATABASE_REPLICA_NAMES=db.replica.sqlite3 python manage.py runserver
+# Listing and search reads of the repositories go to a replica; writes, and every
+# read after a write in the same request, go to `default` (see config/db_router.py).
+
+DATABASE_ROUTERS = ['config.db_router.PrimaryReplicaRouter']
 
 
 # Password validation
@@ -117,3 +172,289 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Chat lifecycle
+# Chats with no inbound activity for CHAT_IDLE_TTL seconds are closed by the
+# sweeper (`python manage.py sweep_chats`). A closed chat is reopened if the
+# contact writes again within CHAT_REOPEN_WINDOW seconds, otherwise a new chat
+# is started. Chats closed for longer than CHAT_ARCHIVE_AFTER seconds are moved,
+# with their messages (monthly partitions included), to the archive tables
+# CHAT_ARCHIVE_BATCH_SIZE at a time.
+
+CHAT_IDLE_TTL = int(os.environ.get('CHAT_IDLE_TTL', 30 * 60))
+
+CHAT_REOPEN_WINDOW = int(os.environ.get('CHAT_REOPEN_WINDOW', 24 * 60 * 60))
+
+CHAT_ARCHIVE_AFTER = int(os.environ.get('CHAT_ARCHIVE_AFTER', 7 * 24 * 60 * 60))
+
+CHAT_ARCHIVE_BATCH_SIZE = int(os.environ.get('CHAT_ARCHIVE_BATCH_SIZE', 500))
+
+
+# Inbox
+# `/channel/inbox/` pages CHAT_INBOX_PAGE_SIZE chats (at most
+# CHAT_INBOX_MAX_PAGE_SIZE) with their contact, agent and last CHAT_INBOX_MESSAGES
+# messages (at most CHAT_INBOX_MAX_MESSAGES), in a fixed number of queries.
+
+CHAT_INBOX_PAGE_SIZE = int(os.environ.get('CHAT_INBOX_PAGE_SIZE', 50))
+
+CHAT_INBOX_MAX_PAGE_SIZE = int(os.environ.get('CHAT_INBOX_MAX_PAGE_SIZE', 200))
+
+CHAT_INBOX_MESSAGES = int(os.environ.get('CHAT_INBOX_MESSAGES', 20))
+
+CHAT_INBOX_MAX_MESSAGES = int(os.environ.get('CHAT_INBOX_MAX_MESSAGES', 100))
+
+
+# Conversation state
+# The bot flow node of each chat lives in memory (the CHAT_STATE_CACHE_SIZE most
+# recently used chats of each worker, dropped after CHAT_STATE_IDLE_TTL seconds
+# without use) and is written behind to the ChatState table in batches of
+# CHAT_STATE_FLUSH_BATCH_SIZE states, or every CHAT_STATE_FLUSH_INTERVAL seconds.
+
+CHAT_STATE_CACHE_SIZE = int(os.environ.get('CHAT_STATE_CACHE_SIZE', 10_000))
+
+CHAT_STATE_IDLE_TTL = int(os.environ.get('CHAT_STATE_IDLE_TTL', 30 * 60))
+
+CHAT_STATE_FLUSH_BATCH_SIZE = int(os.environ.get('CHAT_STATE_FLUSH_BATCH_SIZE', 100))
+
+CHAT_STATE_FLUSH_INTERVAL = float(os.environ.get('CHAT_STATE_FLUSH_INTERVAL', 5))
+
+
+# Intent classification
+# Free text is matched to a flow node by a local model trained by
+# `python manage.py train_intents` into INTENT_MODEL_PATH and memory-mapped by
+# each worker. Predictions below INTENT_MIN_CONFIDENCE are ignored.
+
+INTENT_MODEL_PATH = Path(os.environ.get('INTENT_MODEL_PATH', BASE_DIR / 'models' / 'intents.bin'))
+
+INTENT_HASH_BUCKETS = int(os.environ.get('INTENT_HASH_BUCKETS', 2 ** 18))
+
+INTENT_MIN_CONFIDENCE = float(os.environ.get('INTENT_MIN_CONFIDENCE', 0.5))
+
+
+# Keyword matching
+# Commands, keywords and moderation terms of MATCHER_RULES_PATH are compiled into
+# one Aho-Corasick automaton per worker; the file is checked for changes every
+# MATCHER_RELOAD_INTERVAL seconds and recompiled when it changes (a file that
+# cannot be read or parsed is logged and the previous rules are kept).
+
+MATCHER_RULES_PATH = Path(os.environ.get('MATCHER_RULES_PATH', BASE_DIR / 'chat' / 'data' / 'matcher_rules.json'))
+
+MATCHER_RELOAD_INTERVAL = float(os.environ.get('MATCHER_RELOAD_INTERVAL', 30))
+
+
+# Knowledge base
+# Active FaqArticle rows are embedded as hashed n-gram vectors into a memory-mapped
+# index at FAQ_INDEX_PATH, rebuilt incrementally in the background
+# FAQ_REBUILD_DELAY seconds after an article changes (0 rebuilds right away);
+# other workers pick up the new file within FAQ_INDEX_RELOAD_INTERVAL seconds. Free-text
+# questions get up to FAQ_TOP_K articles scoring at least FAQ_MIN_SCORE.
+
+FAQ_INDEX_PATH = Path(os.environ.get('FAQ_INDEX_PATH', BASE_DIR / 'models' / 'faq.idx'))
+
+FAQ_HASH_BUCKETS = int(os.environ.get('FAQ_HASH_BUCKETS', 2 ** 18))
+
+FAQ_TOP_K = int(os.environ.get('FAQ_TOP_K', 3))
+
+FAQ_MIN_SCORE = float(os.environ.get('FAQ_MIN_SCORE', 0.2))
+
+FAQ_INDEX_RELOAD_INTERVAL = float(os.environ.get('FAQ_INDEX_RELOAD_INTERVAL', 30))
+
+FAQ_REBUILD_DELAY = float(os.environ.get('FAQ_REBUILD_DELAY', 5))
+
+
+# Message partitioning
+# The Message table only keeps the last MESSAGE_HOT_MONTHS months (current month
+# included). Older months are moved by `python manage.py partition_messages` to
+# one partition per month: a `message_message_YYYYMM` table on Postgres, or a
+# `message_YYYYMM.sqlite3` database in MESSAGE_PARTITION_DIR attached on demand
+# on SQLite. Partitions older than MESSAGE_RETENTION_MONTHS are dropped whole.
+
+MESSAGE_HOT_MONTHS = int(os.environ.get('MESSAGE_HOT_MONTHS', 1))
+
+MESSAGE_RETENTION_MONTHS = int(os.environ.get('MESSAGE_RETENTION_MONTHS', 12))
+
+MESSAGE_PARTITION_DIR = Path(os.environ.get('MESSAGE_PARTITION_DIR', BASE_DIR / 'partitions'))
+
+MESSAGE_PARTITION_BATCH_SIZE = int(os.environ.get('MESSAGE_PARTITION_BATCH_SIZE', 1000))
+
+# `GET /message/?start=&end=` reads every message of the range (hot table and
+# partitions) to build its page, so the range may span MESSAGE_RANGE_MAX_DAYS
+# days at most; both bounds must carry a UTC offset.
+
+MESSAGE_RANGE_MAX_DAYS = int(os.environ.get('MESSAGE_RANGE_MAX_DAYS', 31))
+
+
+# Message attachments
+# Files sent with messages are recorded by the webhook and downloaded by
+# `python manage.py fetch_attachments` in ATTACHMENT_CHUNK_SIZE chunks into a
+# content-addressed store under ATTACHMENT_ROOT (one file per distinct content).
+# Downloads stop at ATTACHMENT_MAX_SIZE (the Bot API serves files up to 20 MB)
+# and are retried up to ATTACHMENT_FETCH_MAX_ATTEMPTS times.
+# `/message/attachments/<id>/` serves them with range requests; behind nginx set
+# ATTACHMENT_SENDFILE_HEADER=X-Accel-Redirect and ATTACHMENT_SENDFILE_ROOT to the
+# internal location aliased to ATTACHMENT_ROOT (X-Sendfile takes the filesystem path).
+# Discord attachment URLs come from the webhook body: only URLs of the
+# DISCORD_ATTACHMENT_ORIGINS (scheme://host) are stored and downloaded, and a
+# redirect to any other origin aborts the download.
+
+ATTACHMENT_ROOT = Path(os.environ.get('ATTACHMENT_ROOT', BASE_DIR / 'attachments'))
+
+ATTACHMENT_CHUNK_SIZE = int(os.environ.get('ATTACHMENT_CHUNK_SIZE', 64 * 1024))
+
+ATTACHMENT_MAX_SIZE = int(os.environ.get('ATTACHMENT_MAX_SIZE', 20 * 1024 * 1024))
+
+ATTACHMENT_DOWNLOAD_TIMEOUT = int(os.environ.get('ATTACHMENT_DOWNLOAD_TIMEOUT', 30))
+
+ATTACHMENT_FETCH_BATCH_SIZE = int(os.environ.get('ATTACHMENT_FETCH_BATCH_SIZE', 100))
+
+ATTACHMENT_FETCH_MAX_ATTEMPTS = int(os.environ.get('ATTACHMENT_FETCH_MAX_ATTEMPTS', 5))
+
+ATTACHMENT_SENDFILE_HEADER = os.environ.get('ATTACHMENT_SENDFILE_HEADER', '')
+
+ATTACHMENT_SENDFILE_ROOT = os.environ.get('ATTACHMENT_SENDFILE_ROOT', str(ATTACHMENT_ROOT))
+
+DISCORD_ATTACHMENT_ORIGINS = [
+    origin.strip().rstrip('/') for origin in os.environ.get(
+        'DISCORD_ATTACHMENT_ORIGINS', 'https://cdn.discordapp.com,https://media.discordapp.net'
+    ).split(',') if origin.strip()
+]
+
+
+# Broadcasts
+# A broadcast stores its outbound messages in bulk INSERTs of BROADCAST_BATCH_SIZE
+# rows; `python manage.py dispatch_broadcasts --loop` sends them BROADCAST_CHUNK_SIZE
+# at a time, BROADCAST_CONCURRENCY at once and at most BROADCAST_RATE per second
+# per bot (Telegram allows about 30). Failed sends are retried up to
+# BROADCAST_MAX_ATTEMPTS times. Each chunk is claimed for BROADCAST_CLAIM_TTL
+# seconds and sent outside any transaction; a chunk left claimed by a dispatcher
+# that died is sent again once the claim expires, so keep it well above the time
+# a chunk takes to send.
+
+BROADCAST_BATCH_SIZE = int(os.environ.get('BROADCAST_BATCH_SIZE', 1000))
+
+BROADCAST_CHUNK_SIZE = int(os.environ.get('BROADCAST_CHUNK_SIZE', 100))
+
+BROADCAST_RATE = float(os.environ.get('BROADCAST_RATE', 25))
+
+BROADCAST_BURST = int(os.environ.get('BROADCAST_BURST', 25))
+
+BROADCAST_CONCURRENCY = int(os.environ.get('BROADCAST_CONCURRENCY', 8))
+
+BROADCAST_MAX_ATTEMPTS = int(os.environ.get('BROADCAST_MAX_ATTEMPTS', 3))
+
+BROADCAST_CLAIM_TTL = int(os.environ.get('BROADCAST_CLAIM_TTL', 300))
+
+BROADCAST_MAX_CHAT_IDS = int(os.environ.get('BROADCAST_MAX_CHAT_IDS', 100000))
+
+
+# Analytics
+# `python manage.py rollup_messages --loop` adds new messages to hourly rollups per
+# chat service and per support agent, ANALYTICS_BATCH_SIZE messages per
+# transaction, leaving the ones younger than ANALYTICS_ROLLUP_DELAY seconds for
+# the next run. Ids skipped because their transaction committed after a later id
+# are re-scanned by the rollup and the export for ANALYTICS_RESCAN_WINDOW
+# seconds. /analytics/ endpoints cover the last ANALYTICS_DEFAULT_DAYS days
+# unless `start` is given.
+
+ANALYTICS_BATCH_SIZE = int(os.environ.get('ANALYTICS_BATCH_SIZE', 5000))
+
+ANALYTICS_ROLLUP_DELAY = int(os.environ.get('ANALYTICS_ROLLUP_DELAY', 10))
+
+ANALYTICS_RESCAN_WINDOW = int(os.environ.get('ANALYTICS_RESCAN_WINDOW', 3600))
+
+ANALYTICS_DEFAULT_DAYS = int(os.environ.get('ANALYTICS_DEFAULT_DAYS', 7))
+
+# `python manage.py export_analytics` writes messages, chats and contacts added
+# since its last run to date-partitioned Parquet (or Arrow IPC) files under
+# EXPORT_ROOT, reading and writing EXPORT_CHUNK_SIZE rows at a time.
+
+EXPORT_ROOT = Path(os.environ.get('EXPORT_ROOT', BASE_DIR / 'exports'))
+
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 50000))
+
+EXPORT_MAX_OPEN_PARTITIONS = int(os.environ.get('EXPORT_MAX_OPEN_PARTITIONS', 32))
+
+# Each worker tracks the open chats waiting for an agent reply in memory
+# (/analytics/waiting/, /analytics/metrics/) and rebuilds the list from the
+# database every SLA_RESYNC_INTERVAL seconds. Chats waiting longer than
+# SLA_TARGET_SECONDS breach the SLA.
+
+SLA_TARGET_SECONDS = int(os.environ.get('SLA_TARGET_SECONDS', 300))
+
+SLA_RESYNC_INTERVAL = int(os.environ.get('SLA_RESYNC_INTERVAL', 30))
+
+
+# Chat providers
+# Webhooks are routed to a provider by path (`/channel/receive-messages/<name>/`)
+# or, on the shared `/channel/receive-messages/` path, by the provider header.
+# Only the providers listed in CHAT_PROVIDERS are imported, on their first update.
+
+AVAILABLE_CHAT_PROVIDERS = {
+    'telegram': {
+        'class': 'chat.providers.telegram_provider.TelegramProvider',
+        'header': 'X-Telegram-Bot-Api-Secret-Token',
+    },
+    'discord': {
+        'class': 'chat.providers.discord_provider.DiscordProvider',
+        'header': 'X-Discord-Event',
+    },
+}
+
+CHAT_PROVIDERS = [
+    name.strip() for name in os.environ.get('CHAT_PROVIDERS', 'telegram').split(',') if name.strip()
+]
+
+DISCORD_BOT_TOKEN = os.environ.get('DISCORD_BOT_TOKEN')
+
+# Bots registered in the Bot table receive updates on
+# `/channel/receive-messages/<provider>/<webhook_key>/`. Each bot is loaded on its
+# first update and cached for BOT_REGISTRY_TTL seconds (at most
+# BOT_REGISTRY_CACHE_SIZE bots per process; unknown keys are not cached); at most
+# CHAT_PROVIDER_POOL_SIZE provider instances (one per token) are kept per process,
+# all sharing one HTTP connection pool of TELEGRAM_HTTP_POOL_SIZE connections.
+
+BOT_REGISTRY_TTL = int(os.environ.get('BOT_REGISTRY_TTL', 60))
+
+BOT_REGISTRY_CACHE_SIZE = int(os.environ.get('BOT_REGISTRY_CACHE_SIZE', 1024))
+
+CHAT_PROVIDER_POOL_SIZE = int(os.environ.get('CHAT_PROVIDER_POOL_SIZE', 4096))
+
+TELEGRAM_HTTP_POOL_SIZE = int(os.environ.get('TELEGRAM_HTTP_POOL_SIZE', 32))
+
+DISCORD_API_BASE = os.environ.get('DISCORD_API_BASE', 'https://discord.com/api/v10')
+
+
+# Webhook protection
+# Requests to WEBHOOK_PATH_PREFIX are rate limited per source IP and size checked
+# by config.middleware.WebhookGuardMiddleware before anything else runs. Then the
+# provider checks its secret header in constant time before the body is parsed:
+# `X-Telegram-Bot-Api-Secret-Token` against Bot.webhook_secret, or
+# TELEGRAM_WEBHOOK_SECRET for the default bot (the `secret_token` of setWebhook),
+# and `X-Discord-Relay-Secret` against DISCORD_RELAY_SECRET. An empty secret
+# disables the check.
+
+WEBHOOK_PATH_PREFIX = '/channel/receive-messages'
+
+WEBHOOK_MAX_BODY_SIZE = int(os.environ.get('WEBHOOK_MAX_BODY_SIZE', 128 * 1024))
+
+WEBHOOK_RATE_LIMIT = float(os.environ.get('WEBHOOK_RATE_LIMIT', 20))
+
+WEBHOOK_RATE_BURST = int(os.environ.get('WEBHOOK_RATE_BURST', 100))
+
+WEBHOOK_RATE_MAX_CLIENTS = int(os.environ.get('WEBHOOK_RATE_MAX_CLIENTS', 100_000))
+
+# Telegram delivers webhooks from these networks (core.telegram.org/bots/webhooks).
+WEBHOOK_RATE_LIMIT_EXEMPT_NETWORKS = [
+    network.strip()
+    for network in os.environ.get('WEBHOOK_RATE_LIMIT_EXEMPT_NETWORKS', '149.154.160.0/20,91.108.4.0/22').split(',')
+    if network.strip()
+]
+
+# META key of the client address set by a trusted reverse proxy, e.g.
+# HTTP_X_FORWARDED_FOR (its last entry is used). Empty to use REMOTE_ADDR.
+WEBHOOK_CLIENT_IP_HEADER = os.environ.get('WEBHOOK_CLIENT_IP_HEADER', '')
+
+TELEGRAM_WEBHOOK_SECRET = os.environ.get('TELEGRAM_WEBHOOK_SECRET', '')
+
+DISCORD_RELAY_SECRET = os.environ.get('DISCORD_RELAY_SECRET', '')
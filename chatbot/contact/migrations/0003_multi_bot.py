@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0007_multi_bot"),
+        ("contact", "0002_alter_contact_email_alter_contact_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contact",
+            name="bot_id",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="bot_contacts",
+                to="chat.bot",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(fields=["bot_id", "name"], name="contact_bot_name_idx"),
+        ),
+    ]
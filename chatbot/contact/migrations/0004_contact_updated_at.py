@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0010_faq_articles"),
+        ("contact", "0003_multi_bot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contact",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(fields=["updated_at"], name="contact_updated_idx"),
+        ),
+    ]
@@ -10,12 +10,24 @@ class Contact(models.Model):
         - telephone: Telephone number of the contact (optional).
         - email: Unique and non-null email address of the contact.
         - name: Full name of the contact (non-null).
+        - bot_id: ForeignKey reference to the bot the contact wrote to (None for the default bot).
+        - updated_at: When the contact was created or last changed (validator of the contact listing).
     """
     id = models.AutoField(primary_key=True)
     cpf = models.CharField(max_length=11, blank=True, null=True)
     telephone = models.CharField(max_length=15, blank=True, null=True)
     email = models.EmailField(unique=True, blank=True, null=True)
     name = models.CharField(max_length=255, blank=True, null=True)
+    bot_id = models.ForeignKey(
+        'chat.Bot', on_delete=models.CASCADE, related_name='bot_contacts', null=True, blank=True
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['bot_id', 'name'], name='contact_bot_name_idx'),
+            models.Index(fields=['updated_at'], name='contact_updated_idx'),
+        ]
 
     def __str__(self):
         """
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
 
+from django.db.models import QuerySet
+
+from chat.models import Bot
 from contact.models import Contact
 
 class AbstractContactRepository(ABC):
@@ -48,6 +51,20 @@ class AbstractContactRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_or_create_by_name(self, name: str, bot: Bot = None) -> Contact:
+        """
+        Method to retrieve a contact by its name, creating it if missing.
+
+        Args:
+            name (str): The name of the contact.
+            bot (Bot, optional): The bot the contact wrote to; None for the default bot.
+
+        Returns:
+            Contact: The existing or created contact instance.
+        """
+        pass
+
     @abstractmethod
     def delete(self, Contact: int) -> None:
         """
@@ -57,3 +74,13 @@ class AbstractContactRepository(ABC):
             contact_id (int): The unique identifier of the contact to delete.
         """
         pass
+
+    @abstractmethod
+    def get_version(self, contacts: QuerySet) -> tuple:
+        """
+        Method to get the validators (write counter, latest id and `updated_at`) of a contact listing.
+
+        Args:
+            contacts (QuerySet): The listed contacts.
+        """
+        pass
@@ -1,5 +1,12 @@
+from django.db import transaction
+from django.db.models import Max, QuerySet
+
+from config.db_router import get_read_database
 from contact.repositories.abstract_contact_repository import AbstractContactRepository
 from contact.models import Contact
+from chat.models import Bot
+from message.models import ListingVersion
+from message.repositories.listing_version_repository import ListingVersionRepository
 
 class ContactRepository(AbstractContactRepository):
     """
@@ -7,6 +14,7 @@ class ContactRepository(AbstractContactRepository):
     
     This repository provides CRUD operations (Create, Read, Update, Delete) for managing 
     Contact records. It interacts with the Django ORM to perform operations on the `Contact` model.
+    Reads (`get_*`) are served by a read replica unless the request is pinned to the primary.
     """
     
     @staticmethod
@@ -24,14 +32,13 @@ class ContactRepository(AbstractContactRepository):
         Raises:
             ValueError: If the data provided is invalid or incomplete.
         """
-        contact = Contact.objects.create(**data)
-        contact.save()
-        return contact
+        return Contact.objects.create(**data)
 
     @staticmethod
     def update(contact: Contact, message_data: dict) -> None:
         """
-        Updates an existing contact record with the provided data.
+        Updates an existing contact record with the provided data, writing only the
+        columns present in `message_data` and `updated_at`.
         
         Args:
             contact (Contact): The `Contact` object to be updated.
@@ -40,11 +47,11 @@ class ContactRepository(AbstractContactRepository):
         Raises:
             ValueError: If the data provided is invalid or incomplete.
         """
-        chat = message_data.pop("chat")
         for key, value in message_data.items():
             setattr(contact, key, value)
-        contact.chat.set(chat[0])  # Assuming 'chat' is a related model
-        contact.save()
+        with transaction.atomic(savepoint=False):
+            contact.save(update_fields=[*message_data, 'updated_at'])
+            ListingVersionRepository.bump(ListingVersion.CONTACTS)
 
     @staticmethod
     def get_by_id(contact_id: int) -> Contact:
@@ -58,7 +65,7 @@ class ContactRepository(AbstractContactRepository):
             Contact: The `Contact` instance corresponding to the provided ID. Returns None 
                      if no contact is found.
         """
-        contact = Contact.objects.filter(id=contact_id).first()
+        contact = Contact.objects.using(get_read_database()).filter(id=contact_id).first()
         return contact
 
     @staticmethod
@@ -73,13 +80,31 @@ class ContactRepository(AbstractContactRepository):
             Contact: The `Contact` instance corresponding to the provided name. Returns None 
                      if no contact is found.
         """
-        contact = Contact.objects.filter(name=name).first()
+        contact = Contact.objects.using(get_read_database()).filter(name=name).first()
+        return contact
+
+    @staticmethod
+    def get_or_create_by_name(name: str, bot: Bot = None) -> Contact:
+        """
+        Retrieves a contact of a bot by its name from the primary database,
+        creating it if it does not exist yet. Served by `contact_bot_name_idx`.
+
+        Args:
+            name (str): The name of the contact.
+            bot (Bot, optional): The bot the contact wrote to; None for the default bot.
+
+        Returns:
+            Contact: The existing or created `Contact` instance.
+        """
+        contact = Contact.objects.filter(bot_id=bot, name=name).first()
+        if contact is None:
+            contact = Contact.objects.create(name=name, bot_id=bot)
         return contact
 
     @staticmethod
     def delete(contact_id: int) -> None:
         """
-        Deletes the contact record with the given ID.
+        Deletes the contact record with the given ID, with its chats and their messages.
         
         Args:
             contact_id (int): The ID of the contact to be deleted.
@@ -87,7 +112,30 @@ class ContactRepository(AbstractContactRepository):
         Raises:
             DoesNotExist: If no contact with the given ID exists.
         """
-        Contact.objects.filter(id=contact_id).delete()
+        with transaction.atomic():
+            Contact.objects.filter(id=contact_id).delete()
+            ListingVersionRepository.bump(ListingVersion.CONTACTS, ListingVersion.MESSAGES)
+
+    @staticmethod
+    def get_version(contacts: QuerySet) -> tuple:
+        """
+        Returns the validators of a contact listing: the write counter of the
+        contacts (an update or a delete bumps it), the latest id (an insert
+        changes it) and the latest `updated_at`. Each maximum is read in its
+        own query, from one end of the primary key and `contact_updated_idx`.
+
+        Args:
+            contacts (QuerySet): The listed contacts.
+
+        Returns:
+            tuple: (counter, id, updated_at), None for the missing maxima.
+        """
+        contacts = contacts.order_by()
+        return (
+            ListingVersionRepository.get(ListingVersion.CONTACTS),
+            contacts.aggregate(value=Max('id'))['value'],
+            contacts.aggregate(value=Max('updated_at'))['value'],
+        )
 
     @staticmethod
     def get_all() -> list[Contact]:
@@ -97,5 +145,5 @@ class ContactRepository(AbstractContactRepository):
         Returns:
             list[Contact]: A list of all `Contact` objects.
         """
-        contacts = Contact.objects.all()
+        contacts = Contact.objects.using(get_read_database()).all()
         return contacts
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from chat.models import Bot
 from contact.models import Contact
 
 class AbstractContactService(ABC):
@@ -47,6 +48,20 @@ class AbstractContactService(ABC):
             Contact: The contact object corresponding to the provided name.
         """
 
+    @abstractmethod
+    def get_or_create_by_name(self, name: str, bot: Bot = None) -> Contact:
+        """
+        Retrieve a contact by its name, creating it if it does not exist yet.
+
+        Args:
+            name (str): The name of the contact.
+            bot (Bot, optional): The bot the contact wrote to; None for the default bot.
+
+        Returns:
+            Contact: The existing or created contact object.
+        """
+        pass
+
     @abstractmethod
     def get_contact_by_id(self, contact_id: int) -> Contact:
         """
@@ -92,3 +107,16 @@ class AbstractContactService(ABC):
             list[Contact]: A list of all contact objects.
         """
         pass
+
+    @abstractmethod
+    def get_version(self, contacts) -> tuple:
+        """
+        Retrieve the validators (latest id and `updated_at`) of a contact listing.
+
+        Args:
+            contacts (QuerySet): The listed contacts.
+
+        Returns:
+            tuple: The validators of the listing.
+        """
+        pass
@@ -1,6 +1,7 @@
 from django.forms import ValidationError
 from contact.repositories.contact_repository import ContactRepository
 from contact.models import Contact
+from chat.models import Bot
 from rest_framework import status
 from contact.services.abstract_contact_service import AbstractContactService
 
@@ -95,6 +96,19 @@ class ContactService(AbstractContactService):
             return None
         return contact
 
+    def get_or_create_by_name(self, name: str, bot: Bot = None) -> Contact:
+        """
+        Retrieves a contact of a bot by its name, creating it if it does not exist yet.
+
+        Args:
+            name (str): The name of the contact.
+            bot (Bot, optional): The bot the contact wrote to; None for the default bot.
+
+        Returns:
+            Contact: The existing or created contact object.
+        """
+        return self.contact_repository.get_or_create_by_name(name, bot)
+
     def delete(self, contact_id: int) -> None:
         """
         Deletes a contact by its ID.
@@ -111,7 +125,16 @@ class ContactService(AbstractContactService):
         Returns:
             list[Contact]: A list of all Contact objects.
         """
-        contacts = self.contact_repository.get_all()
-        if len(contacts) < 0:
-            raise ValidationError(detail="There are no contacts.", status=status.HTTP_404_NOT_FOUND)
-        return contacts
+        return self.contact_repository.get_all()
+
+    def get_version(self, contacts) -> tuple:
+        """
+        Retrieves the validators of a contact listing, for conditional requests.
+
+        Args:
+            contacts (QuerySet): The listed contacts.
+
+        Returns:
+            tuple: The write counter, the latest id and the latest `updated_at` of the contacts.
+        """
+        return self.contact_repository.get_version(contacts)
@@ -1,4 +1,3 @@
-import json
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import permissions, status
@@ -6,11 +5,14 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from config import json_codec
 
 from contact.models import Contact  
 from contact.serializers.contact_create_serializer import ContactCreateSerializer
 from contact.serializers.contact_list_serializer import ContactListSerializer 
 from contact.services.contact_service import ContactService
+from message.utils.compact_serializer import CompactSerializer, parse_fields
+from message.utils.conditional import conditional_list
 from message.utils.pagination import PaginatorConfig 
 
 class ContactViewSet(ModelViewSet):
@@ -39,6 +41,8 @@ class ContactViewSet(ModelViewSet):
     serializer_class = ContactListSerializer
     queryset = Contact.objects.all()
     pagination_class = PaginatorConfig
+    # Listings go through the values_list() fast path of ContactListSerializer; same JSON.
+    compact_serializer = CompactSerializer(ContactListSerializer)
 
     def get_serializer_class(self):
         """
@@ -78,10 +82,10 @@ class ContactViewSet(ModelViewSet):
             Response: A response indicating the success or failure of the operation.
         """
         try:
-            data = json.loads(request.body)
+            data = json_codec.loads(request.body)
             self.contact_service.create(data)
             return Response({"contact_created": True}, status=status.HTTP_201_CREATED)
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json_codec.JSONDecodeError, KeyError) as e:
             return Response({"error": f"Invalid data format: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -100,8 +104,8 @@ class ContactViewSet(ModelViewSet):
         """
         try:
             contact_instance = self.contact_service.get_contact_by_id(pk)
-            data = json.loads(request.body)
-            self.contact_service.update(data, contact_instance)
+            data = json_codec.loads(request.body)
+            self.contact_service.update(contact_instance, data)
             return Response("detail: The contact was updated successfully", status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -112,7 +116,9 @@ class ContactViewSet(ModelViewSet):
     @method_decorator(csrf_exempt, name="dispatch")
     def list(self, request) -> Response:
         """
-        Lists all contact records.
+        Lists all contact records. Conditional requests are answered with 304
+        while no contact was added or changed (see message/utils/conditional.py);
+        `fields=id,name` reads and returns only some of the fields.
 
         Args:
             request (Request): The request to list contacts.
@@ -121,11 +127,12 @@ class ContactViewSet(ModelViewSet):
             Response: A response containing the list of contacts with pagination.
         """
         try:
+            fields = parse_fields(request.query_params.get('fields'))
             contacts = self.contact_service.get_all_contacts()
-            serializer_class = self.get_serializer_class()
-            serializer = serializer_class(contacts, many=True)
-            data_paginator = PaginatorConfig().paging_data(serializer.data)
-            return Response(data_paginator, status=status.HTTP_200_OK)
+            return conditional_list(request, self.contact_service.get_version(contacts), lambda: Response(
+                PaginatorConfig().paging_data(self.compact_serializer.serialize(contacts, fields)),
+                status=status.HTTP_200_OK,
+            ))
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -167,9 +174,7 @@ class ContactViewSet(ModelViewSet):
         """
         try:
             contacts = self.contact_service.get_contact_by_name(name)
-            serializer_class = self.get_serializer_class()
-            serializer = serializer_class(contacts, many=True)
-            data_paginator = PaginatorConfig().paging_data(serializer.data)
+            data_paginator = PaginatorConfig().paging_data(self.compact_serializer.serialize(contacts))
             return Response(data_paginator, status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from message.services.broadcast_service import BroadcastService
+
+
+class Command(BaseCommand):
+    """
+    Sends the pending deliveries of the running broadcasts.
+
+    Keep one instance running with `--loop` next to the web workers:
+        python manage.py dispatch_broadcasts --loop --interval 2
+    """
+
+    help = "Send the pending broadcast deliveries within the provider rate limits."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep dispatching every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=2, help="Seconds between runs with --loop.")
+        parser.add_argument("--limit", type=int, default=None, help="Sends per run; all pending ones by default.")
+
+    def handle(self, *args, **options):
+        broadcast_service = BroadcastService()
+        while True:
+            result = broadcast_service.dispatch(options["limit"])
+            if result["sent"] or result["retried"] or result["failed"] or not options["loop"]:
+                self.stdout.write(f"sent={result['sent']} retried={result['retried']} failed={result['failed']}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
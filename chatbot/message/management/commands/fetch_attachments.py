@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from message.services.attachment_service import AttachmentService
+
+
+class Command(BaseCommand):
+    """
+    Downloads the files sent with messages into the attachment storage.
+
+    Run it from cron, or keep it running with `--loop` next to the web workers:
+        python manage.py fetch_attachments --loop --interval 5
+    """
+
+    help = "Download pending message attachments into ATTACHMENT_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep fetching every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=5, help="Seconds between runs with --loop.")
+        parser.add_argument("--limit", type=int, default=None, help="Attachments per run (ATTACHMENT_FETCH_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        attachment_service = AttachmentService()
+        while True:
+            result = attachment_service.fetch_pending(options["limit"])
+            self.stdout.write(f"fetched={result['fetched']} reused={result['reused']} failed={result['failed']}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from message.services.message_retention_service import MessageRetentionService
+
+
+class Command(BaseCommand):
+    """
+    Moves old messages to monthly partitions and applies the retention policy.
+
+    The first run on an existing database backfills every past month; later runs
+    (e.g. a daily cron) only move the month that just left the hot window.
+        python manage.py partition_messages [--no-retention] [--compact]
+    """
+
+    help = "Move messages older than MESSAGE_HOT_MONTHS to monthly partitions and drop expired partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-retention", action="store_true", help="Do not drop expired partitions.")
+        parser.add_argument("--compact", action="store_true", help="Reclaim the free space of every partition.")
+
+    def handle(self, *args, **options):
+        retention_service = MessageRetentionService()
+        for period, moved in retention_service.rotate().items():
+            self.stdout.write(f"moved period={period} messages={moved}")
+        if not options["no_retention"]:
+            for period in retention_service.apply_retention():
+                self.stdout.write(f"dropped period={period}")
+        if options["compact"]:
+            for period in retention_service.compact():
+                self.stdout.write(f"compacted period={period}")
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-19 12:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0006_chat_lifecycle"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("message", "0004_rename_chat_message_chat_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedMessage",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "sender_type",
+                    models.IntegerField(
+                        choices=[(1, "User"), (2, "Bot"), (3, "Support Agent")],
+                        default=1,
+                    ),
+                ),
+                ("message_content", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                ("sender_object_id", models.PositiveIntegerField(null=True)),
+                (
+                    "chat_id",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="messages",
+                        to="chat.archivedchat",
+                    ),
+                ),
+                (
+                    "sender_content_type",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived message",
+                "verbose_name_plural": "Archived messages",
+                "ordering": ["created_at"],
+            },
+        ),
+    ]
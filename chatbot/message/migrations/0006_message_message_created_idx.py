@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0006_chat_lifecycle"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("message", "0005_chat_lifecycle"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["created_at"], name="message_created_idx"),
+        ),
+    ]
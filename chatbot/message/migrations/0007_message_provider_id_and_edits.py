@@ -0,0 +1,75 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0008_bot_webhook_secret"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("message", "0006_message_message_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageEdit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("previous_content", models.TextField()),
+                ("edited_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Message edit",
+                "verbose_name_plural": "Message edits",
+                "ordering": ["edited_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="archivedmessage",
+            name="edited_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="archivedmessage",
+            name="provider_message_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="message",
+            name="edited_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="message",
+            name="provider_message_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="message",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("provider_message_id__isnull", False)),
+                fields=("chat_id", "provider_message_id"),
+                name="message_provider_id_uniq",
+            ),
+        ),
+        migrations.AddField(
+            model_name="messageedit",
+            name="message",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="edits",
+                to="message.message",
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("message", "0007_message_provider_id_and_edits"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Attachment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("size", models.PositiveBigIntegerField()),
+                (
+                    "mime_type",
+                    models.CharField(
+                        default="application/octet-stream", max_length=127
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Attachment",
+                "verbose_name_plural": "Attachments",
+            },
+        ),
+        migrations.CreateModel(
+            name="MessageAttachment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("provider", models.CharField(max_length=32)),
+                ("kind", models.CharField(max_length=16)),
+                ("file_name", models.CharField(blank=True, default="", max_length=255)),
+                ("mime_type", models.CharField(blank=True, default="", max_length=127)),
+                ("size", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("provider_file_id", models.CharField(max_length=1024)),
+                (
+                    "provider_file_unique_id",
+                    models.CharField(blank=True, default="", max_length=128),
+                ),
+                ("fetch_attempts", models.PositiveSmallIntegerField(default=0)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "attachment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="message_attachments",
+                        to="message.attachment",
+                    ),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="attachments",
+                        to="message.message",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Message attachment",
+                "verbose_name_plural": "Message attachments",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("attachment__isnull", True)),
+                        fields=["id"],
+                        name="message_attachment_pending_idx",
+                    ),
+                    models.Index(
+                        fields=["provider_file_unique_id"],
+                        name="message_attachment_unique_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
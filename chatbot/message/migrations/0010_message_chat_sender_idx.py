@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0010_faq_articles"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("message", "0009_broadcasts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["chat_id", "sender_type", "created_at"],
+                name="message_chat_sender_idx",
+            ),
+        ),
+    ]
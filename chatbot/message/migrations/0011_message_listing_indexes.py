@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0010_faq_articles"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("message", "0010_message_chat_sender_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["sender_content_type", "sender_object_id", "created_at"],
+                name="message_sender_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                condition=models.Q(("edited_at__isnull", False)),
+                fields=["edited_at"],
+                name="message_edited_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("message", "0012_message_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="broadcast",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("preparing", "Preparing"),
+                    ("running", "Running"),
+                    ("cancelled", "Cancelled"),
+                    ("completed", "Completed"),
+                ],
+                default="running",
+                max_length=16,
+            ),
+        ),
+    ]
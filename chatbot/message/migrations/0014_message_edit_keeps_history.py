@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("message", "0013_broadcast_preparing"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="messageedit",
+            name="message",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="edits",
+                to="message.message",
+            ),
+        ),
+    ]
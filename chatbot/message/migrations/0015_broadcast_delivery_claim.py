@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("message", "0014_message_edit_keeps_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="broadcastdelivery",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
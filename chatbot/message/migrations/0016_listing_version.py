@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    ListingVersion = apps.get_model("message", "ListingVersion")
+    ListingVersion.objects.bulk_create(
+        [ListingVersion(name=name) for name in ("message", "contact")], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("message", "0015_broadcast_delivery_claim"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListingVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Listing version",
+                "verbose_name_plural": "Listing versions",
+            },
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
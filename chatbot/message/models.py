@@ -3,7 +3,8 @@ from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
-from chat.models import Chat
+from chat.models import ArchivedChat, Chat
+from supportAgent.models import SupportAgent
 
 
 class Message(models.Model):
@@ -17,6 +18,10 @@ class Message(models.Model):
         message_content (str): The content of the message (cannot be null).
         created_at (datetime): The date and time when the message was created (default: current timestamp).
         updated_at (datetime): The date and time when the message was last updated (optional, for edited messages).
+        provider_message_id (str): The id of the message in the provider (Telegram `message_id`, Discord message id),
+            unique per chat; used to drop duplicate deliveries and to find the message of an edit.
+        edited_at (datetime): The date and time of the last edit of the message (optional).
+        updated_at (datetime): The date and time the row was last written (None for rows older than the column).
     """
     
     chat_id = models.ForeignKey(Chat, on_delete=models.CASCADE, related_name='messages', help_text="The chat to which this message belongs.")
@@ -30,13 +35,318 @@ class Message(models.Model):
     sender_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=False)
     sender_object_id = models.PositiveIntegerField(null=True, blank=False)
     sender = GenericForeignKey('sender_content_type', 'sender_object_id')
+    provider_message_id = models.CharField(max_length=64, null=True, blank=True)
+    edited_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
     class Meta:
         verbose_name = "Message"
         verbose_name_plural = "Messages"
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='message_created_idx'),
+            models.Index(fields=['chat_id', 'sender_type', 'created_at'], name='message_chat_sender_idx'),
+            models.Index(
+                fields=['sender_content_type', 'sender_object_id', 'created_at'], name='message_sender_created_idx'
+            ),
+            models.Index(
+                fields=['edited_at'], condition=models.Q(edited_at__isnull=False), name='message_edited_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['chat_id', 'provider_message_id'], condition=models.Q(provider_message_id__isnull=False),
+                name='message_provider_id_uniq'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns a string representation of the message, including the sender type and a preview of the message content.
         """
         return f"{self.get_sender_type_display()}: {self.message_content[:50]}..."
+
+
+class ListingVersion(models.Model):
+    """
+    Write counter of a listed table, part of the ETag of its listings.
+
+    An insert moves the latest id of a listing, which is read from the primary
+    key index; updates, edits and deletes (archive and partition moves
+    included) do not, so the repositories bump this counter in the same
+    transaction. A conditional request is then answered with two index lookups
+    instead of an aggregate over the listed rows.
+
+    Attributes:
+        name (str): The listed table (`MESSAGES`, `CONTACTS`).
+        version (int): The number of writes that did not insert a row.
+    """
+
+    MESSAGES = 'message'
+    CONTACTS = 'contact'
+
+    name = models.CharField(max_length=32, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Listing version"
+        verbose_name_plural = "Listing versions"
+
+    def __str__(self):
+        """
+        Returns a string representation of the counter.
+        """
+        return f"{self.name} v{self.version}"
+
+
+class MessageEdit(models.Model):
+    """
+    Edit history of a message: one row per edit, holding the content the
+    message had before it. The message row itself always has the latest content.
+
+    Attributes:
+        message (ForeignKey): The edited message.
+        previous_content (str): The content replaced by the edit.
+        edited_at (datetime): When the provider reports the edit was made.
+    """
+
+    message = models.ForeignKey(Message, on_delete=models.DO_NOTHING, db_constraint=False, related_name='edits')
+    previous_content = models.TextField()
+    edited_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Message edit"
+        verbose_name_plural = "Message edits"
+        ordering = ['edited_at']
+
+    def __str__(self):
+        """
+        Returns a string representation of the edit.
+        """
+        return f"Edit of message {self.message_id} at {self.edited_at}"
+
+
+class Attachment(models.Model):
+    """
+    A file stored in the content-addressed attachment storage, one row per distinct
+    content: files sent many times (forwards, stickers, the same document in
+    several chats) are stored and counted once.
+
+    Attributes:
+        sha256 (str): The SHA-256 of the content; the file lives at
+            `ATTACHMENT_ROOT/<sha256[:2]>/<sha256[2:4]>/<sha256>`.
+        size (int): The size of the content in bytes.
+        mime_type (str): The MIME type reported by the provider for the first upload.
+        created_at (datetime): When the content was first stored.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    mime_type = models.CharField(max_length=127, default='application/octet-stream')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Attachment"
+        verbose_name_plural = "Attachments"
+
+    def __str__(self):
+        """
+        Returns a string representation of the attachment.
+        """
+        return f"{self.sha256[:12]} ({self.size} bytes)"
+
+
+class MessageAttachment(models.Model):
+    """
+    A file sent with a message, as the provider described it.
+
+    The row is created with the message and linked to its `Attachment` once the
+    file is downloaded by `python manage.py fetch_attachments`. The message
+    reference has no database constraint and survives the deletion of the message
+    row, so attachments stay reachable after their message is archived or moved
+    to a partition (both keep the message id).
+
+    Attributes:
+        message (ForeignKey): The message the file was sent with.
+        attachment (ForeignKey): The stored content; null until the file is downloaded.
+        provider (str): The provider to download the file from ('telegram', 'discord').
+        kind (str): The kind of file (photo, document, voice, audio, video, ...).
+        file_name (str): The original file name, when the provider sends one.
+        mime_type (str): The MIME type reported by the provider.
+        size (int): The size reported by the provider, if any.
+        provider_file_id (str): The reference used to download the file: the Telegram
+            `file_id` or the Discord attachment URL.
+        provider_file_unique_id (str): An id that is the same for the same file across
+            messages and bots (Telegram `file_unique_id`), used to skip downloads of
+            files already stored.
+        fetch_attempts (int): How many downloads failed so far.
+        created_at (datetime): When the message was received.
+    """
+
+    message = models.ForeignKey(
+        Message, on_delete=models.DO_NOTHING, db_constraint=False, related_name='attachments'
+    )
+    attachment = models.ForeignKey(
+        Attachment, on_delete=models.PROTECT, null=True, blank=True, related_name='message_attachments'
+    )
+    provider = models.CharField(max_length=32)
+    kind = models.CharField(max_length=16)
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    mime_type = models.CharField(max_length=127, blank=True, default='')
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    provider_file_id = models.CharField(max_length=1024)
+    provider_file_unique_id = models.CharField(max_length=128, blank=True, default='')
+    fetch_attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Message attachment"
+        verbose_name_plural = "Message attachments"
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'], condition=models.Q(attachment__isnull=True), name='message_attachment_pending_idx'
+            ),
+            models.Index(fields=['provider_file_unique_id'], name='message_attachment_unique_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the message attachment.
+        """
+        return f"{self.kind} of message {self.message_id}"
+
+
+
+class Broadcast(models.Model):
+    """
+    One message sent to many chats (campaigns, incident notices).
+
+    The outbound Message of every target chat is stored when the broadcast is
+    created, one transaction per batch, while the broadcast is 'preparing';
+    once every batch is stored it is 'running' and `python manage.py
+    dispatch_broadcasts` sends them through the provider of each chat, within
+    the provider rate limits. A broadcast can be cancelled while it is sent and
+    resumed later: only deliveries still pending are sent.
+
+    Attributes:
+        message_content (str): The text sent to every chat.
+        support_agent (ForeignKey): The agent who sent it; None for the bot.
+        chat_filter (dict): The chat ids or filter the targets were selected with.
+        status (str): 'preparing', 'running', 'cancelled' or 'completed'.
+        total (int): The number of target chats.
+        sent (int): The number of deliveries sent so far.
+        failed (int): The number of deliveries that gave up after BROADCAST_MAX_ATTEMPTS.
+        created_at (datetime): When the broadcast was created.
+        finished_at (datetime): When the last delivery was attempted.
+    """
+
+    PREPARING = 'preparing'
+    RUNNING = 'running'
+    CANCELLED = 'cancelled'
+    COMPLETED = 'completed'
+
+    message_content = models.TextField()
+    support_agent = models.ForeignKey(
+        SupportAgent, on_delete=models.SET_NULL, null=True, blank=True, related_name='broadcasts'
+    )
+    chat_filter = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, default=RUNNING,
+        choices=[(PREPARING, 'Preparing'), (RUNNING, 'Running'), (CANCELLED, 'Cancelled'), (COMPLETED, 'Completed')],
+    )
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Broadcast"
+        verbose_name_plural = "Broadcasts"
+        ordering = ['id']
+
+    def __str__(self):
+        """
+        Returns a string representation of the broadcast and its progress.
+        """
+        return f"Broadcast {self.id} ({self.status}, {self.sent}/{self.total})"
+
+
+class BroadcastDelivery(models.Model):
+    """
+    The delivery of a broadcast to one chat.
+
+    Like MessageAttachment, the chat and message references have no database
+    constraint, so archiving a chat does not touch the history of a broadcast.
+
+    Attributes:
+        broadcast (ForeignKey): The broadcast.
+        chat (ForeignKey): The target chat.
+        message (ForeignKey): The outbound message stored for the chat.
+        status (int): 0 = pending, 1 = sent, 2 = failed.
+        attempts (int): How many sends failed so far.
+        error (str): The last send error.
+        sent_at (datetime): When the provider accepted the message.
+        claimed_until (datetime): While set and in the future, the pending
+            delivery is being sent by a dispatcher and skipped by the others.
+    """
+
+    PENDING = 0
+    SENT = 1
+    FAILED = 2
+
+    broadcast = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name='deliveries')
+    chat = models.ForeignKey(Chat, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    message = models.ForeignKey(Message, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    status = models.PositiveSmallIntegerField(
+        choices=[(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')], default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Broadcast delivery"
+        verbose_name_plural = "Broadcast deliveries"
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['broadcast', 'id'], condition=models.Q(status=0), name='broadcast_delivery_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the delivery.
+        """
+        return f"Delivery of broadcast {self.broadcast_id} to chat {self.chat_id}"
+
+
+class ArchivedMessage(models.Model):
+    """
+    Cold storage for the messages of an ArchivedChat.
+    Mirrors the Message columns and keeps the original primary key.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    chat_id = models.ForeignKey(ArchivedChat, on_delete=models.CASCADE, related_name='messages')
+    sender_type = models.IntegerField(choices=[(1, 'User'), (2, 'Bot'), (3, 'Support Agent')], default=1)
+    message_content = models.TextField()
+    created_at = models.DateTimeField()
+    sender_content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True, blank=False)
+    sender_object_id = models.PositiveIntegerField(null=True, blank=False)
+    sender = GenericForeignKey('sender_content_type', 'sender_object_id')
+    provider_message_id = models.CharField(max_length=64, null=True, blank=True)
+    edited_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Archived message"
+        verbose_name_plural = "Archived messages"
+        ordering = ['created_at']
+
+    def __str__(self):
+        """
+        Returns a string representation of the archived message.
+        """
+        return f"{self.get_sender_type_display()}: {self.message_content[:50]}..."
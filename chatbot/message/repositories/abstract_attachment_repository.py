@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from message.models import Attachment, Message, MessageAttachment
+
+
+class AbstractAttachmentRepository(ABC):
+    """
+    Abstract base class for attachment repositories.
+    Define the operations for the attachment metadata of messages and the stored files.
+    """
+
+    @abstractmethod
+    def create_for_message(message: Message, attachments: List[dict]) -> List[MessageAttachment]:
+        """
+        Creates the attachment rows of a message, not yet downloaded.
+
+        Args:
+            message (Message): The message the files were sent with.
+            attachments (List[dict]): The `MessageAttachment` fields of each file.
+
+        Returns:
+            List[MessageAttachment]: The created rows.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_id(attachment_id: int) -> Optional[MessageAttachment]:
+        """
+        Retrieves a message attachment with its stored file.
+        """
+        pass
+
+    @abstractmethod
+    def get_pending(limit: int, max_attempts: int) -> List[MessageAttachment]:
+        """
+        Retrieves the oldest attachments that were not downloaded yet and failed
+        fewer than `max_attempts` times.
+        """
+        pass
+
+    @abstractmethod
+    def get_stored_by_unique_id(provider_file_unique_id: str) -> Optional[Attachment]:
+        """
+        Retrieves the stored file of an already downloaded attachment with the same
+        provider unique id.
+        """
+        pass
+
+    @abstractmethod
+    def get_or_create_file(sha256: str, size: int, mime_type: str) -> Attachment:
+        """
+        Retrieves the stored file row of a content, creating it on first storage.
+        """
+        pass
+
+    @abstractmethod
+    def link(message_attachment: MessageAttachment, attachment: Attachment) -> None:
+        """
+        Links a message attachment to its stored file.
+        """
+        pass
+
+    @abstractmethod
+    def record_failure(message_attachment: MessageAttachment) -> None:
+        """
+        Counts a failed download of a message attachment.
+        """
+        pass
@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from message.models import Broadcast, Message
+from supportAgent.models import SupportAgent
+
+
+class AbstractBroadcastRepository(ABC):
+    """
+    Abstract base class for broadcast repositories.
+    Define the operations for broadcasts, their target chats and their deliveries.
+    """
+
+    @abstractmethod
+    def create(message_content: str, support_agent: Optional[SupportAgent], chat_filter: dict) -> Broadcast:
+        """
+        Creates a running broadcast without deliveries.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_id(broadcast_id: int) -> Optional[Broadcast]:
+        """
+        Retrieves a broadcast.
+        """
+        pass
+
+    @abstractmethod
+    def get_target_chat_ids(
+        chat_ids: Optional[List[int]] = None, service: Optional[str] = None, bot_id: Optional[int] = None,
+        open_only: bool = False, active_since: Optional[datetime] = None,
+    ) -> Iterator[int]:
+        """
+        Iterates over the ids of the chats matching a filter.
+        """
+        pass
+
+    @abstractmethod
+    def add_deliveries(broadcast: Broadcast, chat_ids: List[int]) -> List[Message]:
+        """
+        Creates the outbound message and the pending delivery of a broadcast for
+        each chat, and returns the messages.
+        """
+        pass
+
+    @abstractmethod
+    def set_total(broadcast: Broadcast, total: int) -> None:
+        """
+        Stores the number of target chats of a broadcast.
+        """
+        pass
+
+    @abstractmethod
+    def get_running_ids() -> List[int]:
+        """
+        Lists the ids of the running broadcasts, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    def claim_deliveries(broadcast_id: int, limit: int, lease: float) -> List[tuple]:
+        """
+        Claims the oldest unclaimed pending deliveries of a running broadcast for
+        `lease` seconds, with what is needed to send them.
+        """
+        pass
+
+    @abstractmethod
+    def record_results(broadcast_id: int, sent_ids: List[int], failures: List[tuple], max_attempts: int) -> int:
+        """
+        Stores the outcome of a batch of sends, releases their claim and updates the counters of the broadcast.
+        """
+        pass
+
+    @abstractmethod
+    def complete(broadcast_id: int) -> bool:
+        """
+        Marks a running broadcast without pending deliveries as completed.
+        """
+        pass
+
+    @abstractmethod
+    def set_status(broadcast_id: int, status: str, from_status: str) -> bool:
+        """
+        Moves a broadcast from one status to another.
+        """
+        pass
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractListingVersionRepository(ABC):
+    """
+    Abstract base class for the write counters of the listed tables.
+
+    Methods:
+        - get(name: str) -> int: Abstract method to read the counter of a table.
+        - bump(*names: str) -> None: Abstract method to count a write to tables.
+    """
+
+    @abstractmethod
+    def get(self, name: str) -> int:
+        """
+        Reads the write counter of a listed table.
+
+        Args:
+            - name (str): The table, see `ListingVersion`.
+
+        Returns:
+            - int: The counter, 0 before the first write.
+        """
+        pass
+
+    @abstractmethod
+    def bump(self, *names: str) -> None:
+        """
+        Counts an update or a delete of rows of the listed tables.
+
+        Args:
+            - *names (str): The tables, see `ListingVersion`.
+        """
+        pass
@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+
+class AbstractMessagePartitionRepository(ABC):
+    """
+    Abstract base class for monthly message partition repositories.
+    Define the operations for moving, reading and dropping message partitions.
+    """
+
+    @abstractmethod
+    def get_periods(self) -> List[str]:
+        """
+        Lists the periods (`YYYYMM`) that have a partition, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_range(self, start: datetime, end: datetime, only: Optional[List[str]] = None) -> List[list]:
+        """
+        Retrieves the partitioned messages created in `[start, end)`, loading
+        only the `only` columns if given.
+
+        Returns:
+            List[list]: One list of messages per partition read, each ordered by `created_at`.
+        """
+        pass
+
+    @abstractmethod
+    def get_tables(self, start: datetime, end: datetime) -> List[str]:
+        """
+        Lists the quoted tables of the partitions overlapping `[start, end)`,
+        ready to be read and written with raw SQL.
+
+        Returns:
+            List[str]: The partition tables, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    def move_period(self, period: str, batch_size: int) -> int:
+        """
+        Moves the hot-table messages of a period into its partition.
+
+        Returns:
+            int: The number of messages moved.
+        """
+        pass
+
+    @abstractmethod
+    def drop_period(self, period: str) -> None:
+        """
+        Drops the partition of a period with all its messages.
+        """
+        pass
+
+    @abstractmethod
+    def compact_period(self, period: str) -> None:
+        """
+        Reclaims the free space of the partition of a period.
+        """
+        pass
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 
-from message.models import Message
-from typing import List
+from datetime import datetime
+
+from message.models import Message, MessageEdit
+from typing import List, Optional
 from contact.models import Contact
 from supportAgent.models import SupportAgent
 
@@ -86,6 +88,77 @@ class AbstractMessageRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_by_range(start: datetime, end: datetime, only: Optional[List[str]] = None) -> List['Message']:
+        """
+        Retrieves the messages created in `[start, end)`, wherever they are stored.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+            only (list[str], optional): The columns to load (plus `id` and `created_at`); all by default.
+
+        Returns:
+            List[Message]: The messages ordered by `created_at`.
+        """
+        pass
+
+    @abstractmethod
+    def get_version(messages) -> tuple:
+        """
+        Get the validators (write counter, latest id and `created_at`) of a message listing.
+
+        Args:
+            messages (QuerySet): The listed messages.
+
+        Raises:
+            NotImplementedError: If the method is not implemented.
+        """
+        pass
+
+    @abstractmethod
+    def get_range_version(start: datetime, end: datetime) -> tuple:
+        """
+        Get the validators of the messages created in `[start, end)`.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+
+        Raises:
+            NotImplementedError: If the method is not implemented.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_provider_id(chat, provider_message_id: str) -> Message:
+        """
+        Get the message of a chat by its provider message id.
+
+        Args:
+            chat (Chat): The chat of the message.
+            provider_message_id (str): The id of the message in the provider.
+
+        Returns:
+            Message: The message, or None.
+        """
+        pass
+
+    @abstractmethod
+    def create_edit(message: Message, previous_content: str, edited_at: datetime) -> MessageEdit:
+        """
+        Record the content a message had before an edit.
+
+        Args:
+            message (Message): The edited message.
+            previous_content (str): The content replaced by the edit.
+            edited_at (datetime): When the edit was made.
+
+        Returns:
+            MessageEdit: The created history row.
+        """
+        pass
+
     @abstractmethod
     def delete(message_id: int)-> None:
         """
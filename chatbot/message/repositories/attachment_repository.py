@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from message.models import Attachment, Message, MessageAttachment
+from message.repositories.abstract_attachment_repository import AbstractAttachmentRepository
+
+
+@dataclass
+class AttachmentRepository(AbstractAttachmentRepository):
+    """
+    Concrete implementation of the AbstractAttachmentRepository class.
+
+    Every method runs on the primary database: attachments are read by the
+    download worker right after the webhook creates them.
+    """
+
+    @staticmethod
+    def create_for_message(message: Message, attachments: List[dict]) -> List[MessageAttachment]:
+        """
+        Creates the attachment rows of a message in a single INSERT.
+
+        Args:
+            message (Message): The message the files were sent with.
+            attachments (List[dict]): The `MessageAttachment` fields of each file.
+
+        Returns:
+            List[MessageAttachment]: The created rows.
+        """
+        return MessageAttachment.objects.bulk_create(
+            [MessageAttachment(message=message, **attachment) for attachment in attachments]
+        )
+
+    @staticmethod
+    def get_by_id(attachment_id: int) -> Optional[MessageAttachment]:
+        """
+        Retrieves a message attachment with its stored file, in one query.
+
+        Args:
+            attachment_id (int): The id of the message attachment.
+
+        Returns:
+            Optional[MessageAttachment]: The message attachment, or None if it does not exist.
+        """
+        return MessageAttachment.objects.select_related('attachment').filter(id=attachment_id).first()
+
+    @staticmethod
+    def get_pending(limit: int, max_attempts: int) -> List[MessageAttachment]:
+        """
+        Retrieves the oldest attachments that were not downloaded yet, with the
+        chat and bot of their message (for the download token). Served by the
+        `message_attachment_pending_idx` partial index.
+
+        Args:
+            limit (int): The maximum number of attachments.
+            max_attempts (int): Attachments that failed this many times are skipped.
+
+        Returns:
+            List[MessageAttachment]: The pending attachments, oldest first.
+        """
+        return list(
+            MessageAttachment.objects.select_related('message__chat_id__bot_id')
+            .filter(attachment__isnull=True, fetch_attempts__lt=max_attempts)
+            .order_by('id')[:limit]
+        )
+
+    @staticmethod
+    def get_stored_by_unique_id(provider_file_unique_id: str) -> Optional[Attachment]:
+        """
+        Retrieves the stored file of an already downloaded attachment with the
+        same provider unique id, so the same file is not downloaded twice.
+
+        Args:
+            provider_file_unique_id (str): The provider unique id of the file.
+
+        Returns:
+            Optional[Attachment]: The stored file, or None if the file was never downloaded.
+        """
+        if not provider_file_unique_id:
+            return None
+        message_attachment = (
+            MessageAttachment.objects.select_related('attachment')
+            .filter(provider_file_unique_id=provider_file_unique_id, attachment__isnull=False)
+            .first()
+        )
+        return message_attachment.attachment if message_attachment else None
+
+    @staticmethod
+    def get_or_create_file(sha256: str, size: int, mime_type: str) -> Attachment:
+        """
+        Retrieves the stored file row of a content, creating it on first storage.
+        Two workers storing the same content at once end up with the same row.
+
+        Args:
+            sha256 (str): The SHA-256 of the content.
+            size (int): The size of the content.
+            mime_type (str): The MIME type of the content.
+
+        Returns:
+            Attachment: The stored file row.
+        """
+        attachment = Attachment.objects.filter(sha256=sha256).first()
+        if attachment:
+            return attachment
+        try:
+            with transaction.atomic():
+                return Attachment.objects.create(sha256=sha256, size=size, mime_type=mime_type)
+        except IntegrityError:
+            return Attachment.objects.get(sha256=sha256)
+
+    @staticmethod
+    def link(message_attachment: MessageAttachment, attachment: Attachment) -> None:
+        """
+        Links a message attachment to its stored file.
+
+        Args:
+            message_attachment (MessageAttachment): The downloaded message attachment.
+            attachment (Attachment): Its stored file.
+        """
+        message_attachment.attachment = attachment
+        message_attachment.save(update_fields=['attachment'])
+
+    @staticmethod
+    def record_failure(message_attachment: MessageAttachment) -> None:
+        """
+        Counts a failed download of a message attachment.
+
+        Args:
+            message_attachment (MessageAttachment): The attachment that could not be downloaded.
+        """
+        MessageAttachment.objects.filter(id=message_attachment.id).update(fetch_attempts=F('fetch_attempts') + 1)
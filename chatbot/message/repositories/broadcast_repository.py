@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from chat.models import Chat
+from message.models import Broadcast, BroadcastDelivery, Message
+from message.repositories.abstract_broadcast_repository import AbstractBroadcastRepository
+from supportAgent.models import SupportAgent
+
+
+@dataclass
+class BroadcastRepository(AbstractBroadcastRepository):
+    """
+    Concrete implementation of the AbstractBroadcastRepository class.
+
+    Every method runs on the primary database: progress and cancellation must be
+    seen by the dispatcher right after the API writes them.
+    """
+
+    @staticmethod
+    def create(message_content: str, support_agent: Optional[SupportAgent], chat_filter: dict) -> Broadcast:
+        """
+        Creates a preparing broadcast without deliveries; the dispatcher ignores it
+        until it is moved to running.
+
+        Args:
+            message_content (str): The text to send.
+            support_agent (SupportAgent, optional): The agent sending it; None for the bot.
+            chat_filter (dict): The chat ids or filter the targets are selected with.
+
+        Returns:
+            Broadcast: The created broadcast.
+        """
+        return Broadcast.objects.create(
+            message_content=message_content, support_agent=support_agent, chat_filter=chat_filter,
+            status=Broadcast.PREPARING,
+        )
+
+    @staticmethod
+    def get_by_id(broadcast_id: int) -> Optional[Broadcast]:
+        """
+        Retrieves a broadcast.
+
+        Returns:
+            Broadcast: The broadcast, or None.
+        """
+        return Broadcast.objects.filter(id=broadcast_id).first()
+
+    @staticmethod
+    def get_target_chat_ids(
+        chat_ids: Optional[List[int]] = None, service: Optional[str] = None, bot_id: Optional[int] = None,
+        open_only: bool = False, active_since: Optional[datetime] = None,
+    ) -> Iterator[int]:
+        """
+        Iterates over the ids of the chats matching every given condition, in id
+        order, without loading the chats.
+
+        Args:
+            chat_ids (List[int], optional): Only these chats.
+            service (str, optional): Only chats of this service ('0' Telegram, '1' Discord).
+            bot_id (int, optional): Only chats of this registered bot.
+            open_only (bool): Only chats that are not closed.
+            active_since (datetime, optional): Only chats active since then.
+
+        Returns:
+            Iterator[int]: The chat ids.
+        """
+        chats = Chat.objects.all()
+        if chat_ids is not None:
+            chats = chats.filter(id__in=chat_ids)
+        if service is not None:
+            chats = chats.filter(service=service)
+        if bot_id is not None:
+            chats = chats.filter(bot_id=bot_id)
+        if open_only:
+            chats = chats.filter(closing_time__isnull=True)
+        if active_since is not None:
+            chats = chats.filter(last_activity_at__gte=active_since)
+        return chats.order_by('id').values_list('id', flat=True).iterator(chunk_size=2000)
+
+    @staticmethod
+    def add_deliveries(broadcast: Broadcast, chat_ids: List[int]) -> List[Message]:
+        """
+        Creates the outbound message (sent by the agent, or by the bot) and the
+        pending delivery of a broadcast for each chat, with one INSERT per table.
+
+        Args:
+            broadcast (Broadcast): The broadcast.
+            chat_ids (List[int]): The target chats.
+
+        Returns:
+            List[Message]: The outbound messages, one per delivery.
+        """
+        sender = {}
+        if broadcast.support_agent_id is not None:
+            sender = {
+                'sender_content_type': ContentType.objects.get_for_model(SupportAgent),
+                'sender_object_id': broadcast.support_agent_id,
+            }
+        now = timezone.now()
+        messages = Message.objects.bulk_create([
+            Message(
+                chat_id_id=chat_id, sender_type=3 if sender else 2, message_content=broadcast.message_content,
+                created_at=now, **sender,
+            )
+            for chat_id in chat_ids
+        ])
+        BroadcastDelivery.objects.bulk_create([
+            BroadcastDelivery(broadcast=broadcast, chat_id=message.chat_id_id, message_id=message.id)
+            for message in messages
+        ])
+        return messages
+
+    @staticmethod
+    def set_total(broadcast: Broadcast, total: int) -> None:
+        """
+        Stores the number of target chats of a broadcast.
+        """
+        broadcast.total = total
+        broadcast.save(update_fields=['total'])
+
+    @staticmethod
+    def get_running_ids() -> List[int]:
+        """
+        Lists the ids of the running broadcasts, oldest first.
+        """
+        return list(Broadcast.objects.filter(status=Broadcast.RUNNING).order_by('id').values_list('id', flat=True))
+
+    @staticmethod
+    def claim_deliveries(broadcast_id: int, limit: int, lease: float) -> List[tuple]:
+        """
+        Claims the oldest pending deliveries of a broadcast, if it is still
+        running, for `lease` seconds. Served by the `broadcast_delivery_pending_idx`
+        partial index.
+
+        The claim is taken in its own short transaction: the rows are locked
+        (FOR UPDATE SKIP LOCKED) only while `claimed_until` is written, and the
+        sends happen after it commits, outside any transaction. Other dispatchers
+        skip claimed deliveries until `record_results` releases them or the
+        lease runs out (a dispatcher that died while sending), so a delivery is
+        only sent twice if its dispatcher stopped before recording it.
+
+        Args:
+            broadcast_id (int): The broadcast.
+            limit (int): The maximum number of deliveries.
+            lease (float): Seconds the deliveries stay claimed.
+
+        Returns:
+            List[tuple]: (delivery id, provider chat id, service, bot token) of each
+            delivery; the provider chat id is None when the chat no longer exists.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            deliveries = list(
+                BroadcastDelivery.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+                    broadcast_id=broadcast_id, broadcast__status=Broadcast.RUNNING, status=BroadcastDelivery.PENDING,
+                ).order_by('id').values_list('id', 'chat__chat', 'chat__service', 'chat__bot_id__token')[:limit]
+            )
+            if deliveries:
+                BroadcastDelivery.objects.filter(id__in=[delivery[0] for delivery in deliveries]).update(
+                    claimed_until=now + timedelta(seconds=lease)
+                )
+        return deliveries
+
+    @staticmethod
+    def record_results(broadcast_id: int, sent_ids: List[int], failures: List[tuple], max_attempts: int) -> int:
+        """
+        Stores the outcome of a batch of sends: sent deliveries are marked sent,
+        failed ones count an attempt and are marked failed after `max_attempts`.
+        Their claim is released, and the counters of the broadcast are updated
+        in the same transaction.
+
+        Args:
+            broadcast_id (int): The broadcast.
+            sent_ids (List[int]): The deliveries the provider accepted.
+            failures (List[tuple]): (delivery id, error message) of the failed sends.
+            max_attempts (int): Failures after which a delivery is given up.
+
+        Returns:
+            int: The number of deliveries given up.
+        """
+        with transaction.atomic():
+            if sent_ids:
+                BroadcastDelivery.objects.filter(id__in=sent_ids).update(
+                    status=BroadcastDelivery.SENT, sent_at=timezone.now(), claimed_until=None
+                )
+            for delivery_id, error in failures:
+                BroadcastDelivery.objects.filter(id=delivery_id).update(
+                    attempts=F('attempts') + 1, error=error[:255], claimed_until=None
+                )
+            given_up = 0
+            if failures:
+                given_up = BroadcastDelivery.objects.filter(
+                    id__in=[delivery_id for delivery_id, _ in failures], attempts__gte=max_attempts
+                ).update(status=BroadcastDelivery.FAILED)
+            Broadcast.objects.filter(id=broadcast_id).update(
+                sent=F('sent') + len(sent_ids), failed=F('failed') + given_up
+            )
+        return given_up
+
+    @staticmethod
+    def complete(broadcast_id: int) -> bool:
+        """
+        Marks a running broadcast as completed if it has no pending delivery left.
+
+        Returns:
+            bool: True if the broadcast was completed.
+        """
+        if BroadcastDelivery.objects.filter(broadcast_id=broadcast_id, status=BroadcastDelivery.PENDING).exists():
+            return False
+        return bool(
+            Broadcast.objects.filter(id=broadcast_id, status=Broadcast.RUNNING)
+            .update(status=Broadcast.COMPLETED, finished_at=timezone.now())
+        )
+
+    @staticmethod
+    def set_status(broadcast_id: int, status: str, from_status: str) -> bool:
+        """
+        Moves a broadcast to `status` if it is in `from_status`.
+
+        Returns:
+            bool: True if the broadcast was moved.
+        """
+        return bool(Broadcast.objects.filter(id=broadcast_id, status=from_status).update(status=status))
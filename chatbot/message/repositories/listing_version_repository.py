@@ -0,0 +1,44 @@
+from django.db import connection
+
+from config.db_router import get_read_database
+from message.models import ListingVersion
+from message.repositories.abstract_listing_version_repository import \
+    AbstractListingVersionRepository
+
+
+class ListingVersionRepository(AbstractListingVersionRepository):
+    """
+    Concrete implementation of the AbstractListingVersionRepository.
+
+    The counter is read from the same database as the listings (a read replica
+    unless the request is pinned to the primary) and bumped on the primary, in
+    the transaction of the write it counts.
+    """
+
+    @staticmethod
+    def get(name: str) -> int:
+        """
+        Reads the write counter of a listed table, by primary key.
+
+        Returns:
+            - int: The counter, 0 before the first write.
+        """
+        version = ListingVersion.objects.using(get_read_database()).filter(name=name).values_list('version', flat=True)
+        return version.first() or 0
+
+    @staticmethod
+    def bump(*names: str) -> None:
+        """
+        Counts an update or a delete of rows of the listed tables, with one
+        INSERT ... ON CONFLICT per table (the counter is created on first use).
+        """
+        quote = connection.ops.quote_name
+        table = quote(ListingVersion._meta.db_table)
+        name_column, version_column = quote('name'), quote('version')
+        with connection.cursor() as cursor:
+            for name in names:
+                cursor.execute(
+                    f'INSERT INTO {table} ({name_column}, {version_column}) VALUES (%s, 1) '
+                    f'ON CONFLICT ({name_column}) DO UPDATE SET {version_column} = {table}.{version_column} + 1',
+                    [name],
+                )
@@ -0,0 +1,272 @@
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from message.models import ListingVersion, Message
+from message.repositories.listing_version_repository import ListingVersionRepository
+from message.repositories.abstract_message_partition_repository import \
+    AbstractMessagePartitionRepository
+from message.utils.partitions import (partition_model, period_bounds,
+                                      periods_between)
+
+SQLITE_MAX_ATTACHED = 8
+
+
+class SQLitePartitions:
+    """
+    Stores each period in its own database file (`message_YYYYMM.sqlite3` in
+    `MESSAGE_PARTITION_DIR`), attached on demand to the current connection as the
+    `p_YYYYMM` schema. Dropping a period is a DETACH plus a file unlink.
+
+    SQLite refuses ATTACH/DETACH inside a transaction, so partitions must be
+    attached before any atomic block that touches them.
+    """
+
+    @staticmethod
+    def path(period: str) -> Path:
+        return Path(settings.MESSAGE_PARTITION_DIR) / f"message_{period}.sqlite3"
+
+    @staticmethod
+    def table(period: str) -> str:
+        return f'"p_{period}"."{Message._meta.db_table}"'
+
+    def periods(self) -> List[str]:
+        directory = Path(settings.MESSAGE_PARTITION_DIR)
+        if not directory.exists():
+            return []
+        return sorted(
+            match.group(1)
+            for match in (re.fullmatch(r"message_(\d{6})\.sqlite3", path.name) for path in directory.iterdir())
+            if match
+        )
+
+    def attach(self, period: str) -> None:
+        schema = f"p_{period}"
+        path = str(self.path(period).resolve())
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA database_list")
+            attached = {row[1]: row[2] for row in cursor.fetchall() if row[1].startswith("p_")}
+            if attached.get(schema) == path:
+                return
+            if schema in attached:
+                # Attached to a file of another partition directory.
+                cursor.execute(f'DETACH DATABASE "{schema}"')
+                del attached[schema]
+            if len(attached) >= SQLITE_MAX_ATTACHED:
+                cursor.execute(f'DETACH DATABASE "{next(iter(attached))}"')
+            cursor.execute(f'ATTACH DATABASE %s AS "{schema}"', [path])
+
+    def detach(self, period: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA database_list")
+            if f"p_{period}" in (row[1] for row in cursor.fetchall()):
+                cursor.execute(f'DETACH DATABASE "p_{period}"')
+
+    def create(self, period: str) -> None:
+        self.path(period).parent.mkdir(parents=True, exist_ok=True)
+        self.attach(period)
+        columns = ", ".join(
+            f'"{field.column}" {field.rel_db_type(connection) if field.primary_key else field.db_type(connection)}'
+            f'{" PRIMARY KEY" if field.primary_key else ""}{" NULL" if field.null else " NOT NULL"}'
+            for field in Message._meta.concrete_fields
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.table(period)} ({columns})")
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS "p_{period}"."message_created_idx" '
+                f'ON "{Message._meta.db_table}" ("created_at")'
+            )
+
+    def sync_columns(self, period: str) -> None:
+        """
+        Adds the nullable Message columns created after the partition was.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA "p_{period}".table_info("{Message._meta.db_table}")')
+            existing = {row[1] for row in cursor.fetchall()}
+            for field in Message._meta.concrete_fields:
+                if field.column not in existing and field.null:
+                    cursor.execute(
+                        f'ALTER TABLE {self.table(period)} ADD COLUMN "{field.column}" {field.db_type(connection)} NULL'
+                    )
+
+    def drop(self, period: str) -> None:
+        self.detach(period)
+        self.path(period).unlink(missing_ok=True)
+
+    def compact(self, period: str) -> None:
+        self.attach(period)
+        with connection.cursor() as cursor:
+            cursor.execute(f'VACUUM "p_{period}"')
+
+
+class PostgresPartitions:
+    """
+    Stores each period in a `message_message_YYYYMM` table created `LIKE` the
+    Message table (defaults and indexes included). Dropping a period is a single
+    `DROP TABLE`.
+    """
+
+    @staticmethod
+    def table(period: str) -> str:
+        return f"{Message._meta.db_table}_{period}"
+
+    def periods(self) -> List[str]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tablename FROM pg_tables WHERE schemaname = current_schema() AND tablename ~ %s",
+                [rf"^{Message._meta.db_table}_\d{{6}}$"],
+            )
+            return sorted(row[0][-6:] for row in cursor.fetchall())
+
+    def attach(self, period: str) -> None:
+        pass
+
+    def create(self, period: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table(period)}" '
+                f'(LIKE "{Message._meta.db_table}" INCLUDING DEFAULTS INCLUDING INDEXES)'
+            )
+
+    def sync_columns(self, period: str) -> None:
+        """
+        Adds the nullable Message columns created after the partition was.
+        """
+        with connection.cursor() as cursor:
+            for field in Message._meta.concrete_fields:
+                if field.null:
+                    cursor.execute(
+                        f'ALTER TABLE "{self.table(period)}" ADD COLUMN IF NOT EXISTS '
+                        f'"{field.column}" {field.db_type(connection)} NULL'
+                    )
+
+    def drop(self, period: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS "{self.table(period)}"')
+
+    def compact(self, period: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'VACUUM (ANALYZE) "{self.table(period)}"')
+
+
+def _only(messages, only: Optional[List[str]]):
+    return messages.only('id', 'created_at', *only) if only else messages
+
+
+class MessagePartitionRepository(AbstractMessagePartitionRepository):
+    """
+    Concrete implementation of the AbstractMessagePartitionRepository.
+
+    Routes each operation to the partition storage of the current database
+    vendor: attached database files on SQLite, monthly tables on Postgres.
+    Partitions created before a nullable column was added to Message get the
+    column on their first use by the process.
+    """
+
+    _synced_periods = set()
+
+    @staticmethod
+    def _storage():
+        if connection.vendor == "sqlite":
+            return SQLitePartitions()
+        return PostgresPartitions()
+
+    def _model(self, period: str):
+        storage = self._storage()
+        storage.attach(period)
+        if period not in self._synced_periods:
+            storage.sync_columns(period)
+            self._synced_periods.add(period)
+        return partition_model(period, storage.table(period))
+
+    def get_periods(self) -> List[str]:
+        """
+        Lists the periods (`YYYYMM`) that have a partition, oldest first.
+        """
+        return self._storage().periods()
+
+    def get_by_range(self, start: datetime, end: datetime, only: Optional[List[str]] = None) -> List[list]:
+        """
+        Retrieves the partitioned messages created in `[start, end)`, reading only
+        the partitions whose period overlaps the range, and only the `only`
+        columns (plus `id` and `created_at`) if given.
+
+        Returns:
+            List[list]: One list of messages per partition read, each ordered by `created_at`.
+        """
+        existing = set(self.get_periods())
+        return [
+            list(_only(self._model(period).objects.filter(created_at__gte=start, created_at__lt=end), only))
+            for period in periods_between(start, end)
+            if period in existing
+        ]
+
+    def get_tables(self, start: datetime, end: datetime) -> List[str]:
+        """
+        Lists the quoted tables of the partitions overlapping `[start, end)`,
+        ready to be read and written with raw SQL. On SQLite the partitions are
+        attached here, so this must run before the transaction that uses them.
+
+        Returns:
+            List[str]: The partition tables, oldest first.
+        """
+        existing = set(self.get_periods())
+        return [
+            connection.ops.quote_name(self._model(period)._meta.db_table)
+            for period in periods_between(start, end)
+            if period in existing
+        ]
+
+    def move_period(self, period: str, batch_size: int) -> int:
+        """
+        Moves the hot-table messages of a period into its partition, `batch_size`
+        rows at a time, in two steps per batch: the rows are copied with their
+        original primary keys (a row already in the partition is skipped), then
+        only the rows read back from the partition are deleted from the hot table.
+
+        On SQLite the partition is a separate attached file in WAL mode, where a
+        transaction spanning both files is not atomic, so the steps commit
+        separately. A crash between them leaves the batch in both places, never in
+        neither; range reads skip the hot copy and the next run deletes it.
+
+        Returns:
+            int: The number of messages moved.
+        """
+        start, end = period_bounds(period)
+        pending = Message.objects.filter(created_at__gte=start, created_at__lt=end)
+        if not pending.exists():
+            return 0
+        self._storage().create(period)
+        model = self._model(period)
+        columns = [field.attname for field in Message._meta.concrete_fields]
+        moved = 0
+        while True:
+            rows = list(pending.order_by("id").values(*columns)[:batch_size])
+            if not rows:
+                return moved
+            with transaction.atomic():
+                model.objects.bulk_create([model(**row) for row in rows], ignore_conflicts=True)
+            copied = list(model.objects.filter(id__in=[row["id"] for row in rows]).values_list("id", flat=True))
+            if not copied:
+                raise RuntimeError(f"Messages could not be copied to partition {period}.")
+            with transaction.atomic():
+                Message.objects.filter(id__in=copied).delete()
+                ListingVersionRepository.bump(ListingVersion.MESSAGES)
+            moved += len(copied)
+
+    def drop_period(self, period: str) -> None:
+        """
+        Drops the partition of a period with all its messages.
+        """
+        self._storage().drop(period)
+
+    def compact_period(self, period: str) -> None:
+        """
+        Reclaims the free space of the partition of a period.
+        """
+        self._storage().compact(period)
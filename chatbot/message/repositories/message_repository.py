@@ -1,10 +1,19 @@
+import heapq
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from operator import attrgetter
+from typing import List, Optional
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Max, QuerySet
 
+from config.db_router import get_read_database
 from contact.models import Contact
-from message.models import Message
+from message.models import ListingVersion, Message, MessageEdit
 from message.repositories.abstract_message_repository import AbstractMessageRepository
+from message.repositories.listing_version_repository import ListingVersionRepository
+from message.repositories.message_partition_repository import MessagePartitionRepository
+from message.utils.partitions import periods_between
 from supportAgent.models import SupportAgent
 
 
@@ -15,6 +24,7 @@ class MessageRepository(AbstractMessageRepository):
     
     This repository provides CRUD operations (Create, Update, Delete, and Get) for messages.
     The methods interact with the Django ORM to perform operations on the 'Message' model.
+    Reads (`get_*`) are served by a read replica unless the request is pinned to the primary.
     """
     
     @staticmethod
@@ -32,14 +42,13 @@ class MessageRepository(AbstractMessageRepository):
         Raises:
             ValueError: If the data provided is invalid or incomplete.
         """
-        message = Message.objects.create(**data)
-        message.save()
-        return message
+        return Message.objects.create(**data)
 
     @staticmethod
     def update(message: Message, message_data: dict) -> None:
         """
-        Updates an existing message record with the provided data.
+        Updates an existing message record with the provided data, writing only the
+        columns present in `message_data` and `updated_at`.
         
         Args:
             message (Message): The Message object to be updated.
@@ -48,11 +57,11 @@ class MessageRepository(AbstractMessageRepository):
         Raises:
             ValueError: If the data provided is invalid or incomplete.
         """
-        chat = message_data.pop("chat")
         for key, value in message_data.items():
             setattr(message, key, value)
-        message.chat.set(chat[0])
-        message.save()
+        with transaction.atomic(savepoint=False):
+            message.save(update_fields=[*message_data, 'updated_at'])
+            ListingVersionRepository.bump(ListingVersion.MESSAGES)
 
     @staticmethod
     def get_by_contact(contact: int) -> List['Message']:
@@ -65,9 +74,10 @@ class MessageRepository(AbstractMessageRepository):
         Returns:
             List[Message]: A list of messages sent by the contact.
         """
-        contact_instance = Contact.objects.get(id=contact)
+        database = get_read_database()
+        contact_instance = Contact.objects.using(database).get(id=contact)
         contact_content_type = ContentType.objects.get_for_model(contact_instance)
-        messages = Message.objects.filter(
+        messages = Message.objects.using(database).filter(
             sender_content_type=contact_content_type,
             sender_object_id=contact_instance.id
         ).values()
@@ -84,9 +94,10 @@ class MessageRepository(AbstractMessageRepository):
         Returns:
             List[Message]: A list of messages sent by the support agent.
         """
-        support_agent_instance = SupportAgent.objects.get(id=support_agent)        
+        database = get_read_database()
+        support_agent_instance = SupportAgent.objects.using(database).get(id=support_agent)
         support_agent_content_type = ContentType.objects.get_for_model(support_agent_instance)
-        messages = Message.objects.filter(
+        messages = Message.objects.using(database).filter(
             sender_content_type=support_agent_content_type,
             sender_object_id=support_agent_instance.id
         )
@@ -103,13 +114,110 @@ class MessageRepository(AbstractMessageRepository):
         Returns:
             Message: A instance of Menssage.
         """
-        message = Message.objects.filter(id=message).first()      
+        message = Message.objects.using(get_read_database()).filter(id=message).first()
         return message
 
+    @staticmethod
+    def get_by_range(start: datetime, end: datetime, only: Optional[List[str]] = None) -> List['Message']:
+        """
+        Retrieves the messages created in `[start, end)`, from the hot table and
+        from the monthly partitions overlapping the range.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+            only (list[str], optional): The columns to load (plus `id` and `created_at`); all by default.
+
+        Returns:
+            List[Message]: The messages ordered by `created_at`.
+        """
+        hot = Message.objects.using(get_read_database()).filter(created_at__gte=start, created_at__lt=end)
+        if only:
+            hot = hot.only('id', 'created_at', *only)
+        partitions = MessagePartitionRepository().get_by_range(start, end, only)
+        # A move interrupted between its copy and delete steps leaves rows in both places.
+        copied = {message.id for partition in partitions for message in partition}
+        hot = [message for message in hot if message.id not in copied]
+        return list(heapq.merge(*partitions, hot, key=attrgetter('created_at')))
+
+    @staticmethod
+    def get_version(messages: QuerySet) -> tuple:
+        """
+        Returns the validators of a message listing without serializing it: the
+        write counter of the messages (an update, an edit, a delete or an archive
+        move bumps it) and the latest id and `created_at` of the listing (an
+        insert changes them). Each maximum is read in its own query, so the
+        database answers it from one end of an index instead of scanning the
+        listing.
+
+        Args:
+            messages (QuerySet): The listed messages.
+
+        Returns:
+            tuple: (counter, id, created_at), None for the missing maxima.
+        """
+        messages = messages.order_by()
+        return (
+            ListingVersionRepository.get(ListingVersion.MESSAGES),
+            messages.aggregate(value=Max('id'))['value'],
+            messages.aggregate(value=Max('created_at'))['value'],
+        )
+
+    @staticmethod
+    def get_range_version(start: datetime, end: datetime) -> tuple:
+        """
+        Returns the validators of the messages created in `[start, end)`, like
+        `get_version` for the hot table (served by `message_created_idx`), plus the monthly partitions overlapping
+        the range: their rows are not written once moved, so only the set of
+        partitions (a move or a drop) can change them.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+
+        Returns:
+            tuple: `get_version` of the hot rows and the partition periods (None if there is none).
+        """
+        existing = set(MessagePartitionRepository().get_periods())
+        periods = '.'.join(period for period in periods_between(start, end) if period in existing)
+        hot = Message.objects.using(get_read_database()).filter(created_at__gte=start, created_at__lt=end)
+        return (*MessageRepository.get_version(hot), periods or None)
+
+    @staticmethod
+    def get_by_provider_id(chat, provider_message_id: str) -> Message:
+        """
+        Retrieves the message of a chat by its provider message id, from the
+        primary database so a delivery retried right after the first one is seen.
+        Served by the `message_provider_id_uniq` unique index.
+
+        Args:
+            chat (Chat): The chat of the message.
+            provider_message_id (str): The id of the message in the provider.
+
+        Returns:
+            Message: The message, or None if it was not stored.
+        """
+        return Message.objects.filter(chat_id=chat, provider_message_id=provider_message_id).first()
+
+    @staticmethod
+    def create_edit(message: Message, previous_content: str, edited_at: datetime) -> MessageEdit:
+        """
+        Stores the content a message had before an edit.
+
+        Args:
+            message (Message): The edited message.
+            previous_content (str): The content replaced by the edit.
+            edited_at (datetime): When the edit was made.
+
+        Returns:
+            MessageEdit: The created history row.
+        """
+        return MessageEdit.objects.create(message=message, previous_content=previous_content, edited_at=edited_at)
+
     @staticmethod
     def delete(message_id: int) -> None:
         """
-        Deletes the message record with the given ID.
+        Deletes the message record with the given ID, with its edit history.
         
         Args:
             message_id (int): The ID of the message to be deleted.
@@ -117,7 +225,10 @@ class MessageRepository(AbstractMessageRepository):
         Raises:
             DoesNotExist: If no message with the given ID exists.
         """
-        Message.objects.filter(id=message_id).delete()
+        with transaction.atomic():
+            MessageEdit.objects.filter(message_id=message_id).delete()
+            Message.objects.filter(id=message_id).delete()
+            ListingVersionRepository.bump(ListingVersion.MESSAGES)
 
     @staticmethod
     def get_all() -> list[Message]:
@@ -127,5 +238,5 @@ class MessageRepository(AbstractMessageRepository):
         Returns:
             list[Message]: A list of all Message objects.
         """
-        messages = Message.objects.all()
+        messages = Message.objects.using(get_read_database()).all()
         return messages
@@ -0,0 +1,68 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from message.models import Broadcast
+from supportAgent.models import SupportAgent
+
+
+class BroadcastFilterSerializer(serializers.Serializer):
+    """
+    Conditions selecting the target chats of a broadcast; every given condition must match.
+
+    Fields:
+        - service (str): Only chats of this service ('0' = Telegram, '1' = Discord).
+        - bot_id (int): Only chats of this registered bot.
+        - open_only (bool): Only chats that are not closed.
+        - active_since (datetime): Only chats active since then.
+    """
+
+    service = serializers.ChoiceField(choices=['0', '1'], required=False)
+    bot_id = serializers.IntegerField(min_value=1, required=False)
+    open_only = serializers.BooleanField(required=False, default=False)
+    active_since = serializers.DateTimeField(required=False)
+
+
+class BroadcastCreateSerializer(serializers.Serializer):
+    """
+    Validates a broadcast request: the text, the optional sending agent and the
+    target chats, given either as `chat_ids` or as a `filter`.
+    """
+
+    message_content = serializers.CharField(max_length=4096)
+    support_agent = serializers.PrimaryKeyRelatedField(
+        queryset=SupportAgent.objects.all(), required=False, allow_null=True
+    )
+    chat_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+        max_length=settings.BROADCAST_MAX_CHAT_IDS,
+    )
+    filter = BroadcastFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if ('chat_ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide either `chat_ids` or `filter`.")
+        return attrs
+
+
+class BroadcastSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the progress of a broadcast.
+
+    Fields:
+        - total (int): The number of target chats.
+        - sent (int): The deliveries sent so far.
+        - failed (int): The deliveries given up after BROADCAST_MAX_ATTEMPTS.
+        - pending (int): The deliveries still to send.
+    """
+
+    pending = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Broadcast
+        fields = [
+            'id', 'message_content', 'support_agent', 'chat_filter', 'status',
+            'total', 'sent', 'failed', 'pending', 'created_at', 'finished_at',
+        ]
+
+    def get_pending(self, broadcast: Broadcast) -> int:
+        return broadcast.total - broadcast.sent - broadcast.failed
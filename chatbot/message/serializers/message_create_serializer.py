@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from chat.models import Chat
-from contact.models import Contact
 from message.models import Message
+from message.utils.attachments import has_telegram_media
 
 
 class MessageCreateSerializer(serializers.ModelSerializer):
@@ -19,17 +19,27 @@ class MessageCreateSerializer(serializers.ModelSerializer):
             'sender_type',
             'message_content',
             'sender',
+            'provider_message_id',
         ]
+        # Duplicate deliveries are dropped by InboundUpdateService before the
+        # message is validated; the unique index enforces it under races.
+        validators = []
 
     def to_internal_value(self, data):
         """
         Valida e transforma os dados de entrada em um formato interno.
+
+        O remetente de uma mensagem de usuário é o contato do chat; quem chama pode
+        informá-lo no contexto (`sender`) para evitar a consulta ao banco. O
+        `message_id` do provedor é guardado em `provider_message_id`. Mensagens com
+        arquivos usam a legenda como conteúdo e podem não ter texto.
         """
         if not isinstance(data, dict):
             raise serializers.ValidationError("Os dados devem estar no formato de dicionário.")
 
-        message_content = data.get('message', {}).get('text')
-        if not message_content:
+        message = data.get('message', {})
+        message_content = message.get('text') or message.get('caption') or ''
+        if not message_content and not (has_telegram_media(message) or message.get('attachments')):
             raise serializers.ValidationError({"message_content": "O conteúdo da mensagem não pode estar vazio."})
 
         is_bot = data.get('message', {}).get('from', {}).get('is_bot', False)
@@ -38,10 +48,9 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         chat = data.get('chat_id')
         if not chat:
             raise serializers.ValidationError({"chat": "O ID do chat é obrigatório."})
+        contact = None
         if sender_type == 1:
-            contact = Contact.objects.create(name=message_content)
-        if sender_type == 2:
-            contact = Contact.objects.create(name=message_content)
+            contact = self.context.get('sender') or chat.contact_id
 
         message_data = {
             "sender": contact,
@@ -49,5 +58,8 @@ class MessageCreateSerializer(serializers.ModelSerializer):
             "chat_id": chat,
             "sender_type": sender_type,
         }
+        provider_message_id = data.get('message', {}).get('message_id')
+        if provider_message_id is not None:
+            message_data["provider_message_id"] = str(provider_message_id)
 
         return message_data
\ No newline at end of file
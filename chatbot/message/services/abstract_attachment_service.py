@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from message.models import Message, MessageAttachment
+
+
+class AbstractAttachmentService(ABC):
+    """
+    Abstract class for defining methods related to message attachments.
+    """
+
+    @abstractmethod
+    def add_from_telegram(self, message: Message, telegram_message: dict) -> List[MessageAttachment]:
+        """
+        Method to record the files of a Telegram message, to be downloaded later.
+
+        Args:
+            message (Message): The stored message.
+            telegram_message (dict): The `message` object of the Telegram update.
+
+        Returns:
+            List[MessageAttachment]: The recorded attachments.
+        """
+        pass
+
+    @abstractmethod
+    def add_from_discord(self, message: Message, event: dict) -> List[MessageAttachment]:
+        """
+        Method to record the files of a Discord message, to be downloaded later.
+
+        Args:
+            message (Message): The stored message.
+            event (dict): The `d` object of the Discord event.
+
+        Returns:
+            List[MessageAttachment]: The recorded attachments.
+        """
+        pass
+
+    @abstractmethod
+    def fetch_pending(self, limit: Optional[int] = None) -> dict:
+        """
+        Method to download the attachments that were not downloaded yet.
+
+        Args:
+            limit (int, optional): The maximum number of attachments to process.
+
+        Returns:
+            dict: The number of attachments downloaded, reused and failed.
+        """
+        pass
+
+    @abstractmethod
+    def get_downloadable(self, attachment_id: int) -> Optional[MessageAttachment]:
+        """
+        Method to retrieve a message attachment whose file is stored.
+
+        Args:
+            attachment_id (int): The id of the message attachment.
+
+        Returns:
+            Optional[MessageAttachment]: The attachment, or None if it does not exist
+            or was not downloaded yet.
+        """
+        pass
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from message.models import Broadcast
+from supportAgent.models import SupportAgent
+
+
+class AbstractBroadcastService(ABC):
+    """
+    Abstract class for defining methods related to broadcasts.
+    """
+
+    @abstractmethod
+    def create(
+        self, message_content: str, support_agent: Optional[SupportAgent] = None,
+        chat_ids: Optional[List[int]] = None, chat_filter: Optional[dict] = None,
+    ) -> Broadcast:
+        """
+        Method to store a broadcast and its outbound messages, to be sent by the dispatcher.
+
+        Args:
+            message_content (str): The text to send.
+            support_agent (SupportAgent, optional): The agent sending it; None for the bot.
+            chat_ids (List[int], optional): The target chats.
+            chat_filter (dict, optional): A filter selecting the target chats.
+
+        Returns:
+            Broadcast: The created broadcast.
+        """
+        pass
+
+    @abstractmethod
+    def dispatch(self, limit: Optional[int] = None) -> dict:
+        """
+        Method to send the pending deliveries of the running broadcasts.
+
+        Args:
+            limit (int, optional): The maximum number of sends.
+
+        Returns:
+            dict: The number of deliveries `sent`, `retried` and `failed`.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_id(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to retrieve a broadcast and its progress.
+        """
+        pass
+
+    @abstractmethod
+    def cancel(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to stop sending a running broadcast.
+        """
+        pass
+
+    @abstractmethod
+    def resume(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to send the pending deliveries of a cancelled broadcast.
+        """
+        pass
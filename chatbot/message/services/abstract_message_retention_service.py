@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class AbstractMessageRetentionService(ABC):
+    """
+    Abstract class for defining the message partitioning and retention policy.
+    """
+
+    @abstractmethod
+    def rotate(self) -> dict:
+        """
+        Method to move the messages older than the hot window into monthly partitions.
+
+        Returns:
+            dict: The number of messages moved per period.
+        """
+        pass
+
+    @abstractmethod
+    def apply_retention(self) -> List[str]:
+        """
+        Method to drop the partitions older than the retention window.
+
+        Returns:
+            List[str]: The dropped periods.
+        """
+        pass
+
+    @abstractmethod
+    def compact(self) -> List[str]:
+        """
+        Method to reclaim the free space of every partition.
+
+        Returns:
+            List[str]: The compacted periods.
+        """
+        pass
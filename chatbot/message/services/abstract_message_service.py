@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from message.models import Message
 
@@ -77,6 +78,21 @@ class AbstractMessageService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_by_range(self, start: datetime, end: datetime, only: Optional[List[str]] = None) -> List[Message]:
+        """
+        Retrieves the messages created in `[start, end)`.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+            only (list[str], optional): The columns to load (plus `id` and `created_at`); all by default.
+
+        Returns:
+            List[Message]: The messages ordered by `created_at`.
+        """
+        pass
+
     @abstractmethod
     def get_all(self) -> List[Message]:
         """
@@ -87,6 +103,62 @@ class AbstractMessageService(ABC):
         """
         pass
     @abstractmethod
+    def get_version(self, messages) -> tuple:
+        """
+        Method to retrieve the validators of a message listing, for conditional requests.
+
+        Args:
+            messages (QuerySet): The listed messages.
+
+        Returns:
+            tuple: The validators of the listing.
+        """
+        pass
+
+    @abstractmethod
+    def get_range_version(self, start: datetime, end: datetime) -> tuple:
+        """
+        Method to retrieve the validators of the messages created in `[start, end)`.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+
+        Returns:
+            tuple: The validators of the range.
+        """
+        pass
+
+    @abstractmethod
+    def get_by_provider_id(self, chat, provider_message_id: str) -> Message:
+        """
+        Method to retrieve the message of a chat by its provider message id.
+
+        Args:
+            chat (Chat): The chat of the message.
+            provider_message_id (str): The id of the message in the provider.
+
+        Returns:
+            Message: The message, or None.
+        """
+        pass
+
+    @abstractmethod
+    def edit(self, message: Message, content: str, edited_at: datetime) -> bool:
+        """
+        Method to apply a provider edit to a message, keeping its previous content.
+
+        Args:
+            message (Message): The edited message.
+            content (str): The new content.
+            edited_at (datetime): When the edit was made.
+
+        Returns:
+            bool: False if the message already had this content.
+        """
+        pass
+
+    @abstractmethod
     def delete(self, message_id: int) -> None:
         """
         Method to delete a message by its ID.
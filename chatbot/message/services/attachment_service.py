@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+
+from chat.providers.registry import provider_registry
+
+from message.models import Message, MessageAttachment
+from message.repositories.attachment_repository import AttachmentRepository
+from message.services.abstract_attachment_service import AbstractAttachmentService
+from message.utils.attachment_storage import AttachmentStorage
+from message.utils.attachments import discord_attachments, telegram_attachments
+
+
+@dataclass
+class AttachmentService(AbstractAttachmentService):
+    """
+    Service class responsible for the files sent with messages.
+
+    The webhook only records what the provider describes (one INSERT, and only for
+    messages with files); the files are downloaded afterwards by
+    `python manage.py fetch_attachments`, streamed in chunks into the
+    content-addressed AttachmentStorage. A file whose provider unique id or
+    content is already stored is linked to the existing copy.
+    """
+
+    attachment_repository = AttachmentRepository()
+    storage = AttachmentStorage()
+
+    def add_from_telegram(self, message: Message, telegram_message: dict) -> List[MessageAttachment]:
+        attachments = telegram_attachments(telegram_message)
+        if not attachments:
+            return []
+        return self.attachment_repository.create_for_message(message, attachments)
+
+    def add_from_discord(self, message: Message, event: dict) -> List[MessageAttachment]:
+        attachments = discord_attachments(event)
+        if not attachments:
+            return []
+        return self.attachment_repository.create_for_message(message, attachments)
+
+    def fetch_pending(self, limit: Optional[int] = None) -> dict:
+        """
+        Downloads the pending attachments, oldest first.
+
+        Each file is requested from the provider of its message with the token of
+        the bot of its chat. Failed downloads (provider errors, files larger than
+        ATTACHMENT_MAX_SIZE) are retried on later runs, up to
+        ATTACHMENT_FETCH_MAX_ATTEMPTS times.
+
+        Args:
+            limit (int, optional): The maximum number of attachments. Defaults to
+                ATTACHMENT_FETCH_BATCH_SIZE.
+
+        Returns:
+            dict: The number of attachments `fetched`, `reused` (already stored) and `failed`.
+        """
+        result = {'fetched': 0, 'reused': 0, 'failed': 0}
+        pending = self.attachment_repository.get_pending(
+            limit or settings.ATTACHMENT_FETCH_BATCH_SIZE, settings.ATTACHMENT_FETCH_MAX_ATTEMPTS
+        )
+        for message_attachment in pending:
+            stored = self.attachment_repository.get_stored_by_unique_id(message_attachment.provider_file_unique_id)
+            if stored:
+                self.attachment_repository.link(message_attachment, stored)
+                result['reused'] += 1
+                continue
+            bot = message_attachment.message.chat_id.bot_id
+            provider = provider_registry.get(message_attachment.provider, bot.token if bot else None)
+            try:
+                if provider is None:
+                    raise LookupError(f"Provider {message_attachment.provider} is not enabled.")
+                sha256, size = self.storage.save(provider.download_file(message_attachment.provider_file_id))
+            except Exception:
+                self.attachment_repository.record_failure(message_attachment)
+                result['failed'] += 1
+                continue
+            stored = self.attachment_repository.get_or_create_file(
+                sha256, size, message_attachment.mime_type or 'application/octet-stream'
+            )
+            self.attachment_repository.link(message_attachment, stored)
+            result['fetched'] += 1
+        return result
+
+    def get_downloadable(self, attachment_id: int) -> Optional[MessageAttachment]:
+        message_attachment = self.attachment_repository.get_by_id(attachment_id)
+        if message_attachment is None or message_attachment.attachment is None:
+            return None
+        return message_attachment
@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import ClassVar, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import NotFound, ValidationError
+
+from analytics.services.sla_service import SlaService
+from chat.providers.registry import provider_registry
+from chat.services.read_cursor_service import ReadCursorService
+from message.models import Broadcast
+from message.repositories.broadcast_repository import BroadcastRepository
+from message.services.abstract_broadcast_service import AbstractBroadcastService
+from message.utils.broadcast_dispatcher import BroadcastDispatcher
+from supportAgent.models import SupportAgent
+
+
+@dataclass
+class BroadcastService(AbstractBroadcastService):
+    """
+    Service class responsible for sending one message to many chats.
+
+    Creating a broadcast stores the outbound Message and a pending delivery for
+    every target chat (bulk INSERTs of BROADCAST_BATCH_SIZE rows, one
+    transaction per batch, so a large broadcast never holds one long
+    transaction); the sends are made by `python manage.py dispatch_broadcasts`,
+    BROADCAST_CHUNK_SIZE at a time, through the provider of each chat with the
+    token of its bot, at most BROADCAST_RATE messages per second per bot and
+    BROADCAST_CONCURRENCY at once. Each chunk is claimed for
+    BROADCAST_CLAIM_TTL seconds in a short transaction and sent outside any
+    transaction, so several dispatchers can run at once without sending a
+    delivery twice and the database is never locked while the providers answer.
+    The status of the broadcast is checked before each chunk, so a cancelled
+    broadcast stops within one chunk and resumes where it stopped.
+    """
+
+    broadcast_repository = BroadcastRepository()
+    read_cursor_service = ReadCursorService()
+    sla_service = SlaService()
+    _dispatcher: ClassVar[Optional[BroadcastDispatcher]] = None
+
+    @property
+    def dispatcher(self) -> BroadcastDispatcher:
+        if BroadcastService._dispatcher is None:
+            BroadcastService._dispatcher = BroadcastDispatcher(
+                settings.BROADCAST_RATE, settings.BROADCAST_BURST, settings.BROADCAST_CONCURRENCY
+            )
+        return BroadcastService._dispatcher
+
+    def create(
+        self, message_content: str, support_agent: Optional[SupportAgent] = None,
+        chat_ids: Optional[List[int]] = None, chat_filter: Optional[dict] = None,
+    ) -> Broadcast:
+        """
+        Method to store a broadcast and its outbound messages. The broadcast is
+        only sent once every batch is stored; if storing fails, it is left
+        cancelled with the batches already stored, and can be resumed.
+
+        Args:
+            message_content (str): The text to send.
+            support_agent (SupportAgent, optional): The agent sending it; None for the bot.
+            chat_ids (List[int], optional): The target chats; ids of missing chats are skipped.
+            chat_filter (dict, optional): `service`, `bot_id`, `open_only` and `active_since`
+                conditions selecting the target chats.
+
+        Returns:
+            Broadcast: The created broadcast, with its `total`.
+
+        Raises:
+            ValidationError: If no chat matches.
+        """
+        chat_filter = chat_filter or {}
+        targets = self.broadcast_repository.get_target_chat_ids(chat_ids=chat_ids, **chat_filter)
+        batch = list(islice(targets, settings.BROADCAST_BATCH_SIZE))
+        if not batch:
+            raise ValidationError(detail="No chat matches this broadcast.")
+        broadcast = self.broadcast_repository.create(
+            message_content, support_agent,
+            {'chat_ids': chat_ids} if chat_ids is not None else _serializable(chat_filter),
+        )
+        total = 0
+        try:
+            while batch:
+                with transaction.atomic():
+                    messages = self.broadcast_repository.add_deliveries(broadcast, batch)
+                    self.read_cursor_service.record(batch, messages[0].created_at, from_contact=False)
+                    total += len(messages)
+                    transaction.on_commit(lambda messages=messages: self._record_sla(messages))
+                batch = list(islice(targets, settings.BROADCAST_BATCH_SIZE))
+        except BaseException:
+            self.broadcast_repository.set_total(broadcast, total)
+            self.broadcast_repository.set_status(broadcast.id, Broadcast.CANCELLED, Broadcast.PREPARING)
+            raise
+        self.broadcast_repository.set_total(broadcast, total)
+        self.broadcast_repository.set_status(broadcast.id, Broadcast.RUNNING, Broadcast.PREPARING)
+        broadcast.status = Broadcast.RUNNING
+        return broadcast
+
+    def dispatch(self, limit: Optional[int] = None) -> dict:
+        """
+        Method to send the pending deliveries of the running broadcasts, oldest
+        broadcast first. Failed sends are retried on the next chunks, up to
+        BROADCAST_MAX_ATTEMPTS times; a 429 from the provider pauses the bot for
+        the time it asks.
+
+        Args:
+            limit (int, optional): The maximum number of sends; all pending ones when None.
+
+        Returns:
+            dict: The number of deliveries `sent`, `retried` (failed, to be sent again) and `failed` (given up).
+        """
+        result = {'sent': 0, 'retried': 0, 'failed': 0}
+        remaining = limit
+        for broadcast_id in self.broadcast_repository.get_running_ids():
+            broadcast = self.broadcast_repository.get_by_id(broadcast_id)
+            while remaining is None or remaining > 0:
+                size = settings.BROADCAST_CHUNK_SIZE
+                deliveries = self.broadcast_repository.claim_deliveries(
+                    broadcast_id, size if remaining is None else min(size, remaining), settings.BROADCAST_CLAIM_TTL
+                )
+                if not deliveries:
+                    self.broadcast_repository.complete(broadcast_id)
+                    break
+                errors = self.dispatcher.run([
+                    (token or service or '', self._sender(chat, service, token, broadcast.message_content))
+                    for _, chat, service, token in deliveries
+                ])
+                sent_ids, failures = [], []
+                for (delivery_id, *_), error in zip(deliveries, errors):
+                    if error is None:
+                        sent_ids.append(delivery_id)
+                    else:
+                        failures.append((delivery_id, str(error) or type(error).__name__))
+                given_up = self.broadcast_repository.record_results(
+                    broadcast_id, sent_ids, failures, settings.BROADCAST_MAX_ATTEMPTS
+                )
+                result['sent'] += len(sent_ids)
+                result['retried'] += len(failures) - given_up
+                result['failed'] += given_up
+                if remaining is not None:
+                    remaining -= len(deliveries)
+        return result
+
+    def get_by_id(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to retrieve a broadcast and its progress.
+
+        Raises:
+            NotFound: If the broadcast does not exist.
+        """
+        broadcast = self.broadcast_repository.get_by_id(broadcast_id)
+        if broadcast is None:
+            raise NotFound(detail="Broadcast not found.")
+        return broadcast
+
+    def cancel(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to stop sending a running broadcast; the chunk being sent finishes.
+
+        Raises:
+            NotFound: If the broadcast does not exist.
+            ValidationError: If the broadcast is not running.
+        """
+        if not self.broadcast_repository.set_status(broadcast_id, Broadcast.CANCELLED, Broadcast.RUNNING):
+            self.get_by_id(broadcast_id)
+            raise ValidationError(detail="Only running broadcasts can be cancelled.")
+        return self.get_by_id(broadcast_id)
+
+    def resume(self, broadcast_id: int) -> Broadcast:
+        """
+        Method to send the pending deliveries of a cancelled broadcast again.
+
+        Raises:
+            NotFound: If the broadcast does not exist.
+            ValidationError: If the broadcast is not cancelled.
+        """
+        if not self.broadcast_repository.set_status(broadcast_id, Broadcast.RUNNING, Broadcast.CANCELLED):
+            self.get_by_id(broadcast_id)
+            raise ValidationError(detail="Only cancelled broadcasts can be resumed.")
+        return self.get_by_id(broadcast_id)
+
+    def _record_sla(self, messages: list) -> None:
+        # Agent broadcasts answer the chats waiting for an agent.
+        for message in messages:
+            self.sla_service.record(message.chat_id_id, message.sender_type, message.created_at)
+
+    def _sender(self, chat: Optional[str], service: Optional[str], token: Optional[str], text: str):
+        # The provider is resolved here, on the dispatching thread: the registry is not thread-safe.
+        provider = provider_registry.get_by_service(service, token) if chat is not None else None
+
+        def send():
+            if chat is None:
+                raise LookupError("The chat no longer exists.")
+            if provider is None:
+                raise LookupError(f"No enabled provider for service {service}.")
+            provider.reply(chat, text)
+        return send
+
+
+def _serializable(chat_filter: dict) -> dict:
+    return {key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in chat_filter.items()}
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import List
+
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from message.models import Message
+from message.repositories.message_partition_repository import \
+    MessagePartitionRepository
+from message.services.abstract_message_retention_service import \
+    AbstractMessageRetentionService
+from message.utils.partitions import period_of, shift_period
+
+
+@dataclass
+class MessageRetentionService(AbstractMessageRetentionService):
+    """
+    Service class responsible for the message partitioning and retention policy.
+
+    The hot Message table keeps the last `MESSAGE_HOT_MONTHS` months; older months
+    live in monthly partitions, and partitions older than `MESSAGE_RETENTION_MONTHS`
+    are dropped whole instead of deleting their rows one by one.
+    """
+
+    message_partition_repository = MessagePartitionRepository()
+
+    def rotate(self) -> dict:
+        """
+        Moves every month older than the hot window from the Message table to its
+        partition. Running it on an existing database backfills all partitions.
+
+        Returns:
+            dict: The number of messages moved per period.
+        """
+        oldest = Message.objects.aggregate(oldest=Min('created_at'))['oldest']
+        if oldest is None:
+            return {}
+        last_cold = shift_period(period_of(timezone.now()), -settings.MESSAGE_HOT_MONTHS)
+        moved = {}
+        period = period_of(oldest)
+        while period <= last_cold:
+            moved[period] = self.message_partition_repository.move_period(
+                period, settings.MESSAGE_PARTITION_BATCH_SIZE
+            )
+            period = shift_period(period, 1)
+        return moved
+
+    def apply_retention(self) -> List[str]:
+        """
+        Drops the partitions older than `MESSAGE_RETENTION_MONTHS` (current month included).
+
+        Returns:
+            List[str]: The dropped periods.
+        """
+        first_kept = shift_period(period_of(timezone.now()), 1 - settings.MESSAGE_RETENTION_MONTHS)
+        dropped = [period for period in self.message_partition_repository.get_periods() if period < first_kept]
+        for period in dropped:
+            self.message_partition_repository.drop_period(period)
+        return dropped
+
+    def compact(self) -> List[str]:
+        """
+        Reclaims the free space of every partition.
+
+        Returns:
+            List[str]: The compacted periods.
+        """
+        periods = self.message_partition_repository.get_periods()
+        for period in periods:
+            self.message_partition_repository.compact_period(period)
+        return periods
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Union
+from datetime import datetime
+from typing import List, Optional, Union
 
+from django.db import transaction
 from rest_framework.exceptions import ValidationError
 
+from analytics.services.sla_service import SlaService
+from chat.services.read_cursor_service import ReadCursorService
 from contact.models import Contact
 from message.models import Message
 from message.repositories.message_repository import MessageRepository
@@ -10,6 +14,8 @@ from message.services.abstract_message_service import AbstractMessageService
 from rest_framework import status
 from supportAgent.models import SupportAgent
 
+USER = 1
+
 
 @dataclass
 class MessageService(AbstractMessageService):
@@ -19,10 +25,15 @@ class MessageService(AbstractMessageService):
     """
     
     message_repository = AbstractMessageRepository = MessageRepository()  
+    read_cursor_service = ReadCursorService()
+    sla_service = SlaService()
 
     def create(self, data: dict) -> Message:
         """
-        Method to create a new message.
+        Method to create a new message. The read cursors of the chat are
+        updated in the same transaction (one more unread message for the agents
+        following it, for a contact message), and the SLA tracker learns about
+        the message once it is committed.
         
         Args:
             data (dict): Data required to create a new message.
@@ -32,6 +43,10 @@ class MessageService(AbstractMessageService):
         
         """
         message = self.message_repository.create(data)
+        self.read_cursor_service.record([message.chat_id_id], message.created_at, message.sender_type == USER)
+        transaction.on_commit(
+            lambda: self.sla_service.record(message.chat_id_id, message.sender_type, message.created_at)
+        )
         return message
 
     def update(self, data: dict, message: Message) -> None:
@@ -46,7 +61,7 @@ class MessageService(AbstractMessageService):
             Message: The updated message instance.
         
         """
-        updated_message = self.message_repository.update(data, message)
+        updated_message = self.message_repository.update(message, data)
         return updated_message
 
 
@@ -74,7 +89,7 @@ class MessageService(AbstractMessageService):
             ValidationError: If no messages are found for the given support agent, with a 404 HTTP status.
         """
         messages = self.message_repository.get_by_support_agent(support_agent)
-        if len(messages) == 0:
+        if not messages.exists():
             raise ValidationError(
                 detail="Messages from support agents were not found.",
                 code=status.HTTP_404_NOT_FOUND
@@ -95,13 +110,33 @@ class MessageService(AbstractMessageService):
             ValidationError: If no messages are found for the given contact, with a 404 HTTP status.
         """
         messages = self.message_repository.get_by_contact(contact)
-        if len(messages) == 0:
+        if not messages.exists():
             raise ValidationError(
                 detail="Messages from contacts were not found.",
                 code=status.HTTP_404_NOT_FOUND
             )
         return messages
 
+    def get_by_range(self, start: datetime, end: datetime, only: Optional[List[str]] = None) -> List[Message]:
+        """
+        Retrieves the messages created in `[start, end)`, including the ones already
+        moved to monthly partitions.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+            only (list[str], optional): The columns to load (plus `id` and `created_at`); all by default.
+
+        Returns:
+            List[Message]: The messages ordered by `created_at`.
+
+        Raises:
+            ValidationError: If the range is empty or reversed.
+        """
+        if start >= end:
+            raise ValidationError(detail="The start of the range must be before its end.")
+        return self.message_repository.get_by_range(start, end, only)
+
     def get_all(self) -> List[Message]:
         """
         Method to retrieve all messages.
@@ -110,10 +145,68 @@ class MessageService(AbstractMessageService):
             List[Message]: A list of all message instances.
         """
         messages = self.message_repository.get_all()
-        if len(messages) == 0:
+        if not messages.exists():
             raise ValidationError(detail="Messages were not found.", code=status.HTTP_404_NOT_FOUND)
         return messages
 
+    def get_version(self, messages) -> tuple:
+        """
+        Method to retrieve the validators of a message listing, for conditional requests.
+
+        Args:
+            messages (QuerySet): The listed messages.
+
+        Returns:
+            tuple: The write counter of the messages and the latest id and `created_at` of the listing.
+        """
+        return self.message_repository.get_version(messages)
+
+    def get_range_version(self, start: datetime, end: datetime) -> tuple:
+        """
+        Method to retrieve the validators of the messages created in `[start, end)`.
+
+        Args:
+            start (datetime): Inclusive lower bound of `created_at`.
+            end (datetime): Exclusive upper bound of `created_at`.
+
+        Returns:
+            tuple: The validators of the hot messages of the range and its partitions.
+        """
+        return self.message_repository.get_range_version(start, end)
+
+    def get_by_provider_id(self, chat, provider_message_id: str) -> Message:
+        """
+        Method to retrieve the message of a chat by its provider message id.
+
+        Args:
+            chat (Chat): The chat of the message.
+            provider_message_id (str): The id of the message in the provider.
+
+        Returns:
+            Message: The message, or None if it was not stored.
+        """
+        return self.message_repository.get_by_provider_id(chat, provider_message_id)
+
+    def edit(self, message: Message, content: str, edited_at: datetime) -> bool:
+        """
+        Method to apply a provider edit to a message in place: the previous
+        content goes to the edit history and only `message_content` and
+        `edited_at` are written. Redelivered edits (same content) are ignored.
+
+        Args:
+            message (Message): The edited message.
+            content (str): The new content.
+            edited_at (datetime): When the edit was made.
+
+        Returns:
+            bool: False if the message already had this content.
+        """
+        if message.message_content == content:
+            return False
+        self.message_repository.create_edit(message, message.message_content, edited_at)
+        self.message_repository.update(message, {'message_content': content, 'edited_at': edited_at})
+        return True
+
     def delete(self, message_id: int) -> None:
         """
         Method to delete a message by its ID.
@@ -0,0 +1,222 @@
+import time
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from analytics.services.sla_service import SlaService
+from chat.models import Bot, Chat
+from chat.providers.discord_provider import DiscordProvider
+from chat.providers.telegram_provider import TelegramProvider
+from contact.models import Contact
+from message.models import Broadcast, BroadcastDelivery, Message
+from message.repositories.broadcast_repository import BroadcastRepository
+from message.services.broadcast_service import BroadcastService
+from message.utils.broadcast_dispatcher import BroadcastDispatcher
+from supportAgent.models import SupportAgent
+
+
+class RateLimited(Exception):
+    error_code = 429
+    result_json = {"parameters": {"retry_after": 0.05}}
+
+
+@pytest.fixture
+def chats(settings):
+    settings.CHAT_PROVIDERS = ["telegram", "discord"]
+    settings.BROADCAST_BATCH_SIZE = 4
+    settings.BROADCAST_CHUNK_SIZE = 3
+    settings.BROADCAST_MAX_ATTEMPTS = 2
+    settings.BROADCAST_RATE = 1000
+    BroadcastService._dispatcher = None
+    contact = Contact.objects.create(name="Ana")
+    bot = Bot.objects.create(name="Loja", service="1", token="token-a", webhook_key="loja")
+    telegram = [Chat.objects.create(chat=str(1000 + index), service="0", contact_id=contact) for index in range(9)]
+    discord = Chat.objects.create(chat="1200000000000000001", service="1", contact_id=contact, bot_id=bot)
+    yield telegram, discord
+    BroadcastService._dispatcher = None
+
+
+@pytest.fixture
+def staff_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    sent = []
+
+    def telegram_reply(self, chat_id, text):
+        if chat_id == "1008":
+            raise RuntimeError("Forbidden: bot was blocked by the user")
+        sent.append(("telegram", chat_id, text))
+
+    monkeypatch.setattr(TelegramProvider, "reply", telegram_reply)
+    monkeypatch.setattr(DiscordProvider, "reply", lambda self, chat_id, text: sent.append((self.token, chat_id, text)))
+    return sent
+
+
+@pytest.mark.django_db
+def test_broadcast_is_stored_in_bulk_and_dispatched(chats, replies, staff_client):
+    telegram, discord = chats
+    agent = SupportAgent.objects.create(first_name="Rita", last_name="Lima", password="secret")
+    client = staff_client
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            "/channel/broadcasts/",
+            {"message_content": "Instabilidade resolvida.", "support_agent": agent.id, "filter": {"open_only": True}},
+            format="json",
+        )
+    assert response.status_code == 202
+    assert response.json()["total"] == 10
+    # One transaction (two savepoint queries in tests) and three INSERTs/UPDATEs per batch of 4.
+    assert len(queries) < 25
+    assert Message.objects.filter(sender_type=3, message_content="Instabilidade resolvida.").count() == 10
+
+    result = BroadcastService().dispatch()
+
+    assert result == {"sent": 9, "retried": 1, "failed": 1}
+    assert ("token-a", discord.chat, "Instabilidade resolvida.") in replies
+    progress = client.get(f"/channel/broadcasts/{response.json()['id']}/").json()
+    assert (progress["status"], progress["sent"], progress["failed"], progress["pending"]) == ("completed", 9, 1, 0)
+    failed = BroadcastDelivery.objects.get(status=BroadcastDelivery.FAILED)
+    assert (failed.chat_id, failed.attempts) == (telegram[8].id, 2)
+    assert "blocked" in failed.error
+
+
+@pytest.mark.django_db
+def test_broadcast_can_be_cancelled_and_resumed(chats, replies, staff_client):
+    telegram, _ = chats
+    client = staff_client
+    broadcast_id = client.post(
+        "/channel/broadcasts/", {"message_content": "Aviso", "chat_ids": [chat.id for chat in telegram[:6]]},
+        format="json",
+    ).json()["id"]
+
+    assert BroadcastService().dispatch(limit=3)["sent"] == 3
+    assert client.post(f"/channel/broadcasts/{broadcast_id}/cancel/").json()["status"] == "cancelled"
+    assert client.post(f"/channel/broadcasts/{broadcast_id}/cancel/").status_code == 409
+    assert BroadcastService().dispatch()["sent"] == 0
+
+    assert client.post(f"/channel/broadcasts/{broadcast_id}/resume/").json()["status"] == "running"
+    assert BroadcastService().dispatch()["sent"] == 3
+    assert Broadcast.objects.get(id=broadcast_id).status == Broadcast.COMPLETED
+    assert sorted(chat_id for _, chat_id, _ in replies) == [chat.chat for chat in telegram[:6]]
+
+
+@pytest.mark.django_db
+def test_broadcast_requests_are_validated(chats, staff_client):
+    client = staff_client
+
+    assert client.post("/channel/broadcasts/", {"message_content": "Oi"}, format="json").status_code == 400
+    assert client.post(
+        "/channel/broadcasts/", {"message_content": "Oi", "chat_ids": [999999]}, format="json"
+    ).status_code == 400
+    assert not Broadcast.objects.exists()
+    assert client.get("/channel/broadcasts/999/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_broadcasts_are_restricted_to_staff(chats, django_user_model):
+    telegram, _ = chats
+    broadcast = BroadcastService().create("Aviso", None, [telegram[0].id], None)
+    client = APIClient()
+
+    assert client.post(
+        "/channel/broadcasts/", {"message_content": "Oi", "chat_ids": [telegram[0].id]}, format="json"
+    ).status_code in (401, 403)
+    assert client.get(f"/channel/broadcasts/{broadcast.id}/").status_code in (401, 403)
+    assert client.post(f"/channel/broadcasts/{broadcast.id}/cancel/").status_code in (401, 403)
+    client.force_authenticate(django_user_model.objects.create_user("agent", password="secret"))
+    assert client.post(f"/channel/broadcasts/{broadcast.id}/cancel/").status_code == 403
+    assert Broadcast.objects.get().status == Broadcast.RUNNING
+    assert Message.objects.filter(message_content="Oi").count() == 0
+
+
+@pytest.mark.django_db
+def test_broadcast_batches_are_stored_before_it_runs(chats, monkeypatch, django_capture_on_commit_callbacks):
+    telegram, _ = chats
+    agent = SupportAgent.objects.create(first_name="Rita", last_name="Lima", password="secret")
+    Message.objects.create(chat_id=telegram[0], sender_type=1, message_content="Alguém?")
+    SlaService().resync()
+    assert len(SlaService().waiting) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        broadcast = BroadcastService().create("Aviso", agent, chat_ids=[chat.id for chat in telegram])
+    assert (broadcast.status, broadcast.total) == (Broadcast.RUNNING, 9)
+    assert len(SlaService().waiting) == 0
+
+    calls = []
+
+    def add_deliveries(broadcast, chat_ids):
+        calls.append(broadcast.status)
+        if len(calls) == 2:
+            raise DatabaseError("database is gone")
+        return BroadcastRepository.add_deliveries(broadcast, chat_ids)
+
+    monkeypatch.setattr(BroadcastService.broadcast_repository, "add_deliveries", add_deliveries)
+    with pytest.raises(DatabaseError):
+        BroadcastService().create("Outro aviso", chat_ids=[chat.id for chat in telegram])
+    broadcast = Broadcast.objects.get(message_content="Outro aviso")
+    assert calls == [Broadcast.PREPARING, Broadcast.PREPARING]
+    assert (broadcast.status, broadcast.total, broadcast.deliveries.count()) == (Broadcast.CANCELLED, 4, 4)
+
+
+
+@pytest.mark.django_db
+def test_deliveries_are_sent_outside_transactions_while_claimed(chats, replies, monkeypatch):
+    telegram, _ = chats
+    BroadcastService().create("Aviso", chat_ids=[chat.id for chat in telegram[:3]])
+    outer = len(connection.atomic_blocks)
+    run, seen = BroadcastDispatcher.run, []
+
+    def claimed_run(dispatcher, jobs):
+        # A second dispatcher finds nothing to send while this chunk is claimed.
+        seen.append((len(connection.atomic_blocks), BroadcastService().dispatch()["sent"]))
+        return run(dispatcher, jobs)
+
+    monkeypatch.setattr(BroadcastDispatcher, "run", claimed_run)
+    result = BroadcastService().dispatch()
+
+    assert result["sent"] == 3 and len(replies) == 3
+    assert seen == [(outer, 0)]
+    assert not BroadcastDelivery.objects.filter(claimed_until__isnull=False).exists()
+
+
+def test_dispatcher_respects_the_rate_and_retries_after_429():
+    dispatcher = BroadcastDispatcher(rate=50, burst=1, concurrency=4)
+    calls = []
+
+    def send(index):
+        def run():
+            calls.append(index)
+            if index == 0 and calls.count(0) == 1:
+                raise RateLimited()
+        return run
+
+    started = time.monotonic()
+    errors = dispatcher.run([("bot", send(index)) for index in range(6)])
+
+    assert errors == [None] * 6
+    assert calls.count(0) == 2
+    assert time.monotonic() - started >= 0.1
+
+
+@pytest.mark.django_db
+def test_agent_answer_is_stored_and_sent_to_the_chat(chats, replies):
+    telegram, _ = chats
+    agent = SupportAgent.objects.create(first_name="Rita", last_name="Lima", password="secret")
+
+    response = APIClient().post(
+        f"/channel/answer-messages/{telegram[0].id}/", {"support_agent": agent.id, "answer": "Já verifiquei."},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    message = Message.objects.get(chat_id=telegram[0], sender_type=3)
+    assert (message.message_content, message.sender) == ("Já verifiquei.", agent)
+    assert replies == [("telegram", telegram[0].chat, "Já verifiquei.")]
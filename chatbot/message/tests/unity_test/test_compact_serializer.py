@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from chat.models import Chat
+from contact.models import Contact
+from contact.serializers.contact_list_serializer import ContactListSerializer
+from message.models import Message
+from message.serializers.message_list_serializer import MessageListSerializer
+from message.utils.compact_serializer import CompactSerializer
+
+
+@pytest.fixture
+def messages():
+    contact = Contact.objects.create(name="Ana", email="ana@example.com", cpf=None, telephone="61999990000")
+    Contact.objects.create(name="João Ñandú", email=None, cpf="12345678900", telephone=None)
+    chat = Chat.objects.create(chat="1000", service="0", contact_id=contact)
+    start = datetime(2026, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    return [
+        Message.objects.create(
+            chat_id=chat, sender_type=1 + index % 3, message_content=f"Olá \"{index}\" ✓\n",
+            created_at=start + timedelta(seconds=index),
+        )
+        for index in range(6)
+    ]
+
+
+@pytest.mark.django_db
+def test_compact_serializer_renders_the_same_bytes(messages):
+    render = JSONRenderer().render
+    compact = CompactSerializer(MessageListSerializer)
+    queryset = Message.objects.order_by("id")
+
+    assert render(compact.serialize(queryset)) == render(MessageListSerializer(queryset, many=True).data)
+    assert render(compact.serialize(messages)) == render(MessageListSerializer(messages, many=True).data)
+    assert compact.serialize(Message.objects.none()) == []
+
+    contacts = Contact.objects.order_by("id")
+    assert render(CompactSerializer(ContactListSerializer).serialize(contacts)) == render(
+        ContactListSerializer(contacts, many=True).data
+    )
+
+
+@pytest.mark.django_db
+def test_message_list_uses_compact_serializer(messages):
+    response = APIClient().get("/message/")
+
+    assert response.status_code == 200
+    rows = response.json()["results"]
+    assert rows[0]["sender_type_display"] == messages[0].get_sender_type_display()
+    assert rows[0]["created_at"] == "2026-03-01T12:00:00.123456Z"
+
+
+def test_compact_serializer_rejects_computed_fields():
+    class ComputedSerializer(serializers.ModelSerializer):
+        length = serializers.SerializerMethodField()
+
+        class Meta:
+            model = Message
+            fields = ["id", "length"]
+
+    with pytest.raises(ImproperlyConfigured):
+        CompactSerializer(ComputedSerializer).serialize([])
@@ -0,0 +1,139 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from chat.models import Chat
+from contact.models import Contact
+from contact.services.contact_service import ContactService
+from message.models import Message
+from message.services.message_service import MessageService
+
+START = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def chat():
+    contact = Contact.objects.create(name="Ana")
+    chat = Chat.objects.create(chat="1000", service="0", contact_id=contact)
+    for index in range(30):
+        Message.objects.create(
+            chat_id=chat, sender_type=1 + index % 2, created_at=START + timedelta(minutes=index),
+            message_content=f"Olá, preciso de ajuda com o pedido {index}, ele ainda não chegou.",
+        )
+    return chat
+
+
+@pytest.mark.django_db
+def test_listing_answers_304_from_its_validators(chat, django_assert_max_num_queries):
+    client = APIClient()
+    first = client.get("/message/")
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200 and etag.startswith('W/"')
+    assert "Last-Modified" in first.headers
+    with django_assert_max_num_queries(4):
+        cached = client.get("/message/", HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304 and cached.content == b"" and cached.headers["ETag"] == etag
+    # A delete does not move Last-Modified, so If-Modified-Since is not trusted.
+    assert client.get("/message/", HTTP_IF_MODIFIED_SINCE=first.headers["Last-Modified"]).status_code == 200
+
+    MessageService().edit(Message.objects.order_by("id").first(), "editado", START + timedelta(hours=1))
+    edited = client.get("/message/", HTTP_IF_NONE_MATCH=etag)
+    assert edited.status_code == 200 and edited.headers["ETag"] != etag
+
+    Message.objects.create(chat_id=chat, sender_type=1, message_content="Oi", created_at=START + timedelta(hours=2))
+    created = client.get("/message/", HTTP_IF_NONE_MATCH=edited.headers["ETag"])
+    assert created.status_code == 200
+
+    message = Message.objects.order_by("id")[3]
+    MessageService().update({"message_content": "corrigido"}, message)
+    updated = client.get("/message/", HTTP_IF_NONE_MATCH=created.headers["ETag"])
+    assert updated.status_code == 200
+
+    MessageService().delete(message.id)
+    deleted = client.get("/message/", HTTP_IF_NONE_MATCH=updated.headers["ETag"])
+    assert deleted.status_code == 200 and deleted.headers["ETag"] != updated.headers["ETag"]
+
+    params = {"start": "2026-03-01T12:00:00Z", "end": "2026-03-01T12:10:00Z"}
+    ranged = client.get("/message/", params)
+    assert client.get("/message/", params, HTTP_IF_NONE_MATCH=ranged.headers["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_contact_version_follows_updates():
+    service = ContactService()
+    contact = Contact.objects.create(name="Ana")
+    Contact.objects.create(name="Bia")
+    version = service.get_version(service.get_all_contacts())
+
+    service.update(contact, {"telephone": "61999990000"})
+    updated = service.get_version(service.get_all_contacts())
+    service.delete(Contact.objects.get(name="Bia").id)
+
+    assert version != updated != service.get_version(service.get_all_contacts())
+    assert updated[0] == version[0] + 1
+    assert MessageService().get_version(Message.objects.none())[1:] == (None, None)
+
+
+@pytest.mark.django_db
+def test_not_modified_reads_indexes_only(chat):
+    client = APIClient()
+    etag = client.get("/message/").headers["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get("/message/", HTTP_IF_NONE_MATCH=etag)
+
+    assert cached.status_code == 304
+    # Emptiness check (LIMIT 1), then the validators: each one is an index lookup.
+    assert len(queries) == 4
+    with connection.cursor() as cursor:
+        for query in queries[1:]:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            assert all(step[-1].startswith("SEARCH") for step in cursor.fetchall()), query["sql"]
+
+
+@pytest.mark.django_db
+def test_responses_are_compressed_as_negotiated(chat, settings):
+    settings.RESPONSE_COMPRESSION_MIN_SIZE = 512
+    client = APIClient()
+    plain = client.get("/message/")
+    compressed = client.get("/message/", HTTP_ACCEPT_ENCODING="deflate, gzip;q=0.8")
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.content) == plain.content
+    assert int(compressed.headers["Content-Length"]) == len(compressed.content) < len(plain.content)
+    assert "Content-Encoding" not in client.get("/message/", HTTP_ACCEPT_ENCODING="gzip;q=0").headers
+
+    settings.RESPONSE_COMPRESSION_MIN_SIZE = 10 ** 6
+    assert "Content-Encoding" not in client.get("/message/", HTTP_ACCEPT_ENCODING="gzip").headers
+
+
+@pytest.mark.django_db
+def test_brotli_is_preferred_when_installed(chat, settings):
+    brotli = pytest.importorskip("brotli")
+    settings.RESPONSE_COMPRESSION_MIN_SIZE = 512
+    client = APIClient()
+    response = client.get("/message/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.content) == client.get("/message/").content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("start, end", [
+    ("2026-03-01T12:00:00", "2026-03-01T12:10:00"),
+    ("2026-03-01T12:10:00Z", "2026-03-01T12:00:00Z"),
+    ("2026-01-01T00:00:00Z", "2026-03-01T00:00:00Z"),
+])
+def test_range_listing_rejects_naive_reversed_and_long_ranges(chat, settings, start, end):
+    settings.MESSAGE_RANGE_MAX_DAYS = 31
+
+    response = APIClient().get("/message/", {"start": start, "end": end})
+
+    assert response.status_code == 400
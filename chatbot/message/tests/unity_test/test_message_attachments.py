@@ -0,0 +1,188 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from urllib.error import HTTPError
+
+import pytest
+from django.test import Client
+
+from chat.providers.discord_provider import DiscordProvider
+
+from chat.services.inbound_update_service import InboundUpdateService
+from chat.utils.bot_validator import BotValidator
+from message.models import Attachment, MessageAttachment
+from message.services.attachment_service import AttachmentService
+from message.utils.attachments import is_discord_cdn_url
+
+FILE_CONTENT = bytes(range(256)) * 40
+
+
+def telegram_photo(message_id=20):
+    user = {"id": 1001, "is_bot": False, "first_name": "Ana", "language_code": "pt-br"}
+    return {
+        "update_id": 5,
+        "message": {
+            "message_id": message_id,
+            "from": user,
+            "chat": {"id": 1001, "first_name": "Ana", "type": "private"},
+            "date": 1732400000,
+            "caption": "my receipt",
+            "photo": [
+                {"file_id": "small", "file_unique_id": "u-small", "file_size": 100, "width": 90, "height": 90},
+                {"file_id": "large", "file_unique_id": "u-large", "file_size": 9000, "width": 800, "height": 800},
+            ],
+        },
+    }
+
+
+def discord_file(message_id, url):
+    return {
+        "t": "MESSAGE_CREATE",
+        "d": {
+            "id": message_id,
+            "channel_id": "1200000000000000001",
+            "content": "",
+            "author": {"id": "1100000000000000001", "username": "manu"},
+            "attachments": [
+                {"id": "1", "filename": "report.pdf", "size": len(FILE_CONTENT),
+                 "content_type": "application/pdf", "url": url},
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def file_server():
+    """
+    Local stub of the Discord CDN serving FILE_CONTENT on every path, except
+    `/redirect`, which redirects to the path given in the query string.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/redirect?"):
+                self.send_response(302)
+                self.send_header("Location", self.path.split("?", 1)[1])
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(FILE_CONTENT)))
+            self.end_headers()
+            self.wfile.write(FILE_CONTENT)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def storage_settings(settings, tmp_path, file_server):
+    settings.DISCORD_ATTACHMENT_ORIGINS = [file_server]
+    settings.ATTACHMENT_ROOT = tmp_path
+    settings.ATTACHMENT_CHUNK_SIZE = 1024
+    settings.CHAT_PROVIDERS = ["telegram", "discord"]
+    return settings
+
+
+@pytest.mark.django_db
+def test_telegram_photo_is_recorded_without_text():
+    update = telegram_photo()
+
+    assert BotValidator.validate_telegram(json.dumps(update).encode())
+    _, message = InboundUpdateService().persist_telegram_update(update)
+
+    attachment = MessageAttachment.objects.get(message=message)
+    assert message.message_content == "my receipt"
+    assert (attachment.kind, attachment.provider_file_id, attachment.mime_type) == ("photo", "large", "image/jpeg")
+    assert attachment.attachment is None
+
+
+@pytest.mark.django_db
+def test_fetch_streams_and_deduplicates_by_content(storage_settings, file_server, tmp_path):
+    service = InboundUpdateService()
+    service.persist_discord_message(discord_file("1", f"{file_server}/a/report.pdf"))
+    service.persist_discord_message(discord_file("2", f"{file_server}/b/report.pdf"))
+
+    result = AttachmentService().fetch_pending()
+
+    stored = Attachment.objects.get()
+    path = AttachmentService.storage.path(stored.sha256)
+    assert result == {"fetched": 2, "reused": 0, "failed": 0}
+    assert MessageAttachment.objects.filter(attachment=stored).count() == 2
+    assert path.read_bytes() == FILE_CONTENT and stored.size == len(FILE_CONTENT)
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_attachment_urls_outside_the_discord_cdn_are_not_stored(storage_settings):
+    service = InboundUpdateService()
+    for number, url in enumerate([
+        "http://169.254.169.254/latest/meta-data/", "https://cdn.discordapp.com.evil.test/a.pdf",
+        "file:///etc/passwd", "http://cdn.discordapp.com/a.pdf",
+    ]):
+        service.persist_discord_message(discord_file(str(number), url))
+
+    assert not MessageAttachment.objects.exists()
+
+
+def test_default_origins_accept_only_https_discord_cdn_urls():
+    assert is_discord_cdn_url("https://cdn.discordapp.com/attachments/1/2/report.pdf")
+    assert is_discord_cdn_url("https://media.discordapp.net/attachments/1/2/photo.png")
+    assert not is_discord_cdn_url("http://cdn.discordapp.com/attachments/1/2/report.pdf")
+    assert not is_discord_cdn_url("https://user@cdn.discordapp.com/a.pdf")
+    assert not is_discord_cdn_url("https://cdn.discordapp.com:8443/a.pdf")
+    assert not is_discord_cdn_url("https://localhost/a.pdf")
+
+
+@pytest.mark.django_db
+def test_download_does_not_follow_redirects_outside_the_cdn(storage_settings, file_server):
+    provider = DiscordProvider()
+    assert b"".join(provider.download_file(f"{file_server}/redirect?/report.pdf")) == FILE_CONTENT
+
+    with pytest.raises(HTTPError):
+        b"".join(provider.download_file(f"{file_server}/redirect?http://169.254.169.254/latest/"))
+    with pytest.raises(ValueError):
+        b"".join(provider.download_file("http://169.254.169.254/latest/"))
+
+
+@pytest.mark.django_db
+def test_fetch_stops_at_max_size(storage_settings, file_server, tmp_path):
+    storage_settings.ATTACHMENT_MAX_SIZE = 4096
+    InboundUpdateService().persist_discord_message(discord_file("1", f"{file_server}/report.pdf"))
+
+    result = AttachmentService().fetch_pending()
+
+    assert result["failed"] == 1
+    assert MessageAttachment.objects.get().fetch_attempts == 1
+    assert not Attachment.objects.exists()
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_download_supports_ranges_and_etag(storage_settings, file_server):
+    InboundUpdateService().persist_discord_message(discord_file("1", f"{file_server}/report.pdf"))
+    AttachmentService().fetch_pending()
+    attachment = MessageAttachment.objects.select_related("attachment").get()
+    url = f"/message/attachments/{attachment.id}/"
+    client = Client()
+
+    full = client.get(url)
+    partial = client.get(url, headers={"Range": "bytes=100-199"})
+    suffix = client.get(url, headers={"Range": "bytes=-10"})
+    cached = client.get(url, headers={"If-None-Match": f'"{attachment.attachment.sha256}"'})
+    outside = client.get(url, headers={"Range": f"bytes={len(FILE_CONTENT)}-"})
+
+    assert full.status_code == 200 and b"".join(full.streaming_content) == FILE_CONTENT
+    assert full["Content-Length"] == str(len(FILE_CONTENT)) and full["Accept-Ranges"] == "bytes"
+    assert 'filename="report.pdf"' in full["Content-Disposition"]
+    assert partial.status_code == 206 and b"".join(partial.streaming_content) == FILE_CONTENT[100:200]
+    assert partial["Content-Range"] == f"bytes 100-199/{len(FILE_CONTENT)}"
+    assert b"".join(suffix.streaming_content) == FILE_CONTENT[-10:]
+    assert cached.status_code == 304
+    assert outside.status_code == 416
+    assert client.get("/message/attachments/999/").status_code == 404
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.utils import timezone as django_timezone
+
+from chat.models import Chat
+from chat.repositories.chat_archive_repository import ChatArchiveRepository
+from message.models import ArchivedMessage, Message, MessageEdit
+from message.repositories.listing_version_repository import \
+    ListingVersionRepository
+from message.repositories.message_partition_repository import \
+    MessagePartitionRepository
+from message.repositories.message_repository import MessageRepository
+from message.services.message_retention_service import MessageRetentionService
+from message.utils.partitions import period_of, periods_between, shift_period
+
+
+@pytest.fixture
+def partition_settings(settings, tmp_path):
+    settings.MESSAGE_PARTITION_DIR = tmp_path
+    settings.MESSAGE_HOT_MONTHS = 1
+    settings.MESSAGE_RETENTION_MONTHS = 4
+    settings.MESSAGE_PARTITION_BATCH_SIZE = 2
+    return settings
+
+
+def months_ago(months):
+    now = django_timezone.now()
+    return now.replace(day=15) - timedelta(days=30 * months)
+
+
+def test_periods_between_covers_every_overlapping_month():
+    start = datetime(2024, 11, 20, tzinfo=timezone.utc)
+    end = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    assert periods_between(start, end) == ['202411', '202412', '202501']
+    assert shift_period('202401', -1) == '202312'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rotate_moves_old_months_and_range_reads_merge_partitions(partition_settings):
+    chat = Chat.objects.create(chat='1', service='0')
+    for months in (0, 2, 2, 2, 3):
+        Message.objects.create(chat_id=chat, message_content=f"{months} months ago", created_at=months_ago(months))
+
+    moved = MessageRetentionService().rotate()
+
+    assert sum(moved.values()) == 4
+    assert Message.objects.count() == 1
+    assert MessagePartitionRepository().get_periods() == sorted(
+        {period_of(months_ago(2)), period_of(months_ago(3))}
+    )
+    messages = MessageRepository.get_by_range(months_ago(4), django_timezone.now())
+    assert [message.message_content for message in messages] == [
+        "3 months ago", "2 months ago", "2 months ago", "2 months ago", "0 months ago"
+    ]
+    assert messages[0].chat_id_id == chat.id
+    assert messages[0].get_sender_type_display() == 'User'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_move_interrupted_before_the_delete_step_resumes_without_duplicates(partition_settings, monkeypatch):
+    chat = Chat.objects.create(chat='1', service='0')
+    for _ in range(3):
+        Message.objects.create(chat_id=chat, message_content="2 months ago", created_at=months_ago(2))
+    period = period_of(months_ago(2))
+    repository = MessagePartitionRepository()
+
+    def crash(*names):
+        raise RuntimeError("crash")
+
+    monkeypatch.setattr(ListingVersionRepository, 'bump', crash)
+    with pytest.raises(RuntimeError):
+        repository.move_period(period, 2)
+    monkeypatch.undo()
+
+    assert Message.objects.count() == 3
+    assert len(MessageRepository.get_by_range(months_ago(3), django_timezone.now())) == 3
+
+    assert repository.move_period(period, 2) == 3
+    assert Message.objects.count() == 0
+    assert len(MessageRepository.get_by_range(months_ago(3), django_timezone.now())) == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_retention_drops_whole_partitions(partition_settings):
+    chat = Chat.objects.create(chat='1', service='0')
+    Message.objects.create(chat_id=chat, message_content="expired", created_at=months_ago(6))
+    Message.objects.create(chat_id=chat, message_content="kept", created_at=months_ago(2))
+    retention_service = MessageRetentionService()
+    retention_service.rotate()
+
+    dropped = retention_service.apply_retention()
+
+    assert dropped == [period_of(months_ago(6))]
+    assert not (partition_settings.MESSAGE_PARTITION_DIR / f"message_{dropped[0]}.sqlite3").exists()
+    assert MessagePartitionRepository().get_periods() == [period_of(months_ago(2))]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_edit_history_survives_archive_and_partitioning(partition_settings):
+    now = django_timezone.now()
+    archived_chat = Chat.objects.create(chat='1', service='0', closing_time=now)
+    archived = Message.objects.create(chat_id=archived_chat, message_content="archived, edited")
+    chat = Chat.objects.create(chat='2', service='0')
+    partitioned = Message.objects.create(chat_id=chat, message_content="moved, edited", created_at=months_ago(2))
+    for message in (archived, partitioned):
+        MessageEdit.objects.create(message=message, previous_content="before", edited_at=now)
+
+    ChatArchiveRepository.archive([archived_chat.id])
+    MessageRetentionService().rotate()
+
+    assert ArchivedMessage.objects.filter(id=archived.id).exists()
+    assert not Message.objects.exists()
+    assert sorted(MessageEdit.objects.values_list("message_id", flat=True)) == sorted([archived.id, partitioned.id])
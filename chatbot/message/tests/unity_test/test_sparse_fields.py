@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from chat.models import Chat
+from chat.serializers.chat_serializer import ChatSerializer
+from contact.models import Contact
+from contact.serializers.contact_list_serializer import ContactListSerializer
+from message.models import Message
+from message.utils.compact_serializer import CompactSerializer
+
+START = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def chat():
+    contact = Contact.objects.create(name="Ana", email="ana@example.com")
+    chat = Chat.objects.create(chat="1000", service="0", contact_id=contact)
+    for index in range(3):
+        Message.objects.create(
+            chat_id=chat, sender_type=1 + index, created_at=START + timedelta(minutes=index),
+            message_content="Um texto longo que o painel não precisa " * 20,
+        )
+    return chat
+
+
+def message_selects(queries) -> list:
+    # The selected columns of the listing queries.
+    return [
+        query["sql"].split(" FROM ")[0] for query in queries
+        if query["sql"].startswith("SELECT") and '"message_message"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_message_listing_reads_and_returns_only_the_fields_asked(chat):
+    client = APIClient()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/message/", {"fields": "id,sender_type_display"})
+
+    assert response.status_code == 200
+    first = Message.objects.order_by("id").first()
+    assert response.json()["results"][0] == {"id": first.id, "sender_type_display": "User"}
+    listing = message_selects(queries)[-1]
+    assert '"sender_type"' in listing and '"message_content"' not in listing and '"created_at"' not in listing
+
+    with CaptureQueriesContext(connection) as queries:
+        ranged = client.get("/message/", {
+            "fields": "created_at,id", "start": "2026-03-01T12:00:00Z", "end": "2026-03-01T13:00:00Z",
+        })
+    assert ranged.json()["results"][1] == {"id": first.id + 1, "created_at": "2026-03-01T12:01:00Z"}
+    assert '"message_content"' not in message_selects(queries)[-1]
+
+    unknown = client.get("/message/", {"fields": "id,password"})
+    assert unknown.status_code == 400 and "password" in unknown.json()["error"]
+
+
+@pytest.mark.django_db
+def test_chat_listing_projects_chat_serializer(chat):
+    client = APIClient()
+    full = client.get("/channel/")
+
+    assert full.content == JSONRenderer().render(ChatSerializer(Chat.objects.all(), many=True).data)
+    assert client.get("/channel/", {"fields": "id,contact_id"}).json() == [{"id": chat.id, "contact_id": chat.contact_id_id}]
+    assert client.get("/channel/", {"fields": "nope"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_contact_fields_select_columns():
+    contact = Contact.objects.create(name="Ana", email="ana@example.com", telephone="61999990000")
+    compact = CompactSerializer(ContactListSerializer)
+
+    assert compact.columns(["name", "id"]) == ["id", "name"]
+    assert compact.serialize(Contact.objects.all(), ["name", "id"]) == [{"id": contact.id, "name": "Ana"}]
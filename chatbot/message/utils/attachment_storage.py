@@ -0,0 +1,95 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from django.conf import settings
+
+
+class AttachmentTooLarge(Exception):
+    """
+    Raised when a download goes past ATTACHMENT_MAX_SIZE.
+    """
+
+
+class AttachmentStorage:
+    """
+    Content-addressed file storage for message attachments.
+
+    A file is stored once under the SHA-256 of its content, at
+    `<root>/<sha256[:2]>/<sha256[2:4]>/<sha256>`. Files are written from an
+    iterable of chunks into a temporary file in `<root>/tmp` while being hashed,
+    then renamed into place, so a file is never held whole in memory and a
+    partial download is never visible under its final name. Storing content that
+    already exists only removes the temporary file.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_size: Optional[int] = None):
+        self._root = root
+        self._max_size = max_size
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.ATTACHMENT_ROOT)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size or settings.ATTACHMENT_MAX_SIZE
+
+    def relative_path(self, sha256: str) -> str:
+        """
+        Returns the path of a file relative to the storage root.
+        """
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def path(self, sha256: str) -> Path:
+        """
+        Returns the absolute path of a file.
+        """
+        return self.root / self.relative_path(sha256)
+
+    def save(self, chunks: Iterable[bytes]) -> tuple[str, int]:
+        """
+        Streams chunks to the storage.
+
+        Args:
+            chunks (Iterable[bytes]): The content, in chunks of any size.
+
+        Returns:
+            tuple[str, int]: The SHA-256 (hex) and the size of the content.
+
+        Raises:
+            AttachmentTooLarge: If the content is larger than `max_size`; nothing is stored.
+        """
+        tmp_dir = self.root / 'tmp'
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise AttachmentTooLarge(f"Attachment larger than {self.max_size} bytes.")
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+            sha256 = digest.hexdigest()
+            final_path = self.path(sha256)
+            if final_path.exists():
+                os.unlink(tmp_path)
+            else:
+                final_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return sha256, size
+
+    def open(self, sha256: str) -> BinaryIO:
+        """
+        Opens a stored file for reading.
+        """
+        return open(self.path(sha256), 'rb')
@@ -0,0 +1,108 @@
+"""
+Extraction of the files sent with provider messages.
+
+Each function returns the attachments of a message as `MessageAttachment`
+field values, without downloading anything.
+"""
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+# Telegram message keys that carry a file, with the MIME type used when the
+# Bot API does not send one.
+TELEGRAM_MEDIA_KINDS = {
+    'photo': 'image/jpeg',
+    'document': 'application/octet-stream',
+    'audio': 'audio/mpeg',
+    'voice': 'audio/ogg',
+    'video': 'video/mp4',
+    'video_note': 'video/mp4',
+    'animation': 'video/mp4',
+}
+
+
+def has_telegram_media(message: dict) -> bool:
+    """
+    Returns True if a Telegram message carries at least one file.
+    """
+    return any(kind in message for kind in TELEGRAM_MEDIA_KINDS)
+
+
+def telegram_attachments(message: dict) -> list[dict]:
+    """
+    Returns the files of a Telegram message.
+
+    A photo comes in several sizes; only the largest one is kept.
+
+    Args:
+        message (dict): The `message` object of a Telegram update.
+
+    Returns:
+        list[dict]: The attachment fields, one dict per file.
+    """
+    attachments = []
+    for kind, default_mime_type in TELEGRAM_MEDIA_KINDS.items():
+        media = message.get(kind)
+        if not media:
+            continue
+        if kind == 'photo':
+            media = media[-1]
+        attachments.append({
+            'provider': 'telegram',
+            'kind': kind,
+            'file_name': media.get('file_name', '')[:255],
+            'mime_type': media.get('mime_type') or default_mime_type,
+            'size': media.get('file_size'),
+            'provider_file_id': media['file_id'],
+            'provider_file_unique_id': media.get('file_unique_id', ''),
+        })
+    return attachments
+
+
+def is_discord_cdn_url(url: str) -> bool:
+    """
+    Returns True if a URL belongs to one of the DISCORD_ATTACHMENT_ORIGINS
+    (by default https on cdn.discordapp.com or media.discordapp.net).
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except (TypeError, ValueError):
+        return False
+    if not parts.hostname or parts.username or parts.password:
+        return False
+    origin = f"{parts.scheme.lower()}://{parts.hostname}" + (f":{port}" if port else '')
+    return origin in settings.DISCORD_ATTACHMENT_ORIGINS
+
+
+def discord_attachments(event: dict) -> list[dict]:
+    """
+    Returns the files of a Discord `MESSAGE_CREATE` event.
+
+    Discord attachments are downloaded from their CDN URL, so the URL is kept as
+    the file reference. The URL comes from the webhook body: files whose URL is
+    not on the Discord CDN (`is_discord_cdn_url`) are dropped.
+
+    Args:
+        event (dict): The `d` object of the event.
+
+    Returns:
+        list[dict]: The attachment fields, one dict per file.
+    """
+    attachments = []
+    for attachment in event.get('attachments') or []:
+        if not isinstance(attachment.get('url'), str) or not is_discord_cdn_url(attachment['url']):
+            continue
+        mime_type = attachment.get('content_type') or 'application/octet-stream'
+        major = mime_type.split('/', 1)[0]
+        kind = {'image': 'photo', 'audio': 'audio', 'video': 'video'}.get(major, 'document')
+        attachments.append({
+            'provider': 'discord',
+            'kind': kind,
+            'file_name': attachment.get('filename', '')[:255],
+            'mime_type': mime_type,
+            'size': attachment.get('size'),
+            'provider_file_id': attachment['url'],
+            'provider_file_unique_id': '',
+        })
+    return attachments
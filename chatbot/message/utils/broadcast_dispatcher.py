@@ -0,0 +1,83 @@
+"""
+Concurrent sender for broadcasts, within the rate limits of each bot.
+
+Telegram accepts about 30 messages per second from a bot across chats (and
+answers 429 with `retry_after` beyond that); Discord answers 429 with a
+`Retry-After` header. Sends run on a thread pool, since they only wait on the
+network, and each one first takes a token from the bucket of its bot. A 429
+pauses the whole bot for the time the provider asks, then the send is retried
+once.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from urllib.error import HTTPError
+
+from config.middleware import TokenBucketLimiter
+
+MAX_TRACKED_BOTS = 4096
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Returns how long the provider asked to wait after a send failed for
+    exceeding its rate limit, or None for other errors.
+    """
+    result = getattr(error, 'result_json', None)
+    if getattr(error, 'error_code', None) == 429 and isinstance(result, dict):
+        return float(result.get('parameters', {}).get('retry_after', 1))
+    if isinstance(error, HTTPError) and error.code == 429:
+        return float(error.headers.get('Retry-After') or 1)
+    return None
+
+
+class BroadcastDispatcher:
+    """
+    Runs sends concurrently, at most `rate` per second (bursts of `burst`) for
+    each key (the bot token).
+    """
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.concurrency = concurrency
+        self._limiter = TokenBucketLimiter(rate, burst, MAX_TRACKED_BOTS)
+        self._paused_until = {}
+        self._lock = threading.Lock()
+
+    def run(self, jobs: list[tuple[str, Callable[[], object]]]) -> list[Optional[Exception]]:
+        """
+        Runs `(key, send)` jobs and waits for all of them.
+
+        Args:
+            jobs (list[tuple[str, Callable]]): The rate-limit key and the send function of each job.
+
+        Returns:
+            list[Optional[Exception]]: None for each send that succeeded, the error of the others, in job order.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(self._send, jobs))
+
+    def _send(self, job: tuple[str, Callable[[], object]]) -> Optional[Exception]:
+        key, send = job
+        for attempt in range(2):
+            self._acquire(key)
+            try:
+                send()
+                return None
+            except Exception as error:
+                wait = retry_after(error)
+                if wait is None or attempt:
+                    return error
+                with self._lock:
+                    self._paused_until[key] = max(self._paused_until.get(key, 0.0), time.monotonic() + wait)
+
+    def _acquire(self, key: str) -> None:
+        while True:
+            with self._lock:
+                paused = self._paused_until.get(key, 0.0) - time.monotonic()
+            if paused > 0:
+                time.sleep(paused)
+            elif self._limiter.allow(key):
+                return
+            else:
+                time.sleep(1 / self._limiter.rate)
@@ -0,0 +1,65 @@
+"""
+Conditional GET for the listing endpoints.
+
+A listing is identified by a version tuple read by its repository (the write
+counter of its table, see `ListingVersion`, and its latest id and timestamp)
+instead of a hash of its body, so a poll whose `If-None-Match` still matches is
+answered 304 after a few index lookups, without reading or serializing the rows.
+
+The ETag is weak: the body is the same JSON whatever its compression.
+`Last-Modified` is sent for information only: a delete does not move it, so
+`If-Modified-Since` alone is never answered 304.
+"""
+from datetime import datetime
+from typing import Callable, Optional
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def list_validators(request, version: tuple) -> tuple[str, Optional[datetime]]:
+    """
+    Returns the ETag and Last-Modified of a listing.
+
+    Args:
+        request (Request): The DRF request; the ETag depends on its negotiated format.
+        version (tuple): Ids, datetimes, strings or None identifying the rows listed.
+
+    Returns:
+        tuple[str, Optional[datetime]]: The ETag and the latest datetime of the version.
+    """
+    parts = [getattr(request.accepted_renderer, 'format', None) or 'json']
+    for part in version:
+        if isinstance(part, datetime):
+            part = int(part.timestamp() * 1_000_000)
+        parts.append('' if part is None else str(part))
+    moments = [part for part in version if isinstance(part, datetime)]
+    return f'W/"{"-".join(parts)}"', max(moments, default=None)
+
+
+def conditional_list(request, version: tuple, build: Callable[[], HttpResponseBase]) -> HttpResponseBase:
+    """
+    Answers 304 Not Modified (or 412 for a failed `If-Match`) when the client
+    already has this version of the listing, else builds the response; both
+    carry the ETag and Last-Modified of the version. Only the ETag is compared.
+
+    Args:
+        request (Request): The listing request.
+        version (tuple): The version of the listing, see `list_validators`.
+        build (Callable[[], HttpResponseBase]): Reads and serializes the listing.
+
+    Returns:
+        HttpResponseBase: The 304/412 response or the built one.
+    """
+    etag, last_modified = list_validators(request, version)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+        if not 200 <= response.status_code < 300:
+            return response
+    response.headers['ETag'] = etag
+    if timestamp is not None:
+        response.headers['Last-Modified'] = http_date(timestamp)
+    return response
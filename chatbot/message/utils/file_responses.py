@@ -0,0 +1,143 @@
+"""
+Responses that serve stored files without loading them in memory.
+
+Files go out through Django's FileResponse, which hands the open file to the
+server's `wsgi.file_wrapper`: gunicorn sends it with `sendfile(2)`, limited to
+the Content-Length of the response, so the bytes never pass through Python.
+When ATTACHMENT_SENDFILE_HEADER is set (`X-Accel-Redirect` for nginx,
+`X-Sendfile` for Apache/lighttpd), the response is empty and the front server
+sends the file, ranges included.
+"""
+import re
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRange:
+    """
+    Read-only view of `length` bytes of an open file, starting at `start`.
+
+    The file is positioned at `start`, so servers that send the file descriptor
+    directly (gunicorn's sendfile) start at the right offset and stop at the
+    Content-Length; servers that read it go through `read`.
+    """
+
+    def __init__(self, file: BinaryIO, start: int, length: int):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses a single-range `Range` header.
+
+    Args:
+        header (str): The header value, e.g. `bytes=0-1023`, `bytes=1024-` or `bytes=-512`.
+        size (int): The size of the file.
+
+    Returns:
+        Optional[tuple[int, int]]: The first and last byte (inclusive), None when the
+        header is malformed or asks for several ranges (the whole file is then sent),
+        or `(size, size)` when the range starts past the end of the file.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return size, size
+        return max(size - suffix, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first > last:
+        return (size, size) if first >= size else None
+    return first, last
+
+
+def stored_file_response(
+    request, path: Path, relative_path: str, size: int, content_type: str, file_name: str, etag: str
+) -> HttpResponse:
+    """
+    Serves a stored file, honouring `Range`, `If-Range` and `If-None-Match`.
+
+    Args:
+        request (HttpRequest): The download request.
+        path (Path): The absolute path of the file.
+        relative_path (str): The path of the file under the storage root, used
+            to build the ATTACHMENT_SENDFILE_HEADER value.
+        size (int): The size of the file.
+        content_type (str): The MIME type sent to the client.
+        file_name (str): The download name; empty for none.
+        etag (str): The strong validator of the content (without quotes).
+
+    Returns:
+        HttpResponse: 200 with the file, 206 with one range of it, 304 when the
+        client already has it, or 416 when the range is outside the file.
+    """
+    quoted_etag = f'"{etag}"'
+    if request.headers.get('If-None-Match') == quoted_etag:
+        response = HttpResponse(status=304)
+        response['ETag'] = quoted_etag
+        return response
+
+    if settings.ATTACHMENT_SENDFILE_HEADER:
+        response = HttpResponse(content_type=content_type)
+        response[settings.ATTACHMENT_SENDFILE_HEADER] = (
+            f"{str(settings.ATTACHMENT_SENDFILE_ROOT).rstrip('/')}/{relative_path}"
+        )
+        if file_name:
+            response['Content-Disposition'] = content_disposition_header(True, file_name)
+        response['ETag'] = quoted_etag
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', quoted_etag) == quoted_etag:
+        byte_range = parse_range(range_header, size)
+
+    if byte_range and byte_range[0] >= size:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f"bytes */{size}"
+        return response
+
+    file = open(path, 'rb')
+    if byte_range:
+        first, last = byte_range
+        response = FileResponse(
+            FileRange(file, first, last - first + 1), status=206, content_type=content_type,
+            as_attachment=bool(file_name), filename=file_name,
+        )
+        response['Content-Length'] = str(last - first + 1)
+        response['Content-Range'] = f"bytes {first}-{last}/{size}"
+    else:
+        response = FileResponse(file, content_type=content_type, as_attachment=bool(file_name), filename=file_name)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = quoted_etag
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
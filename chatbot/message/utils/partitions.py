@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+from django.db import models
+
+from message.models import Message
+
+_PARTITION_MODELS = {}
+
+
+def period_of(moment: datetime) -> str:
+    """
+    Returns the monthly partition key (`YYYYMM`) a timestamp belongs to.
+
+    Parameters:
+        moment (datetime): An aware datetime.
+
+    Returns:
+        str: The period key, e.g. '202411'.
+    """
+    moment = moment.astimezone(timezone.utc)
+    return f"{moment.year:04d}{moment.month:02d}"
+
+
+def shift_period(period: str, months: int) -> str:
+    """
+    Returns the period `months` months after (or before, if negative) `period`.
+    """
+    index = int(period[:4]) * 12 + int(period[4:]) - 1 + months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def period_bounds(period: str) -> tuple[datetime, datetime]:
+    """
+    Returns the half-open UTC range `[start, end)` covered by a period.
+    """
+    start = datetime(int(period[:4]), int(period[4:]), 1, tzinfo=timezone.utc)
+    following = shift_period(period, 1)
+    end = datetime(int(following[:4]), int(following[4:]), 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def periods_between(start: datetime, end: datetime) -> list[str]:
+    """
+    Returns every period overlapping the half-open range `[start, end)`, oldest first.
+    """
+    periods = []
+    period = period_of(start)
+    while period_bounds(period)[0] < end:
+        periods.append(period)
+        period = shift_period(period, 1)
+    return periods
+
+
+def partition_model(period: str, db_table: str) -> type[models.Model]:
+    """
+    Builds (once per period) an unmanaged model with the same concrete columns as
+    `Message`, bound to the partition table of that period.
+
+    Relations keep their columns but lose their database constraints and reverse
+    accessors, so partition rows can outlive the rows they point to. Instances
+    expose the same attributes as `Message` (`chat_id_id`, `get_sender_type_display`)
+    and can be handed to the message serializers unchanged.
+
+    Parameters:
+        period (str): The period key (`YYYYMM`).
+        db_table (str): The (already quoted, if schema-qualified) partition table.
+
+    Returns:
+        type[models.Model]: The partition model class.
+    """
+    if period in _PARTITION_MODELS:
+        return _PARTITION_MODELS[period]
+
+    attrs = {"__module__": __name__}
+    for field in Message._meta.concrete_fields:
+        _, _, args, kwargs = field.deconstruct()
+        if field.is_relation:
+            kwargs.update(on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+        kwargs.pop("db_index", None)
+        if field.primary_key:
+            field_class = models.BigIntegerField
+        else:
+            field_class = field.__class__
+        attrs[field.name] = field_class(*args, **kwargs)
+    attrs["Meta"] = type("Meta", (), {
+        "app_label": Message._meta.app_label,
+        "db_table": db_table,
+        "managed": False,
+        "ordering": ["created_at"],
+    })
+    model = type(f"MessagePartition{period}", (models.Model,), attrs)
+    _PARTITION_MODELS[period] = model
+    return model
@@ -1,5 +1,7 @@
-import json
+from datetime import timedelta
 
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import permissions, status
@@ -7,13 +9,18 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from config import json_codec
 from message.utils.pagination import PaginatorConfig
 
 from message.models import Message
 from message.serializers.message_create_serializer import \
     MessageCreateSerializer
 from message.serializers.message_list_serializer import MessageListSerializer
+from message.services.attachment_service import AttachmentService
 from message.services.message_service import MessageService
+from message.utils.compact_serializer import CompactSerializer, parse_fields
+from message.utils.conditional import conditional_list
+from message.utils.file_responses import stored_file_response
 
 
 class MessageViewSet(ModelViewSet):
@@ -27,12 +34,15 @@ class MessageViewSet(ModelViewSet):
         update: Update an existing message.
         list: List all messages.
         delete: Delete a message by ID.
+        download_attachment: Download a file sent with a message.
     """
     
     permission_classes = [permissions.AllowAny]
     serializer_class = MessageCreateSerializer
     queryset = Message.objects.all()
     pagination_class= PaginatorConfig
+    # Listings go through the values_list() fast path of MessageListSerializer; same JSON.
+    compact_serializer = CompactSerializer(MessageListSerializer)
 
     
     def get_serializer_class(self):
@@ -47,15 +57,22 @@ class MessageViewSet(ModelViewSet):
 
         return MessageListSerializer
 
-    def __init__(self, message_service: MessageService = MessageService(), **kwargs):
+    def __init__(
+        self,
+        message_service: MessageService = MessageService(),
+        attachment_service: AttachmentService = AttachmentService(),
+        **kwargs,
+    ):
         """
         Initializes the MessageViewSet with the message service.
         
         Args:
             message_service (MessageService, optional): The service used to handle message logic.
+            attachment_service (AttachmentService, optional): The service used to find message attachments.
         """
         super().__init__(**kwargs)
         self.message_service = message_service
+        self.attachment_service = attachment_service
 
     @method_decorator(csrf_exempt, name="dispatch")
     def create(self, request) -> Response:
@@ -69,11 +86,11 @@ class MessageViewSet(ModelViewSet):
             Response: The response with the status of the operation.
         """
         try:
-            data = json.loads(request.body)
+            data = json_codec.loads(request.body)
             self.message_service.create(data)
             return Response({"message_received": True}, status=status.HTTP_200_OK)
         
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json_codec.JSONDecodeError, KeyError) as e:
             return Response({"error": f"Invalid data format: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
         except ValidationError as e:
@@ -92,9 +109,8 @@ class MessageViewSet(ModelViewSet):
             Response: The response with the status of the operation.
         """
         try:
-            message_id = Message.objects.get(id=pk)
-            data = json.loads(request.body)
-            message_instance = self.message_service.get_by_id(message_id)
+            data = json_codec.loads(request.body)
+            message_instance = self.message_service.get_by_id(pk)
             self.message_service.update(data, message_instance)
             return Response("detail: The message was updated with success", status=status.HTTP_200_OK)
         except ValidationError as e:
@@ -104,10 +120,27 @@ class MessageViewSet(ModelViewSet):
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 
+    def paginated(self, messages, fields=None) -> Response:
+        """
+        Returns the first page of a message listing, with only `fields` if given.
+        """
+        data_paginator = PaginatorConfig().paging_data(self.compact_serializer.serialize(messages, fields))
+        return Response(data_paginator, status=status.HTTP_200_OK)
+
     @method_decorator(csrf_exempt, name="dispatch")
     def list(self, request) -> Response:
         """
         List all messages in the database.
+
+        When both `start` and `end` (ISO 8601) query parameters are given, only the
+        messages created in `[start, end)` are listed, including the ones already
+        moved to monthly partitions. Both must carry a UTC offset, and the range
+        may span `MESSAGE_RANGE_MAX_DAYS` days at most: every message of the
+        range is read to build the page.
+
+        The listings answer conditional requests (ETag / Last-Modified of their
+        latest message, see message/utils/conditional.py) with 304, and accept
+        `fields=id,created_at` to read and return only some of the fields.
         
         Args:
             request (Request): The request to fetch the list of messages.
@@ -116,11 +149,28 @@ class MessageViewSet(ModelViewSet):
             Response: The response containing the list of messages.
         """
         try:
+            start = request.query_params.get('start')
+            end = request.query_params.get('end')
+            fields = parse_fields(request.query_params.get('fields'))
+            if start and end:
+                start, end = parse_datetime(start), parse_datetime(end)
+                if not start or not end:
+                    raise ValidationError("start and end must be ISO 8601 datetimes.")
+                if start.tzinfo is None or end.tzinfo is None:
+                    raise ValidationError("start and end must include a UTC offset.")
+                if not start < end <= start + timedelta(days=settings.MESSAGE_RANGE_MAX_DAYS):
+                    raise ValidationError(
+                        f"end must be after start, at most {settings.MESSAGE_RANGE_MAX_DAYS} days later."
+                    )
+                only = self.compact_serializer.columns(fields) if fields else None
+                return conditional_list(
+                    request, self.message_service.get_range_version(start, end),
+                    lambda: self.paginated(self.message_service.get_by_range(start, end, only), fields),
+                )
             messages = self.message_service.get_all()
-            serializer_class = self.get_serializer_class()
-            serializer = serializer_class(messages, many=True)
-            data_paginator = PaginatorConfig().paging_data(serializer.data)
-            return Response(data_paginator, status=status.HTTP_200_OK)
+            return conditional_list(
+                request, self.message_service.get_version(messages), lambda: self.paginated(messages, fields)
+            )
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -141,11 +191,11 @@ class MessageViewSet(ModelViewSet):
             Response: A paginated response containing the messages for the contact.
         """
         try:
+            fields = parse_fields(request.query_params.get('fields'))
             messages = self.message_service.get_by_contact(contact)
-            serializer_class = self.get_serializer_class()
-            serializer = serializer_class(messages, many=True)
-            data_paginator = PaginatorConfig().paging_data(serializer.data)
-            return Response(data_paginator, status=status.HTTP_200_OK)
+            return conditional_list(
+                request, self.message_service.get_version(messages), lambda: self.paginated(messages, fields)
+            )
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -166,17 +216,49 @@ class MessageViewSet(ModelViewSet):
             Response: A paginated response containing the messages for the support agent.
         """
         try:
+            fields = parse_fields(request.query_params.get('fields'))
             messages = self.message_service.get_by_support_agent(support_agent)
-            serializer_class = self.get_serializer_class()
-            serializer = serializer_class(messages, many=True)
-            data_paginator = PaginatorConfig().paging_data(serializer.data)
-            return Response(data_paginator, status=status.HTTP_200_OK)
+            return conditional_list(
+                request, self.message_service.get_version(messages), lambda: self.paginated(messages, fields)
+            )
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"error": "An error occurred while fetching messages for the support agent."},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=["get"], url_path=r"attachments/(?P<attachment_id>\d+)")
+    def download_attachment(self, request, attachment_id: int):
+        """
+        Downloads a file sent with a message.
+
+        The file is streamed from the attachment storage (or handed to the front
+        server with ATTACHMENT_SENDFILE_HEADER), never loaded in memory. A `Range`
+        header gets a 206 with that part of the file, and the ETag (the SHA-256 of
+        the content) answers `If-None-Match` with a 304.
+
+        Args:
+            request (Request): The HTTP request.
+            attachment_id (int): The ID of the message attachment.
+
+        Returns:
+            HttpResponse: The file, or a 404 if it does not exist or was not downloaded yet.
+        """
+        message_attachment = self.attachment_service.get_downloadable(int(attachment_id))
+        if message_attachment is None:
+            return Response({"error": "Attachment not found."}, status=status.HTTP_404_NOT_FOUND)
+        stored = message_attachment.attachment
+        storage = self.attachment_service.storage
+        return stored_file_response(
+            request,
+            storage.path(stored.sha256),
+            storage.relative_path(stored.sha256),
+            stored.size,
+            message_attachment.mime_type or stored.mime_type,
+            message_attachment.file_name,
+            stored.sha256,
+        )
+
     @method_decorator(csrf_exempt, name="dispatch")
     def destroy(self, request, pk=None) -> Response:
         """
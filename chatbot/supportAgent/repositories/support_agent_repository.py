@@ -1,6 +1,3 @@
-from abc import ABC, abstractmethod
-
-from chat.models import Chat
 from supportAgent.models import SupportAgent
 from supportAgent.repositories.abstract_support_agent import AbstractSupportAgentRepository
 
@@ -8,20 +5,15 @@ from supportAgent.repositories.abstract_support_agent import AbstractSupportAgen
 
 class SupportAgentRepository(AbstractSupportAgentRepository):
     """
-    Abstract base class for a SupportAgent Repository.
-
-    Purpose:
-        - Serves as a blueprint for repository implementations that handle 
-          operations related to the support_agent model.
-        - Enforces a contract for implementing CRUD operations on support_agent objects.
+    Concrete implementation of the AbstractSupportAgentRepository class.
 
     Methods:
-        - create(data: dict) -> support_agent: Abstract method to create a new support_agent instance.
-        - get_by_id() -> support_agent: Abstract method to retrieve all support_agent instances.
+        - create(data: dict) -> support_agent: Creates a new support_agent instance.
+        - get_by_id(support_id: int) -> support_agent: Retrieves a support_agent by its ID.
     """
 
-    @abstractmethod
-    def create(self, data: dict) -> SupportAgent:
+    @staticmethod
+    def create(data: dict) -> SupportAgent:
         """
         Creates a new support_agent instance.
 
@@ -31,18 +23,15 @@ class SupportAgentRepository(AbstractSupportAgentRepository):
         Returns:
             - support_agent: The created support_agent instance.
         """
-        support_agent = support_agent.objects.create(**data)
-        support_agent.save()
-        return support_agent
+        return SupportAgent.objects.create(**data)
     
 
-    @abstractmethod
-    def get_by_id(self, support_id: int) -> SupportAgent:
+    @staticmethod
+    def get_by_id(support_id: int) -> SupportAgent:
         """
-        Retrieves all support_agent instances.
+        Retrieves a support_agent by its ID.
 
         Returns:
-            - QuerySet: A QuerySet of all support_agent instances.
+            - support_agent: The support_agent instance, or None if it does not exist.
         """
-        support_agent = support_agent.objects.filter(support_agent=support_id).first()
-        return support_agent
\ No newline at end of file
+        return SupportAgent.objects.filter(id=support_id).first()
\ No newline at end of file
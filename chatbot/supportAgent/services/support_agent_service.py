@@ -25,14 +25,14 @@ class SupportAgentService:
     
 
 
-    def get_by_id(self, chat_id: int):
+    def get_by_id(self, support_agent_id: int):
         """
-        Recupera todos os canais (Chats) existentes.
+        Recupera um agente de suporte pelo ID.
 
         Returns:
-            list[Chat]: Uma lista contendo todas as instâncias de support_agent.
+            SupportAgent: A instância do agente, ou None se não existir.
         """
-        return self.support_agent_repository.get_all()
+        return self.support_agent_repository.get_by_id(support_agent_id)
 
     def get_by_chat_id(self, chat_id: int):
         support_agent = self.support_agent_repository.get_by_id(chat_id)